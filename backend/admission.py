@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from typing import Any, Callable, Sequence
+
+from . import job_manager, metrics, model_pool, remote_jobs
+from .scheduler import RESOURCE_HEAVY, get_scheduler, resource_for, timeout_for
+
+
+LOGGER = logging.getLogger("pipeline.backend.admission")
+
+# 모듈별 대기(pending) 작업 상한 기본값. PADIEM_MAX_QUEUED_<MODULE>로 조정, 0 이하면 제한 없음
+DEFAULT_QUEUE_LIMITS = {RESOURCE_HEAVY: 8}
+DEFAULT_LIGHT_QUEUE_LIMIT = 32
+# 동시에 진행하는 서버 측 파이프라인 수 상한 (PADIEM_MAX_QUEUED_PIPELINE)
+DEFAULT_PIPELINE_LIMIT = 4
+# 모듈 최대 메모리 외에 남겨 둘 여유 메모리 (PADIEM_MEM_RESERVE_MB)
+DEFAULT_MEM_RESERVE_MB = 512
+# 실행 기록이 없는 모듈의 작업당 예상 실행 시간(초)
+DEFAULT_RUN_ESTIMATE_SEC = 30.0
+MIN_RETRY_AFTER_SEC = 1
+MAX_RETRY_AFTER_SEC = 3600
+# 실행 중 자식 프로세스 메모리를 재는 주기(초)
+DEFAULT_SAMPLE_SEC = 2.0
+
+
+class AdmissionRejected(Exception):
+    """과부하로 요청을 받지 않음 (HTTP 429 + Retry-After로 응답).
+
+    라우터의 RuntimeError 처리(500)에 걸리지 않도록 RuntimeError를 상속하지 않는다.
+    """
+
+    def __init__(self, module: str, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.module = module
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def queue_limit(module: str) -> int | None:
+    if module == "pipeline":
+        default = DEFAULT_PIPELINE_LIMIT
+    else:
+        default = DEFAULT_QUEUE_LIMITS.get(resource_for(module), DEFAULT_LIGHT_QUEUE_LIMIT)
+    limit = int(_env_number(f"PADIEM_MAX_QUEUED_{module.upper()}", default))
+    return limit if limit > 0 else None
+
+
+# ---- 모듈별 최대 메모리 관측 ----
+
+_peak_lock = threading.Lock()
+# 모듈(또는 resident:<상주 모듈>) -> 관측한 최대 RSS(바이트)
+_peak_rss: dict[str, int] = {}
+
+
+def record_rss(usage: dict[str, int]) -> None:
+    with _peak_lock:
+        for label, value in usage.items():
+            if value > _peak_rss.get(label, 0):
+                _peak_rss[label] = value
+
+
+def peak_rss() -> dict[str, int]:
+    with _peak_lock:
+        return dict(_peak_rss)
+
+
+def available_memory() -> int | None:
+    """/proc/meminfo의 MemAvailable(바이트). 읽을 수 없는 환경(Linux 외)이면 None = 메모리 검사를 하지 않음."""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _memory_needed(module: str, command: Sequence[str] | None) -> int:
+    """작업을 새로 시작할 때 필요한 메모리 추정치 (관측 기록이 없으면 0 = 검사하지 않음)."""
+    resident = model_pool.module_for_command(command) if command else None
+    if resident is not None and model_pool.status().get(resident, {}).get("alive"):
+        # 이미 떠 있는 상주 워커는 모델을 다시 적재하지 않는다.
+        return 0
+    with _peak_lock:
+        if resident is not None:
+            return _peak_rss.get(f"resident:{resident}", _peak_rss.get(module, 0))
+        return _peak_rss.get(module, 0)
+
+
+# ---- 재시도 시각 추정 ----
+
+def _run_estimate(module: str, stats: dict[str, Any]) -> float:
+    module_stats = stats["modules"].get(module)
+    if module_stats and module_stats["completed"]:
+        return max(0.1, float(module_stats["run_sec"]["avg"]))
+    timeout = timeout_for(module)
+    return min(DEFAULT_RUN_ESTIMATE_SEC, timeout) if timeout is not None else DEFAULT_RUN_ESTIMATE_SEC
+
+
+def _clamp_retry(seconds: float) -> int:
+    return int(min(MAX_RETRY_AFTER_SEC, max(MIN_RETRY_AFTER_SEC, math.ceil(seconds))))
+
+
+def retry_after(module: str, excess: int = 1) -> int:
+    """대기열에서 excess개가 빠질 때까지 걸릴 시간: 모듈 평균 실행 시간 × 건수 / 리소스 슬롯 수."""
+    stats = get_scheduler().stats()
+    slots = stats["resources"].get(resource_for(module), {}).get("slots") or 1
+    return _clamp_retry(_run_estimate(module, stats) * max(1, excess) / slots)
+
+
+# ---- 판정 ----
+
+def check(module: str | None, command: Sequence[str] | None = None) -> None:
+    """새 작업을 받아도 되는지 확인하고, 과부하면 AdmissionRejected.
+
+    1) 모듈 대기 작업 수가 상한 이상이면 거절 (파이프라인은 진행 중인 실행 수 기준)
+    2) 이 호스트에서 바로 시작할 작업인데 사용 가능 메모리 - 여유분이 그 모듈의 관측 최대 RSS보다 작으면 거절
+       (슬롯이 모두 차 있으면 앞 작업이 끝나 메모리를 돌려준 뒤 시작하므로 검사하지 않음)
+    """
+    module = module or "unknown"
+    counts = job_manager.active_counts()
+    limit = queue_limit(module)
+    if module == "pipeline":
+        depth = counts.get((module, job_manager.JobStatus.PENDING), 0) + counts.get((module, job_manager.JobStatus.RUNNING), 0)
+    else:
+        depth = counts.get((module, job_manager.JobStatus.PENDING), 0)
+    if limit is not None and depth >= limit:
+        wait = retry_after(module, depth - limit + 1)
+        LOGGER.warning("%s 대기 작업 %d건이 상한 %d건에 도달해 요청을 거절합니다 (Retry-After %ds).", module, depth, limit, wait)
+        raise AdmissionRejected(module, f"{module} 대기 작업이 많아 지금은 요청을 받을 수 없습니다 ({depth}/{limit}).", wait)
+
+    if module == "pipeline" or remote_jobs.is_remote(module):
+        return
+    needed = _memory_needed(module, command)
+    available = available_memory()
+    if not needed or available is None:
+        return
+    pool = get_scheduler().stats()["resources"].get(resource_for(module), {})
+    if pool.get("running", 0) + pool.get("queued", 0) >= pool.get("slots", 1):
+        return
+    reserve = int(_env_number("PADIEM_MEM_RESERVE_MB", DEFAULT_MEM_RESERVE_MB)) * 1024**2
+    if available - reserve < needed:
+        wait = retry_after(module)
+        LOGGER.warning(
+            "%s 실행에 필요한 메모리(최대 %.0f MiB)가 부족해 요청을 거절합니다 (사용 가능 %.0f MiB, 여유분 %.0f MiB).",
+            module,
+            needed / 1024**2,
+            available / 1024**2,
+            reserve / 1024**2,
+        )
+        raise AdmissionRejected(
+            module,
+            f"메모리가 부족해 지금은 {module} 작업을 시작할 수 없습니다 "
+            f"(필요 {needed // 1024**2} MiB, 사용 가능 {max(0, available - reserve) // 1024**2} MiB).",
+            wait,
+        )
+
+
+# ---- 백그라운드 메모리 샘플링 ----
+
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+
+
+def _loop(process_groups: Callable[[], dict[int, str]], interval: float) -> None:
+    while not _stop.wait(interval):
+        try:
+            groups = process_groups()
+            if groups:
+                record_rss(metrics.group_rss_bytes(groups))
+        except Exception:  # noqa: BLE001 - 샘플링 실패가 서버를 멈추지 않도록
+            LOGGER.warning("자식 프로세스 메모리 측정 실패", exc_info=True)
+
+
+def start(process_groups: Callable[[], dict[int, str]]) -> None:
+    """PADIEM_RSS_SAMPLE_SEC 주기로 실행 중 모듈 프로세스 그룹의 RSS를 재어 모듈별 최대값을 갱신 (0 이하면 끔)."""
+    global _thread
+    interval = _env_number("PADIEM_RSS_SAMPLE_SEC", DEFAULT_SAMPLE_SEC)
+    if interval <= 0:
+        return
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, args=(process_groups, interval), name="admission-rss", daemon=True)
+        _thread.start()
+
+
+def shutdown() -> None:
+    _stop.set()
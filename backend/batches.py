@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+import uuid
+from pathlib import Path
+from typing import Any, Sequence
+
+from .utils import BASE_DIR
+
+
+# 배치 요청의 매니페스트/항목별 결과 보고서 저장 위치
+BATCH_ROOT = BASE_DIR / "data" / "batches"
+
+
+def write_manifest(module: str, pairs: Sequence[tuple[Path, Path]]) -> tuple[Path, Path]:
+    """(입력, 출력) 목록으로 모듈 --batch-manifest 파일을 만들고 (매니페스트, 보고서) 경로를 반환.
+
+    없는 입력 파일이 있으면 아무것도 만들지 않고 FileNotFoundError.
+    """
+    missing = [str(source) for source, _ in pairs if not source.exists()]
+    if missing:
+        preview = ", ".join(missing[:5]) + (f" 외 {len(missing) - 5}개" if len(missing) > 5 else "")
+        raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {preview}")
+    BATCH_ROOT.mkdir(parents=True, exist_ok=True)
+    batch_id = f"{module}_{uuid.uuid4().hex[:12]}"
+    manifest = BATCH_ROOT / f"{batch_id}.json"
+    items = [{"input": str(source), "output": str(target)} for source, target in pairs]
+    manifest.write_text(json.dumps({"items": items}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest, BATCH_ROOT / f"{batch_id}.report.json"
+
+
+def read_report(report_path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(report_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def summarize(job_id: str, report_path: Path) -> dict[str, Any]:
+    """동기 배치 응답: 항목별 상태와 성공/실패 수 (일부 실패면 status=partial)."""
+    report = read_report(report_path) or {}
+    failed = int(report.get("failed", 0))
+    return {
+        "status": "partial" if failed else "success",
+        "job_id": job_id,
+        "report": str(report_path),
+        "total": report.get("total", 0),
+        "succeeded": report.get("succeeded", 0),
+        "failed": failed,
+        "elapsed_sec": report.get("elapsed_sec"),
+        "items": report.get("items", []),
+    }
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Iterable
+
+from .utils import BASE_DIR
+
+
+BLOB_ROOT = BASE_DIR / "data" / "blobs" / "sha256"
+UPLOAD_ROOT = BASE_DIR / "data" / "uploads"
+SESSION_ROOT = UPLOAD_ROOT / ".sessions"
+CHUNK_SIZE = 1024 * 1024
+# PUT 한 번에 받을 수 있는 최대 청크 크기
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+class UploadError(ValueError):
+    """업로드 요청 오류 (잘못된 세션/해시 불일치 등)."""
+
+
+class OffsetMismatch(UploadError):
+    """청크 offset이 서버가 받은 크기와 다름 (클라이언트는 current부터 다시 보내야 함)."""
+
+    def __init__(self, current: int) -> None:
+        super().__init__(f"업로드 위치가 맞지 않습니다. 현재 {current}바이트까지 받았습니다.")
+        self.current = current
+
+
+_lock = threading.Lock()
+_session_locks: dict[str, threading.Lock] = {}
+
+
+def blob_path(sha256: str) -> Path:
+    return BLOB_ROOT / sha256[:2] / sha256
+
+
+def has_blob(sha256: str) -> bool:
+    return blob_path(sha256).is_file()
+
+
+def normalize_hash(value: str) -> str:
+    value = value.strip().lower()
+    if len(value) != 64 or any(ch not in "0123456789abcdef" for ch in value):
+        raise UploadError("SHA-256 값 형식이 올바르지 않습니다.")
+    return value
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _link(source: Path, target: Path) -> None:
+    """source를 target에 하드링크(불가하면 복사)로 배치 (기존 파일은 교체)."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def _same_content(path: Path, sha256: str) -> bool:
+    blob = blob_path(sha256)
+    try:
+        if os.path.samefile(path, blob):
+            return True
+        return path.stat().st_size == blob.stat().st_size and hash_file(path) == sha256
+    except OSError:
+        return False
+
+
+def default_destination(filename: str, sha256: str) -> Path:
+    """data/uploads/<파일명>. 같은 이름의 다른 파일이 있으면 N_ 접두사, 같은 내용이면 그 경로를 재사용."""
+    safe_name = Path(filename).name or "upload.bin"
+    candidate = UPLOAD_ROOT / safe_name
+    counter = 1
+    while candidate.exists() and not _same_content(candidate, sha256):
+        candidate = UPLOAD_ROOT / f"{counter}_{safe_name}"
+        counter += 1
+    return candidate
+
+
+def store_file(source: Path, sha256: str) -> tuple[Path, bool]:
+    """검증된 파일을 콘텐츠 주소 저장소로 이동. 이미 같은 blob이 있으면 source를 지우고 (blob, True)."""
+    blob = blob_path(sha256)
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        if blob.is_file():
+            source.unlink(missing_ok=True)
+            return blob, True
+        os.replace(source, blob)
+    return blob, False
+
+
+def materialize(sha256: str, destination: Path) -> Path:
+    """blob을 destination에 배치 (같은 blob이면 그대로 둠)."""
+    blob = blob_path(sha256)
+    if destination.exists() and _same_content(destination, sha256):
+        return destination
+    _link(blob, destination)
+    return destination
+
+
+class BlobWriter:
+    """청크를 임시 파일에 쓰면서 SHA-256을 계산하고, commit()으로 저장소에 넣는다."""
+
+    def __init__(self) -> None:
+        SESSION_ROOT.mkdir(parents=True, exist_ok=True)
+        self._tmp = SESSION_ROOT / f"{uuid.uuid4().hex}.part"
+        self._file = self._tmp.open("wb")
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> tuple[str, bool]:
+        """(sha256, 이미 있던 blob인지)를 반환."""
+        self._file.close()
+        sha256 = self._digest.hexdigest()
+        _, deduplicated = store_file(self._tmp, sha256)
+        return sha256, deduplicated
+
+    def abort(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+# ---- 이어받기 업로드 세션 ----
+
+def _session_paths(upload_id: str) -> tuple[Path, Path]:
+    if not upload_id or any(ch not in "0123456789abcdef" for ch in upload_id):
+        raise UploadError("업로드 ID 형식이 올바르지 않습니다.")
+    return SESSION_ROOT / f"{upload_id}.json", SESSION_ROOT / f"{upload_id}.part"
+
+
+def _load_session(upload_id: str) -> tuple[dict[str, Any], Path, Path]:
+    meta_path, part_path = _session_paths(upload_id)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except FileNotFoundError as exc:
+        raise KeyError(upload_id) from exc
+    return meta, meta_path, part_path
+
+
+def create_session(filename: str, size: int | None = None, destination: Path | None = None) -> dict[str, Any]:
+    SESSION_ROOT.mkdir(parents=True, exist_ok=True)
+    upload_id = uuid.uuid4().hex
+    meta_path, part_path = _session_paths(upload_id)
+    meta = {
+        "upload_id": upload_id,
+        "filename": Path(filename).name or "upload.bin",
+        "size": size,
+        "destination": str(destination) if destination is not None else None,
+        "created_at": time.time(),
+    }
+    part_path.touch()
+    meta_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    return {**meta, "offset": 0}
+
+
+def session_status(upload_id: str) -> dict[str, Any]:
+    """세션 정보와 현재까지 받은 크기(offset). 없으면 KeyError."""
+    meta, _, part_path = _load_session(upload_id)
+    return {**meta, "offset": part_path.stat().st_size}
+
+
+def append_chunk(upload_id: str, offset: int, chunks: Iterable[bytes]) -> int:
+    """offset 위치에 청크를 이어 쓰고 새 offset을 반환. offset이 현재 크기와 다르면 OffsetMismatch."""
+    meta, _, part_path = _load_session(upload_id)
+    with _lock:
+        session_lock = _session_locks.setdefault(upload_id, threading.Lock())
+    with session_lock:
+        current = part_path.stat().st_size
+        if offset != current:
+            raise OffsetMismatch(current)
+        with part_path.open("ab") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            written = f.tell()
+            if meta.get("size") is not None and written > meta["size"]:
+                # 선언한 크기를 넘는 청크는 받지 않은 것으로 되돌린다.
+                f.truncate(current)
+                raise UploadError(f"선언한 크기({meta['size']}바이트)를 넘었습니다.")
+    return written
+
+
+def finalize_session(upload_id: str, sha256: str) -> dict[str, Any]:
+    """받은 파일의 SHA-256을 확인하고 저장소에 넣은 뒤 목적 경로에 하드링크로 배치.
+
+    해시가 다르면 세션을 지우고 UploadError (처음부터 다시 업로드해야 함).
+    """
+    expected = normalize_hash(sha256)
+    meta, meta_path, part_path = _load_session(upload_id)
+    size = part_path.stat().st_size
+    if meta.get("size") is not None and size != meta["size"]:
+        raise UploadError(f"아직 업로드가 끝나지 않았습니다 ({size}/{meta['size']}바이트).")
+    actual = hash_file(part_path)
+    if actual != expected:
+        discard_session(upload_id)
+        raise UploadError(f"SHA-256이 일치하지 않습니다 (받은 파일: {actual}).")
+
+    _, deduplicated = store_file(part_path, actual)
+    meta_path.unlink(missing_ok=True)
+    with _lock:
+        _session_locks.pop(upload_id, None)
+    destination = Path(meta["destination"]) if meta.get("destination") else default_destination(meta["filename"], actual)
+    materialize(actual, destination)
+    return {"sha256": actual, "size": size, "path": destination, "deduplicated": deduplicated}
+
+
+def discard_session(upload_id: str) -> None:
+    meta_path, part_path = _session_paths(upload_id)
+    with _lock:
+        _session_locks.pop(upload_id, None)
+    meta_path.unlink(missing_ok=True)
+    part_path.unlink(missing_ok=True)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from . import job_manager
+
+
+LOGGER = logging.getLogger("pipeline.backend.events")
+
+# 구독자별 대기열 상한 (느린 클라이언트 때문에 메모리가 늘지 않도록 오래된 이벤트부터 버림)
+QUEUE_MAXSIZE = 256
+# SSE/WebSocket 연결 유지용 keepalive 주기(초)
+KEEPALIVE_SEC = 15.0
+
+
+class JobEventBus:
+    """작업별 이벤트를 워커 스레드에서 받아 구독 중인 이벤트 루프의 asyncio.Queue로 전달."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """현재 이벤트 루프에서 job_id 이벤트를 받을 대기열을 등록 (루프 안에서 호출)."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((loop, queue))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            entries = [entry for entry in self._subscribers.get(job_id, []) if entry[1] is not queue]
+            if entries:
+                self._subscribers[job_id] = entries
+            else:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: str, event: dict[str, Any]) -> None:
+        """스레드 안전하게 이벤트를 발행 (구독자가 없으면 아무 일도 하지 않음)."""
+        with self._lock:
+            entries = list(self._subscribers.get(job_id, []))
+        for loop, queue in entries:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, event)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 구독자
+                self.unsubscribe(job_id, queue)
+
+    def subscriber_count(self, job_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(job_id, []))
+
+
+def _put_latest(queue: asyncio.Queue, event: dict[str, Any]) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+_bus = JobEventBus()
+
+
+def get_bus() -> JobEventBus:
+    return _bus
+
+
+def status_event(job: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "status", "job_id": job["job_id"], "status": job["status"], "job": job}
+
+
+def publish_progress(job_id: str, **fields: Any) -> None:
+    """모듈 진행률 등 상태 외 이벤트를 발행."""
+    _bus.publish(job_id, {"type": "progress", "job_id": job_id, **fields})
+
+
+def _on_job_update(job: dict[str, Any]) -> None:
+    _bus.publish(job["job_id"], status_event(job))
+
+
+def install() -> None:
+    """작업 저장소 상태 변경을 이벤트 버스로 연결."""
+    job_manager.add_listener(_on_job_update)
+
+
+def is_terminal(event: dict[str, Any]) -> bool:
+    return event.get("type") == "status" and event.get("status") in job_manager.TERMINAL_STATUSES
+
+
+@asynccontextmanager
+async def subscription(job_id: str) -> AsyncIterator[asyncio.Queue]:
+    queue = _bus.subscribe(job_id)
+    try:
+        yield queue
+    finally:
+        _bus.unsubscribe(job_id, queue)
+
+
+async def job_events(job_id: str, keepalive: float = KEEPALIVE_SEC) -> AsyncIterator[dict[str, Any] | None]:
+    """현재 상태를 먼저 보내고, 이후 변경 이벤트를 종료 상태까지 전달.
+
+    keepalive 주기 동안 이벤트가 없으면 None을 내보내 호출 측이 연결 유지/종료 확인을 하게 한다.
+    작업이 없으면 KeyError.
+    """
+    async with subscription(job_id) as queue:
+        # 구독을 먼저 등록한 뒤 현재 상태를 읽어야 그 사이의 변경을 놓치지 않는다.
+        current = status_event(job_manager.get_job(job_id))
+        yield current
+        if is_terminal(current):
+            return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            yield event
+            if is_terminal(event):
+                return
+
+
+def format_sse(event: dict[str, Any]) -> str:
+    data = json.dumps(event, ensure_ascii=False)
+    return f"event: {event.get('type', 'message')}\ndata: {data}\n\n"
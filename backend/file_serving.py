@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import gzip
+import re
+from email.utils import formatdate
+from pathlib import Path
+from typing import Iterator
+
+from shared.utils.step_cache import file_digest
+
+
+CHUNK_SIZE = 1024 * 1024
+# 이보다 작은 JSON은 압축 이득보다 비용이 커서 그대로 보낸다.
+GZIP_MIN_BYTES = 1024
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(ValueError):
+    """파일 크기를 벗어난 Range 요청 (416)."""
+
+
+def strong_etag(path: Path) -> str:
+    """크기/수정 시각/내용 해시로 만든 강한 ETag (해시는 크기·수정 시각이 같으면 재사용)."""
+    stat = path.stat()
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}-{file_digest(path)[:16]}"'
+
+
+def last_modified(path: Path) -> str:
+    return formatdate(path.stat().st_mtime, usegmt=True)
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    """If-None-Match 헤더가 etag와 일치하는지 (약한 비교, `*` 포함)."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [value.strip() for value in header.split(",")]
+    return any(value.removeprefix("W/") == etag.removeprefix("W/") for value in candidates)
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """`bytes=start-end` 단일 구간을 (start, end 포함)으로 해석.
+
+    헤더가 없거나 지원하지 않는 형식(여러 구간 등)이면 None으로 전체 응답을 보내고,
+    파일 범위를 벗어나면 RangeNotSatisfiable.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # bytes=-N: 마지막 N바이트
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+def iter_file(path: Path, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """파일의 [start, end] 구간을 chunk_size 단위로 읽기."""
+    with path.open("rb") as f:
+        f.seek(start)
+        remaining = None if end is None else end - start + 1
+        while remaining is None or remaining > 0:
+            chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def accepts_gzip(header: str | None) -> bool:
+    if not header:
+        return False
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def maybe_gzip(body: bytes, accept_encoding: str | None) -> tuple[bytes, bool]:
+    """클라이언트가 gzip을 받고 본문이 충분히 크면 압축한 본문과 True를 반환."""
+    if len(body) < GZIP_MIN_BYTES or not accepts_gzip(accept_encoding):
+        return body, False
+    return gzip.compress(body, compresslevel=6, mtime=0), True
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+import json
+import logging
+import os
+import sqlite3
 import threading
 import uuid
 from datetime import datetime
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
+
+
+LOGGER = logging.getLogger("pipeline.backend.jobs")
 
 
 class JobStatus:
@@ -11,65 +19,288 @@ class JobStatus:
     RUNNING = "running"
     SUCCESS = "success"
     FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed_out"
+
+
+# 더 이상 상태가 바뀌지 않는 작업 상태
+TERMINAL_STATUSES = frozenset({JobStatus.SUCCESS, JobStatus.FAILED, JobStatus.CANCELLED, JobStatus.TIMED_OUT})
+
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "data" / "jobs.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    module TEXT,
+    command TEXT,
+    result TEXT,
+    error TEXT,
+    meta TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs(status, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_module_created ON jobs(module, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs(created_at);
+"""
+
+# 초기 스키마 이후 추가된 컬럼 (기존 DB 파일은 시작 시 ALTER TABLE로 보강)
+_EXTRA_COLUMNS = {
+    "started_at": "TEXT",
+    "finished_at": "TEXT",
+    "progress": "TEXT",
+    "logs": "TEXT",
+    "timings": "TEXT",
+}
 
 
 def _now() -> str:
     return datetime.utcnow().isoformat() + "Z"
 
 
-_lock = threading.Lock()
-_jobs: dict[str, dict[str, Any]] = {}
+_init_lock = threading.Lock()
+_local = threading.local()
+_db_path: Path = Path(os.getenv("PADIEM_JOB_DB", str(DEFAULT_DB_PATH)))
+_initialized = False
+_listeners: list[Callable[[dict[str, Any]], None]] = []
+
+
+def configure(db_path: str | Path) -> None:
+    """작업 저장소 DB 경로를 변경 (테스트/운영 환경 분리용)."""
+    global _db_path, _initialized
+    with _init_lock:
+        _db_path = Path(db_path)
+        _initialized = False
+
+
+def _connect() -> sqlite3.Connection:
+    """스레드별 SQLite 연결을 반환 (WAL 모드로 읽기/쓰기 동시성 확보)."""
+    global _initialized
+    conn: sqlite3.Connection | None = getattr(_local, "conn", None)
+    if conn is not None and getattr(_local, "path", None) == _db_path:
+        return conn
+    if conn is not None:
+        conn.close()
+
+    _db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(_db_path), timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    with _init_lock:
+        if not _initialized:
+            conn.executescript(_SCHEMA)
+            _migrate(conn)
+            _initialized = True
+    _local.conn = conn
+    _local.path = _db_path
+    return conn
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+    for name, column_type in _EXTRA_COLUMNS.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+
+
+def _loads(value: str | None) -> Any:
+    return json.loads(value) if value is not None else None
+
+
+def _row_to_job(row: sqlite3.Row, include_command: bool = False, include_logs: bool = False) -> dict[str, Any]:
+    job: dict[str, Any] = {
+        "job_id": row["job_id"],
+        "status": row["status"],
+        "result": json.loads(row["result"]) if row["result"] is not None else None,
+        "error": row["error"],
+        "created_at": row["created_at"],
+        "updated_at": row["updated_at"],
+        "started_at": row["started_at"],
+        "finished_at": row["finished_at"],
+        "meta": json.loads(row["meta"] or "{}"),
+        "progress": _loads(row["progress"]),
+        "timings": _loads(row["timings"]),
+    }
+    if include_logs:
+        job["logs"] = _loads(row["logs"]) or []
+    if include_command:
+        job["command"] = json.loads(row["command"]) if row["command"] else None
+    return job
+
+
+def _update(job_id: str, notify: bool = True, **fields: Any) -> None:
+    fields["updated_at"] = _now()
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    conn = _connect()
+    cursor = conn.execute(
+        f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+        (*fields.values(), job_id),
+    )
+    if cursor.rowcount == 0:
+        raise KeyError(job_id)
+    if notify:
+        _notify(job_id)
 
 
-def create_job(meta: dict[str, Any] | None = None) -> str:
+def add_listener(callback: Callable[[dict[str, Any]], None]) -> None:
+    """작업 상태가 바뀔 때마다 갱신된 작업 정보로 호출할 콜백을 등록."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback: Callable[[dict[str, Any]], None]) -> None:
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def _notify(job_id: str) -> None:
+    if not _listeners:
+        return
+    job = get_job(job_id, include_logs=False)
+    for callback in list(_listeners):
+        try:
+            callback(job)
+        except Exception:  # noqa: BLE001 - 알림 실패가 상태 저장을 막지 않도록
+            LOGGER.exception("작업 상태 알림 실패: %s", job_id)
+
+
+def create_job(meta: dict[str, Any] | None = None, command: list[str] | None = None) -> str:
     job_id = uuid.uuid4().hex
-    with _lock:
-        _jobs[job_id] = {
-            "job_id": job_id,
-            "status": JobStatus.PENDING,
-            "result": None,
-            "error": None,
-            "created_at": _now(),
-            "updated_at": _now(),
-            "meta": meta or {},
-        }
+    meta = meta or {}
+    now = _now()
+    _connect().execute(
+        "INSERT INTO jobs (job_id, status, module, command, result, error, meta, created_at, updated_at)"
+        " VALUES (?, ?, ?, ?, NULL, NULL, ?, ?, ?)",
+        (
+            job_id,
+            JobStatus.PENDING,
+            meta.get("module"),
+            json.dumps(command, ensure_ascii=False) if command is not None else None,
+            json.dumps(meta, ensure_ascii=False),
+            now,
+            now,
+        ),
+    )
     return job_id
 
 
 def mark_running(job_id: str) -> None:
-    with _lock:
-        if job_id not in _jobs:
-            raise KeyError(job_id)
-        _jobs[job_id]["status"] = JobStatus.RUNNING
-        _jobs[job_id]["updated_at"] = _now()
+    _update(job_id, status=JobStatus.RUNNING, started_at=_now(), finished_at=None)
 
 
 def mark_success(job_id: str, result: dict[str, Any] | None = None) -> None:
-    with _lock:
-        if job_id not in _jobs:
-            raise KeyError(job_id)
-        _jobs[job_id]["status"] = JobStatus.SUCCESS
-        _jobs[job_id]["result"] = result or {}
-        _jobs[job_id]["error"] = None
-        _jobs[job_id]["updated_at"] = _now()
+    _update(
+        job_id,
+        status=JobStatus.SUCCESS,
+        result=json.dumps(result or {}, ensure_ascii=False),
+        error=None,
+        finished_at=_now(),
+    )
 
 
 def mark_failed(job_id: str, error: str) -> None:
-    with _lock:
-        if job_id not in _jobs:
-            raise KeyError(job_id)
-        _jobs[job_id]["status"] = JobStatus.FAILED
-        _jobs[job_id]["error"] = error
-        _jobs[job_id]["updated_at"] = _now()
+    _update(job_id, status=JobStatus.FAILED, error=error, finished_at=_now())
+
+
+def mark_stopped(job_id: str, status: str, reason: str) -> None:
+    """취소(cancelled) 또는 시간 초과(timed_out)로 중단된 작업 기록."""
+    if status not in (JobStatus.CANCELLED, JobStatus.TIMED_OUT):
+        raise ValueError(f"중단 상태가 아닙니다: {status}")
+    _update(job_id, status=status, error=reason, finished_at=_now())
+
+
+def update_progress(
+    job_id: str,
+    progress: dict[str, Any] | None = None,
+    logs: list[str] | None = None,
+    timings: dict[str, float] | None = None,
+) -> None:
+    """실행 중 진행률/최근 로그/단계별 소요 시간 저장 (상태 변경 알림은 보내지 않음)."""
+    fields: dict[str, Any] = {}
+    if progress is not None:
+        fields["progress"] = json.dumps(progress, ensure_ascii=False)
+    if logs is not None:
+        fields["logs"] = json.dumps(logs, ensure_ascii=False)
+    if timings is not None:
+        fields["timings"] = json.dumps(timings, ensure_ascii=False)
+    if fields:
+        _update(job_id, notify=False, **fields)
+
+
+def get_job(job_id: str, include_logs: bool = True) -> dict[str, Any]:
+    row = _connect().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+    if row is None:
+        raise KeyError(job_id)
+    return _row_to_job(row, include_logs=include_logs)
+
+
+def _filter_clause(status: str | None, module: str | None) -> tuple[str, list[Any]]:
+    conditions: list[str] = []
+    params: list[Any] = []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if module:
+        conditions.append("module = ?")
+        params.append(module)
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def list_jobs(
+    status: str | None = None,
+    module: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """작업 목록을 최신순으로 조회 (상태/모듈 필터, 페이지네이션 지원)."""
+    where, params = _filter_clause(status, module)
+    query = f"SELECT * FROM jobs{where} ORDER BY created_at DESC"
+    if limit is not None:
+        query += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    rows = _connect().execute(query, params).fetchall()
+    return [_row_to_job(row) for row in rows]
+
+
+def count_jobs(status: str | None = None, module: str | None = None) -> int:
+    where, params = _filter_clause(status, module)
+    return int(_connect().execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0])
+
+
+def active_counts() -> dict[tuple[str, str], int]:
+    """대기/실행 중인 작업 수를 (모듈, 상태)별로 집계."""
+    rows = _connect().execute(
+        "SELECT module, status, COUNT(*) FROM jobs WHERE status IN (?, ?) GROUP BY module, status",
+        (JobStatus.PENDING, JobStatus.RUNNING),
+    ).fetchall()
+    return {(row[0] or "unknown", row[1]): int(row[2]) for row in rows}
 
 
-def get_job(job_id: str) -> dict[str, Any]:
-    with _lock:
-        if job_id not in _jobs:
-            raise KeyError(job_id)
-        return dict(_jobs[job_id])
+def purge_jobs(finished_before: str, dry_run: bool = False) -> int:
+    """finished_before(ISO 시각) 이전에 끝난 작업 레코드를 삭제하고 삭제(dry_run이면 대상) 수를 반환."""
+    statuses = sorted(TERMINAL_STATUSES)
+    placeholders = ", ".join("?" for _ in statuses)
+    where = f"WHERE status IN ({placeholders}) AND COALESCE(finished_at, updated_at) < ?"
+    conn = _connect()
+    if dry_run:
+        return int(conn.execute(f"SELECT COUNT(*) FROM jobs {where}", (*statuses, finished_before)).fetchone()[0])
+    return conn.execute(f"DELETE FROM jobs {where}", (*statuses, finished_before)).rowcount
 
 
-def list_jobs() -> list[dict[str, Any]]:
-    with _lock:
-        return [dict(job) for job in _jobs.values()]
+def recover_jobs() -> list[dict[str, Any]]:
+    """재시작 시 실행 중이던 작업을 대기 상태로 되돌리고, 재실행할 작업 목록을 반환."""
+    conn = _connect()
+    conn.execute(
+        "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+        (JobStatus.PENDING, _now(), JobStatus.RUNNING),
+    )
+    rows = conn.execute(
+        "SELECT * FROM jobs WHERE status = ? ORDER BY created_at ASC",
+        (JobStatus.PENDING,),
+    ).fetchall()
+    return [_row_to_job(row, include_command=True) for row in rows]
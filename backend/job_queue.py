@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol, Sequence
+
+
+LOGGER = logging.getLogger("pipeline.backend.queue")
+
+DEFAULT_QUEUE_PATH = Path(__file__).resolve().parent.parent / "data" / "queue.sqlite3"
+# 원격 워커가 자기 파이썬 실행 파일로 바꿔 쓰는 자리표시자
+PYTHON_TOKEN = "{python}"
+# 리스가 만료돼 다시 대기열로 돌아간 작업을 포기하기까지의 최대 시도 횟수
+MAX_ATTEMPTS = 3
+
+STATE_QUEUED = "queued"
+STATE_CLAIMED = "claimed"
+STATE_DONE = "done"
+
+
+@dataclass
+class QueuedJob:
+    job_id: str
+    module: str | None
+    command: list[str]
+    meta: dict[str, Any]
+    attempts: int
+
+
+@dataclass
+class FinishedJob:
+    job_id: str
+    outcome: str  # success / failed / cancelled / timed_out
+    result: dict[str, Any] | None
+    error: str | None
+    logs: list[str] | None = None
+
+
+class JobQueue(Protocol):
+    """API 서버와 실행 워커 사이의 작업 대기열.
+
+    워커는 claim()으로 리스를 얻어 작업을 가져가고 heartbeat()로 연장한다. 리스가 만료되면(워커 종료 등)
+    작업은 다른 워커가 다시 가져갈 수 있다. API 서버는 finished()로 결과를 읽고 acknowledge()로 지운다.
+    """
+
+    def enqueue(self, job_id: str, module: str | None, command: Sequence[str], meta: dict[str, Any]) -> bool: ...
+
+    def claim(self, worker_id: str, modules: set[str] | None, lease_sec: float) -> QueuedJob | None: ...
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_sec: float, logs: list[str] | None = None) -> bool: ...
+
+    def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        outcome: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> bool: ...
+
+    def release(self, job_id: str, worker_id: str) -> bool: ...
+
+    def cancel(self, job_id: str, status: str, reason: str) -> str | None: ...
+
+    def cancel_reason(self, job_id: str) -> tuple[str, str] | None: ...
+
+    def running(self) -> list[dict[str, Any]]: ...
+
+    def finished(self) -> list[FinishedJob]: ...
+
+    def acknowledge(self, job_id: str) -> None: ...
+
+    def contains(self, job_id: str) -> bool: ...
+
+    def counts(self) -> dict[str, int]: ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    job_id TEXT PRIMARY KEY,
+    module TEXT,
+    command TEXT NOT NULL,
+    meta TEXT NOT NULL DEFAULT '{}',
+    state TEXT NOT NULL,
+    worker_id TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_status TEXT,
+    cancel_reason TEXT,
+    outcome TEXT,
+    result TEXT,
+    error TEXT,
+    logs TEXT,
+    enqueued_at REAL NOT NULL,
+    claimed_at REAL,
+    heartbeat_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_queue_state ON queue(state, enqueued_at);
+"""
+
+
+class SqliteQueue:
+    """SQLite 파일 하나로 구현한 대기열 (같은 파일을 여는 여러 워커 프로세스가 리스로 작업을 나눠 가짐).
+
+    claim은 BEGIN IMMEDIATE 트랜잭션 안에서 만료된 리스 회수와 선점을 함께 처리하므로 두 워커가 같은 작업을
+    가져가지 않는다. 여러 호스트에서 쓰려면 SQLite 파일 잠금을 지원하는 공유 저장소에 두어야 한다.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # 네트워크 파일 시스템에서는 WAL 공유 메모리를 쓸 수 없으므로 저널 모드를 바꿀 수 있게 둔다.
+        conn.execute(f"PRAGMA journal_mode={os.getenv('PADIEM_QUEUE_JOURNAL', 'WAL')}")
+        conn.execute("PRAGMA busy_timeout=30000")
+        with self._init_lock:
+            if not self._initialized:
+                conn.executescript(_SCHEMA)
+                self._initialized = True
+        self._local.conn = conn
+        return conn
+
+    def enqueue(self, job_id: str, module: str | None, command: Sequence[str], meta: dict[str, Any]) -> bool:
+        """작업을 넣는다. 이미 있는 작업(재시작 후 재등록 등)이면 그대로 두고 False."""
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO queue (job_id, module, command, meta, state, enqueued_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, module, json.dumps(list(command), ensure_ascii=False), json.dumps(meta, ensure_ascii=False), STATE_QUEUED, time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def _reclaim_expired(self, conn: sqlite3.Connection, now: float) -> None:
+        rows = conn.execute(
+            "SELECT job_id, worker_id, attempts FROM queue WHERE state = ? AND lease_until < ?",
+            (STATE_CLAIMED, now),
+        ).fetchall()
+        for row in rows:
+            if row["attempts"] >= MAX_ATTEMPTS:
+                LOGGER.warning("작업 %s: 워커 응답이 %d번 끊겨 실패로 처리합니다.", row["job_id"], row["attempts"])
+                conn.execute(
+                    "UPDATE queue SET state = ?, outcome = 'failed', error = ?, finished_at = ? WHERE job_id = ?",
+                    (STATE_DONE, f"워커 응답이 없어 {row['attempts']}번 재시도 후 중단했습니다.", now, row["job_id"]),
+                )
+            else:
+                LOGGER.warning("작업 %s: 워커 %s의 리스가 만료되어 다시 대기열에 넣습니다.", row["job_id"], row["worker_id"])
+                conn.execute(
+                    "UPDATE queue SET state = ?, worker_id = NULL, lease_until = NULL WHERE job_id = ?",
+                    (STATE_QUEUED, row["job_id"]),
+                )
+
+    def claim(self, worker_id: str, modules: set[str] | None, lease_sec: float) -> QueuedJob | None:
+        """가장 오래 기다린 작업 하나를 리스와 함께 가져간다 (modules가 있으면 해당 모듈만)."""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._reclaim_expired(conn, now)
+            query = "SELECT * FROM queue WHERE state = ? AND cancel_status IS NULL"
+            params: list[Any] = [STATE_QUEUED]
+            if modules:
+                query += f" AND module IN ({', '.join('?' for _ in modules)})"
+                params.extend(sorted(modules))
+            row = conn.execute(query + " ORDER BY enqueued_at LIMIT 1", params).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE queue SET state = ?, worker_id = ?, lease_until = ?, attempts = attempts + 1, "
+                "claimed_at = ?, heartbeat_at = ? WHERE job_id = ?",
+                (STATE_CLAIMED, worker_id, now + lease_sec, now, now, row["job_id"]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return QueuedJob(
+            job_id=row["job_id"],
+            module=row["module"],
+            command=json.loads(row["command"]),
+            meta=json.loads(row["meta"] or "{}"),
+            attempts=row["attempts"] + 1,
+        )
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_sec: float, logs: list[str] | None = None) -> bool:
+        """리스를 연장. 취소 요청이 있거나 리스를 잃었으면(다른 워커가 가져감) False."""
+        now = time.time()
+        fields = "lease_until = ?, heartbeat_at = ?"
+        params: list[Any] = [now + lease_sec, now]
+        if logs is not None:
+            fields += ", logs = ?"
+            params.append(json.dumps(logs, ensure_ascii=False))
+        conn = self._connect()
+        cursor = conn.execute(
+            f"UPDATE queue SET {fields} WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (*params, job_id, worker_id, STATE_CLAIMED),
+        )
+        if cursor.rowcount != 1:
+            return False
+        row = conn.execute("SELECT cancel_status FROM queue WHERE job_id = ?", (job_id,)).fetchone()
+        return row is not None and row["cancel_status"] is None
+
+    def complete(
+        self,
+        job_id: str,
+        worker_id: str,
+        outcome: str,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE queue SET state = ?, outcome = ?, result = ?, error = ?, finished_at = ? "
+            "WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (
+                STATE_DONE,
+                outcome,
+                json.dumps(result, ensure_ascii=False) if result is not None else None,
+                error,
+                time.time(),
+                job_id,
+                worker_id,
+                STATE_CLAIMED,
+            ),
+        )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """워커 종료 시 끝내지 못한 작업을 대기열로 되돌린다 (시도 횟수는 되돌리지 않음)."""
+        cursor = self._connect().execute(
+            "UPDATE queue SET state = ?, worker_id = NULL, lease_until = NULL WHERE job_id = ? AND worker_id = ? AND state = ?",
+            (STATE_QUEUED, job_id, worker_id, STATE_CLAIMED),
+        )
+        return cursor.rowcount == 1
+
+    def cancel(self, job_id: str, status: str, reason: str) -> str | None:
+        """취소 요청. 대기 중이면 바로 끝난 상태로 바꾸고 'queued', 실행 중이면 표시만 하고 'claimed', 없으면 None."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT state FROM queue WHERE job_id = ?", (job_id,)).fetchone()
+            state = row["state"] if row is not None else None
+            if state == STATE_QUEUED:
+                conn.execute("DELETE FROM queue WHERE job_id = ?", (job_id,))
+            elif state == STATE_CLAIMED:
+                conn.execute(
+                    "UPDATE queue SET cancel_status = COALESCE(cancel_status, ?), cancel_reason = COALESCE(cancel_reason, ?) WHERE job_id = ?",
+                    (status, reason, job_id),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return state if state in (STATE_QUEUED, STATE_CLAIMED) else None
+
+    def cancel_reason(self, job_id: str) -> tuple[str, str] | None:
+        row = self._connect().execute("SELECT cancel_status, cancel_reason FROM queue WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None or row["cancel_status"] is None:
+            return None
+        return row["cancel_status"], row["cancel_reason"] or ""
+
+    def running(self) -> list[dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT job_id, worker_id, logs, heartbeat_at FROM queue WHERE state = ?", (STATE_CLAIMED,)
+        ).fetchall()
+        return [
+            {"job_id": row["job_id"], "worker_id": row["worker_id"], "logs": json.loads(row["logs"]) if row["logs"] else None}
+            for row in rows
+        ]
+
+    def finished(self) -> list[FinishedJob]:
+        rows = self._connect().execute("SELECT * FROM queue WHERE state = ?", (STATE_DONE,)).fetchall()
+        return [
+            FinishedJob(
+                job_id=row["job_id"],
+                outcome=row["outcome"] or "failed",
+                result=json.loads(row["result"]) if row["result"] else None,
+                error=row["error"],
+                logs=json.loads(row["logs"]) if row["logs"] else None,
+            )
+            for row in rows
+        ]
+
+    def acknowledge(self, job_id: str) -> None:
+        self._connect().execute("DELETE FROM queue WHERE job_id = ?", (job_id,))
+
+    def contains(self, job_id: str) -> bool:
+        return self._connect().execute("SELECT 1 FROM queue WHERE job_id = ?", (job_id,)).fetchone() is not None
+
+    def counts(self) -> dict[str, int]:
+        rows = self._connect().execute("SELECT state, COUNT(*) FROM queue GROUP BY state").fetchall()
+        return {row[0]: int(row[1]) for row in rows}
+
+
+def portable_command(command: Sequence[str], base_dir: Path) -> list[str]:
+    """다른 호스트의 워커가 실행할 수 있도록 파이썬 경로는 자리표시자로, 프로젝트 내부 절대 경로는 상대 경로로 바꾼다."""
+    portable: list[str] = []
+    for part in command:
+        if part == sys.executable:
+            portable.append(PYTHON_TOKEN)
+            continue
+        path = Path(part)
+        if path.is_absolute():
+            try:
+                portable.append(path.relative_to(base_dir).as_posix())
+                continue
+            except ValueError:
+                pass
+        portable.append(part)
+    return portable
+
+
+def local_command(command: Sequence[str]) -> list[str]:
+    """워커 측: 자리표시자를 자신의 파이썬 실행 파일로 바꾼다 (상대 경로는 프로젝트 루트 기준으로 실행)."""
+    return [sys.executable if part == PYTHON_TOKEN else part for part in command]
+
+
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+
+def get_queue() -> JobQueue:
+    """PADIEM_QUEUE_BACKEND(기본 sqlite)에 따른 공용 대기열. SQLite 파일 경로는 PADIEM_QUEUE_DB."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            backend = os.getenv("PADIEM_QUEUE_BACKEND", "sqlite").strip().lower()
+            if backend != "sqlite":
+                raise ValueError(f"지원하지 않는 대기열 종류입니다: {backend}")
+            _queue = SqliteQueue(os.getenv("PADIEM_QUEUE_DB", str(DEFAULT_QUEUE_PATH)))
+        return _queue
+
+
+def configure(queue: JobQueue | None) -> None:
+    """공용 대기열 교체 (테스트/다른 구현 연결용, None이면 다음 호출 때 환경 변수로 다시 생성)."""
+    global _queue
+    with _queue_lock:
+        _queue = queue
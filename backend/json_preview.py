@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+
+READ_CHUNK_CHARS = 64 * 1024
+# 세그먼트 외 최상위 필드 중 이보다 큰 값(전체 전사 text 등)은 미리보기에서 생략
+MAX_FIELD_CHARS = 4096
+SEGMENTS_KEY = "segments"
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class _Scanner:
+    """파일을 조금씩 읽으며 JSON 값을 하나씩 해석하는 증분 파서 (전체 문서를 메모리에 올리지 않음)."""
+
+    def __init__(self, fp: TextIO) -> None:
+        self._fp = fp
+        self._buffer = ""
+        self._pos = 0
+        self._dropped = 0
+        self._eof = False
+
+    @property
+    def offset(self) -> int:
+        """문서 처음부터 지금까지 해석한 문자 수."""
+        return self._dropped + self._pos
+
+    def _fill(self, at_least: int = 0) -> bool:
+        if self._eof:
+            return False
+        chunk = self._fp.read(max(at_least, READ_CHUNK_CHARS))
+        if not chunk:
+            self._eof = True
+            return False
+        # 이미 해석한 앞부분은 버려 버퍼가 커지지 않게 한다.
+        self._dropped += self._pos
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 문자 (끝이면 빈 문자열)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"JSON 형식 오류: '{char}' 위치에 '{self.peek()}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """다음 JSON 값 하나를 해석 (버퍼 끝에 걸치면 더 읽고 다시 시도)."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # 큰 값은 읽는 양을 버퍼 크기만큼 늘려 재시도 횟수를 줄인다.
+                if self._fill(len(self._buffer)):
+                    continue
+                raise
+            # 숫자/리터럴이 버퍼 끝에서 잘렸을 수 있으므로 끝까지 왔으면 더 읽어 확인
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[Any]:
+        """현재 위치의 배열 원소를 하나씩 반환."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError("JSON 형식 오류: 배열 구분자가 없습니다.")
+
+
+def _segment_times(segment: Any) -> tuple[float | None, float | None]:
+    if not isinstance(segment, dict):
+        return None, None
+    start = segment.get("start", segment.get("startTime"))
+    end = segment.get("end", segment.get("endTime"))
+    try:
+        return (float(start) if start is not None else None, float(end) if end is not None else None)
+    except (TypeError, ValueError):
+        return None, None
+
+
+def _in_range(segment: Any, start: float | None, end: float | None) -> bool:
+    if start is None and end is None:
+        return True
+    seg_start, seg_end = _segment_times(segment)
+    if seg_start is None:
+        return False
+    seg_end = seg_start if seg_end is None else seg_end
+    return (start is None or seg_end >= start) and (end is None or seg_start <= end)
+
+
+def slice_segments(
+    path: Path,
+    offset: int = 0,
+    limit: int | None = None,
+    start: float | None = None,
+    end: float | None = None,
+) -> dict[str, Any]:
+    """STT/텍스트 처리 결과 JSON에서 세그먼트 일부만 읽어 반환.
+
+    최상위가 배열(Gemini STT)이거나 `segments` 배열을 가진 객체(Whisper, 텍스트 처리)를 지원한다.
+    start/end(초)와 겹치는 세그먼트 중 offset부터 limit개만 메모리에 올리고, 나머지는 개수만 센다.
+    """
+    selected: list[Any] = []
+    fields: dict[str, Any] = {}
+    omitted: list[str] = []
+    total = 0
+    matched = 0
+
+    def _consume(segments: Iterator[Any]) -> None:
+        nonlocal total, matched
+        for segment in segments:
+            total += 1
+            if not _in_range(segment, start, end):
+                continue
+            if matched >= offset and (limit is None or len(selected) < limit):
+                selected.append(segment)
+            matched += 1
+
+    with path.open("r", encoding="utf-8") as fp:
+        scanner = _Scanner(fp)
+        head = scanner.peek()
+        if head == "[":
+            _consume(scanner.items())
+        elif head == "{":
+            scanner.expect("{")
+            while scanner.peek() != "}":
+                key = scanner.value()
+                scanner.expect(":")
+                if key == SEGMENTS_KEY and scanner.peek() == "[":
+                    _consume(scanner.items())
+                else:
+                    scanner.peek()
+                    value_start = scanner.offset
+                    value = scanner.value()
+                    if scanner.offset - value_start > MAX_FIELD_CHARS:
+                        omitted.append(key)
+                    else:
+                        fields[key] = value
+                if scanner.peek() == ",":
+                    scanner.expect(",")
+        else:
+            raise ValueError("세그먼트 배열을 찾을 수 없는 JSON입니다.")
+
+    return {
+        "total": total,
+        "matched": matched,
+        "offset": offset,
+        "limit": limit,
+        "segments": selected,
+        "fields": fields,
+        "omitted_fields": omitted,
+    }
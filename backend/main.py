@@ -1,18 +1,45 @@
 from __future__ import annotations
-from fastapi import FastAPI
+
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from dotenv import load_dotenv
 
-from .routers import audio, files, jobs, lipsync, lipsync_musetalk, rvc, stt, stt_gemini, text, tts, tts_backup, tts_gemini, uploads
+from . import admission, events, job_manager, metrics, model_pool, progress, remote_jobs, retention
+from .routers import audio, files, jobs, lipsync, lipsync_musetalk, pipeline, rvc, stt, stt_gemini, text, tts, tts_backup, tts_gemini, uploads
+from .scheduler import get_scheduler
+from .utils import LOGGER, JobStopped, process_groups, resume_jobs
 
 
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """서버 시작 시 중단된 작업을 복구하고 보존 정책 정리를 시작, 종료 시 상주 모델 워커를 정리."""
+    events.install()
+    metrics.install()
+    resumed = resume_jobs()
+    if resumed:
+        LOGGER.info("재시작 전 미완료 작업 %d건을 다시 실행합니다.", len(resumed))
+    retention.start()
+    admission.start(process_groups)
+    yield
+    admission.shutdown()
+    retention.shutdown()
+    remote_jobs.shutdown()
+    model_pool.shutdown()
+    progress.shutdown()
+
+
 app = FastAPI(
     title="Padiem RnD 모듈형 더빙 파이프라인 API",
     description="각 파이프라인 모듈을 HTTP API로 노출하고 작업 큐를 지원하는 프로토타입",
     version="0.2.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -40,17 +67,76 @@ app.include_router(tts_gemini.router)
 app.include_router(rvc.router)
 app.include_router(lipsync.router)
 app.include_router(lipsync_musetalk.router)
+app.include_router(pipeline.router)
 app.include_router(jobs.router)
 app.include_router(files.router)
 app.include_router(uploads.router)
 
 
+@app.exception_handler(admission.AdmissionRejected)
+async def admission_rejected_handler(_request: Request, exc: admission.AdmissionRejected) -> JSONResponse:
+    """과부하로 받지 않은 요청: 429와 예상 대기 시간(Retry-After, 초)."""
+    return JSONResponse(
+        status_code=429,
+        headers={"Retry-After": str(exc.retry_after)},
+        content={"detail": exc.reason, "module": exc.module, "retry_after": exc.retry_after},
+    )
+
+
+@app.exception_handler(JobStopped)
+async def job_stopped_handler(_request: Request, exc: JobStopped) -> JSONResponse:
+    """동기 요청이 기다리던 작업이 취소/시간 초과로 중단됨: 409와 중단 사유."""
+    return JSONResponse(
+        status_code=409,
+        content={"detail": exc.reason, "status": exc.status, "job_id": exc.job_id},
+    )
+
+
 @app.get("/health", tags=["Health"])
 async def health_check() -> dict[str, str]:
     """상태 점검 엔드포인트."""
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus 형식 지표 (모듈별 대기/실행 시간·실시간 배율 히스토그램, 종료 건수, 대기열 길이, 자식 프로세스 메모리)."""
+
+    def _collect() -> str:
+        return metrics.render(job_manager.active_counts(), get_scheduler().stats(), process_groups())
+
+    body = await run_in_threadpool(_collect)
+    return PlainTextResponse(body, media_type=metrics.CONTENT_TYPE)
+
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check() -> JSONResponse:
+    """작업 저장소 접근 가능 여부와 상주 모델 워커의 적재(warm) 상태.
+
+    저장소를 읽을 수 없으면 503. 모델이 아직 적재되지 않았어도 요청은 받을 수 있으므로 준비 상태로 본다.
+    """
+    try:
+        await run_in_threadpool(job_manager.count_jobs)
+        store_ok = True
+    except Exception:  # noqa: BLE001 - 원인과 관계없이 준비되지 않음으로 응답
+        LOGGER.exception("작업 저장소 확인 실패")
+        store_ok = False
+    models = model_pool.status()
+    remote = remote_jobs.remote_modules()
+    return JSONResponse(
+        status_code=200 if store_ok else 503,
+        content={
+            "status": "ready" if store_ok else "unavailable",
+            "job_store": store_ok,
+            "warm": sorted(name for name, state in models.items() if state["warm"]),
+            "models": models,
+            "scheduler": get_scheduler().stats()["resources"],
+            "remote_modules": sorted(remote) if remote is not None else [],
+            "memory": {"available": admission.available_memory(), "peak_rss": admission.peak_rss()},
+        },
+    )
+
+
 @app.get("/api/{service}/{remaining:path}", include_in_schema=False)
 async def external_service_placeholder(service: str, remaining: str = "") -> JSONResponse:
     """미구현 외부 서비스 요청에 대한 안내."""
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import logging
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from shared.utils.io_helpers import wav_duration
+from shared.utils.process_tree import group_rss_bytes
+
+from . import job_manager
+
+
+LOGGER = logging.getLogger("pipeline.backend.metrics")
+
+# 대기/실행 시간(초) 버킷: 짧은 텍스트 처리부터 긴 립싱크까지
+SECONDS_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+# 실시간 배율(처리 시간 / 오디오 길이) 버킷
+RTF_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16)
+# 중복 집계를 막기 위해 기억해 두는 최근 종료 작업 수
+_SEEN_TERMINAL_LIMIT = 4096
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """레이블별 누적 값."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        with self._lock:
+            return self._values.get(label_values, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram:
+    """레이블별 누적 버킷 히스토그램 (Prometheus 형식)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = SECONDS_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # 레이블 -> (버킷별 개수(마지막은 +Inf), 합계)
+        self._values: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(label_values) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[label_values] = (counts, total + value)
+
+    def count(self, *label_values: str) -> int:
+        with self._lock:
+            counts, _ = self._values.get(label_values) or ([0], 0.0)
+            return sum(counts)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for label_values, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _format_labels((*self.labels, "le"), (*label_values, _format_value(bound)))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+QUEUE_WAIT = Histogram("padiem_job_queue_wait_seconds", "스케줄러 대기열에서 기다린 시간", ("module",))
+RUN_TIME = Histogram("padiem_job_run_seconds", "슬롯에서 실행한 시간 (단계 캐시 적중 포함)", ("module",))
+REALTIME_FACTOR = Histogram(
+    "padiem_job_realtime_factor",
+    "실행 시간 / 오디오 길이 (WAV 입출력이 있는 작업, 캐시 적중 제외)",
+    ("module",),
+    buckets=RTF_BUCKETS,
+)
+JOBS_FINISHED = Counter("padiem_jobs_finished_total", "종료된 작업 수 (상태별)", ("module", "status"))
+CACHE_HITS = Counter("padiem_step_cache_hits_total", "단계 결과 캐시 적중 수", ("module",))
+
+_REGISTRY: list[Counter | Histogram] = [QUEUE_WAIT, RUN_TIME, REALTIME_FACTOR, JOBS_FINISHED, CACHE_HITS]
+
+_seen_lock = threading.Lock()
+_seen_terminal: OrderedDict[str, None] = OrderedDict()
+
+
+def observe_scheduled(module: str, wait_sec: float, run_sec: float) -> None:
+    QUEUE_WAIT.observe(wait_sec, module)
+    RUN_TIME.observe(run_sec, module)
+
+
+def observe_run(module: str, paths: Iterable[Path], elapsed: float, cache_hit: bool = False) -> None:
+    """실행 결과를 기록. paths 중 처음 읽히는 WAV 길이로 실시간 배율을 계산한다."""
+    if cache_hit:
+        CACHE_HITS.inc(module)
+        return
+    for path in paths:
+        duration = wav_duration(path)
+        if duration:
+            REALTIME_FACTOR.observe(elapsed / duration, module)
+            return
+
+
+def _on_job_update(job: dict[str, Any]) -> None:
+    status = job["status"]
+    if status not in job_manager.TERMINAL_STATUSES:
+        return
+    with _seen_lock:
+        if job["job_id"] in _seen_terminal:
+            return
+        _seen_terminal[job["job_id"]] = None
+        while len(_seen_terminal) > _SEEN_TERMINAL_LIMIT:
+            _seen_terminal.popitem(last=False)
+    JOBS_FINISHED.inc(job.get("meta", {}).get("module") or "unknown", status)
+
+
+def install() -> None:
+    """작업 상태 변경을 종료 건수 집계에 연결."""
+    job_manager.add_listener(_on_job_update)
+
+
+# ---- 수집 시점에 읽는 값 ----
+
+def _gauge(name: str, help_text: str, labels: Sequence[str], values: dict[tuple[str, ...], float]) -> list[str]:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for label_values, value in sorted(values.items()):
+        lines.append(f"{name}{_format_labels(labels, label_values)} {_format_value(value)}")
+    return lines
+
+
+def render(
+    job_counts: dict[tuple[str, str], int],
+    scheduler_stats: dict[str, Any],
+    process_groups: dict[int, str],
+) -> str:
+    """Prometheus 텍스트 형식으로 모든 지표를 직렬화.
+
+    job_counts: (module, status) -> 대기/실행 중 작업 수, process_groups: 프로세스 그룹 ID -> 모듈 레이블.
+    """
+    lines: list[str] = []
+    for metric in _REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.samples())
+
+    queued = {(module,): count for (module, status), count in job_counts.items() if status == job_manager.JobStatus.PENDING}
+    running = {(module,): count for (module, status), count in job_counts.items() if status == job_manager.JobStatus.RUNNING}
+    lines += _gauge("padiem_jobs_queued", "대기 중인 작업 수", ("module",), queued)
+    lines += _gauge("padiem_jobs_in_flight", "실행 중인 작업 수", ("module",), running)
+
+    resources = scheduler_stats.get("resources", {})
+    for field, help_text in (("slots", "리소스 클래스별 동시 실행 슬롯"), ("running", "슬롯에서 실행 중인 작업 수"), ("queued", "슬롯 대기열 길이")):
+        lines += _gauge(
+            f"padiem_scheduler_{field}",
+            help_text,
+            ("resource",),
+            {(name,): snapshot.get(field, 0) for name, snapshot in resources.items()},
+        )
+
+    rss = group_rss_bytes(process_groups)
+    lines += _gauge("padiem_child_rss_bytes", "모듈 자식 프로세스(그룹 전체) 상주 메모리", ("module",), {(k,): v for k, v in rss.items()})
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Sequence
+
+from shared.utils.resident_worker import ResidentWorker
+
+from . import progress
+
+
+LOGGER = logging.getLogger("pipeline.backend.model_pool")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 모델을 프로세스 내부에서 로드하는 모듈만 기본으로 상주시킨다.
+DEFAULT_WARM_MODULES = "stt_whisper,tts_xtts,tts_vallex"
+
+_lock = threading.Lock()
+_workers: dict[str, ResidentWorker] = {}
+_active_jobs: dict[str, ResidentWorker] = {}
+# 워커에 전달되기 전에 취소 요청이 들어온 작업
+_pending_cancel: set[str] = set()
+
+
+def warm_modules() -> set[str]:
+    """상주 워커로 실행할 모듈 목록 (PADIEM_WARM_MODULES, 'none'이면 비활성화)."""
+    value = os.getenv("PADIEM_WARM_MODULES", DEFAULT_WARM_MODULES).strip()
+    if value.lower() in ("", "none", "off", "0"):
+        return set()
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def module_for_command(command: Sequence[str]) -> str | None:
+    """`python modules/<name>/run.py ...` 형태의 명령에서 상주 가능한 모듈 이름을 추출."""
+    if len(command) < 2 or command[0] != sys.executable:
+        return None
+    script = Path(command[1])
+    if script.name != "run.py" or script.parent.parent.name != "modules":
+        return None
+    name = script.parent.name
+    return name if name in warm_modules() else None
+
+
+def _get_worker(module: str, script: str) -> ResidentWorker:
+    with _lock:
+        worker = _workers.get(module)
+        if worker is None:
+            worker = ResidentWorker(script, cwd=BASE_DIR, new_group=True)
+            _workers[module] = worker
+        return worker
+
+
+def run(command: Sequence[str], job_id: str | None = None) -> dict[str, str]:
+    """상주 워커에 명령을 전달해 실행 (모델은 워커 프로세스에 유지)."""
+    module = module_for_command(command)
+    if module is None:
+        raise ValueError(f"상주 워커로 실행할 수 없는 명령입니다: {command}")
+    worker = _get_worker(module, command[1])
+    LOGGER.info("상주 워커(%s) 실행: %s", module, " ".join(command[2:]))
+    if job_id:
+        with _lock:
+            if job_id in _pending_cancel:
+                _pending_cancel.discard(job_id)
+                raise RuntimeError("작업이 시작 전에 취소되었습니다.")
+            _active_jobs[job_id] = worker
+    try:
+        reply = worker.call(
+            list(command[2:]),
+            on_event=(lambda event: progress.handle_event(job_id, event)) if job_id else None,
+        )
+    finally:
+        if job_id:
+            with _lock:
+                _active_jobs.pop(job_id, None)
+                _pending_cancel.discard(job_id)
+    return {
+        "stdout": "(상주 워커 출력 참조)",
+        "stderr": "",
+        "worker_pid": str(worker.pid),
+        "elapsed_sec": f"{reply.get('elapsed_sec', 0.0):.3f}",
+    }
+
+
+def cancel(job_id: str) -> bool:
+    """작업을 처리 중인 상주 워커를 자식 프로세스까지 종료 (모델은 다음 요청 시 다시 로드).
+
+    아직 워커에 전달되지 않았으면 전달 직전에 취소되도록 표시하고 False를 반환.
+    """
+    with _lock:
+        worker = _active_jobs.get(job_id)
+        if worker is None:
+            _pending_cancel.add(job_id)
+            return False
+    worker.kill()
+    return True
+
+
+def status() -> dict[str, dict[str, Any]]:
+    """모듈별 상주 워커 상태 (warm: 한 번 이상 요청을 처리해 모델이 적재된 상태)."""
+    with _lock:
+        workers = dict(_workers)
+    report: dict[str, dict[str, Any]] = {}
+    for module in sorted(warm_modules()):
+        worker = workers.get(module)
+        alive = bool(worker and worker.alive)
+        report[module] = {
+            "alive": alive,
+            "pid": worker.pid if alive and worker else None,
+            "requests": worker.requests if worker else 0,
+            "warm": alive and bool(worker and worker.requests),
+        }
+    return report
+
+
+def shutdown() -> None:
+    with _lock:
+        workers = list(_workers.values())
+        _workers.clear()
+    for worker in workers:
+        worker.stop()
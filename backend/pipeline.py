@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from . import events, job_manager
+from .utils import BASE_DIR, _launch_job, cancel_job
+
+
+LOGGER = logging.getLogger("pipeline.backend.pipeline")
+
+# 서버 측 파이프라인 실행 결과 폴더 (run_name별 하위 폴더)
+RUN_ROOT = BASE_DIR / "data" / "runs"
+AUDIO_SUFFIXES = {".mp3", ".wav", ".m4a", ".flac", ".aac"}
+ALL_STAGES = ("audio_extract", "stt", "text_process", "tts", "rvc", "lipsync")
+
+# 단계 상태: 자식 작업 상태(pending/running/success/...)에 더해 아직 시작 전(waiting),
+# 선행 단계 실패로 건너뜀(skipped)을 사용
+STEP_WAITING = "waiting"
+STEP_SKIPPED = "skipped"
+_STEP_BLOCKING = {
+    job_manager.JobStatus.FAILED,
+    job_manager.JobStatus.CANCELLED,
+    job_manager.JobStatus.TIMED_OUT,
+    STEP_SKIPPED,
+}
+
+# (모듈 스크립트, 스케줄러 모듈 이름, 기본 설정 파일)
+STT_MODELS = {
+    "whisper": ("modules/stt_whisper/run.py", "stt", "modules/stt_whisper/config/settings.yaml"),
+    "gemini": ("modules/stt_gemini/run.py", "stt_gemini", None),
+}
+TTS_MODELS = {
+    "vallex": ("modules/tts_vallex/run.py", "tts", "modules/tts_vallex/config/settings.yaml"),
+    "xtts": ("modules/tts_xtts/run.py", "tts_backup", "modules/tts_xtts/config/settings.yaml"),
+    "gemini": ("modules/tts_gemini/run.py", "tts_gemini", None),
+}
+# TTS 출력 파일 접미사 (오케스트레이터와 같은 이름을 사용)
+TTS_OUTPUT_SUFFIX = {"vallex": "valle", "xtts": "xtts", "gemini": "gemini_tts"}
+LIPSYNC_MODELS = {
+    "wav2lip": ("modules/lipsync_wav2lip/run.py", "lipsync", "modules/lipsync_wav2lip/config/settings.yaml"),
+    "musetalk": ("modules/lipsync_musetalk/run.py", "lipsync_musetalk", "modules/lipsync_musetalk/config/settings.yaml"),
+}
+
+
+class RunDirBusy(RuntimeError):
+    """같은 실행 폴더를 쓰는 파이프라인이 이미 진행 중."""
+
+    def __init__(self, run_dir: Path, job_id: str) -> None:
+        super().__init__(f"실행 폴더 {run_dir.name}을(를) 사용하는 파이프라인({job_id})이 진행 중입니다.")
+        self.job_id = job_id
+
+
+def sanitize_run_name(name: str) -> str:
+    sanitized = "".join(ch if ch.isalnum() or ch in {"-", "_"} else "_" for ch in name.strip())
+    return sanitized or "run"
+
+
+@dataclass
+class PipelineStep:
+    name: str
+    module: str
+    command: list[str]
+    output: str
+    needs: list[str] = field(default_factory=list)
+
+
+def _require_existing(path: Path, label: str) -> str:
+    if not path.exists():
+        raise ValueError(f"{label} 파일이 없어 이 단계부터 시작할 수 없습니다: {path}")
+    return str(path)
+
+
+def build_steps(
+    input_media: Path,
+    run_dir: Path,
+    *,
+    stt_model: str = "whisper",
+    tts_models: Iterable[str] = ("vallex",),
+    lipsync_model: str = "wav2lip",
+    stages: Iterable[str] = ALL_STAGES,
+    source_language: str | None = None,
+    target_language: str | None = "en",
+    configs: dict[str, str] | None = None,
+) -> list[PipelineStep]:
+    """입력 미디어와 모델 선택으로 단계 DAG를 구성.
+
+    오디오 추출 → STT → 텍스트 처리 → TTS → RVC → 립싱크 순으로 연결하며, tts_models의 첫 모델이
+    RVC/립싱크로 이어지는 주 경로이고 나머지 TTS 모델은 텍스트 처리 뒤에 병렬 분기로 실행된다.
+    실행하지 않는 단계의 출력은 run_dir에 이미 있어야 한다 (없으면 ValueError).
+    """
+    stages = set(stages)
+    configs = configs or {}
+    tts_models = list(dict.fromkeys(tts_models)) or ["vallex"]
+    if stt_model not in STT_MODELS:
+        raise ValueError(f"지원하지 않는 STT 모델입니다: {stt_model}")
+    if lipsync_model not in LIPSYNC_MODELS:
+        raise ValueError(f"지원하지 않는 립싱크 모델입니다: {lipsync_model}")
+    for model in tts_models:
+        if model not in TTS_MODELS:
+            raise ValueError(f"지원하지 않는 TTS 모델입니다: {model}")
+
+    run_name = run_dir.name
+    is_audio_input = input_media.suffix.lower() in AUDIO_SUFFIXES
+    paths = {
+        "audio_extract": input_media if is_audio_input else run_dir / f"{run_name}_audio.wav",
+        "stt": run_dir / f"{run_name}_result.json",
+        "text_process": run_dir / f"{run_name}_text.json",
+        "rvc": run_dir / f"{run_name}_rvc.wav",
+        "lipsync": run_dir / f"{run_name}_{lipsync_model}.mp4",
+    }
+    for model in tts_models:
+        paths[f"tts_{model}"] = run_dir / f"{run_name}_{TTS_OUTPUT_SUFFIX[model]}.wav"
+
+    steps: list[PipelineStep] = []
+    produced: set[str] = set()
+
+    def _input(step: str, label: str) -> tuple[str, list[str]]:
+        """선행 단계가 이번 실행에 있으면 의존성으로, 없으면 기존 파일을 입력으로 사용."""
+        if step in produced:
+            return str(paths[step]), [step]
+        return _require_existing(paths[step], label), []
+
+    def _config(stage: str, default: str | None) -> list[str]:
+        value = configs.get(stage, default)
+        return ["--config", value] if value else []
+
+    def _add(name: str, module: str, script: str, args: list[str], needs: list[str]) -> None:
+        steps.append(PipelineStep(name, module, [sys.executable, script, *args], str(paths[name]), needs))
+        produced.add(name)
+
+    if "audio_extract" in stages and not is_audio_input:
+        _add(
+            "audio_extract",
+            "audio_extractor",
+            "modules/audio_extractor/run.py",
+            ["--input", _require_existing(input_media, "입력 미디어"), "--output", str(paths["audio_extract"])],
+            [],
+        )
+
+    if "stt" in stages:
+        audio, needs = _input("audio_extract", "추출 오디오")
+        script, module, default_config = STT_MODELS[stt_model]
+        if stt_model == "gemini" and "stt" not in configs:
+            # Gemini STT는 목표 언어를 설정 JSON으로 받는다.
+            config_path = run_dir / "stt_gemini_config.json"
+            config_path.parent.mkdir(parents=True, exist_ok=True)
+            config_path.write_text(
+                json.dumps(
+                    {"target_language": target_language, "source_language": source_language or "auto", "transcribe_only": False},
+                    ensure_ascii=False,
+                ),
+                encoding="utf-8",
+            )
+            default_config = str(config_path)
+        _add("stt", module, script, ["--input", audio, "--output", str(paths["stt"]), *_config("stt", default_config)], needs)
+
+    if "text_process" in stages:
+        transcript, needs = _input("stt", "STT 결과")
+        args = ["--input", transcript, "--output", str(paths["text_process"])]
+        args += _config("text_process", "modules/text_processor/config/settings.yaml")
+        if source_language and source_language.lower() != "auto":
+            args += ["--source-language", source_language]
+        if target_language:
+            args += ["--target-language", target_language]
+        _add("text_process", "text_processor", "modules/text_processor/run.py", args, needs)
+
+    if "tts" in stages:
+        text_json, needs = _input("text_process", "텍스트 처리 결과")
+        for model in tts_models:
+            script, module, default_config = TTS_MODELS[model]
+            name = f"tts_{model}"
+            args = ["--input", text_json, "--output", str(paths[name]), *_config(name, default_config)]
+            _add(name, module, script, args, needs)
+
+    primary_tts = f"tts_{tts_models[0]}"
+    if "rvc" in stages:
+        tts_audio, needs = _input(primary_tts, "TTS 음성")
+        args = ["--input", tts_audio, "--output", str(paths["rvc"])]
+        args += _config("rvc", "modules/voice_conversion_rvc/config/settings.yaml")
+        _add("rvc", "rvc", "modules/voice_conversion_rvc/run.py", args, needs)
+
+    if "lipsync" in stages and not is_audio_input:
+        voice, needs = _input("rvc", "RVC 음성") if "rvc" in stages else _input(primary_tts, "TTS 음성")
+        script, module, default_config = LIPSYNC_MODELS[lipsync_model]
+        if lipsync_model == "musetalk":
+            args = ["--input_video", str(input_media), "--input_audio", voice, "--output_video", str(paths["lipsync"])]
+        else:
+            args = ["--video", str(input_media), "--audio", voice, "--output", str(paths["lipsync"])]
+        _add("lipsync", module, script, [*args, *_config("lipsync", default_config)], needs)
+
+    if not steps:
+        raise ValueError("실행할 단계가 없습니다.")
+    return steps
+
+
+class PipelineRun:
+    """파이프라인 부모 작업 하나를 실행하는 DAG 실행기.
+
+    각 단계는 자식 작업으로 스케줄러에 제출되어 리소스 슬롯 제한을 그대로 따르고,
+    선행 단계가 모두 성공한 단계부터 바로 제출되므로 독립 분기는 동시에 진행된다.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        steps: list[PipelineStep],
+        launch: Callable[[str, list[str], dict[str, Any]], Future] = _launch_job,
+        cancel: Callable[[str, str], bool] = cancel_job,
+        run_dir: Path | None = None,
+    ) -> None:
+        self.job_id = job_id
+        self.run_dir = run_dir.resolve() if run_dir is not None else None
+        self.steps = {step.name: step for step in steps}
+        self._launch = launch
+        self._cancel_child = cancel
+        self._lock = threading.Lock()
+        self._cancelled: str | None = None
+        self.state: dict[str, dict[str, Any]] = {
+            step.name: {
+                "status": STEP_WAITING,
+                "module": step.module,
+                "needs": step.needs,
+                "output": step.output,
+                "job_id": None,
+                "error": None,
+            }
+            for step in steps
+        }
+
+    def on_child_update(self, job: dict[str, Any]) -> None:
+        step = job.get("meta", {}).get("pipeline_step")
+        with self._lock:
+            if step not in self.state or self.state[step]["job_id"] != job["job_id"]:
+                return
+            self.state[step]["status"] = job["status"]
+            self.state[step]["error"] = job.get("error")
+        self._publish()
+
+    def cancel(self, reason: str) -> None:
+        with self._lock:
+            self._cancelled = reason
+            running = [entry["job_id"] for entry in self.state.values() if entry["job_id"] and entry["status"] not in job_manager.TERMINAL_STATUSES]
+            for entry in self.state.values():
+                if entry["status"] == STEP_WAITING:
+                    entry["status"] = job_manager.JobStatus.CANCELLED
+        for child_id in running:
+            self._cancel_child(child_id, reason)
+        self._publish()
+
+    def _schedule_ready(self, futures: dict[Future, str]) -> None:
+        with self._lock:
+            # 취소 확인을 잠금 안에서 해야 cancel()과 새 단계 제출이 엇갈리지 않는다.
+            changed = self._cancelled is None
+            while changed:
+                changed = False
+                for name, entry in self.state.items():
+                    if entry["status"] != STEP_WAITING:
+                        continue
+                    needs = [self.state[need]["status"] for need in entry["needs"]]
+                    if any(status in _STEP_BLOCKING for status in needs):
+                        entry["status"] = STEP_SKIPPED
+                        entry["error"] = "선행 단계가 완료되지 않아 건너뛰었습니다."
+                        changed = True
+                    elif all(status == job_manager.JobStatus.SUCCESS for status in needs):
+                        step = self.steps[name]
+                        meta = {
+                            "module": step.module,
+                            "output": step.output,
+                            "parent_job_id": self.job_id,
+                            "pipeline_step": name,
+                        }
+                        child_id = job_manager.create_job(meta, command=step.command)
+                        entry["job_id"] = child_id
+                        entry["status"] = job_manager.JobStatus.PENDING
+                        futures[self._launch(child_id, step.command, meta)] = name
+                        LOGGER.info("파이프라인 %s: 단계 %s 제출 (작업 %s)", self.job_id, name, child_id)
+
+    def _collect(self, name: str) -> None:
+        with self._lock:
+            entry = self.state[name]
+            job = job_manager.get_job(entry["job_id"], include_logs=False)
+            entry["status"] = job["status"]
+            entry["error"] = job.get("error")
+            entry["timings"] = job.get("timings")
+
+    def _snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            steps = {name: dict(entry) for name, entry in self.state.items()}
+        finished = sum(1 for entry in steps.values() if entry["status"] in job_manager.TERMINAL_STATUSES | {STEP_SKIPPED})
+        running = [name for name, entry in steps.items() if entry["status"] == job_manager.JobStatus.RUNNING]
+        return {
+            "stage": ",".join(running) or None,
+            "fraction": round(finished / len(steps), 4) if steps else 1.0,
+            "steps": steps,
+        }
+
+    def _publish(self) -> None:
+        snapshot = self._snapshot()
+        job_manager.update_progress(self.job_id, progress=snapshot)
+        events.get_bus().publish(self.job_id, {"type": "progress", "job_id": self.job_id, **snapshot})
+
+    def run(self) -> None:
+        job_manager.mark_running(self.job_id)
+        futures: dict[Future, str] = {}
+        try:
+            while True:
+                self._schedule_ready(futures)
+                self._publish()
+                if not futures:
+                    break
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    self._collect(futures.pop(future))
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.exception("파이프라인 %s 실행 오류", self.job_id)
+            job_manager.mark_failed(self.job_id, str(exc))
+            return
+        finally:
+            with _runs_lock:
+                _runs.pop(self.job_id, None)
+
+        snapshot = self._snapshot()
+        if self._cancelled is not None:
+            job_manager.mark_stopped(self.job_id, job_manager.JobStatus.CANCELLED, self._cancelled)
+            return
+        failed = [name for name, entry in snapshot["steps"].items() if entry["status"] != job_manager.JobStatus.SUCCESS]
+        if failed:
+            job_manager.mark_failed(self.job_id, f"완료되지 않은 단계: {', '.join(failed)}")
+            return
+        outputs = {name: entry["output"] for name, entry in snapshot["steps"].items()}
+        job_manager.mark_success(self.job_id, {"outputs": outputs, "steps": snapshot["steps"]})
+        LOGGER.info("파이프라인 %s 완료", self.job_id)
+
+
+_runs_lock = threading.Lock()
+_runs: dict[str, PipelineRun] = {}
+
+
+def _on_job_update(job: dict[str, Any]) -> None:
+    parent = job.get("meta", {}).get("parent_job_id")
+    if not parent:
+        return
+    with _runs_lock:
+        run = _runs.get(parent)
+    if run is not None:
+        run.on_child_update(job)
+
+
+def _owner_locked(run_dir: Path) -> str | None:
+    for job_id, run in _runs.items():
+        if run.run_dir == run_dir:
+            return job_id
+    return None
+
+
+def run_dir_owner(run_dir: Path) -> str | None:
+    """run_dir을 쓰는 진행 중인 파이프라인의 작업 ID (없으면 None)."""
+    with _runs_lock:
+        return _owner_locked(run_dir.resolve())
+
+
+def start_pipeline(steps: list[PipelineStep], meta: dict[str, Any] | None = None) -> str:
+    """파이프라인 부모 작업을 만들고 DAG 실행 스레드를 시작 (부모는 스케줄러 슬롯을 쓰지 않음).
+
+    meta의 run_dir을 다른 파이프라인이 쓰고 있으면 RunDirBusy (같은 출력 파일을 덮어쓰지 않도록).
+    """
+    job_manager.add_listener(_on_job_update)
+    run_dir = Path(meta["run_dir"]).resolve() if meta and meta.get("run_dir") else None
+    with _runs_lock:
+        owner = _owner_locked(run_dir) if run_dir is not None else None
+        if owner is not None:
+            raise RunDirBusy(run_dir, owner)
+        job_id = job_manager.create_job({"module": "pipeline", **(meta or {})})
+        run = PipelineRun(job_id, steps, run_dir=run_dir)
+        _runs[job_id] = run
+    run._publish()
+    threading.Thread(target=run.run, name=f"pipeline-{job_id[:8]}", daemon=True).start()
+    return job_id
+
+
+def cancel_pipeline(job_id: str, reason: str) -> bool:
+    """실행 중인 파이프라인이면 남은 단계를 취소하고 실행 중인 자식 작업을 중단."""
+    with _runs_lock:
+        run = _runs.get(job_id)
+    if run is None:
+        return False
+    run.cancel(reason)
+    return True
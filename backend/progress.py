@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from shared.utils import progress as progress_protocol
+
+from . import events, job_manager
+
+
+LOGGER = logging.getLogger("pipeline.backend.progress")
+
+# 작업 레코드에 보관할 최근 로그 줄 수
+LOG_TAIL_LINES = int(os.getenv("PADIEM_JOB_LOG_LINES", "200"))
+# 진행률을 DB에 반영하는 최소 간격(초) - 이벤트마다 쓰지 않도록 묶어서 저장
+FLUSH_INTERVAL_SEC = 1.0
+
+
+@dataclass
+class _Tracker:
+    progress: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, float] = field(default_factory=dict)
+    open_stages: dict[str, float] = field(default_factory=dict)
+    logs: deque[str] = field(default_factory=lambda: deque(maxlen=LOG_TAIL_LINES))
+    last_flush: float = 0.0
+
+
+_lock = threading.Lock()
+_trackers: dict[str, _Tracker] = {}
+
+
+def begin(job_id: str) -> None:
+    with _lock:
+        _trackers[job_id] = _Tracker()
+
+
+def _close_stage(tracker: _Tracker, name: str, elapsed: float | None = None) -> None:
+    started = tracker.open_stages.pop(name, None)
+    if elapsed is None:
+        elapsed = time.monotonic() - started if started is not None else 0.0
+    tracker.timings[name] = round(tracker.timings.get(name, 0.0) + elapsed, 3)
+
+
+def handle_event(job_id: str, event: dict[str, Any]) -> None:
+    """모듈이 보낸 진행률/단계/로그 이벤트를 반영 (워커 스레드, IPC 수신 스레드에서 호출)."""
+    kind = event.get("type")
+    with _lock:
+        tracker = _trackers.get(job_id)
+        if tracker is None:
+            return
+        if kind == "log":
+            tracker.logs.append(str(event.get("line", ""))[:2000])
+        elif kind == "stage":
+            name = str(event.get("stage"))
+            if event.get("status") == "start":
+                tracker.open_stages[name] = time.monotonic()
+                tracker.progress["stage"] = name
+            else:
+                _close_stage(tracker, name, event.get("elapsed_sec"))
+        elif kind == "progress":
+            name = event.get("stage")
+            if name and name not in tracker.open_stages and name not in tracker.timings:
+                tracker.open_stages[name] = time.monotonic()
+            tracker.progress.update({k: v for k, v in event.items() if k not in ("type", "ts")})
+        else:
+            return
+        # 저장 순서가 뒤바뀌지 않도록 잠금 안에서 기록 (finish()의 최종 기록보다 늦게 쓰지 않음)
+        if kind == "stage" or time.monotonic() - tracker.last_flush >= FLUSH_INTERVAL_SEC:
+            _store(job_id, _snapshot(tracker))
+
+    if kind != "log":
+        events.get_bus().publish(job_id, {**event, "job_id": job_id})
+
+
+def add_log(job_id: str, line: str) -> None:
+    handle_event(job_id, {"type": "log", "line": line})
+
+
+def _snapshot(tracker: _Tracker) -> dict[str, Any]:
+    tracker.last_flush = time.monotonic()
+    return {
+        "progress": dict(tracker.progress),
+        "logs": list(tracker.logs),
+        "timings": dict(tracker.timings),
+    }
+
+
+def _store(job_id: str, snapshot: dict[str, Any]) -> None:
+    try:
+        job_manager.update_progress(job_id, **snapshot)
+    except KeyError:
+        LOGGER.warning("진행률을 저장할 작업이 없습니다: %s", job_id)
+
+
+def finish(job_id: str) -> None:
+    """열린 단계를 닫고 최종 진행률/로그/단계별 시간을 저장."""
+    with _lock:
+        tracker = _trackers.pop(job_id, None)
+        if tracker is None:
+            return
+        for name in list(tracker.open_stages):
+            _close_stage(tracker, name)
+        _store(job_id, _snapshot(tracker))
+
+
+class ProgressServer(progress_protocol.EventServer):
+    """서브프로세스 모듈이 접속하는 진행률 소켓. 받은 이벤트를 작업별 진행률에 반영."""
+
+    def __init__(self) -> None:
+        super().__init__(handle_event)
+
+
+_server: ProgressServer | None = None
+_server_lock = threading.Lock()
+
+
+def env_for(job_id: str) -> dict[str, str]:
+    """서브프로세스에 넘길 진행률 채널 환경 변수 (소켓을 열 수 없으면 빈 dict)."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ProgressServer()
+            except OSError:
+                LOGGER.warning("진행률 채널을 열 수 없어 진행률 없이 실행합니다.", exc_info=True)
+                return {}
+        return _server.env_for(job_id)
+
+
+def shutdown() -> None:
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.close()
+            _server = None
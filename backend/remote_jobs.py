@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+from . import job_manager, job_queue
+
+
+LOGGER = logging.getLogger("pipeline.backend.remote")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+# 대기열 결과를 확인하는 주기(초)
+DEFAULT_POLL_SEC = 1.0
+
+_lock = threading.Lock()
+# 이 API 프로세스가 대기열에 넣고 결과를 기다리는 작업 -> Future
+_futures: dict[str, Future] = {}
+# 실행 중으로 기록한 작업 -> 마지막으로 저장한 로그
+_running: dict[str, list[str] | None] = {}
+
+
+def remote_modules() -> set[str] | None:
+    """PADIEM_REMOTE_MODULES (쉼표 구분, '*'는 전체). 비어 있으면 None = 모든 작업을 이 프로세스에서 실행."""
+    value = os.getenv("PADIEM_REMOTE_MODULES", "").strip()
+    if not value:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def is_remote(module: str | None) -> bool:
+    modules = remote_modules()
+    if modules is None:
+        return False
+    return "*" in modules or (module or "") in modules
+
+
+def submit(job_id: str, command: list[str], meta: dict[str, Any] | None = None) -> Future:
+    """작업을 대기열에 넣고 워커가 끝내면 결과가 채워지는 Future를 반환.
+
+    재시작 후 다시 제출해도 대기열에 남아 있던 작업은 새로 넣지 않고 결과만 다시 기다린다.
+    """
+    future: Future = Future()
+    with _lock:
+        _futures[job_id] = future
+    module = (meta or {}).get("module")
+    if job_queue.get_queue().enqueue(job_id, module, job_queue.portable_command(command, BASE_DIR), meta or {}):
+        LOGGER.info("작업 %s를 원격 워커 대기열에 넣었습니다 (%s).", job_id, module or "unknown")
+    else:
+        LOGGER.info("작업 %s가 이미 원격 워커 대기열에 있어 결과를 다시 기다립니다.", job_id)
+    _ensure_poller()
+    return future
+
+
+def cancel(job_id: str, reason: str, status: str = job_manager.JobStatus.CANCELLED) -> bool:
+    """원격 작업 중단 요청. 대기 중이면 바로 기록하고, 실행 중이면 워커가 다음 하트비트에서 프로세스를 종료한다."""
+    with _lock:
+        if job_id not in _futures:
+            return False
+    state = job_queue.get_queue().cancel(job_id, status, reason)
+    if state is None:
+        return False
+    if state == job_queue.STATE_QUEUED:
+        LOGGER.warning("원격 대기 중인 작업 %s 중단(%s): %s", job_id, status, reason)
+        job_manager.mark_stopped(job_id, status, reason)
+        with _lock:
+            future = _futures.pop(job_id, None)
+            _running.pop(job_id, None)
+        if future is not None:
+            future.set_exception(_stopped(status, reason))
+    return True
+
+
+def _stopped(status: str, reason: str) -> Exception:
+    from .utils import JobStopped  # utils가 이 모듈을 가져오므로 순환 참조를 피해 여기서 가져온다
+
+    return JobStopped(status, reason)
+
+
+def poll_once() -> int:
+    """대기열 상태를 작업 레코드에 반영하고 끝난 작업의 Future를 채운다. 처리한 종료 작업 수를 반환."""
+    queue = job_queue.get_queue()
+    with _lock:
+        pending = set(_futures)
+    if not pending:
+        return 0
+
+    for entry in queue.running():
+        job_id = entry["job_id"]
+        if job_id not in pending:
+            continue
+        with _lock:
+            first = job_id not in _running
+            changed = first or entry["logs"] != _running[job_id]
+            _running[job_id] = entry["logs"]
+        if first:
+            LOGGER.info("작업 %s: 워커 %s가 실행을 시작했습니다.", job_id, entry["worker_id"])
+            job_manager.mark_running(job_id)
+        if changed and entry["logs"] is not None:
+            job_manager.update_progress(job_id, logs=entry["logs"])
+
+    handled = 0
+    for finished in queue.finished():
+        if finished.job_id not in pending:
+            continue
+        with _lock:
+            future = _futures.pop(finished.job_id, None)
+            _running.pop(finished.job_id, None)
+        if finished.logs is not None:
+            job_manager.update_progress(finished.job_id, logs=finished.logs)
+        error: Exception | None = None
+        if finished.outcome == "success":
+            job_manager.mark_success(finished.job_id, finished.result)
+            LOGGER.info("원격 작업 %s 완료", finished.job_id)
+        elif finished.outcome in (job_manager.JobStatus.CANCELLED, job_manager.JobStatus.TIMED_OUT):
+            reason = finished.error or "원격 워커에서 작업이 중단되었습니다."
+            job_manager.mark_stopped(finished.job_id, finished.outcome, reason)
+            error = _stopped(finished.outcome, reason)
+        else:
+            message = finished.error or "원격 워커에서 작업이 실패했습니다."
+            LOGGER.error("원격 작업 %s 실패: %s", finished.job_id, message)
+            job_manager.mark_failed(finished.job_id, message)
+            error = RuntimeError(message)
+        queue.acknowledge(finished.job_id)
+        if future is not None:
+            if error is None:
+                future.set_result(finished.result or {})
+            else:
+                future.set_exception(error)
+        handled += 1
+    return handled
+
+
+# ---- 결과 확인 스레드 ----
+
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+
+
+def _loop(interval: float) -> None:
+    while not _stop.wait(interval):
+        try:
+            poll_once()
+        except Exception:  # noqa: BLE001 - 일시적인 잠금/파일 오류로 스레드가 멈추지 않도록
+            LOGGER.exception("원격 작업 대기열 확인 실패")
+
+
+def _ensure_poller() -> None:
+    global _thread
+    try:
+        interval = float(os.getenv("PADIEM_QUEUE_POLL_SEC", str(DEFAULT_POLL_SEC)))
+    except ValueError:
+        interval = DEFAULT_POLL_SEC
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, args=(max(0.05, interval),), name="remote-jobs", daemon=True)
+        _thread.start()
+
+
+def shutdown() -> None:
+    """결과 확인 스레드 종료 (대기열의 작업은 그대로 두어 재시작 후 resume_jobs가 다시 기다린다)."""
+    _stop.set()
@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Sequence
+
+from shared.utils import run_lock, step_cache
+
+from . import batches, blob_store, job_manager
+from .pipeline import RUN_ROOT
+from .utils import BASE_DIR
+
+
+LOGGER = logging.getLogger("pipeline.backend.retention")
+
+_HOUR = 3600
+# 분류별 기본 보존 시간(초). PADIEM_TTL_<분류> (예: PADIEM_TTL_RUNS)로 조정, 0 이하면 시간 기준으로 지우지 않음
+ARTIFACT_TTLS = {
+    "temp": 24 * _HOUR,  # lipsync_wav2lip의 ROOT/temp 변환·잘라낸 파일
+    "tmp": 24 * _HOUR,  # 시스템 임시 폴더의 padiem_* 파일 (RVC 증강 등, 비정상 종료 시 남음)
+    "sessions": 48 * _HOUR,  # 끝나지 않은 이어받기 업로드 세션
+    "batches": 7 * 24 * _HOUR,  # data/batches 배치 매니페스트/항목별 보고서
+    "cache": 14 * 24 * _HOUR,  # 단계 결과 캐시 (마지막 사용 기준)
+    "runs": 7 * 24 * _HOUR,  # data/runs/<run_name>의 중간 산출물 (추출 오디오, 엔진별 TTS, .stamps, trace.json 등)
+    "finals": 0,  # data/runs/<run_name>의 최종 결과물. 기본은 지우지 않음(PADIEM_TTL_FINALS로 켬)
+    "blobs": 30 * 24 * _HOUR,  # 어느 경로에도 배치되지 않은 업로드 blob
+    "jobs": 30 * 24 * _HOUR,  # 종료된 작업 레코드
+}
+# 디스크 사용률이 상한을 넘으면 이 순서(앞쪽 분류의 오래된 항목부터)로 보존 시간 전이라도 지운다.
+# finals는 PADIEM_TTL_FINALS를 켠 경우에만 수집된다.
+EVICTION_ORDER = ("temp", "tmp", "sessions", "batches", "cache", "runs", "blobs", "finals")
+# 실행 폴더의 최종 결과물: 앞쪽 묶음부터 보고 처음으로 파일이 있는 묶음 (립싱크 영상 → RVC 음성 → TTS 음성 → 텍스트)
+FINAL_OUTPUT_TIERS = (
+    ("*_wav2lip.mp4", "*_musetalk.mp4"),
+    ("*_rvc.wav",),
+    ("*_valle.wav", "*_xtts.wav", "*_gemini_tts.wav"),
+    ("*_text.json", "*_result.json"),
+)
+# 실행 중인 작업이 입력으로 쓰는 임시 파일 분류 -> 그 파일을 만드는 모듈.
+# 해당 모듈 작업이 실행 중이면 (수정 시각이 오래됐더라도) 그 분류는 정리하지 않는다.
+ARTIFACT_OWNERS = {
+    "temp": ("lipsync",),
+    "tmp": ("rvc",),
+}
+# 쓰는 중일 수 있는 최근 항목은 어떤 경우에도 지우지 않음
+MIN_AGE_SEC = 600
+DEFAULT_HIGH_WATER = 0.90
+DEFAULT_LOW_WATER = 0.80
+DEFAULT_INTERVAL_SEC = 3600
+TEMP_PREFIX = "padiem_"
+TEMP_DIR = BASE_DIR / "temp"
+
+
+@dataclass
+class _Item:
+    kind: str
+    paths: list[Path]
+    mtime: float
+    size: int
+
+
+def ttl_for(kind: str) -> float | None:
+    default = ARTIFACT_TTLS[kind]
+    value = os.getenv(f"PADIEM_TTL_{kind.upper()}", str(default))
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = float(default)
+    return seconds if seconds > 0 else None
+
+
+def _env_ratio(name: str, default: float) -> float:
+    try:
+        return min(1.0, max(0.0, float(os.getenv(name, str(default)))))
+    except ValueError:
+        return default
+
+
+def _tree_stats(path: Path) -> tuple[float, int]:
+    """(가장 최근 수정 시각, 전체 크기). 디렉터리는 하위 파일 기준 (비어 있으면 디렉터리 자체 시각)."""
+    stat = path.stat()
+    if not path.is_dir():
+        return stat.st_mtime, stat.st_size
+    newest, size = 0.0, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                file_stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            newest = max(newest, file_stat.st_mtime)
+            size += file_stat.st_size
+    return newest or stat.st_mtime, size
+
+
+def _item(kind: str, paths: list[Path], mtime: float | None = None) -> _Item | None:
+    newest, total = 0.0, 0
+    try:
+        for path in paths:
+            path_mtime, path_size = _tree_stats(path)
+            newest = max(newest, path_mtime)
+            total += path_size
+    except OSError:
+        return None
+    return _Item(kind, paths, mtime if mtime is not None else newest, total)
+
+
+def _active_runs() -> set[Path]:
+    """대기/실행 중인 작업이 쓰는 data/runs 하위 폴더."""
+    active: set[Path] = set()
+    for status in (job_manager.JobStatus.PENDING, job_manager.JobStatus.RUNNING):
+        for job in job_manager.list_jobs(status=status):
+            meta = job.get("meta", {})
+            for value in (meta.get("run_dir"), meta.get("output")):
+                if not value:
+                    continue
+                try:
+                    relative = Path(value).resolve().relative_to(RUN_ROOT.resolve())
+                except ValueError:
+                    continue
+                if relative.parts:
+                    active.add(RUN_ROOT / relative.parts[0])
+    return active
+
+
+def _final_outputs(run_dir: Path) -> set[Path]:
+    """실행 폴더의 최종 결과물 (마지막 단계 출력)."""
+    for patterns in FINAL_OUTPUT_TIERS:
+        finals = {path for pattern in patterns for path in run_dir.glob(pattern) if path.is_file()}
+        if finals:
+            return finals
+    return set()
+
+
+def _run_items(run_dir: Path, now: float) -> list[_Item | None]:
+    """실행 폴더 하나의 중간 산출물(runs)과 최종 결과물(finals, 켠 경우만)을 항목별로.
+
+    최근에 수정됐거나 오케스트레이터가 실행 중인(잠금 파일) 폴더는 통째로 건너뛴다.
+    """
+    try:
+        newest, _ = _tree_stats(run_dir)
+    except OSError:
+        return []
+    if now - newest < MIN_AGE_SEC or run_lock.is_locked(run_dir, now):
+        return []
+    finals = _final_outputs(run_dir)
+    keep_finals = ttl_for("finals") is None
+    items: list[_Item | None] = []
+    for path in run_dir.iterdir():
+        if path not in finals:
+            items.append(_item("runs", [path]))
+        elif not keep_finals:
+            items.append(_item("finals", [path]))
+    return items
+
+
+def _busy_kinds() -> set[str]:
+    """소유 모듈의 작업이 실행 중인 임시 파일 분류."""
+    running = {module for (module, status), count in job_manager.active_counts().items() if status == job_manager.JobStatus.RUNNING and count}
+    return {kind for kind, modules in ARTIFACT_OWNERS.items() if running.intersection(modules)}
+
+
+def collect(now: float | None = None) -> list[_Item]:
+    """정리 대상이 될 수 있는 모든 산출물 (사용자가 올린 원본, 활성 실행 폴더, 실행 중인 작업의 임시 파일은 제외)."""
+    items: list[_Item | None] = []
+    busy = _busy_kinds()
+    if TEMP_DIR.is_dir() and "temp" not in busy:
+        items += [_item("temp", [path]) for path in TEMP_DIR.iterdir()]
+    if "tmp" not in busy:
+        items += [_item("tmp", [path]) for path in Path(tempfile.gettempdir()).glob(f"{TEMP_PREFIX}*")]
+
+    if blob_store.SESSION_ROOT.is_dir():
+        # <upload_id>.json/.part, 스트리밍 추출의 <id>_audio.wav 를 세션 하나로 묶는다.
+        groups: dict[str, list[Path]] = {}
+        for path in blob_store.SESSION_ROOT.iterdir():
+            groups.setdefault(path.name.split(".")[0].split("_")[0], []).append(path)
+        items += [_item("sessions", paths) for paths in groups.values()]
+
+    if batches.BATCH_ROOT.is_dir():
+        # <batch_id>.json 매니페스트와 <batch_id>.report.json 보고서를 한 묶음으로
+        groups = {}
+        for path in batches.BATCH_ROOT.iterdir():
+            groups.setdefault(path.name.split(".")[0], []).append(path)
+        items += [_item("batches", paths) for paths in groups.values()]
+
+    cache = step_cache.get_cache()
+    if cache is not None and cache.root.is_dir():
+        for entry in cache.root.glob("??/*"):
+            if entry.is_dir() and not entry.name.startswith("."):
+                # 항목 디렉터리 수정 시각 = 마지막 적중 시각
+                items.append(_item("cache", [entry], entry.stat().st_mtime))
+
+    if RUN_ROOT.is_dir():
+        active = _active_runs()
+        now = time.time() if now is None else now
+        for path in RUN_ROOT.iterdir():
+            if path.is_dir() and path not in active:
+                items += _run_items(path, now)
+
+    if blob_store.BLOB_ROOT.is_dir():
+        for blob in blob_store.BLOB_ROOT.glob("??/*"):
+            try:
+                # 링크 수 1 = 저장소에만 남은 blob (배치한 파일이 지워짐)
+                orphan = blob.is_file() and blob.stat().st_nlink == 1
+            except OSError:
+                continue
+            if orphan:
+                items.append(_item("blobs", [blob]))
+    return [item for item in items if item is not None]
+
+
+def _remove(item: _Item) -> bool:
+    try:
+        for path in item.paths:
+            if path.is_dir() and not path.is_symlink():
+                shutil.rmtree(path)
+            else:
+                path.unlink(missing_ok=True)
+    except OSError:
+        LOGGER.warning("산출물 삭제 실패: %s", item.paths[0], exc_info=True)
+        return False
+    if item.kind in ("runs", "finals"):
+        # 마지막 항목까지 지운 실행 폴더는 함께 지운다.
+        try:
+            item.paths[0].parent.rmdir()
+        except OSError:
+            pass
+    return True
+
+
+def _disk_usage(path: Path) -> tuple[int, int]:
+    usage = shutil.disk_usage(path)
+    return usage.used, usage.total
+
+
+def run_gc(dry_run: bool = False, now: float | None = None) -> dict[str, Any]:
+    """보존 시간이 지난 산출물/작업 레코드를 지우고, 디스크 사용률이 상한을 넘으면 오래된 중간 산출물부터 더 지운다.
+
+    dry_run이면 아무것도 지우지 않고 같은 형식의 보고서만 만든다.
+    """
+    now = time.time() if now is None else now
+    removed: list[dict[str, Any]] = []
+    summary: dict[str, dict[str, int]] = {}
+
+    def _drop(item: _Item, reason: str) -> bool:
+        if not dry_run and not _remove(item):
+            return False
+        removed.append({"kind": item.kind, "path": str(item.paths[0]), "bytes": item.size, "reason": reason})
+        stats = summary.setdefault(item.kind, {"items": 0, "bytes": 0})
+        stats["items"] += 1
+        stats["bytes"] += item.size
+        return True
+
+    remaining: list[_Item] = []
+    for item in collect(now):
+        age = now - item.mtime
+        ttl = ttl_for(item.kind)
+        if age >= MIN_AGE_SEC and ttl is not None and age > ttl and _drop(item, "ttl"):
+            continue
+        remaining.append(item)
+
+    disk_root = BASE_DIR / "data" if (BASE_DIR / "data").is_dir() else BASE_DIR
+    high = _env_ratio("PADIEM_DISK_HIGH_WATER", DEFAULT_HIGH_WATER)
+    low = min(high, _env_ratio("PADIEM_DISK_LOW_WATER", DEFAULT_LOW_WATER))
+    used, total = _disk_usage(disk_root)
+    if dry_run:
+        used -= sum(entry["bytes"] for entry in removed)
+    if total and used / total > high:
+        LOGGER.warning("디스크 사용률 %.1f%%가 상한 %.0f%%를 넘어 중간 산출물을 추가로 정리합니다.", used / total * 100, high * 100)
+        remaining.sort(key=lambda item: (EVICTION_ORDER.index(item.kind), item.mtime))
+        for item in remaining:
+            if used / total <= low:
+                break
+            if now - item.mtime < MIN_AGE_SEC or not _drop(item, "disk"):
+                continue
+            if dry_run:
+                used -= item.size
+            else:
+                # 하드링크로 공유된 파일은 지워도 공간이 돌아오지 않으므로 실제 사용량을 다시 잰다.
+                used, total = _disk_usage(disk_root)
+
+    jobs_ttl = ttl_for("jobs")
+    jobs_purged = 0
+    if jobs_ttl is not None:
+        cutoff = datetime.utcfromtimestamp(now - jobs_ttl).isoformat() + "Z"
+        jobs_purged = job_manager.purge_jobs(cutoff, dry_run=dry_run)
+
+    report = {
+        "dry_run": dry_run,
+        "removed": removed,
+        "summary": summary,
+        "jobs_purged": jobs_purged,
+        "disk": {"used": used, "total": total, "ratio": round(used / total, 4) if total else None, "high_water": high},
+    }
+    if removed or jobs_purged:
+        LOGGER.info(
+            "보존 정책 정리%s: 산출물 %d개 (%.1f MiB), 작업 레코드 %d건",
+            " (dry-run)" if dry_run else "",
+            len(removed),
+            sum(entry["bytes"] for entry in removed) / 1024**2,
+            jobs_purged,
+        )
+    return report
+
+
+# ---- 백그라운드 주기 실행 ----
+
+_stop = threading.Event()
+_thread: threading.Thread | None = None
+_thread_lock = threading.Lock()
+
+
+def _loop(interval: float) -> None:
+    while not _stop.wait(interval):
+        try:
+            run_gc()
+        except Exception:  # noqa: BLE001 - 정리 실패가 서버를 멈추지 않도록
+            LOGGER.exception("보존 정책 정리 실패")
+
+
+def start() -> None:
+    """PADIEM_GC_INTERVAL_SEC 주기로 정리 스레드를 시작 (0 이하면 시작하지 않음)."""
+    global _thread
+    try:
+        interval = float(os.getenv("PADIEM_GC_INTERVAL_SEC", str(DEFAULT_INTERVAL_SEC)))
+    except ValueError:
+        interval = DEFAULT_INTERVAL_SEC
+    if interval <= 0:
+        return
+    with _thread_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(target=_loop, args=(interval,), name="retention-gc", daemon=True)
+        _thread.start()
+
+
+def shutdown() -> None:
+    _stop.set()
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="보존 시간이 지난 작업 레코드와 산출물 정리")
+    parser.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상만 보고")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    report = run_gc(dry_run=args.dry_run)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
 from __future__ import annotations
 import sys
-from fastapi import APIRouter, HTTPException, status
+import uuid
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
 from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart 0.0.12 이하
+    from multipart.multipart import MultipartParser, parse_options_header
 
-from ..utils import resolve_path, run_module, start_module_job
+from .. import blob_store, job_manager
+from ..stream_extract import DEFAULT_SAMPLE_RATE, StreamingExtractor
+from ..utils import BASE_DIR, resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/audio", tags=["Audio Extractor"])
@@ -17,7 +28,7 @@ class AudioExtractRequest(BaseModel):
 
 
 @router.post("/extract")
-async def extract_audio(request: AudioExtractRequest) -> dict[str, str]:
+async def extract_audio(request: AudioExtractRequest, http_request: Request) -> dict[str, str]:
     """오디오 추출 모듈 실행."""
     input_path = resolve_path(request.input_media)
     output_path = resolve_path(request.output_audio)
@@ -44,18 +55,162 @@ async def extract_audio(request: AudioExtractRequest) -> dict[str, str]:
             )
         command.extend(["--config", str(config_path)])
 
+    meta = {"module": "audio_extractor"}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "audio_extractor"})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
     }
+
+
+class _MultipartFileSink:
+    """multipart 본문에서 첫 번째 파일 파트만 골라 StreamingExtractor로 흘려보내는 파서 콜백."""
+
+    def __init__(self, boundary: bytes, extractor: StreamingExtractor) -> None:
+        self.extractor = extractor
+        self.filename: str | None = None
+        self._header_field = b""
+        self._header_value = b""
+        self._in_file = False
+        self._file_seen = False
+        self.parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._on_part_begin,
+                "on_header_field": self._on_header_field,
+                "on_header_value": self._on_header_value,
+                "on_header_end": self._on_header_end,
+                "on_part_data": self._on_part_data,
+                "on_part_end": self._on_part_end,
+            },
+        )
+
+    def _on_part_begin(self) -> None:
+        self._in_file = False
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        if self._header_field.lower() == b"content-disposition" and not self._file_seen:
+            _, options = parse_options_header(self._header_value)
+            if b"filename" in options:
+                self.filename = options[b"filename"].decode("utf-8", errors="replace")
+                self._in_file = True
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self._in_file:
+            self.extractor.feed(data[start:end])
+
+    def _on_part_end(self) -> None:
+        if self._in_file:
+            self._file_seen = True
+        self._in_file = False
+
+
+@router.post("/extract/upload")
+async def upload_and_extract(
+    request: Request,
+    filename: str | None = Query(default=None, description="원시 본문(application/octet-stream)으로 보낼 때의 파일명"),
+    output_audio: str | None = Query(default=None, min_length=1),
+    target_path: str | None = Query(default=None, min_length=1, description="원본 저장 경로 (기본 data/uploads/<파일명>)"),
+    sample_rate: int = Query(default=DEFAULT_SAMPLE_RATE, ge=8000, le=48000),
+) -> dict:
+    """업로드와 오디오 추출을 한 번에 처리.
+
+    multipart(`file` 파트) 또는 원시 본문으로 받은 바이트를 원본 저장과 ffmpeg 표준 입력에 동시에 흘려보내므로,
+    마지막 바이트가 도착하면 곧바로 추출 결과(기본 16kHz 모노 PCM WAV)가 준비된다.
+    """
+    content_type = request.headers.get("content-type", "")
+    is_multipart = content_type.lower().startswith("multipart/form-data")
+    if not is_multipart and not filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="multipart/form-data로 보내거나 filename 쿼리 파라미터를 지정하세요.",
+        )
+    for value in (output_audio, target_path):
+        if value and not _within_base(resolve_path(value)):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="허용되지 않은 경로 요청입니다.")
+
+    output_path = resolve_path(output_audio) if output_audio else None
+    # 출력 경로를 지정하지 않으면 원본 파일명을 알 때까지 세션 디렉터리에 쓴다.
+    staging_output = output_path or blob_store.SESSION_ROOT / f"{uuid.uuid4().hex}_audio.wav"
+    try:
+        extractor = await run_in_threadpool(StreamingExtractor, staging_output, sample_rate)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+    job_id = job_manager.create_job({"module": "audio_extractor", "output": str(output_path or ""), "streaming": True})
+    job_manager.mark_running(job_id)
+    try:
+        if is_multipart:
+            _, params = parse_options_header(content_type)
+            boundary = params.get(b"boundary")
+            if not boundary:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="multipart boundary가 없습니다.")
+            sink = _MultipartFileSink(boundary, extractor)
+            async for chunk in request.stream():
+                # ffmpeg 입력 파이프가 가득 차면 쓰기가 막히므로 스레드에서 처리
+                await run_in_threadpool(sink.parser.write, chunk)
+            await run_in_threadpool(sink.parser.finalize)
+            filename = sink.filename
+            if not filename:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="업로드된 파일 파트가 없습니다.")
+        else:
+            async for chunk in request.stream():
+                await run_in_threadpool(extractor.feed, chunk)
+        result = await run_in_threadpool(extractor.finish)
+    except BaseException as exc:
+        extractor.abort()
+        job_manager.mark_failed(job_id, str(getattr(exc, "detail", exc)) or "업로드가 중단되었습니다.")
+        if isinstance(exc, RuntimeError):
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        raise
+
+    original = resolve_path(target_path) if target_path else None
+    if original is None:
+        original = await run_in_threadpool(blob_store.default_destination, filename, result["sha256"])
+    await run_in_threadpool(blob_store.materialize, result["sha256"], original)
+    if output_path is None:
+        output_path = original.with_name(f"{original.stem}_audio.wav")
+        staging_output.replace(output_path)
+
+    response = {
+        "status": "success",
+        "job_id": job_id,
+        "input_media": _relative(original),
+        "output": str(output_path),
+        "sha256": result["sha256"],
+        "size": result["size"],
+        "streamed": result["streamed"],
+    }
+    job_manager.mark_success(job_id, response)
+    return response
+
+
+def _within_base(path: Path) -> bool:
+    try:
+        path.relative_to(BASE_DIR)
+    except ValueError:
+        return False
+    return True
+
+
+def _relative(path: Path) -> str:
+    return str(path.relative_to(BASE_DIR)).replace("\\", "/")
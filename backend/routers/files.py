@@ -1,10 +1,14 @@
 from __future__ import annotations
 
 import json
+from pathlib import Path
+from urllib.parse import quote
 
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
+from .. import file_serving, json_preview
 from ..utils import BASE_DIR, resolve_path
 
 
@@ -21,8 +25,65 @@ MEDIA_TYPES = {
 router = APIRouter(prefix="/files", tags=["File Serving"])
 
 
+async def _file_response(
+    request: Request,
+    resolved: Path,
+    media_type: str | None,
+    filename: str | None = None,
+) -> Response:
+    """ETag/Last-Modified 검증과 Range 요청을 지원하는 파일 응답.
+
+    같은 파일을 다시 요청하면 304로 본문 없이 응답하고, 미디어 탐색(Range)은 206으로 요청 구간만 보낸다.
+    """
+    # 첫 요청의 내용 해시 계산이 이벤트 루프를 막지 않도록 스레드에서 수행
+    etag = await run_in_threadpool(file_serving.strong_etag, resolved)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": file_serving.last_modified(resolved),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "no-cache",
+    }
+    if filename:
+        quoted = quote(filename)
+        # 한글 등 비ASCII 파일명은 RFC 5987 형식으로 전달
+        headers["Content-Disposition"] = (
+            f'attachment; filename="{filename}"' if quoted == filename else f"attachment; filename*=utf-8''{quoted}"
+        )
+
+    if file_serving.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    size = resolved.stat().st_size
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        # 클라이언트가 가진 구간이 다른 버전의 파일이면 전체를 다시 보낸다.
+        range_header = None
+    try:
+        byte_range = file_serving.parse_range(range_header, size)
+    except file_serving.RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{size}"},
+        )
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(file_serving.iter_file(resolved), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        file_serving.iter_file(resolved, start, end),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 @router.get("")
-async def serve_file(path: str = Query(..., min_length=1)) -> FileResponse:
+async def serve_file(request: Request, path: str = Query(..., min_length=1)) -> Response:
     """프로젝트 내 파일을 안전하게 서빙."""
 
     resolved = resolve_path(path)
@@ -41,45 +102,81 @@ async def serve_file(path: str = Query(..., min_length=1)) -> FileResponse:
         )
 
     media_type = MEDIA_TYPES.get(resolved.suffix.lower())
-    return FileResponse(resolved, media_type=media_type)
+    return await _file_response(request, resolved, media_type)
 
 
 @router.get("/preview/json")
-async def preview_json(path: str = Query(..., min_length=1)) -> JSONResponse:
+async def preview_json(
+    request: Request,
+    path: str = Query(..., min_length=1),
+    offset: int = Query(default=0, ge=0, description="세그먼트 시작 위치"),
+    limit: int | None = Query(default=None, ge=1, le=5000, description="반환할 세그먼트 수"),
+    start: float | None = Query(default=None, ge=0, description="이 시각(초) 이후에 끝나는 세그먼트만"),
+    end: float | None = Query(default=None, ge=0, description="이 시각(초) 이전에 시작하는 세그먼트만"),
+) -> Response:
+    """JSON 미리보기.
+
+    offset/limit/start/end 중 하나라도 지정하면 세그먼트 배열을 증분 파싱해 요청 구간만
+    `{"total", "matched", "segments", "fields", ...}` 형태로 반환하고, 지정하지 않으면 파일 전체를 반환한다.
+    """
     resolved = resolve_path(path)
     if not resolved.exists() or resolved.suffix.lower() != ".json":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="JSON 파일을 찾을 수 없습니다.")
 
-    with resolved.open("r", encoding="utf-8") as fp:
-        data = json.load(fp)
+    sliced = offset > 0 or limit is not None or start is not None or end is not None
+    etag = await run_in_threadpool(file_serving.strong_etag, resolved)
+    if sliced:
+        # 구간마다 응답 내용이 다르므로 ETag에 질의 조건을 포함
+        etag = f'{etag[:-1]}-{offset}-{limit}-{start}-{end}"'
+    accept_encoding = request.headers.get("accept-encoding")
+    # 압축 여부에 따라 표현이 달라지므로 ETag도 구분
+    gzip_etag = etag[:-1] + '-gz"'
+    headers = {"Last-Modified": file_serving.last_modified(resolved), "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if_none_match = request.headers.get("if-none-match")
+    for candidate in (etag, gzip_etag):
+        if file_serving.etag_matches(if_none_match, candidate):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**headers, "ETag": candidate})
+
+    try:
+        if sliced:
+            data = await run_in_threadpool(json_preview.slice_segments, resolved, offset, limit, start, end)
+        else:
+            with resolved.open("r", encoding="utf-8") as fp:
+                data = json.load(fp)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"JSON을 읽을 수 없습니다: {exc}") from exc
 
-    return JSONResponse(data)
+    body, compressed = file_serving.maybe_gzip(json.dumps(data, ensure_ascii=False).encode("utf-8"), accept_encoding)
+    headers["ETag"] = gzip_etag if compressed else etag
+    if compressed:
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @router.get("/preview/audio")
-async def preview_audio(path: str = Query(..., min_length=1)) -> FileResponse:
+async def preview_audio(request: Request, path: str = Query(..., min_length=1)) -> Response:
     resolved = resolve_path(path)
     if not resolved.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="오디오 파일을 찾을 수 없습니다.")
 
     media_type = MEDIA_TYPES.get(resolved.suffix.lower(), "audio/wav")
-    return FileResponse(resolved, media_type=media_type)
+    return await _file_response(request, resolved, media_type)
 
 
 @router.get("/preview/video")
-async def preview_video(path: str = Query(..., min_length=1)) -> FileResponse:
+async def preview_video(request: Request, path: str = Query(..., min_length=1)) -> Response:
     resolved = resolve_path(path)
     if not resolved.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="비디오 파일을 찾을 수 없습니다.")
 
     media_type = MEDIA_TYPES.get(resolved.suffix.lower(), "video/mp4")
-    return FileResponse(resolved, media_type=media_type)
+    return await _file_response(request, resolved, media_type)
 
 
 @router.get("/download")
-async def download_file(path: str = Query(..., min_length=1)) -> FileResponse:
+async def download_file(request: Request, path: str = Query(..., min_length=1)) -> Response:
     resolved = resolve_path(path)
     if not resolved.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="파일을 찾을 수 없습니다.")
 
-    return FileResponse(resolved, filename=resolved.name, media_type="application/octet-stream")
+    return await _file_response(request, resolved, "application/octet-stream", filename=resolved.name)
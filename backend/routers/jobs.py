@@ -1,25 +1,123 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, HTTPException, status
+from typing import AsyncIterator
 
-from .. import job_manager
+from fastapi import APIRouter, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from .. import events, job_manager, pipeline
+from ..scheduler import get_scheduler
+from ..utils import cancel_job
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
 
+@router.get("/stats")
+async def scheduler_stats() -> dict:
+    """리소스 클래스별 슬롯/대기열 현황과 모듈별 대기·실행 시간 통계."""
+    return get_scheduler().stats()
+
+
 @router.get("/{job_id}")
 async def get_job(job_id: str) -> dict:
     """작업 상태 조회."""
     try:
-        return job_manager.get_job(job_id)
+        job = job_manager.get_job(job_id)
     except KeyError as exc:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"존재하지 않는 작업 ID입니다: {job_id}",
         ) from exc
+    if job["status"] == job_manager.JobStatus.PENDING:
+        job["queue_position"] = get_scheduler().queue_position(job_id)
+    return job
+
+
+@router.delete("/{job_id}")
+async def cancel(job_id: str, response: Response) -> dict:
+    """작업 취소.
+
+    대기 중이면 즉시 cancelled로 바뀌고(200), 실행 중이면 프로세스 트리를 종료한 뒤
+    슬롯이 정리되면서 cancelled로 바뀐다(202).
+    """
+    _ensure_job(job_id)
+    job = job_manager.get_job(job_id, include_logs=False)
+    if job["status"] in job_manager.TERMINAL_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"이미 종료된 작업입니다 (상태: {job['status']})",
+        )
+
+    reason = "사용자 요청으로 취소되었습니다."
+    # 파이프라인 부모 작업은 남은 단계를 취소하고, 실행 중인 단계가 정리되면 cancelled로 바뀐다.
+    if not (pipeline.cancel_pipeline(job_id, reason) or cancel_job(job_id, reason)):
+        # 이 서버 프로세스가 실행하고 있지 않은 작업(이전 실행에서 남은 기록 등)은 상태만 정리
+        job_manager.mark_stopped(job_id, job_manager.JobStatus.CANCELLED, reason)
+
+    job = job_manager.get_job(job_id, include_logs=False)
+    if job["status"] not in job_manager.TERMINAL_STATUSES:
+        response.status_code = status.HTTP_202_ACCEPTED
+    return job
+
+
+def _ensure_job(job_id: str) -> None:
+    try:
+        job_manager.get_job(job_id)
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"존재하지 않는 작업 ID입니다: {job_id}",
+        ) from exc
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request) -> StreamingResponse:
+    """작업 상태/진행률 변경을 Server-Sent Events로 전달 (종료 상태가 되면 스트림 종료)."""
+    _ensure_job(job_id)
+
+    async def _stream() -> AsyncIterator[str]:
+        async for event in events.job_events(job_id):
+            if event is None:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield events.format_sse(event)
+
+    return StreamingResponse(
+        _stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/{job_id}/ws")
+async def job_events_websocket(websocket: WebSocket, job_id: str) -> None:
+    """/jobs/{job_id}/events와 같은 이벤트를 WebSocket JSON 메시지로 전달."""
+    await websocket.accept()
+    try:
+        job_manager.get_job(job_id)
+    except KeyError:
+        await websocket.send_json({"type": "error", "detail": f"존재하지 않는 작업 ID입니다: {job_id}"})
+        await websocket.close(code=4404)
+        return
+    try:
+        async for event in events.job_events(job_id):
+            await websocket.send_json(event if event is not None else {"type": "keepalive"})
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
 
 
 @router.get("/")
-async def list_all_jobs() -> list[dict]:
-    """모든 작업 상태 나열."""
-    return job_manager.list_jobs()
+async def list_all_jobs(
+    response: Response,
+    status_filter: str | None = Query(default=None, alias="status"),
+    module: str | None = Query(default=None),
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+) -> list[dict]:
+    """작업 상태 목록을 최신순으로 조회 (전체 개수는 X-Total-Count 헤더로 반환)."""
+    total = job_manager.count_jobs(status=status_filter, module=module)
+    response.headers["X-Total-Count"] = str(total)
+    return job_manager.list_jobs(status=status_filter, module=module, limit=limit, offset=offset)
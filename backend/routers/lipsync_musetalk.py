@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 import sys
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from ..utils import resolve_path, run_module, start_module_job
+from ..utils import resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/lipsync-musetalk", tags=["LipSync (MuseTalk)"])
@@ -19,7 +19,7 @@ class LipSyncMuseTalkRequest(BaseModel):
 
 
 @router.post("/")
-async def run_lipsync_musetalk(request: LipSyncMuseTalkRequest) -> dict[str, str]:
+async def run_lipsync_musetalk(request: LipSyncMuseTalkRequest, http_request: Request) -> dict[str, str]:
     """MuseTalk 립싱크 모듈 실행."""
     video_path = resolve_path(request.input_video)
     audio_path = resolve_path(request.input_audio)
@@ -56,17 +56,19 @@ async def run_lipsync_musetalk(request: LipSyncMuseTalkRequest) -> dict[str, str
             )
         command.extend(["--config", str(config_path)])
 
+    meta = {"module": "lipsync_musetalk", "output": str(output_path)}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "lipsync_musetalk", "output": str(output_path)})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
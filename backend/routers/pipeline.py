@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, Field
+
+from .. import admission, pipeline
+from ..utils import resolve_path
+
+
+router = APIRouter(prefix="/pipeline", tags=["Pipeline"])
+
+class PipelineRequest(BaseModel):
+    input_media: str = Field(..., min_length=1)
+    run_name: str | None = Field(default=None, min_length=1, description="결과 폴더명 (미지정 시 입력 파일명 기반)")
+    stt_model: str = Field(default="whisper", description="whisper 또는 gemini")
+    tts_models: list[str] = Field(
+        default_factory=lambda: ["vallex"],
+        description="첫 모델이 RVC/립싱크로 이어지고 나머지는 병렬로 추가 합성 (vallex, xtts, gemini)",
+    )
+    lipsync_model: str = Field(default="wav2lip", description="wav2lip 또는 musetalk")
+    stages: list[str] = Field(default_factory=lambda: list(pipeline.ALL_STAGES))
+    source_language: str | None = Field(default=None)
+    target_language: str | None = Field(default="en")
+    configs: dict[str, str] = Field(
+        default_factory=dict,
+        description="단계별 설정 파일 경로 (stt, text_process, tts_<모델>, rvc, lipsync)",
+    )
+
+
+@router.post("/", status_code=status.HTTP_202_ACCEPTED)
+async def run_pipeline(request: PipelineRequest) -> dict:
+    """입력 미디어 하나로 전체 더빙 파이프라인을 서버에서 실행.
+
+    단계 DAG를 구성해 부모 작업 하나로 반환하며, 단계별 상태는 /jobs/{job_id}의
+    progress.steps와 /jobs/{job_id}/events 스트림으로 확인한다.
+    """
+    input_path = resolve_path(request.input_media)
+    if not input_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"입력 미디어를 찾을 수 없습니다: {input_path}",
+        )
+    unknown = set(request.stages) - set(pipeline.ALL_STAGES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"알 수 없는 단계입니다: {', '.join(sorted(unknown))}",
+        )
+
+    configs: dict[str, str] = {}
+    for stage, config in request.configs.items():
+        config_path = resolve_path(config)
+        if not config_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"설정 파일을 찾을 수 없습니다: {config_path}",
+            )
+        configs[stage] = str(config_path)
+
+    # 동시에 진행 중인 파이프라인이 많으면 실행 폴더를 만들기 전에 429로 거절
+    admission.check("pipeline")
+    run_name = pipeline.sanitize_run_name(request.run_name or input_path.stem)
+    run_dir = pipeline.RUN_ROOT / run_name
+    # 같은 이름의 실행 폴더를 쓰는 파이프라인이 진행 중이면 서로의 출력을 덮어쓰므로 409
+    owner = pipeline.run_dir_owner(run_dir)
+    if owner is not None:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(pipeline.RunDirBusy(run_dir, owner)))
+    run_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        steps = pipeline.build_steps(
+            input_path,
+            run_dir,
+            stt_model=request.stt_model,
+            tts_models=request.tts_models,
+            lipsync_model=request.lipsync_model,
+            stages=request.stages,
+            source_language=request.source_language,
+            target_language=request.target_language,
+            configs=configs,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    try:
+        job_id = pipeline.start_pipeline(steps, meta={"run_dir": str(run_dir)})
+    except pipeline.RunDirBusy as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    return {
+        "status": "queued",
+        "job_id": job_id,
+        "run_dir": str(run_dir),
+        "steps": {step.name: {"module": step.module, "needs": step.needs, "output": step.output} for step in steps},
+    }
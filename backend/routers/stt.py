@@ -1,9 +1,10 @@
 from __future__ import annotations
 import sys
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from ..utils import resolve_path, run_module, start_module_job
+from .. import batches
+from ..utils import resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/stt", tags=["Whisper STT"])
@@ -16,8 +17,31 @@ class SttRequest(BaseModel):
     async_run: bool = False
 
 
+class SttBatchItem(BaseModel):
+    input_audio: str = Field(..., min_length=1)
+    output_json: str = Field(..., min_length=1)
+
+
+class SttBatchRequest(BaseModel):
+    items: list[SttBatchItem] = Field(..., min_length=1)
+    config: str | None = Field(default=None, min_length=1)
+    async_run: bool = False
+
+
+def _config_args(config: str | None) -> list[str]:
+    if not config:
+        return []
+    config_path = resolve_path(config)
+    if not config_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"설정 파일을 찾을 수 없습니다: {config_path}",
+        )
+    return ["--config", str(config_path)]
+
+
 @router.post("/")
-async def run_stt(request: SttRequest) -> dict[str, str]:
+async def run_stt(request: SttRequest, http_request: Request) -> dict[str, str]:
     """Whisper STT 모듈 실행."""
     input_path = resolve_path(request.input_audio)
     output_path = resolve_path(request.output_json)
@@ -35,27 +59,54 @@ async def run_stt(request: SttRequest) -> dict[str, str]:
         "--output",
         str(output_path),
     ]
-    if request.config:
-        config_path = resolve_path(request.config)
-        if not config_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"설정 파일을 찾을 수 없습니다: {config_path}",
-            )
-        command.extend(["--config", str(config_path)])
+    command.extend(_config_args(request.config))
 
+    meta = {"module": "stt", "output": str(output_path)}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "stt", "output": str(output_path)})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
     }
+
+
+@router.post("/batch")
+async def run_stt_batch(request: SttBatchRequest, http_request: Request) -> dict:
+    """여러 오디오를 한 프로세스에서 Whisper 모델 한 번 적재로 전사하고 항목별 결과를 반환."""
+    config_args = _config_args(request.config)
+    try:
+        manifest, report = batches.write_manifest(
+            "stt", [(resolve_path(item.input_audio), resolve_path(item.output_json)) for item in request.items]
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    command = [
+        sys.executable,
+        "modules/stt_whisper/run.py",
+        "--batch-manifest",
+        str(manifest),
+        "--batch-report",
+        str(report),
+        *config_args,
+    ]
+    meta = {"module": "stt", "output": str(report), "batch_items": len(request.items)}
+    if request.async_run:
+        job_id = start_module_job(command, meta=meta)
+        return {"status": "queued", "job_id": job_id, "report": str(report)}
+
+    try:
+        result = await run_module_async(command, meta=meta, request=http_request)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return batches.summarize(result.get("job_id", ""), report)
@@ -1,17 +1,16 @@
 from __future__ import annotations
 import sys
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from ..utils import resolve_path, run_module, start_module_job
+from .. import batches
+from ..utils import resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/text", tags=["Text Processor"])
 
 
-class TextProcessRequest(BaseModel):
-    input_json: str = Field(..., min_length=1)
-    output_json: str = Field(..., min_length=1)
+class TextOptions(BaseModel):
     config: str | None = Field(default=None, min_length=1)
     async_run: bool = False
     source_language: str | None = Field(
@@ -24,25 +23,23 @@ class TextProcessRequest(BaseModel):
     enforce_timing: bool | None = Field(default=None, description="타이밍 엄격 모드")
 
 
-@router.post("/process")
-async def process_text(request: TextProcessRequest) -> dict[str, str]:
-    """텍스트 전처리/번역 모듈 실행."""
-    input_path = resolve_path(request.input_json)
-    output_path = resolve_path(request.output_json)
-    if not input_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"입력 JSON을 찾을 수 없습니다: {input_path}",
-        )
+class TextProcessRequest(TextOptions):
+    input_json: str = Field(..., min_length=1)
+    output_json: str = Field(..., min_length=1)
 
-    command = [
-        sys.executable,
-        "modules/text_processor/run.py",
-        "--input",
-        str(input_path),
-        "--output",
-        str(output_path),
-    ]
+
+class TextBatchItem(BaseModel):
+    input_json: str = Field(..., min_length=1)
+    output_json: str = Field(..., min_length=1)
+
+
+class TextBatchRequest(TextOptions):
+    items: list[TextBatchItem] = Field(..., min_length=1)
+
+
+def _option_args(request: TextOptions) -> list[str]:
+    """설정 파일/언어/번역 옵션을 모듈 CLI 인자로 변환."""
+    command: list[str] = []
     if request.config:
         config_path = resolve_path(request.config)
         if not config_path.exists():
@@ -68,19 +65,76 @@ async def process_text(request: TextProcessRequest) -> dict[str, str]:
         command.extend(["--syllable-tolerance", str(request.syllable_tolerance)])
     if request.enforce_timing is not None:
         command.extend(["--enforce-timing", str(request.enforce_timing)])
+    return command
+
+
+@router.post("/process")
+async def process_text(request: TextProcessRequest, http_request: Request) -> dict[str, str]:
+    """텍스트 전처리/번역 모듈 실행."""
+    input_path = resolve_path(request.input_json)
+    output_path = resolve_path(request.output_json)
+    if not input_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"입력 JSON을 찾을 수 없습니다: {input_path}",
+        )
 
+    command = [
+        sys.executable,
+        "modules/text_processor/run.py",
+        "--input",
+        str(input_path),
+        "--output",
+        str(output_path),
+    ]
+    command.extend(_option_args(request))
+
+    meta = {"module": "text_processor", "output": str(output_path)}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "text_processor", "output": str(output_path)})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
-    }
\ No newline at end of file
+    }
+
+
+@router.post("/batch")
+async def process_text_batch(request: TextBatchRequest, http_request: Request) -> dict:
+    """여러 STT 결과를 한 프로세스에서 차례로 전처리/번역하고 항목별 결과를 반환."""
+    option_args = _option_args(request)
+    try:
+        manifest, report = batches.write_manifest(
+            "text_processor", [(resolve_path(item.input_json), resolve_path(item.output_json)) for item in request.items]
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    command = [
+        sys.executable,
+        "modules/text_processor/run.py",
+        "--batch-manifest",
+        str(manifest),
+        "--batch-report",
+        str(report),
+        *option_args,
+    ]
+    meta = {"module": "text_processor", "output": str(report), "batch_items": len(request.items)}
+    if request.async_run:
+        job_id = start_module_job(command, meta=meta)
+        return {"status": "queued", "job_id": job_id, "report": str(report)}
+
+    try:
+        result = await run_module_async(command, meta=meta, request=http_request)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return batches.summarize(result.get("job_id", ""), report)
@@ -1,42 +1,39 @@
 from __future__ import annotations
 import sys
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from ..utils import resolve_path, run_module, start_module_job
+from .. import batches
+from ..utils import resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/tts-backup", tags=["XTTS"])
 
 
-class TtsBackupRequest(BaseModel):
-    input_json: str = Field(..., min_length=1)
-    output_audio: str = Field(..., min_length=1)
+class TtsBackupOptions(BaseModel):
     config: str | None = Field(default=None, min_length=1)
     speaker_wav: str | None = Field(default=None, min_length=1)
     language: str | None = Field(default=None, min_length=1)
     async_run: bool = False
 
 
-@router.post("/")
-async def synthesize_backup(request: TtsBackupRequest) -> dict[str, str]:
-    """XTTS 백업 음성 합성 모듈 실행."""
-    input_path = resolve_path(request.input_json)
-    output_path = resolve_path(request.output_audio)
-    if not input_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"입력 JSON을 찾을 수 없습니다: {input_path}",
-        )
+class TtsBackupRequest(TtsBackupOptions):
+    input_json: str = Field(..., min_length=1)
+    output_audio: str = Field(..., min_length=1)
 
-    command = [
-        sys.executable,
-        "modules/tts_xtts/run.py",
-        "--input",
-        str(input_path),
-        "--output",
-        str(output_path),
-    ]
+
+class TtsBackupBatchItem(BaseModel):
+    input_json: str = Field(..., min_length=1)
+    output_audio: str = Field(..., min_length=1)
+
+
+class TtsBackupBatchRequest(TtsBackupOptions):
+    items: list[TtsBackupBatchItem] = Field(..., min_length=1)
+
+
+def _option_args(request: TtsBackupOptions) -> list[str]:
+    """설정 파일/참조 음성/언어 옵션을 모듈 CLI 인자로 변환."""
+    command: list[str] = []
     if request.config:
         config_path = resolve_path(request.config)
         if not config_path.exists():
@@ -57,19 +54,76 @@ async def synthesize_backup(request: TtsBackupRequest) -> dict[str, str]:
 
     if request.language:
         command.extend(["--language", request.language])
+    return command
+
+
+@router.post("/")
+async def synthesize_backup(request: TtsBackupRequest, http_request: Request) -> dict[str, str]:
+    """XTTS 백업 음성 합성 모듈 실행."""
+    input_path = resolve_path(request.input_json)
+    output_path = resolve_path(request.output_audio)
+    if not input_path.exists():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"입력 JSON을 찾을 수 없습니다: {input_path}",
+        )
 
+    command = [
+        sys.executable,
+        "modules/tts_xtts/run.py",
+        "--input",
+        str(input_path),
+        "--output",
+        str(output_path),
+    ]
+    command.extend(_option_args(request))
+
+    meta = {"module": "tts_backup", "output": str(output_path)}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "tts_backup", "output": str(output_path)})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
     }
+
+
+@router.post("/batch")
+async def synthesize_backup_batch(request: TtsBackupBatchRequest, http_request: Request) -> dict:
+    """여러 텍스트를 XTTS 모델 한 번 적재로 합성하고 항목별 결과를 반환."""
+    option_args = _option_args(request)
+    try:
+        manifest, report = batches.write_manifest(
+            "tts_backup", [(resolve_path(item.input_json), resolve_path(item.output_audio)) for item in request.items]
+        )
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    command = [
+        sys.executable,
+        "modules/tts_xtts/run.py",
+        "--batch-manifest",
+        str(manifest),
+        "--batch-report",
+        str(report),
+        *option_args,
+    ]
+    meta = {"module": "tts_backup", "output": str(report), "batch_items": len(request.items)}
+    if request.async_run:
+        job_id = start_module_job(command, meta=meta)
+        return {"status": "queued", "job_id": job_id, "report": str(report)}
+
+    try:
+        result = await run_module_async(command, meta=meta, request=http_request)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return batches.summarize(result.get("job_id", ""), report)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 import sys
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from pydantic import BaseModel, Field
 
-from ..utils import resolve_path, run_module, start_module_job
+from ..utils import resolve_path, run_module_async, start_module_job
 
 
 router = APIRouter(prefix="/tts-gemini", tags=["Gemini TTS"])
@@ -17,7 +17,7 @@ class TtsGeminiRequest(BaseModel):
 
 
 @router.post("/")
-async def run_tts_gemini(request: TtsGeminiRequest) -> dict[str, str]:
+async def run_tts_gemini(request: TtsGeminiRequest, http_request: Request) -> dict[str, str]:
     """Gemini TTS 모듈 실행."""
     input_path = resolve_path(request.input_json)
     output_path = resolve_path(request.output_audio)
@@ -44,17 +44,19 @@ async def run_tts_gemini(request: TtsGeminiRequest) -> dict[str, str]:
             )
         command.extend(["--config", str(config_path)])
 
+    meta = {"module": "tts_gemini", "output": str(output_path)}
     if request.async_run:
-        job_id = start_module_job(command, meta={"module": "tts_gemini", "output": str(output_path)})
+        job_id = start_module_job(command, meta=meta)
         return {"status": "queued", "job_id": job_id}
 
     try:
-        result = run_module(command)
+        result = await run_module_async(command, meta=meta, request=http_request)
     except RuntimeError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
     return {
         "status": "success",
+        "job_id": result.get("job_id", ""),
         "output": str(output_path),
         "stdout": result.get("stdout", ""),
         "stderr": result.get("stderr", ""),
@@ -2,55 +2,174 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile, status
+from fastapi import APIRouter, File, Form, HTTPException, Query, Request, Response, UploadFile, status
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 
+from .. import blob_store
 from ..utils import BASE_DIR, resolve_path
 
 
 router = APIRouter(prefix="/uploads", tags=["File Uploads"])
 
 
+class UploadSessionRequest(BaseModel):
+    filename: str = Field(..., min_length=1)
+    size: int | None = Field(default=None, ge=0, description="전체 파일 크기(바이트)")
+    sha256: str | None = Field(default=None, description="알고 있으면 전달 (저장소에 있으면 전송 없이 완료)")
+    target_path: str | None = Field(default=None)
+
+
+class FinalizeRequest(BaseModel):
+    sha256: str = Field(..., min_length=64, max_length=64)
+
+
 @router.post("")
 async def upload_file(
     file: UploadFile = File(...),
     target_path: str | None = Form(default=None),
 ) -> dict[str, str]:
-    """클라이언트에서 업로드한 파일을 프로젝트 디렉터리에 저장."""
+    """클라이언트에서 업로드한 파일을 프로젝트 디렉터리에 저장 (같은 내용의 파일은 하나의 blob을 공유)."""
 
     if not file.filename:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="파일 이름이 비어 있습니다.")
 
-    normalized_target = (target_path or "").strip()
-    if normalized_target:
-        destination = resolve_path(normalized_target)
-    else:
-        destination = _default_destination(file.filename)
-
-    _ensure_within_base(destination)
-    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination = _target_destination(target_path)
 
-    with destination.open("wb") as buffer:
+    writer = blob_store.BlobWriter()
+    try:
         while True:
-            chunk = await file.read(1024 * 1024)
+            chunk = await file.read(blob_store.CHUNK_SIZE)
             if not chunk:
                 break
-            buffer.write(chunk)
-    await file.close()
-
-    relative_path = destination.relative_to(BASE_DIR)
-    return {"status": "success", "path": str(relative_path).replace("\\", "/")}
-
-
-def _default_destination(filename: str) -> Path:
-    safe_name = Path(filename).name or "upload.bin"
-    base_dir = BASE_DIR / "data" / "uploads"
-    base_dir.mkdir(parents=True, exist_ok=True)
-    candidate = base_dir / safe_name
-    counter = 1
-    while candidate.exists():
-        candidate = base_dir / f"{counter}_{safe_name}"
-        counter += 1
-    return candidate
+            writer.write(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    finally:
+        await file.close()
+    sha256, _ = await run_in_threadpool(writer.commit)
+
+    if destination is None:
+        destination = await run_in_threadpool(blob_store.default_destination, file.filename, sha256)
+    await run_in_threadpool(blob_store.materialize, sha256, destination)
+    return {"status": "success", "path": _relative(destination), "sha256": sha256}
+
+
+@router.post("/sessions", status_code=status.HTTP_201_CREATED)
+async def create_upload_session(request: UploadSessionRequest, response: Response) -> dict:
+    """이어받기 업로드 시작.
+
+    sha256을 알려 준 파일이 이미 저장소에 있으면 전송 없이 바로 배치하고 `status: complete`로 응답한다.
+    그 외에는 `upload_id`를 받아 PUT /uploads/sessions/{upload_id}?offset=N 으로 청크를 보내고
+    POST /uploads/sessions/{upload_id}/finalize 로 마친다.
+    """
+    destination = _target_destination(request.target_path)
+    if request.sha256:
+        try:
+            sha256 = blob_store.normalize_hash(request.sha256)
+        except blob_store.UploadError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+        if blob_store.has_blob(sha256):
+            if destination is None:
+                destination = await run_in_threadpool(blob_store.default_destination, request.filename, sha256)
+            await run_in_threadpool(blob_store.materialize, sha256, destination)
+            response.status_code = status.HTTP_200_OK
+            return {"status": "complete", "path": _relative(destination), "sha256": sha256, "deduplicated": True}
+
+    session = blob_store.create_session(request.filename, request.size, destination)
+    return {
+        "status": "created",
+        "upload_id": session["upload_id"],
+        "offset": 0,
+        "max_chunk_bytes": blob_store.MAX_CHUNK_BYTES,
+    }
+
+
+@router.get("/sessions/{upload_id}")
+async def get_upload_session(upload_id: str) -> dict:
+    """끊긴 업로드를 이어 보낼 위치(offset) 조회."""
+    session = _call(blob_store.session_status, upload_id)
+    return {"upload_id": upload_id, "offset": session["offset"], "size": session["size"]}
+
+
+@router.put("/sessions/{upload_id}")
+async def upload_chunk(upload_id: str, request: Request, offset: int = Query(..., ge=0)) -> dict:
+    """offset 위치부터 청크(요청 본문 전체)를 이어 쓴다. 위치가 맞지 않으면 409와 현재 offset."""
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > blob_store.MAX_CHUNK_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"청크는 최대 {blob_store.MAX_CHUNK_BYTES}바이트입니다.",
+            )
+    try:
+        written = await run_in_threadpool(blob_store.append_chunk, upload_id, offset, [bytes(body)])
+    except blob_store.OffsetMismatch as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": str(exc), "offset": exc.current},
+            headers={"Upload-Offset": str(exc.current)},
+        ) from exc
+    except KeyError as exc:
+        raise _not_found(upload_id) from exc
+    except blob_store.UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {"upload_id": upload_id, "offset": written}
+
+
+@router.post("/sessions/{upload_id}/finalize")
+async def finalize_upload(upload_id: str, request: FinalizeRequest) -> dict:
+    """SHA-256을 확인해 저장소에 넣고 목적 경로에 배치 (같은 내용이 이미 있으면 그 blob을 하드링크)."""
+    try:
+        result = await run_in_threadpool(blob_store.finalize_session, upload_id, request.sha256)
+    except KeyError as exc:
+        raise _not_found(upload_id) from exc
+    except blob_store.UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc)) from exc
+    return {
+        "status": "success",
+        "path": _relative(result["path"]),
+        "sha256": result["sha256"],
+        "size": result["size"],
+        "deduplicated": result["deduplicated"],
+    }
+
+
+@router.delete("/sessions/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload(upload_id: str) -> Response:
+    _call(blob_store.discard_session, upload_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+def _call(func, upload_id: str):
+    try:
+        return func(upload_id)
+    except KeyError as exc:
+        raise _not_found(upload_id) from exc
+    except blob_store.UploadError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+
+def _not_found(upload_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"존재하지 않는 업로드 세션입니다: {upload_id}",
+    )
+
+
+def _target_destination(target_path: str | None) -> Path | None:
+    normalized_target = (target_path or "").strip()
+    if not normalized_target:
+        return None
+    destination = resolve_path(normalized_target)
+    _ensure_within_base(destination)
+    return destination
+
+
+def _relative(path: Path) -> str:
+    return str(path.relative_to(BASE_DIR)).replace("\\", "/")
 
 
 def _ensure_within_base(path: Path) -> None:
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from . import metrics
+
+LOGGER = logging.getLogger("pipeline.backend.scheduler")
+
+RESOURCE_HEAVY = "heavy"
+RESOURCE_LIGHT = "light"
+
+# 모델을 메모리에 올리는 단계는 heavy, ffmpeg/텍스트/클라우드 호출 단계는 light로 분류
+MODULE_RESOURCES = {
+    "stt": RESOURCE_HEAVY,
+    "tts": RESOURCE_HEAVY,
+    "tts_backup": RESOURCE_HEAVY,
+    "rvc": RESOURCE_HEAVY,
+    "lipsync": RESOURCE_HEAVY,
+    "lipsync_musetalk": RESOURCE_HEAVY,
+    "audio_extractor": RESOURCE_LIGHT,
+    "text_processor": RESOURCE_LIGHT,
+    "stt_gemini": RESOURCE_LIGHT,
+    "tts_gemini": RESOURCE_LIGHT,
+}
+
+
+# 모듈별 기본 실행 제한 시간(초). PADIEM_TIMEOUT_<MODULE> (예: PADIEM_TIMEOUT_LIPSYNC)로 조정, 0 이하면 무제한
+MODULE_TIMEOUTS = {
+    "stt": 3600,
+    "tts": 1800,
+    "tts_backup": 1800,
+    "rvc": 1800,
+    "lipsync": 7200,
+    "lipsync_musetalk": 7200,
+    "audio_extractor": 600,
+    "text_processor": 900,
+    "stt_gemini": 1800,
+    "tts_gemini": 900,
+}
+DEFAULT_TIMEOUT_SEC = 3600
+
+
+def _env_slots(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def default_slots() -> dict[str, int]:
+    """리소스 클래스별 동시 실행 슬롯 수 (환경 변수로 조정)."""
+    return {
+        RESOURCE_HEAVY: _env_slots("PADIEM_HEAVY_SLOTS", 1),
+        RESOURCE_LIGHT: _env_slots("PADIEM_LIGHT_SLOTS", 4),
+    }
+
+
+def resource_for(module: str | None) -> str:
+    return MODULE_RESOURCES.get(module or "", RESOURCE_LIGHT)
+
+
+def timeout_for(module: str | None, items: int | None = None) -> float | None:
+    """모듈 실행 제한 시간(초), 제한이 없으면 None.
+
+    items는 배치 작업의 항목 수로, 한 항목 기준 제한 시간에 곱한다.
+    """
+    default = MODULE_TIMEOUTS.get(module or "", DEFAULT_TIMEOUT_SEC)
+    value = os.getenv(f"PADIEM_TIMEOUT_{(module or 'unknown').upper()}", str(default))
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = float(default)
+    return seconds * max(1, items or 1) if seconds > 0 else None
+
+
+@dataclass
+class _Task:
+    job_id: str
+    module: str
+    fn: Callable[[], Any]
+    future: Future = field(default_factory=Future)
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _ModuleStats:
+    completed: int = 0
+    wait_total: float = 0.0
+    wait_max: float = 0.0
+    run_total: float = 0.0
+    run_max: float = 0.0
+
+    def record(self, wait_sec: float, run_sec: float) -> None:
+        self.completed += 1
+        self.wait_total += wait_sec
+        self.wait_max = max(self.wait_max, wait_sec)
+        self.run_total += run_sec
+        self.run_max = max(self.run_max, run_sec)
+
+    def as_dict(self) -> dict[str, Any]:
+        count = self.completed or 1
+        return {
+            "completed": self.completed,
+            "wait_sec": {"avg": round(self.wait_total / count, 3), "max": round(self.wait_max, 3)},
+            "run_sec": {"avg": round(self.run_total / count, 3), "max": round(self.run_max, 3)},
+        }
+
+
+class _ResourcePool:
+    """슬롯 수만큼의 워커 스레드가 FIFO 대기열에서 작업을 꺼내 실행."""
+
+    def __init__(self, name: str, slots: int, on_done: Callable[[_Task, float, float], None]) -> None:
+        self.name = name
+        self.slots = slots
+        self._on_done = on_done
+        self._queue: deque[_Task] = deque()
+        self._running: set[str] = set()
+        self._cond = threading.Condition()
+        for index in range(slots):
+            thread = threading.Thread(target=self._loop, name=f"scheduler-{name}-{index}", daemon=True)
+            thread.start()
+
+    def put(self, task: _Task) -> None:
+        with self._cond:
+            self._queue.append(task)
+            self._cond.notify()
+
+    def position(self, job_id: str) -> int | None:
+        with self._cond:
+            for index, task in enumerate(self._queue):
+                if task.job_id == job_id:
+                    return index + 1
+        return None
+
+    def remove(self, job_id: str) -> _Task | None:
+        with self._cond:
+            for task in self._queue:
+                if task.job_id == job_id:
+                    self._queue.remove(task)
+                    return task
+        return None
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {"slots": self.slots, "running": len(self._running), "queued": len(self._queue)}
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                task = self._queue.popleft()
+                self._running.add(task.job_id)
+
+            started = time.monotonic()
+            wait_sec = started - task.enqueued_at
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    try:
+                        task.future.set_result(task.fn())
+                    except BaseException as exc:  # noqa: BLE001 - 호출 측이 Future로 확인
+                        task.future.set_exception(exc)
+            finally:
+                with self._cond:
+                    self._running.discard(task.job_id)
+                self._on_done(task, wait_sec, time.monotonic() - started)
+
+
+class Scheduler:
+    """리소스 클래스별 슬롯 제한과 FIFO 대기열을 가진 작업 스케줄러."""
+
+    def __init__(self, slots: dict[str, int] | None = None) -> None:
+        self._stats_lock = threading.Lock()
+        self._stats: dict[str, _ModuleStats] = {}
+        self._pools = {
+            name: _ResourcePool(name, count, self._record)
+            for name, count in (slots or default_slots()).items()
+        }
+
+    def submit(self, job_id: str, module: str | None, fn: Callable[[], Any]) -> Future:
+        """작업을 모듈의 리소스 클래스 대기열에 추가하고 완료 Future를 반환."""
+        task = _Task(job_id=job_id, module=module or "unknown", fn=fn)
+        pool = self._pools.get(resource_for(module)) or self._pools[RESOURCE_LIGHT]
+        pool.put(task)
+        return task.future
+
+    def queue_position(self, job_id: str) -> int | None:
+        for pool in self._pools.values():
+            position = pool.position(job_id)
+            if position is not None:
+                return position
+        return None
+
+    def cancel(self, job_id: str) -> bool:
+        """대기열에 있는 작업을 제거 (이미 실행 중이면 False)."""
+        for pool in self._pools.values():
+            task = pool.remove(job_id)
+            if task is not None:
+                task.future.cancel()
+                return True
+        return False
+
+    def stats(self) -> dict[str, Any]:
+        with self._stats_lock:
+            modules = {name: stats.as_dict() for name, stats in self._stats.items()}
+        return {
+            "resources": {name: pool.snapshot() for name, pool in self._pools.items()},
+            "modules": modules,
+        }
+
+    def _record(self, task: _Task, wait_sec: float, run_sec: float) -> None:
+        with self._stats_lock:
+            self._stats.setdefault(task.module, _ModuleStats()).record(wait_sec, run_sec)
+        metrics.observe_scheduled(task.module, wait_sec, run_sec)
+        LOGGER.info(
+            "작업 %s (%s) 대기 %.2fs / 실행 %.2fs",
+            task.job_id,
+            task.module,
+            wait_sec,
+            run_sec,
+        )
+
+
+_scheduler: Scheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> Scheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler()
+        return _scheduler
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from shared.utils import process_tree
+from shared.utils.io_helpers import read_yaml
+
+from . import blob_store
+from .utils import BASE_DIR
+
+
+LOGGER = logging.getLogger("pipeline.backend.stream_extract")
+
+DEFAULT_CONFIG = BASE_DIR / "modules" / "audio_extractor" / "config" / "settings.yaml"
+# STT 입력용 기본 출력 형식 (16kHz 모노 PCM)
+DEFAULT_SAMPLE_RATE = 16000
+_STDERR_TAIL_LINES = 20
+
+
+def build_command(output_audio: Path, source: str = "pipe:0", sample_rate: int = DEFAULT_SAMPLE_RATE, config: dict | None = None) -> list[str]:
+    """audio_extractor 설정(ffmpeg 경로/코덱/추가 인자)을 따르는 ffmpeg 명령."""
+    config = config if config is not None else (read_yaml(DEFAULT_CONFIG) if DEFAULT_CONFIG.exists() else {})
+    command = [
+        config.get("ffmpeg_path", "ffmpeg"),
+        "-hide_banner",
+        "-y",
+        "-i",
+        source,
+        "-vn",
+        "-acodec",
+        config.get("audio_codec", "pcm_s16le"),
+        "-ar",
+        str(sample_rate),
+        "-ac",
+        "1",
+    ]
+    command.extend(config.get("extra_args") or [])
+    command.append(str(output_audio))
+    return command
+
+
+class StreamingExtractor:
+    """업로드되는 바이트를 원본 저장(BlobWriter)과 ffmpeg 표준 입력으로 동시에 흘려보낸다.
+
+    ffmpeg가 표준 입력으로 디코딩할 수 없는 형식(moov 정보가 파일 끝에 있는 MP4 등)이면 스트림 디코딩을
+    포기하고, 업로드가 끝난 뒤 저장된 원본으로 다시 추출한다.
+    """
+
+    def __init__(self, output_audio: Path, sample_rate: int = DEFAULT_SAMPLE_RATE, config: dict | None = None) -> None:
+        self.output_audio = output_audio
+        self.sample_rate = sample_rate
+        self.config = config
+        self.writer = blob_store.BlobWriter()
+        self.streamed = True
+        self._stderr: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+        output_audio.parent.mkdir(parents=True, exist_ok=True)
+        command = build_command(output_audio, "pipe:0", sample_rate, config)
+        LOGGER.info("스트리밍 오디오 추출 시작: %s", " ".join(command))
+        try:
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                **process_tree.new_group_kwargs(),
+            )
+        except FileNotFoundError as exc:
+            self.writer.abort()
+            raise RuntimeError("ffmpeg 실행 파일을 찾을 수 없습니다.") from exc
+        self._stderr_reader = threading.Thread(target=self._read_stderr, daemon=True)
+        self._stderr_reader.start()
+
+    def _read_stderr(self) -> None:
+        for line in iter(self._process.stderr.readline, b""):
+            text = line.decode("utf-8", errors="replace").strip()
+            if text:
+                self._stderr.append(text)
+
+    def feed(self, chunk: bytes) -> None:
+        """청크를 원본 파일과 ffmpeg에 전달 (ffmpeg가 먼저 끝나도 원본 저장은 계속)."""
+        self.writer.write(chunk)
+        if not self.streamed:
+            return
+        try:
+            self._process.stdin.write(chunk)
+        except (BrokenPipeError, OSError):
+            LOGGER.warning("ffmpeg가 입력을 더 받지 않아 업로드 완료 후 파일로 다시 추출합니다.")
+            self.streamed = False
+
+    def _wait_stream(self) -> int:
+        try:
+            self._process.stdin.close()
+        except OSError:
+            pass
+        returncode = self._process.wait()
+        self._stderr_reader.join(5)
+        return returncode
+
+    def finish(self) -> dict[str, Any]:
+        """입력을 닫고 ffmpeg 완료를 기다린 뒤 원본을 저장소에 넣는다.
+
+        반환: sha256, size, streamed(스트림 디코딩 성공 여부), deduplicated.
+        스트림 디코딩이 실패했으면 저장된 원본으로 한 번 더 추출하고, 그것도 실패하면 RuntimeError.
+        """
+        returncode = self._wait_stream()
+        sha256, deduplicated = self.writer.commit()
+        if returncode != 0:
+            if self.streamed:
+                LOGGER.warning("스트림 디코딩 실패 (exit %s): %s", returncode, " / ".join(self._stderr))
+            self.streamed = False
+        if not self.streamed:
+            source = blob_store.blob_path(sha256)
+            command = build_command(self.output_audio, str(source), self.sample_rate, self.config)
+            LOGGER.info("저장된 원본으로 오디오 추출: %s", " ".join(command))
+            result = subprocess.run(command, capture_output=True, text=True, check=False)
+            if result.returncode != 0:
+                tail = "\n".join(result.stderr.strip().splitlines()[-_STDERR_TAIL_LINES:])
+                raise RuntimeError(f"오디오 추출 중 오류가 발생했습니다.\n{tail}")
+        return {"sha256": sha256, "size": self.writer.size, "streamed": self.streamed, "deduplicated": deduplicated}
+
+    def abort(self) -> None:
+        """업로드가 중단되면 ffmpeg를 종료하고 임시 파일을 지운다."""
+        process_tree.kill_tree(self._process)
+        self.writer.abort()
+        self.output_audio.unlink(missing_ok=True)
@@ -1,18 +1,71 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
 import subprocess
+import sys
 import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Sequence
+from typing import IO, TYPE_CHECKING, Any, Sequence
 
-from . import job_manager
+from shared.utils import process_tree, step_cache
+
+from . import admission, job_manager, metrics, model_pool, progress, remote_jobs
+from .scheduler import get_scheduler, timeout_for
+
+if TYPE_CHECKING:
+    from fastapi import Request
 
 
 LOGGER = logging.getLogger("pipeline.backend")
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# 클라이언트 연결 종료 여부를 확인하는 주기(초)
+DISCONNECT_POLL_SEC = 1.0
+
+_process_lock = threading.Lock()
+_processes: dict[str, subprocess.Popen] = {}
+# 이 프로세스의 스케줄러 슬롯에서 실행 중인 작업 -> 명령
+_running_jobs: dict[str, list[str]] = {}
+_running_modules: dict[str, str] = {}
+# 중단 요청된 작업 -> (cancelled/timed_out, 사유)
+_cancel_reasons: dict[str, tuple[str, str]] = {}
+
+
+@dataclass
+class _Flight:
+    """같은 요청을 공유하는 실행 중 작업 (waiters: 결과를 기다리는 요청 수)."""
+
+    job_id: str
+    future: Future
+    waiters: int = 1
+
+
+_inflight_lock = threading.Lock()
+# 정규화한 명령 + 입력 해시 -> 실행 중 작업
+_inflight: dict[str, _Flight] = {}
+_inflight_by_job: dict[str, str] = {}
+
+
+class JobStopped(Exception):
+    """취소 또는 시간 초과로 중단된 작업.
+
+    라우터의 RuntimeError(500) 처리에 걸리지 않고 앱의 예외 처리기에서 409로 응답한다.
+    """
+
+    def __init__(self, status: str, reason: str, job_id: str | None = None) -> None:
+        super().__init__(reason)
+        self.status = status
+        self.reason = reason
+        self.job_id = job_id
+
 
 def resolve_path(path_str: str) -> Path:
     """프로젝트 루트를 기준으로 경로를 해석."""
@@ -22,44 +75,335 @@ def resolve_path(path_str: str) -> Path:
     return path
 
 
-def run_module(command: Sequence[str]) -> dict[str, str]:
-    """모듈 실행을 위한 동기 서브프로세스 호출."""
+def _tee_output(job_id: str, stream: IO[bytes]) -> None:
+    """자식 프로세스 출력을 터미널로 그대로 흘리면서 최근 로그 줄을 작업에 기록."""
+    terminal = getattr(sys.stdout, "buffer", None)
+    pending = b""
+    while True:
+        chunk = stream.read1(8192) if hasattr(stream, "read1") else stream.read(8192)
+        if not chunk:
+            break
+        if terminal is not None:
+            terminal.write(chunk)
+            terminal.flush()
+        # tqdm 진행 바는 \r로 갱신되므로 \r도 줄 구분으로 취급
+        *lines, pending = (pending + chunk).replace(b"\r", b"\n").split(b"\n")
+        for line in lines:
+            if line.strip():
+                progress.add_log(job_id, line.decode("utf-8", errors="replace"))
+    if pending.strip():
+        progress.add_log(job_id, pending.decode("utf-8", errors="replace"))
+
+
+def run_module(command: Sequence[str], job_id: str | None = None) -> dict[str, str]:
+    """모듈 실행을 위한 동기 호출 (상주 워커 대상이면 워커로, 아니면 서브프로세스로).
+
+    job_id가 있으면 진행률 채널 환경 변수를 넘기고, 출력은 터미널에 그대로 보여주면서
+    최근 로그 줄을 작업 레코드에 남긴다.
+    """
+    if model_pool.module_for_command(command):
+        return model_pool.run(command, job_id=job_id)
+
     # 사용자가 터미널에서 진행 상황을 볼 수 있도록 로그 출력
     LOGGER.info("서브프로세스 실행 시작: %s", " ".join(command))
-    
+
+    popen_kwargs: dict[str, Any] = {"cwd": BASE_DIR}
+    if job_id:
+        # 모듈이 띄우는 ffmpeg/추론 스크립트까지 한 번에 정리할 수 있도록 별도 프로세스 그룹으로 실행
+        popen_kwargs.update(process_tree.new_group_kwargs())
+        popen_kwargs["env"] = {**os.environ, "PYTHONUNBUFFERED": "1", **progress.env_for(job_id)}
+        popen_kwargs["stdout"] = subprocess.PIPE
+        popen_kwargs["stderr"] = subprocess.STDOUT
     try:
-        # capture_output=True를 제거하여 터미널에 직접 출력(Progress Bar 등)이 나오도록 함
-        subprocess.run(
-            command,
-            check=True,
-            cwd=BASE_DIR,
-        )
-        # 출력은 터미널로 직접 나갔으므로, 반환값에는 빈 문자열을 넣음
-        return {"stdout": "(터미널 출력 참조)", "stderr": ""}
+        process = subprocess.Popen(command, **popen_kwargs)
     except FileNotFoundError as exc:
         raise RuntimeError("명령 실행 파일을 찾을 수 없습니다.") from exc
-    except subprocess.CalledProcessError as exc:
-        raise RuntimeError(f"모듈 실행 중 오류 발생 (Exit code: {exc.returncode})") from exc
 
+    reader: threading.Thread | None = None
+    if job_id:
+        with _process_lock:
+            _processes[job_id] = process
+            stop_requested = job_id in _cancel_reasons
+        if stop_requested:
+            process_tree.kill_tree(process)
+        reader = threading.Thread(target=_tee_output, args=(job_id, process.stdout), daemon=True)
+        reader.start()
+    try:
+        returncode = process.wait()
+        if reader is not None:
+            reader.join(5)
+    finally:
+        if job_id:
+            with _process_lock:
+                _processes.pop(job_id, None)
 
-def start_module_job(command: Sequence[str], meta: dict[str, Any] | None = None) -> str:
-    """비동기 작업으로 모듈 실행."""
+    if returncode != 0:
+        raise RuntimeError(f"모듈 실행 중 오류 발생 (Exit code: {returncode})")
+    return {"stdout": "(터미널 출력 참조)", "stderr": ""}
 
-    job_id = job_manager.create_job(meta)
-    command_list = list(command)
 
-    def _worker() -> None:
+def _launch_job(job_id: str, command_list: list[str], meta: dict[str, Any] | None = None) -> Future:
+    """작업을 스케줄러 대기열에 넣어 리소스 슬롯이 비면 실행 (원격 실행 모듈이면 작업 대기열로 넘김)."""
+
+    module = (meta or {}).get("module")
+    if remote_jobs.is_remote(module):
+        return remote_jobs.submit(job_id, command_list, meta)
+
+    def _worker() -> dict[str, str]:
         LOGGER.info("작업 %s 시작: %s", job_id, " ".join(command_list))
         job_manager.mark_running(job_id)
+        progress.begin(job_id)
+        with _process_lock:
+            _running_jobs[job_id] = command_list
+            _running_modules[job_id] = module or "unknown"
+        timeout = timeout_for(module, (meta or {}).get("batch_items"))
+        watchdog: threading.Timer | None = None
+        if timeout is not None:
+            watchdog = threading.Timer(
+                timeout,
+                cancel_job,
+                args=(job_id, f"실행 제한 시간({timeout:.0f}초)을 초과해 중단했습니다.", job_manager.JobStatus.TIMED_OUT),
+            )
+            watchdog.daemon = True
+            watchdog.start()
+        started = time.monotonic()
         try:
-            result = run_module(command_list)
+            try:
+                # 같은 입력/설정/모듈 버전으로 실행한 적이 있으면 출력만 배치하고 실행을 건너뜀
+                result = step_cache.run_cached(command_list, lambda: run_module(command_list, job_id=job_id), cwd=BASE_DIR)
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                progress.finish(job_id)
+                with _process_lock:
+                    _running_jobs.pop(job_id, None)
+                    _running_modules.pop(job_id, None)
+                    stopped = _cancel_reasons.pop(job_id, None)
         except Exception as exc:  # noqa: BLE001
+            if stopped:
+                status, reason = stopped
+                LOGGER.warning("작업 %s 중단(%s): %s", job_id, status, reason)
+                job_manager.mark_stopped(job_id, status, reason)
+                raise JobStopped(status, reason) from exc
             LOGGER.exception("작업 %s 실패", job_id)
             job_manager.mark_failed(job_id, str(exc))
-            return
+            raise
+        _observe_run(module, command_list, time.monotonic() - started, bool(result.get("cache_hit")))
         job_manager.mark_success(job_id, result)
         LOGGER.info("작업 %s 완료", job_id)
+        return result
+
+    return get_scheduler().submit(job_id, module, _worker)
+
+
+def _observe_run(module: str | None, command_list: list[str], elapsed: float, cache_hit: bool) -> None:
+    """실시간 배율/캐시 적중 지표 기록 (입출력 WAV 길이 기준)."""
+    try:
+        spec = step_cache.parse_command(command_list, BASE_DIR)
+    except OSError:
+        spec = None
+    paths = [*spec.inputs, *spec.outputs] if spec is not None else []
+    metrics.observe_run(module or "unknown", paths, elapsed, cache_hit)
+
+
+def process_groups() -> dict[int, str]:
+    """지표 수집용: 실행 중인 모듈 서브프로세스/상주 워커의 프로세스 그룹 ID -> 레이블."""
+    with _process_lock:
+        groups = {
+            process.pid: _running_modules.get(job_id, "unknown")
+            for job_id, process in _processes.items()
+            if process.poll() is None
+        }
+    for module, state in model_pool.status().items():
+        if state["pid"]:
+            groups[state["pid"]] = f"resident:{module}"
+    return groups
+
+
+def _file_identity(path: Path) -> list[int]:
+    """내용을 읽지 않는 파일 식별값 (장치, inode, 크기, 수정 시각).
+
+    업로드 저장소가 같은 내용을 하드링크로 배치하므로 같은 내용의 업로드는 같은 inode를 가진다.
+    """
+    stat = path.stat()
+    return [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns]
 
-    thread = threading.Thread(target=_worker, daemon=True)
-    thread.start()
+
+def _coalesce_key(command_list: list[str], meta: dict[str, Any] | None) -> str | None:
+    """동일 요청 판별 키: 입력/설정 파일 식별값, 모듈 버전, 나머지 인자와 출력 경로.
+
+    이벤트 루프에서 호출되므로 입력 파일 내용은 해시하지 않는다(내용 해시는 워커의 단계 캐시가 계산).
+    입력 파일이 없거나 디렉터리인 명령은 합치지 않는다(None).
+    """
+    spec = step_cache.parse_command(command_list, BASE_DIR)
+    if spec is None or not spec.outputs or not spec.script.exists():
+        return None
+    if any(not path.is_file() for path in spec.inputs):
+        return None
+    payload = {
+        "script": str(spec.script),
+        "version": step_cache.module_version(spec.script),
+        "inputs": [_file_identity(path) for path in spec.inputs],
+        "config": _file_identity(spec.config) if spec.config is not None and spec.config.is_file() else None,
+        "references": [_file_identity(path) for path in step_cache.referenced_files(spec)],
+        "args": spec.args,
+        "outputs": [str(path) for path in spec.outputs],
+        "module": (meta or {}).get("module"),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _forget_flight(key: str, job_id: str) -> None:
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        if flight is not None and flight.job_id == job_id:
+            del _inflight[key]
+        _inflight_by_job.pop(job_id, None)
+
+
+def _submit_job(command_list: list[str], meta: dict[str, Any] | None) -> tuple[str, Future]:
+    """작업을 만들어 스케줄러에 제출. 같은 입력/출력의 작업이 실행 중이면 그 작업에 합류(single-flight).
+
+    새 작업을 만들어야 하는데 과부하면 admission.AdmissionRejected (실행 중인 작업 합류는 항상 허용).
+    """
+    module = (meta or {}).get("module")
+    try:
+        key = _coalesce_key(command_list, meta)
+    except OSError:
+        key = None
+    if key is None:
+        admission.check(module, command_list)
+        job_id = job_manager.create_job(meta, command=command_list)
+        return job_id, _launch_job(job_id, command_list, meta)
+
+    with _inflight_lock:
+        flight = _inflight.get(key)
+        if flight is not None and not flight.future.done():
+            flight.waiters += 1
+            LOGGER.info("동일한 요청이 실행 중이어서 작업 %s에 합류합니다.", flight.job_id)
+            return flight.job_id, flight.future
+        admission.check(module, command_list)
+        job_id = job_manager.create_job(meta, command=command_list)
+        future = _launch_job(job_id, command_list, meta)
+        _inflight[key] = _Flight(job_id, future)
+        _inflight_by_job[job_id] = key
+    future.add_done_callback(lambda _: _forget_flight(key, job_id))
+    return job_id, future
+
+
+def _release_waiter(job_id: str) -> bool:
+    """결과를 기다리던 요청 하나가 빠짐. 남은 대기자가 없으면 True (작업을 취소해도 됨)."""
+    with _inflight_lock:
+        key = _inflight_by_job.get(job_id)
+        flight = _inflight.get(key) if key is not None else None
+        if flight is None:
+            return True
+        flight.waiters -= 1
+        return flight.waiters <= 0
+
+
+def start_module_job(command: Sequence[str], meta: dict[str, Any] | None = None) -> str:
+    """비동기 작업으로 모듈 실행 (동일한 작업이 실행 중이면 그 작업 ID를 반환)."""
+
+    job_id, _ = _submit_job(list(command), meta)
     return job_id
+
+
+def cancel_job(job_id: str, reason: str, status: str = job_manager.JobStatus.CANCELLED) -> bool:
+    """작업 중단 요청.
+
+    대기 중이면 대기열에서 빼고 바로 status로 기록하며, 실행 중이면 서브프로세스(또는 상주 워커)를
+    자식 프로세스까지 종료한다. 실행 중인 작업의 상태는 슬롯 워커 스레드가 종료를 확인한 뒤 기록한다.
+    원격 워커에 넘긴 작업은 워커가 다음 하트비트에서 종료한다.
+    이 프로세스에서 대기/실행 중인 작업이 아니면 False.
+    """
+    if remote_jobs.cancel(job_id, reason, status):
+        return True
+    if get_scheduler().cancel(job_id):
+        LOGGER.warning("대기 중인 작업 %s 중단(%s): %s", job_id, status, reason)
+        job_manager.mark_stopped(job_id, status, reason)
+        return True
+
+    with _process_lock:
+        command = _running_jobs.get(job_id)
+        if command is None:
+            return False
+        _cancel_reasons.setdefault(job_id, (status, reason))
+        process = _processes.get(job_id)
+    if process is not None:
+        process_tree.kill_tree(process)
+    elif model_pool.module_for_command(command):
+        model_pool.cancel(job_id)
+    # 프로세스가 아직 시작 전이면 run_module이 시작 직후 _cancel_reasons를 보고 종료한다.
+    return True
+
+
+async def run_module_async(
+    command: Sequence[str],
+    meta: dict[str, Any] | None = None,
+    request: Request | None = None,
+) -> dict[str, str]:
+    """동기 응답용 모듈 실행.
+
+    실제 실행은 스케줄러 슬롯의 워커 스레드가 맡고 이벤트 루프는 완료만 기다리므로,
+    실행 중에도 다른 요청(/health, /jobs 폴링 등)이 처리된다.
+    클라이언트 연결이 끊기면 작업을 취소한다 (같은 작업에 합류한 다른 요청이 남아 있으면 유지).
+    기다리던 작업이 취소/시간 초과로 중단되면 JobStopped.
+    """
+    job_id, shared_future = _submit_job(list(command), meta)
+    future = asyncio.wrap_future(shared_future)
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_SEC)
+            if done:
+                break
+            if request is not None and await request.is_disconnected():
+                reason = "클라이언트 연결이 끊어져 작업을 취소했습니다."
+                if _release_waiter(job_id):
+                    cancel_job(job_id, reason)
+                raise RuntimeError(reason)
+    except asyncio.CancelledError:
+        if _release_waiter(job_id):
+            cancel_job(job_id, "요청이 취소되어 작업을 중단했습니다.")
+        raise
+    if future.cancelled():
+        # 대기 중에 취소된 작업: 스케줄러가 Future를 취소하므로 사유는 작업 레코드에서 읽는다.
+        raise _stopped_error(job_id)
+    try:
+        result = future.result()
+    except JobStopped as exc:
+        exc.job_id = job_id
+        raise
+    return {**result, "job_id": job_id}
+
+
+def _stopped_error(job_id: str) -> JobStopped:
+    try:
+        job = job_manager.get_job(job_id, include_logs=False)
+    except KeyError:
+        job = {}
+    status = job.get("status")
+    if status not in (job_manager.JobStatus.CANCELLED, job_manager.JobStatus.TIMED_OUT):
+        # 대기열에서 뺀 직후 기록 전일 수 있다.
+        status = job_manager.JobStatus.CANCELLED
+    return JobStopped(status, job.get("error") or "작업이 취소되었습니다.", job_id)
+
+
+def resume_jobs() -> list[str]:
+    """서버 재시작 전 대기/실행 중이던 작업을 다시 실행."""
+
+    resumed: list[str] = []
+    for job in job_manager.recover_jobs():
+        command = job.get("command")
+        if job.get("meta", {}).get("parent_job_id"):
+            # 파이프라인 단계는 부모 실행기가 없으므로 다시 실행하지 않는다.
+            job_manager.mark_stopped(job["job_id"], job_manager.JobStatus.CANCELLED, "서버 재시작으로 파이프라인이 중단되었습니다.")
+            continue
+        if not command:
+            job_manager.mark_failed(job["job_id"], "재시작 후 복구할 명령 정보가 없습니다.")
+            continue
+        LOGGER.info("작업 %s 재개", job["job_id"])
+        _launch_job(job["job_id"], list(command), job.get("meta"))
+        resumed.append(job["job_id"])
+    return resumed
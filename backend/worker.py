@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import subprocess
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Sequence
+
+from shared.utils import process_tree, step_cache
+
+from . import job_queue
+from .progress import LOG_TAIL_LINES
+from .scheduler import timeout_for
+
+
+LOGGER = logging.getLogger("pipeline.backend.worker")
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_LEASE_SEC = 60.0
+DEFAULT_POLL_SEC = 2.0
+
+
+@dataclass
+class _Running:
+    job: job_queue.QueuedJob
+    process: subprocess.Popen | None = None
+    logs: deque[str] = field(default_factory=lambda: deque(maxlen=LOG_TAIL_LINES))
+    # (cancelled/timed_out, 사유) 또는 리스를 잃었을 때 ("lost", "")
+    stopped: tuple[str, str] | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def stop(self, status: str, reason: str) -> None:
+        with self.lock:
+            if self.stopped is None:
+                self.stopped = (status, reason)
+            process = self.process
+        if process is not None:
+            process_tree.kill_tree(process)
+
+
+class Worker:
+    """대기열에서 작업을 가져와 이 호스트에서 모듈 서브프로세스로 실행하는 워커.
+
+    API 서버와 같은 저장소 레이아웃/데이터 폴더(공유 저장소)를 쓴다고 가정하고, 명령의 상대 경로는
+    프로젝트 루트 기준으로 실행한다. 하트비트로 리스를 연장하며, 취소 요청이 보이면 자식 프로세스까지 종료한다.
+    """
+
+    def __init__(
+        self,
+        queue: job_queue.JobQueue,
+        worker_id: str,
+        modules: set[str] | None = None,
+        lease_sec: float = DEFAULT_LEASE_SEC,
+        poll_sec: float = DEFAULT_POLL_SEC,
+    ) -> None:
+        self.queue = queue
+        self.worker_id = worker_id
+        self.modules = modules
+        self.lease_sec = lease_sec
+        self.poll_sec = poll_sec
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running: dict[str, _Running] = {}
+
+    def run_next(self) -> bool:
+        """작업 하나를 가져와 끝까지 실행. 가져갈 작업이 없으면 False."""
+        job = self.queue.claim(self.worker_id, self.modules, self.lease_sec)
+        if job is None:
+            return False
+        running = _Running(job)
+        with self._lock:
+            self._running[job.job_id] = running
+        try:
+            self._execute(running)
+        finally:
+            with self._lock:
+                self._running.pop(job.job_id, None)
+        return True
+
+    def _execute(self, running: _Running) -> None:
+        job = running.job
+        LOGGER.info("작업 %s 시작 (%s, 시도 %d): %s", job.job_id, job.module or "unknown", job.attempts, " ".join(job.command))
+        heartbeat = threading.Thread(target=self._heartbeat_loop, args=(running,), name=f"heartbeat-{job.job_id}", daemon=True)
+        heartbeat.start()
+        timeout = timeout_for(job.module, job.meta.get("batch_items"))
+        watchdog: threading.Timer | None = None
+        if timeout is not None:
+            watchdog = threading.Timer(
+                timeout,
+                running.stop,
+                args=("timed_out", f"실행 제한 시간({timeout:.0f}초)을 초과해 중단했습니다."),
+            )
+            watchdog.daemon = True
+            watchdog.start()
+        command = job_queue.local_command(job.command)
+        try:
+            try:
+                result = step_cache.run_cached(command, lambda: self._run_process(running, command), cwd=BASE_DIR)
+            finally:
+                if watchdog is not None:
+                    watchdog.cancel()
+                with running.lock:
+                    stopped = running.stopped
+                    running.stopped = running.stopped or ("done", "")
+        except Exception as exc:  # noqa: BLE001
+            if stopped is not None and stopped[0] == "lost":
+                LOGGER.warning("작업 %s: 리스를 잃어 결과를 기록하지 않습니다.", job.job_id)
+                return
+            if stopped is not None:
+                LOGGER.warning("작업 %s 중단(%s): %s", job.job_id, *stopped)
+                self.queue.complete(job.job_id, self.worker_id, stopped[0], error=stopped[1])
+                return
+            LOGGER.exception("작업 %s 실패", job.job_id)
+            self.queue.heartbeat(job.job_id, self.worker_id, self.lease_sec, logs=list(running.logs))
+            self.queue.complete(job.job_id, self.worker_id, "failed", error=str(exc))
+            return
+        self.queue.heartbeat(job.job_id, self.worker_id, self.lease_sec, logs=list(running.logs))
+        if not self.queue.complete(job.job_id, self.worker_id, "success", result={**result, "worker_id": self.worker_id}):
+            LOGGER.warning("작업 %s: 리스를 잃어 결과를 기록하지 못했습니다.", job.job_id)
+            return
+        LOGGER.info("작업 %s 완료", job.job_id)
+
+    def _run_process(self, running: _Running, command: list[str]) -> dict[str, Any]:
+        try:
+            process = subprocess.Popen(
+                command,
+                cwd=BASE_DIR,
+                env={**os.environ, "PYTHONUNBUFFERED": "1"},
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                **process_tree.new_group_kwargs(),
+            )
+        except FileNotFoundError as exc:
+            raise RuntimeError("명령 실행 파일을 찾을 수 없습니다.") from exc
+        with running.lock:
+            running.process = process
+            stop_requested = running.stopped is not None
+        if stop_requested:
+            process_tree.kill_tree(process)
+        reader = threading.Thread(target=_collect_output, args=(process.stdout, running.logs), daemon=True)
+        reader.start()
+        returncode = process.wait()
+        reader.join(5)
+        if returncode != 0:
+            raise RuntimeError(f"모듈 실행 중 오류 발생 (Exit code: {returncode})")
+        return {"stdout": "(워커 로그 참조)", "stderr": ""}
+
+    def _heartbeat_loop(self, running: _Running) -> None:
+        job_id = running.job.job_id
+        interval = max(0.05, self.lease_sec / 3)
+        while True:
+            with running.lock:
+                if running.stopped is not None:
+                    return
+            try:
+                alive = self.queue.heartbeat(job_id, self.worker_id, self.lease_sec, logs=list(running.logs))
+            except Exception:  # noqa: BLE001 - 공유 저장소 일시 오류는 다음 주기에 다시 시도
+                LOGGER.warning("작업 %s 하트비트 실패", job_id, exc_info=True)
+                alive = True
+            if not alive:
+                cancelled = self.queue.cancel_reason(job_id)
+                if cancelled is not None:
+                    LOGGER.warning("작업 %s 취소 요청을 받아 중단합니다: %s", job_id, cancelled[1])
+                    running.stop(*cancelled)
+                else:
+                    LOGGER.warning("작업 %s의 리스를 잃어 실행을 중단합니다.", job_id)
+                    running.stop("lost", "")
+                return
+            if self._stop.wait(interval):
+                return
+
+    def serve(self, concurrency: int = 1) -> None:
+        """stop()이 호출될 때까지 concurrency개의 작업을 동시에 가져와 실행."""
+        LOGGER.info(
+            "워커 %s 시작 (모듈: %s, 동시 실행 %d)",
+            self.worker_id,
+            ", ".join(sorted(self.modules)) if self.modules else "전체",
+            concurrency,
+        )
+        threads = [
+            threading.Thread(target=self._claim_loop, name=f"worker-{index}", daemon=True)
+            for index in range(max(1, concurrency))
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            for thread in threads:
+                thread.join(process_tree.DEFAULT_GRACE_SEC + 5)
+
+    def _claim_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_next()
+            except Exception:  # noqa: BLE001 - 대기열 오류로 워커가 죽지 않도록
+                LOGGER.exception("대기열에서 작업을 가져오지 못했습니다.")
+                claimed = False
+            if not claimed:
+                self._stop.wait(self.poll_sec)
+
+    def stop(self) -> None:
+        """새 작업을 가져오지 않고, 실행 중인 작업은 종료한 뒤 다른 워커가 가져가도록 대기열로 돌려보낸다."""
+        self._stop.set()
+        with self._lock:
+            running = list(self._running.values())
+        for entry in running:
+            entry.stop("lost", "")
+            if self.queue.release(entry.job.job_id, self.worker_id):
+                LOGGER.info("작업 %s를 대기열로 돌려보냈습니다.", entry.job.job_id)
+
+
+def _collect_output(stream: IO[bytes], logs: deque[str]) -> None:
+    """자식 프로세스 출력을 워커 터미널로 흘리면서 최근 로그 줄을 모은다 (하트비트로 API 서버에 전달)."""
+    pending = b""
+    while True:
+        chunk = stream.read1(8192) if hasattr(stream, "read1") else stream.read(8192)
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).replace(b"\r", b"\n").split(b"\n")
+        for line in lines:
+            if line.strip():
+                text = line.decode("utf-8", errors="replace")
+                print(text, flush=True)
+                logs.append(text[:2000])
+    if pending.strip():
+        logs.append(pending.decode("utf-8", errors="replace")[:2000])
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="작업 대기열에서 모듈 작업을 가져와 이 호스트에서 실행하는 워커")
+    parser.add_argument("--modules", help="처리할 모듈 (쉼표 구분, 기본: 전체). 예: tts_backup,lipsync")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}", help="대기열에 기록할 워커 이름")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시에 실행할 작업 수")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_SEC, help="리스 시간(초). 하트비트는 1/3 주기")
+    parser.add_argument("--poll", type=float, default=DEFAULT_POLL_SEC, help="작업이 없을 때 다시 확인하는 주기(초)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    modules = {name.strip() for name in args.modules.split(",") if name.strip()} if args.modules else None
+    worker = Worker(job_queue.get_queue(), args.worker_id, modules, args.lease, args.poll)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    worker.serve(args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import argparse
 import csv
+import json
 import sys
 import time
 from pathlib import Path
@@ -184,6 +185,29 @@ def run_pipeline_and_measure(
     }
 
 
+def read_trace_timings(trace_path: Path) -> dict[str, Any]:
+    """pipeline_runner가 남긴 trace.json에서 단계별 소요 시간(초)과 가장 오래 걸린 세부 구간을 읽는다."""
+    try:
+        events = json.loads(trace_path.read_text(encoding="utf-8")).get("traceEvents", [])
+    except (OSError, ValueError):
+        return {}
+
+    timings: dict[str, Any] = {}
+    hot_name, hot_sec = "", 0.0
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        sec = event.get("dur", 0) / 1_000_000
+        if event.get("cat") == "step":
+            timings[f"step_{event['name']}_sec"] = round(sec, 3)
+        elif event.get("cat") == "phase" and sec > hot_sec:
+            hot_name, hot_sec = event["name"], sec
+    if hot_name:
+        timings["hot_phase"] = hot_name
+        timings["hot_phase_sec"] = round(hot_sec, 3)
+    return timings
+
+
 def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -195,9 +219,12 @@ def write_rows(output_csv: Path, rows: list[dict[str, Any]]) -> None:
         output_csv.write_text("", encoding="utf-8")
         return
 
-    fieldnames = list(rows[0].keys())
+    # 파이프라인 종류/실패 여부에 따라 단계 열이 달라질 수 있으므로 모든 행의 열을 합친다.
+    fieldnames: list[str] = []
+    for r in rows:
+        fieldnames.extend(k for k in r if k not in fieldnames)
     with output_csv.open("w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer = csv.DictWriter(f, fieldnames=fieldnames, restval="")
         writer.writeheader()
         for r in rows:
             writer.writerow(r)
@@ -210,13 +237,14 @@ def main() -> None:
     finalv2_root = script_path.parents[1]
     repo_root = script_path.parents[2]
 
-    input_dir = Path(args.input_dir)
+    # pipeline_runner는 저장소 루트를 작업 폴더로 실행되므로 상대 경로는 여기서 절대 경로로 바꿔 넘긴다.
+    input_dir = Path(args.input_dir).resolve()
     output_csv = Path(args.output_csv)
 
     pipeline_runner = find_pipeline_runner(repo_root=repo_root, finalv2_root=finalv2_root)
 
     if args.run_root:
-        run_root = Path(args.run_root)
+        run_root = Path(args.run_root).resolve()
     else:
         run_root = finalv2_root / "data" / "runs" / "benchmarks"
 
@@ -237,6 +265,8 @@ def main() -> None:
             "duration_sec": round(duration_sec, 3) if duration_sec is not None else "",
             "pipeline_type": args.pipeline_type,
         }
+        # 하위 폴더의 같은 파일명이 같은 실행 폴더를 쓰지 않도록 실행 이름을 순번으로 직접 지정한다.
+        run_name = f"bench_{idx:04d}"
 
         if args.dry_run:
             row.update(
@@ -262,6 +292,8 @@ def main() -> None:
             str(wav_path),
             "--run-root",
             str(run_root),
+            "--run-name",
+            run_name,
         ]
 
         stats = run_pipeline_and_measure(command=command, cwd=repo_root, poll_interval=args.poll_interval)
@@ -279,8 +311,10 @@ def main() -> None:
                 "gpu_mem_peak_mb": stats.get("gpu_mem_peak_mb", ""),
                 "gpu_mem_end_mb": stats.get("gpu_mem_end_mb", ""),
                 "return_code": stats.get("return_code", ""),
+                "run_dir": str(run_root / run_name),
             }
         )
+        row.update(read_trace_timings(run_root / run_name / "trace.json"))
 
         rows.append(row)
 
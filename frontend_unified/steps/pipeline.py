@@ -4,7 +4,7 @@ from pathlib import Path
 import tempfile
 import json
 from frontend_unified.utils.ui_utils import text_input_with_state
-from frontend_unified.utils.api_utils import execute_step
+from frontend_unified.utils.api_utils import execute_step, run_pipeline_job
 from frontend_unified.utils.config_utils import update_run_defaults
 from frontend_unified.constants import (
     DEFAULT_STT_CONFIG_PATH,
@@ -100,9 +100,54 @@ def render():
         with col_steps[4]:
             run_lipsync = st.checkbox(get_text("step_lipsync"), value=lipsync_value, disabled=disable_lipsync)
 
+        server_side = st.checkbox(
+            "서버에서 한 번에 실행 (Run on server)",
+            value=False,
+            help="백엔드가 단계 DAG를 구성해 하나의 작업으로 실행합니다. 독립 단계는 동시에 실행되고 결과는 data/runs/<입력 파일명>에 저장됩니다.",
+        )
+
         if st.button(get_text("run_selected_steps")):
             if not pipeline_input:
                 st.error("입력 파일을 선택해주세요.")
+            elif server_side:
+                stages = []
+                if run_stt:
+                    stages += ["audio_extract", "stt"]
+                if run_text:
+                    stages.append("text_process")
+                if run_tts:
+                    stages.append("tts")
+                if run_rvc:
+                    stages.append("rvc")
+                if run_lipsync:
+                    stages.append("lipsync")
+                if "Gemini" in tts_method:
+                    tts_model = "gemini"
+                elif "XTTS" in tts_method:
+                    tts_model = "xtts"
+                else:
+                    tts_model = "vallex"
+                result = run_pipeline_job({
+                    "input_media": pipeline_input,
+                    "stt_model": "gemini" if "Gemini" in stt_method else "whisper",
+                    "tts_models": [tts_model],
+                    "lipsync_model": "musetalk" if "MuseTalk" in lipsync_method else "wav2lip",
+                    "stages": stages,
+                    "target_language": target_lang,
+                })
+                if result is None:
+                    st.error("서버 파이프라인 실행 중 오류가 발생했습니다. 작업 로그를 확인해 주세요.")
+                else:
+                    outputs = result.get("outputs", {})
+                    final_video = outputs.get("lipsync")
+                    final_audio = outputs.get("rvc") or outputs.get(f"tts_{tts_model}")
+                    if final_video and os.path.exists(final_video):
+                        st.video(final_video)
+                    elif final_audio and os.path.exists(final_audio):
+                        st.audio(final_audio)
+                    with st.expander("단계별 출력 경로"):
+                        st.json(outputs)
+                    st.success("선택한 파이프라인 단계 실행이 완료되었습니다.")
             else:
                 # 실행 전에 입력 파일 기준으로 기본 경로들을 갱신
                 update_run_defaults(pipeline_input)
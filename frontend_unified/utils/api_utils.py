@@ -31,10 +31,149 @@ def get_job_status(job_id):
     """비동기 작업 상태를 조회합니다."""
     return call_api(f"jobs/{job_id}", method="GET")
 
+# SSE 연결 읽기 타임아웃(초) - 서버 keepalive(15초)보다 길게 둔다.
+EVENT_STREAM_READ_TIMEOUT = 60
+POLL_INTERVAL_SEC = 2
+
+
+def iter_job_events(job_id):
+    """GET /jobs/{job_id}/events SSE 스트림을 읽어 이벤트(dict)를 순서대로 반환합니다."""
+    url = f"{API_BASE_URL}/jobs/{job_id}/events"
+    with requests.get(
+        url,
+        stream=True,
+        headers={"Accept": "text/event-stream"},
+        timeout=(5, EVENT_STREAM_READ_TIMEOUT),
+    ) as response:
+        response.raise_for_status()
+        data_lines = []
+        for line in response.iter_lines(decode_unicode=True):
+            if line is None:
+                continue
+            if line == "":
+                if data_lines:
+                    yield json.loads("\n".join(data_lines))
+                    data_lines = []
+                continue
+            if line.startswith(":"):
+                continue  # keepalive 주석
+            if line.startswith("data:"):
+                data_lines.append(line[5:].lstrip())
+
+
+def _render_progress(event, status_placeholder, progress_bar):
+    fraction = event.get("fraction")
+    if fraction is not None:
+        progress_bar.progress(int(max(0.0, min(float(fraction), 1.0)) * 100))
+    stage = event.get("stage") or event.get("message") or "실행 중"
+    status_placeholder.info(f"{stage}...")
+
+
+def _render_status(job, status_placeholder, progress_bar):
+    """작업 상태를 화면에 반영하고, 종료 상태면 (True, 반환값)을 돌려줍니다."""
+    state = job.get("status")  # pending, running, success, failed, cancelled, timed_out
+    if state == "success":
+        progress_bar.progress(100)
+        status_placeholder.success("완료되었습니다.")
+        return True, job.get("result", True)
+    if state == "failed":
+        status_placeholder.error(f"실패: {job.get('error') or '알 수 없는 오류'}")
+        return True, None
+    if state in ("cancelled", "timed_out"):
+        label = "취소됨" if state == "cancelled" else "시간 초과"
+        status_placeholder.warning(f"{label}: {job.get('error') or ''}")
+        return True, None
+    if state == "pending":
+        position = job.get("queue_position")
+        label = f"대기 중... (대기 순번: {position})" if position else "대기 중..."
+    else:
+        label = "실행 중..."
+    status_placeholder.info(f"{label} (상태: {state})")
+    return False, None
+
+
+def _wait_with_events(job_id, status_placeholder, progress_bar):
+    for event in iter_job_events(job_id):
+        if event.get("type") == "progress":
+            _render_progress(event, status_placeholder, progress_bar)
+        elif event.get("type") == "status":
+            done, result = _render_status(event.get("job", event), status_placeholder, progress_bar)
+            if done:
+                return True, result
+    return False, None
+
+
+def _wait_with_polling(job_id, status_placeholder, progress_bar):
+    while True:
+        status = get_job_status(job_id)
+        if not status:
+            return None
+        done, result = _render_status(status, status_placeholder, progress_bar)
+        if done:
+            return result
+        time.sleep(POLL_INTERVAL_SEC)
+
+
+STEP_STATUS_LABELS = {
+    "waiting": "⏸ 대기",
+    "pending": "⏳ 대기열",
+    "running": "▶ 실행 중",
+    "success": "✅ 완료",
+    "failed": "❌ 실패",
+    "cancelled": "⛔ 취소",
+    "timed_out": "⏱ 시간 초과",
+    "skipped": "↷ 건너뜀",
+}
+
+
+def _render_steps(steps, steps_placeholder):
+    lines = [
+        f"- **{name}** ({info.get('module')}): {STEP_STATUS_LABELS.get(info.get('status'), info.get('status'))}"
+        for name, info in steps.items()
+    ]
+    steps_placeholder.markdown("\n".join(lines))
+
+
+def run_pipeline_job(payload):
+    """
+    POST /pipeline/ 으로 전체 파이프라인을 서버에서 실행하고, 단계별 상태를 이벤트 스트림으로 표시합니다.
+    성공하면 작업 결과(단계별 출력 경로 outputs 포함)를, 실패하면 None을 반환합니다.
+    """
+    response = call_api("pipeline/", data=payload)
+    if not response or "job_id" not in response:
+        return None
+    job_id = response["job_id"]
+    st.info(f"서버에서 파이프라인을 시작했습니다. (Job ID: {job_id})")
+
+    status_placeholder = st.empty()
+    progress_bar = st.progress(0)
+    steps_placeholder = st.empty()
+    try:
+        for event in iter_job_events(job_id):
+            job = event.get("job", event)
+            steps = event.get("steps") or (job.get("progress") or {}).get("steps")
+            if steps:
+                _render_steps(steps, steps_placeholder)
+            if event.get("type") == "progress":
+                _render_progress(event, status_placeholder, progress_bar)
+            elif event.get("type") == "status":
+                done, result = _render_status(job, status_placeholder, progress_bar)
+                if done:
+                    return result
+    except (requests.exceptions.RequestException, ValueError):
+        pass
+    result = _wait_with_polling(job_id, status_placeholder, progress_bar)
+    job = get_job_status(job_id) or {}
+    if (job.get("progress") or {}).get("steps"):
+        _render_steps(job["progress"]["steps"], steps_placeholder)
+    return result
+
+
 def execute_step(endpoint, payload, async_mode=False):
     """
     각 단계의 실행을 담당하는 공통 함수.
     동기/비동기 모드를 지원하며, 상태 표시 및 에러 처리를 수행합니다.
+    비동기 모드는 작업 이벤트 스트림(SSE)으로 상태/진행률을 받고, 스트림을 쓸 수 없으면 폴링합니다.
     """
     if async_mode:
         # 비동기 실행 요청 (backend의 async_run 플래그 사용)
@@ -46,33 +185,16 @@ def execute_step(endpoint, payload, async_mode=False):
             job_id = response["job_id"]
             st.info(f"작업이 백그라운드에서 시작되었습니다. (Job ID: {job_id})")
             
-            # 상태 폴링 UI
             status_placeholder = st.empty()
             progress_bar = st.progress(0)
-            progress = 0
-            
-            while True:
-                status = get_job_status(job_id)
-                if not status:
-                    break
-                
-                state = status.get("status")  # pending, running, success, failed
-                error = status.get("error")
-                
-                if state == "success":
-                    progress_bar.progress(100)
-                    status_placeholder.success("완료되었습니다.")
-                    return status.get("result", True)
-                elif state == "failed":
-                    status_placeholder.error(f"실패: {error or '알 수 없는 오류'}")
-                    return None
-                else:
-                    # pending / running 상태에서는 점진적으로 진행률만 올려주고 상태 텍스트를 갱신
-                    label = "대기 중..." if state == "pending" else "실행 중..."
-                    progress = min(progress + 5, 95)
-                    progress_bar.progress(progress)
-                    status_placeholder.info(f"{label} (상태: {state})")
-                    time.sleep(2)  # 2초 간격 폴링
+            try:
+                done, result = _wait_with_events(job_id, status_placeholder, progress_bar)
+                if done:
+                    return result
+            except (requests.exceptions.RequestException, ValueError):
+                # 구버전 백엔드/프록시 등으로 스트림을 쓸 수 없으면 폴링으로 전환
+                pass
+            return _wait_with_polling(job_id, status_placeholder, progress_bar)
         return None
     else:
         # 동기 실행
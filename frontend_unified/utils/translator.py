@@ -1,7 +1,11 @@
 import os
-import google.generativeai as genai
 import streamlit as st
 
+from shared.utils.gemini_client import get_client
+
+# 실시간 통역용 텍스트 모델
+TRANSLATION_MODEL = "gemini-pro"
+
 def get_api_key():
     """Retrieves Gemini API Key from environment or session state."""
     return os.getenv("GEMINI_API_KEY") or st.session_state.get("gemini_api_key")
@@ -24,9 +28,6 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         return f"[Error: Missing API Key] {text}"
         
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
         prompt = f"""
         You are a professional interpreter. Translate the following text from {source_lang} to {target_lang}.
         Output ONLY the translated text, without any explanations or quotes.
@@ -34,7 +35,8 @@ def translate_text(text: str, source_lang: str, target_lang: str) -> str:
         Text: {text}
         """
         
-        response = model.generate_content(prompt)
+        # 공용 클라이언트: 세션 간 속도 제한 공유, 일시적 오류 재시도, 느린 응답은 헤지
+        response = get_client(api_key).generate(TRANSLATION_MODEL, prompt)
         return response.text.strip()
         
     except Exception as e:
@@ -51,9 +53,6 @@ def translate_text_stream(text: str, source_lang: str, target_lang: str):
         return
 
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-pro')
-        
         prompt = f"""
         You are a professional interpreter. Translate the following text from {source_lang} to {target_lang}.
         Output ONLY the translated text, without any explanations or quotes.
@@ -61,10 +60,8 @@ def translate_text_stream(text: str, source_lang: str, target_lang: str):
         Text: {text}
         """
         
-        response = model.generate_content(prompt, stream=True)
-        for chunk in response:
-            if chunk.text:
-                yield chunk.text
+        for chunk in get_client(api_key).stream(TRANSLATION_MODEL, prompt):
+            yield chunk
                 
     except Exception as e:
         yield f"[Translation Error] {str(e)}"
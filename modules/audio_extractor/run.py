@@ -5,13 +5,16 @@ import logging
 import subprocess
 import sys
 from pathlib import Path
+from typing import Sequence
 
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import progress
 from shared.utils.io_helpers import configure_logging, ensure_parent, read_yaml
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.audio_extractor")
@@ -54,12 +57,13 @@ def extract_audio(input_media: Path, output_audio: Path, config: dict) -> None:
     LOGGER.info("FFmpeg 오디오 추출 실행: %s", " ".join(command))
 
     try:
-        result = subprocess.run(
-            command,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        with progress.stage("extract"):
+            result = subprocess.run(
+                command,
+                check=True,
+                capture_output=True,
+                text=True,
+            )
         if result.stdout:
             LOGGER.debug("ffmpeg stdout: %s", result.stdout)
         if result.stderr:
@@ -74,12 +78,12 @@ def extract_audio(input_media: Path, output_audio: Path, config: dict) -> None:
     LOGGER.info("오디오 추출 완료: %s", output_audio)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--config")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -90,4 +94,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
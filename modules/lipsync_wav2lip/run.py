@@ -6,13 +6,16 @@ import os
 import subprocess
 import sys
 from pathlib import Path
+from typing import Sequence
 
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import progress
 from shared.utils.io_helpers import configure_logging, ensure_parent, read_yaml
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.lipsync")
@@ -202,11 +205,13 @@ def apply_lipsync(input_video: Path, input_audio: Path, output_video: Path, conf
 
     # inference.py 내부의 ffmpeg 호출은 경로 인용 문제로 실패할 수 있으므로,
     # 여기서 먼저 안전하게 WAV로 변환한 뒤 해당 경로를 넘긴다.
-    audio_for_inference = _prepare_audio_for_inference(input_audio)
+    with progress.stage("prepare_audio"):
+        audio_for_inference = _prepare_audio_for_inference(input_audio)
 
     # 설정에 max_duration_sec가 지정된 경우, 앞부분 N초만 사용하는 트림 버전을 생성한다.
     max_duration = float(config.get("max_duration_sec", 0) or 0)
-    video_for_inference, audio_for_inference = _trim_media(input_video, audio_for_inference, max_duration)
+    with progress.stage("trim"):
+        video_for_inference, audio_for_inference = _trim_media(input_video, audio_for_inference, max_duration)
 
     ensure_parent(output_video)
     command, env = _build_command(config, video_for_inference, audio_for_inference, output_video)
@@ -214,7 +219,8 @@ def apply_lipsync(input_video: Path, input_audio: Path, output_video: Path, conf
     LOGGER.info("Wav2Lip 실행: %s", " ".join(command))
 
     try:
-        subprocess.run(command, check=True, env=env)
+        with progress.stage("inference"):
+            subprocess.run(command, check=True, env=env)
     except subprocess.CalledProcessError as exc:
         LOGGER.error("Wav2Lip 실행 실패: %s", exc)
         raise RuntimeError("Wav2Lip 실행 중 오류가 발생했습니다.") from exc
@@ -225,13 +231,13 @@ def apply_lipsync(input_video: Path, input_audio: Path, output_video: Path, conf
     LOGGER.info("립싱크 합성 완료: %s", output_video)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--video", required=True)
     parser.add_argument("--audio", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--config")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -242,4 +248,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
@@ -4,9 +4,13 @@ import os
 import sys
 from pathlib import Path
 
-import google.generativeai as genai
 from dotenv import load_dotenv
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from shared.utils.gemini_client import get_client
 
 # Load environment variables
 load_dotenv()
@@ -35,7 +39,7 @@ def process_audio(input_path: str, output_path: str, config_path: str | None = N
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables.")
 
-    genai.configure(api_key=api_key)
+    client = get_client(api_key)
 
     # Check for transcribe_only flag
     transcribe_only = False
@@ -101,14 +105,15 @@ def process_audio(input_path: str, output_path: str, config_path: str | None = N
         ]
         """
 
-    model = genai.GenerativeModel("gemini-2.5-flash")
-
     print("Generating content...")
-    response = model.generate_content(
+    # 오디오 전체를 올리는 큰 요청이라 헤지(중복 전송)는 하지 않고, 429/5xx만 재시도한다.
+    response = client.generate(
+        "gemini-2.5-flash",
         [prompt, audio_part],
         generation_config={
             "response_mime_type": "application/json",
         },
+        hedge=False,
     )
 
     print("Processing response...")
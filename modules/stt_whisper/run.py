@@ -3,9 +3,10 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 
 import torch
 import whisper
@@ -15,11 +16,16 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import batch, progress
 from shared.utils.io_helpers import configure_logging, ensure_parent, read_yaml, write_json
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.stt")
 
+# 상주 워커/인프로세스 실행 시 같은 설정의 모델을 재사용하기 위한 캐시
+_MODEL_CACHE: dict[tuple[str, str, str | None], whisper.Whisper] = {}
+
 
 def load_config(config_path: Path) -> dict:
     if not config_path.exists():
@@ -35,9 +41,16 @@ def _load_whisper_model(config: dict) -> whisper.Whisper:
     LOGGER.info(f"DEBUG: use_gpu={use_gpu}, cuda_available={cuda_available}")
     device = "cuda" if use_gpu and cuda_available else "cpu"
 
+    download_root = str(Path(model_dir)) if model_dir else None
+    cache_key = (model_name, device, download_root)
+    if cache_key in _MODEL_CACHE:
+        LOGGER.info("캐시된 Whisper 모델 재사용: name=%s, device=%s", model_name, device)
+        return _MODEL_CACHE[cache_key]
+
     LOGGER.info("Whisper 모델 로드: name=%s, device=%s", model_name, device)
-    download_root = Path(model_dir) if model_dir else None
-    return whisper.load_model(model_name, device=device, download_root=str(download_root) if download_root else None)
+    model = whisper.load_model(model_name, device=device, download_root=download_root)
+    _MODEL_CACHE[cache_key] = model
+    return model
 
 
 def _build_transcribe_options(config: dict) -> dict[str, Any]:
@@ -79,13 +92,29 @@ def run_stt(input_audio: Path, output_json: Path, config: dict) -> None:
     if not input_audio.exists():
         raise FileNotFoundError(f"입력 오디오를 찾을 수 없습니다: {input_audio}")
 
-    model = _load_whisper_model(config)
+    with progress.stage("load_model"):
+        model = _load_whisper_model(config)
     transcribe_options = _build_transcribe_options(config)
 
+    # 디코딩(ffmpeg)과 추론 시간을 나눠 보기 위해 오디오를 먼저 읽어 배열로 넘긴다.
+    with progress.stage("decode"):
+        audio = whisper.load_audio(str(input_audio))
+    audio_duration = len(audio) / whisper.audio.SAMPLE_RATE
+
     LOGGER.info("Whisper 전사를 시작합니다: %s", input_audio)
-    result = model.transcribe(str(input_audio), **transcribe_options)
+    started = time.perf_counter()
+    with progress.stage("transcribe"):
+        result = model.transcribe(audio, **transcribe_options)
+    elapsed = time.perf_counter() - started
 
     segments = _format_segments(result.get("segments", []))
+    progress.report(
+        stage="transcribe",
+        fraction=1.0,
+        segments_done=len(segments),
+        audio_sec=round(audio_duration, 3),
+        rtf=round(elapsed / audio_duration, 3) if audio_duration else None,
+    )
     transcript = {
         "id": input_audio.stem,
         "created_at": datetime.utcnow().isoformat() + "Z",
@@ -102,24 +131,27 @@ def run_stt(input_audio: Path, output_json: Path, config: dict) -> None:
         },
     }
 
-    ensure_parent(output_json)
-    write_json(output_json, transcript)
+    with progress.stage("write"):
+        ensure_parent(output_json)
+        write_json(output_json, transcript)
     LOGGER.info("STT 결과를 저장했습니다: %s", output_json)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True)
-    parser.add_argument("--output", required=True)
+    parser.add_argument("--input")
+    parser.add_argument("--output")
     parser.add_argument("--config", default="config/settings.yaml")
-    args = parser.parse_args()
+    batch.add_arguments(parser)
+    args = parser.parse_args(argv)
+    batch.validate_arguments(parser, args)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
 
     config = load_config(Path(args.config))
-    run_stt(Path(args.input), Path(args.output), config)
+    batch.run_from_args(args, run_stt, config)
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
@@ -5,18 +5,18 @@ import re
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Sequence
 import json
 
 import unicodedata
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import batch, progress
+from shared.utils.gemini_client import BLOCK_NONE_SAFETY, GeminiClient, get_client
 from shared.utils.io_helpers import (
     configure_logging,
     ensure_parent,
@@ -24,6 +24,7 @@ from shared.utils.io_helpers import (
     read_yaml,
     write_json,
 )
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.text_processor")
@@ -180,7 +181,8 @@ def _filter_hallucinations(segments: list[dict]) -> list[dict]:
 
 
 def _batch_translate_segments(
-    model: genai.GenerativeModel,
+    client: GeminiClient,
+    model_name: str,
     segments: list[dict],
     source_language: str,
     target_language: str,
@@ -235,15 +237,8 @@ Return ONLY JSON with this structure:
 Do not add any commentary, explanations, or extra fields.
 """
 
-    response = model.generate_content(
-        prompt,
-        safety_settings={
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        },
-    )
+    # 공용 클라이언트가 속도 제한과 일시적 오류(429/5xx) 재시도를 맡는다.
+    response = client.generate(model_name, prompt, safety_settings=BLOCK_NONE_SAFETY)
 
     translations: dict[int, str] = {}
     try:
@@ -323,7 +318,6 @@ def process_text(input_json: Path, output_json: Path, config: dict) -> None:
             source_language = detected_source_lang
 
     # Gemini 번역기 초기화
-    gemini_model = None
     translations: dict[int, str] = {}
     api_key = config.get("gemini_api_key") or os.getenv("GEMINI_API_KEY")
 
@@ -337,20 +331,21 @@ def process_text(input_json: Path, output_json: Path, config: dict) -> None:
     if source_language != target_language and not has_inline_translated:
         if api_key:
             try:
-                genai.configure(api_key=api_key)
+                client = get_client(api_key)
                 model_name = config.get("gemini_model_name", "gemini-2.5-flash-lite")
-                gemini_model = genai.GenerativeModel(model_name)
                 LOGGER.info("Gemini 모델 초기화: %s (%s -> %s)", model_name, source_language, target_language)
 
                 # 세그먼트별 개별 호출 대신 배치 번역 한 번 수행
                 try:
-                    translations = _batch_translate_segments(
-                        gemini_model,
-                        segments,
-                        source_language,
-                        target_language,
-                        syllable_tolerance,
-                    )
+                    with progress.stage("translate", segments=len(segments)):
+                        translations = _batch_translate_segments(
+                            client,
+                            model_name,
+                            segments,
+                            source_language,
+                            target_language,
+                            syllable_tolerance,
+                        )
                     LOGGER.info("배치 번역 완료: %d개 세그먼트", len(translations))
                 except Exception as exc:
                     LOGGER.warning("배치 번역 실패, 원문 텍스트로 진행합니다: %s", exc)
@@ -442,18 +437,20 @@ def process_text(input_json: Path, output_json: Path, config: dict) -> None:
     LOGGER.info("텍스트 처리 완료: %s", output_json)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True)
-    parser.add_argument("--output", required=True)
+    parser.add_argument("--input")
+    parser.add_argument("--output")
     parser.add_argument("--config")
     parser.add_argument("--source-language")
     parser.add_argument("--target-language")
     parser.add_argument("--gemini-api-key")
     parser.add_argument("--syllable-tolerance", type=float)
     parser.add_argument("--enforce-timing", type=str)  # "true"/"false"로 받음
+    batch.add_arguments(parser)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    batch.validate_arguments(parser, args)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -472,8 +469,8 @@ def main() -> None:
     if args.enforce_timing is not None:
         config["enforce_timing"] = args.enforce_timing.lower() == "true"
 
-    process_text(Path(args.input), Path(args.output), config)
+    batch.run_from_args(args, process_text, config)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    run_entrypoint(main)
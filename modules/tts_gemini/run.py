@@ -5,10 +5,15 @@ import sys
 from pathlib import Path
 import base64
 import struct
-import google.generativeai as genai
 
 from dotenv import load_dotenv
 
+ROOT_DIR = Path(__file__).resolve().parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from shared.utils.gemini_client import get_client
+
 # Load environment variables
 load_dotenv()
 
@@ -63,7 +68,7 @@ def synthesize_speech(input_path: str, output_path: str, config_path: str = None
     if not api_key:
         raise ValueError("GEMINI_API_KEY not found in environment variables.")
 
-    genai.configure(api_key=api_key)
+    client = get_client(api_key)
 
     # Load input JSON
     if not os.path.exists(input_path):
@@ -103,13 +108,12 @@ def synthesize_speech(input_path: str, output_path: str, config_path: str = None
     print(f"Synthesizing text: {full_text[:50]}...")
     print(f"Using voice: {voice_name}")
 
-    # google-generativeai SDK를 사용하여 Gemini TTS 호출
+    # 공용 Gemini 클라이언트로 TTS 호출 (속도 제한/재시도 포함)
     # Model name confirmed to work for TTS
     model_name = "gemini-2.5-flash-preview-tts" 
-    model = genai.GenerativeModel(model_name)
 
     try:
-        # Dictionary-based configuration (verified working with google-generativeai >= 0.8.5)
+        # Dictionary-based configuration (REST generationConfig 형식 그대로 전달)
         generation_config = {
             "response_modalities": ["AUDIO"],
             "speech_config": {
@@ -121,23 +125,11 @@ def synthesize_speech(input_path: str, output_path: str, config_path: str = None
             }
         }
 
-        # `contents` 에는 합성할 텍스트만 전달합니다.
-        response = model.generate_content(
-            contents=full_text,
-            generation_config=generation_config
-        )
-
-        # Check for audio data in response parts (standard for gemini-2.5-flash-preview-tts)
-        pcm_bytes = None
-        if hasattr(response, 'parts'):
-            for part in response.parts:
-                if part.inline_data:
-                    pcm_bytes = part.inline_data.data
-                    break
-        
-        # Fallback check for response.audio (older SDK behavior)
-        if not pcm_bytes and hasattr(response, 'audio') and response.audio:
-             pcm_bytes = response.audio.data
+        # `contents` 에는 합성할 텍스트만 전달합니다. 합성은 비용이 커서 헤지하지 않는다.
+        response = client.generate(model_name, full_text, generation_config=generation_config, hedge=False)
+
+        # 응답 파트 중 inlineData에 PCM 오디오가 들어 있다 (gemini-2.5-flash-preview-tts)
+        pcm_bytes = response.inline_data()
 
         if not pcm_bytes:
             print("No audio data returned from Gemini.")
@@ -145,9 +137,6 @@ def synthesize_speech(input_path: str, output_path: str, config_path: str = None
             # print(response)
             sys.exit(1)
 
-        # SDK는 response.audio.data 필드에 PCM 바이너리를 직접 반환합니다.
-        # pcm_bytes is already retrieved above
-
         # PCM 데이터를 WAV 컨테이너로 감쌉니다.
         wav_bytes = _pcm_to_wav(pcm_bytes, sample_rate=24000)
 
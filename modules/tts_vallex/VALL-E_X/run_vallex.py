@@ -7,6 +7,7 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import Sequence
 
 import soundfile as sf
 import torch
@@ -17,6 +18,15 @@ current_dir = Path(__file__).resolve().parent
 os.chdir(current_dir)
 if str(current_dir) not in sys.path:
     sys.path.insert(0, str(current_dir))
+ROOT_DIR = current_dir.parents[2]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from shared.utils import progress
+from shared.utils.resident_worker import run_entrypoint
+
+# 상주 워커 모드에서 동일 체크포인트의 모델을 다시 로드하지 않도록 기록
+_loaded_checkpoint_dir: Path | None = None
 
 
 def _import_vallex():
@@ -35,7 +45,9 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(mess
 LOGGER = logging.getLogger("run_vallex")
 
 
-def main():
+def main(argv: Sequence[str] | None = None):
+    global _loaded_checkpoint_dir
+
     parser = argparse.ArgumentParser(description="VALL-E X TTS CLI")
     parser.add_argument("--input-text", required=True, help="Path to text file containing input text")
     parser.add_argument("--output-path", required=True, help="Path to save output WAV file")
@@ -43,7 +55,7 @@ def main():
     parser.add_argument("--speaker", default=None, help="Speaker prompt name (optional)")
     parser.add_argument("--language", default="auto", help="Language (auto, en, zh, ja, ko)")
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     input_text_path = Path(args.input_text).resolve()
     output_path = Path(args.output_path).resolve()
@@ -73,13 +85,20 @@ def main():
     except Exception:
         pass
 
-    preload_models()
+    loaded_model = getattr(sys.modules.get("utils.generation"), "model", None)
+    if _loaded_checkpoint_dir != checkpoint_dir or loaded_model is None:
+        with progress.stage("load_model"):
+            preload_models()
+        _loaded_checkpoint_dir = checkpoint_dir
+    else:
+        LOGGER.info("Reusing preloaded VALL-E X models")
 
     prompt_arg = args.speaker
     if prompt_arg and prompt_arg.lower() == "default":
         prompt_arg = None
 
-    audio_array = generate_audio(text, prompt=prompt_arg, language=args.language)
+    with progress.stage("generate", chars=len(text)):
+        audio_array = generate_audio(text, prompt=prompt_arg, language=args.language)
 
     if audio_array is None:
         LOGGER.error("Audio generation failed (returned None)")
@@ -93,4 +112,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
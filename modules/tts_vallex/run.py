@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import json
 import logging
 import os
 import re
@@ -8,12 +10,14 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from typing import Sequence
 
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import progress
 from shared.utils.io_helpers import (
     configure_logging,
     ensure_parent,
@@ -21,10 +25,15 @@ from shared.utils.io_helpers import (
     read_json,
     read_yaml,
 )
+from shared.utils.resident_worker import ResidentWorker, in_worker_mode, run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.tts.vallex")
 
+# 이 모듈이 상주 워커로 실행될 때 VALL-E X 스크립트도 상주시켜 preload_models()를 한 번만 수행.
+# (python, 스크립트) -> (작업 폴더·환경 변수 식별값, 워커). 식별값이 바뀌면 워커를 다시 띄운다.
+_VALLEX_WORKERS: dict[tuple[str, str], tuple[str, ResidentWorker]] = {}
+
 
 def _resolve_path(path_value: str | Path | None, *, base: Path = ROOT_DIR) -> Path:
     """Resolve a potential relative path against the project root."""
@@ -69,8 +78,16 @@ def _prepare_text_payload(input_json: Path, fallback_text: str | None = None) ->
     return combined
 
 
-def _run_vallex(command: list[str], work_dir: Path | None = None, env: dict[str, str] | None = None) -> None:
+def _run_vallex(
+    command: list[str],
+    work_dir: Path | None = None,
+    env: dict[str, str] | None = None,
+    checkpoint_dir: Path | None = None,
+) -> None:
     LOGGER.debug("VALL-E X 실행 명령: %s", " ".join(command))
+    if in_worker_mode():
+        _run_vallex_resident(command, work_dir=work_dir, env=env, checkpoint_dir=checkpoint_dir)
+        return
     try:
         subprocess.run(
             command,
@@ -83,6 +100,52 @@ def _run_vallex(command: list[str], work_dir: Path | None = None, env: dict[str,
         raise RuntimeError("VALL-E X 합성 중 오류가 발생했습니다.") from exc
 
 
+def _worker_settings(
+    work_dir: Path | None,
+    env: dict[str, str] | None,
+    checkpoint_dir: Path | None,
+) -> tuple[str, dict[str, str]]:
+    """상주 워커 식별값과, 이 프로세스 환경과 다른 환경 변수만 모은 dict.
+
+    워커는 처음 뜰 때 체크포인트를 적재하므로 체크포인트 폴더도 식별값에 넣는다.
+    작업마다 달라지는 진행률 채널 등은 이 프로세스 환경에 그대로 있으므로 식별값에 들어가지 않는다.
+    """
+    overrides = {name: value for name, value in (env or {}).items() if os.environ.get(name) != value}
+    payload = {
+        "cwd": str(work_dir.resolve()) if work_dir else None,
+        "env": overrides,
+        "checkpoint_dir": str(checkpoint_dir.resolve()) if checkpoint_dir else None,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest(), overrides
+
+
+def _run_vallex_resident(
+    command: list[str],
+    work_dir: Path | None = None,
+    env: dict[str, str] | None = None,
+    checkpoint_dir: Path | None = None,
+) -> None:
+    python_exec, script, *argv = command
+    key = (python_exec, script)
+    settings, overrides = _worker_settings(work_dir, env, checkpoint_dir)
+    current = _VALLEX_WORKERS.get(key)
+    if current is not None and current[0] != settings:
+        # 작업 폴더, 환경(config의 env), 체크포인트 폴더가 바뀌었으면 이전 설정으로 뜬 워커를 쓰지 않는다.
+        LOGGER.info("VALL-E X 작업 폴더/환경 변수/체크포인트가 바뀌어 상주 워커를 다시 시작합니다.")
+        current[1].stop()
+        current = None
+    if current is None:
+        current = (settings, ResidentWorker(script, python=python_exec, cwd=work_dir, env=overrides))
+        _VALLEX_WORKERS[key] = current
+    worker = current[1]
+    try:
+        # 하위 워커의 진행률/로그 이벤트를 상위 채널로 그대로 전달
+        worker.call(argv, on_event=progress.emit)
+    except RuntimeError as exc:
+        LOGGER.error("VALL-E X 합성 실패: %s", exc)
+        raise RuntimeError("VALL-E X 합성 중 오류가 발생했습니다.") from exc
+
+
 def synthesize_speech(input_json: Path, output_audio: Path, config: dict) -> None:
     input_json = input_json.resolve()
     output_audio = output_audio.resolve()
@@ -153,7 +216,8 @@ def synthesize_speech(input_json: Path, output_audio: Path, config: dict) -> Non
         env = {**os.environ, **env_config}
 
     try:
-        _run_vallex(command, work_dir=work_dir, env=env)
+        with progress.stage("synthesize"):
+            _run_vallex(command, work_dir=work_dir, env=env, checkpoint_dir=checkpoint_dir)
         LOGGER.info("VALL-E X 합성 완료: %s", output_audio)
     finally:
         if text_file.exists():
@@ -163,12 +227,12 @@ def synthesize_speech(input_json: Path, output_audio: Path, config: dict) -> Non
                 LOGGER.warning("임시 텍스트 파일 삭제 실패: %s", text_file)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--config")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -179,4 +243,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
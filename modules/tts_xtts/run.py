@@ -4,7 +4,7 @@ import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 import re
 import torch
@@ -14,16 +14,21 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import batch, progress
 from shared.utils.io_helpers import (
     configure_logging,
     ensure_parent,
     read_json,
     read_yaml,
 )
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.tts.xtts")
 
+# 상주 워커/인프로세스 실행 시 같은 설정의 모델을 재사용하기 위한 캐시
+_MODEL_CACHE: dict[tuple[str, bool], TTS] = {}
+
 
 def load_config(config_path: Path | None) -> dict:
     if config_path is None:
@@ -116,8 +121,15 @@ def _load_tts_model(config: dict) -> TTS:
         LOGGER.warning("CUDA를 사용할 수 없습니다. CPU 모드로 전환합니다.")
         use_gpu = False
 
+    cache_key = (model_name, bool(use_gpu))
+    if cache_key in _MODEL_CACHE:
+        LOGGER.info("캐시된 XTTS 모델 재사용: %s (GPU=%s)", model_name, use_gpu)
+        return _MODEL_CACHE[cache_key]
+
     LOGGER.info("XTTS 모델 로드: %s (GPU=%s)", model_name, use_gpu)
-    return TTS(model_name=model_name, progress_bar=False, gpu=use_gpu)
+    model = TTS(model_name=model_name, progress_bar=False, gpu=use_gpu)
+    _MODEL_CACHE[cache_key] = model
+    return model
 
 
 def _convert_to_wav(input_path: Path) -> Path:
@@ -166,9 +178,11 @@ def synthesize_backup(input_json: Path, output_audio: Path, config: dict) -> Non
 
     LOGGER.info("XTTS 백업 합성을 시작합니다: %s", input_json)
     text = _prepare_text(input_json, config.get("fallback_text"))
-    speaker_wav = _resolve_speaker_wav(config)
+    with progress.stage("prepare_speaker"):
+        speaker_wav = _resolve_speaker_wav(config)
 
-    tts = _load_tts_model(config)
+    with progress.stage("load_model"):
+        tts = _load_tts_model(config)
 
     ensure_parent(output_audio)
     synthesis_kwargs = {
@@ -181,22 +195,26 @@ def synthesize_backup(input_json: Path, output_audio: Path, config: dict) -> Non
         synthesis_kwargs["language"] = language
 
     try:
-        tts.tts_to_file(**synthesis_kwargs)
+        with progress.stage("synthesize", chars=len(text)):
+            tts.tts_to_file(**synthesis_kwargs)
     except Exception as exc:  # noqa: BLE001
         LOGGER.exception("XTTS 합성 실패")
         raise RuntimeError("XTTS 합성 중 오류가 발생했습니다.") from exc
+    progress.report(stage="synthesize", fraction=1.0)
 
     LOGGER.info("XTTS 백업 합성 완료: %s", output_audio)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
-    parser.add_argument("--input", required=True)
-    parser.add_argument("--output", required=True)
+    parser.add_argument("--input")
+    parser.add_argument("--output")
     parser.add_argument("--config")
     parser.add_argument("--speaker-wav")
     parser.add_argument("--language")
-    args = parser.parse_args()
+    batch.add_arguments(parser)
+    args = parser.parse_args(argv)
+    batch.validate_arguments(parser, args)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -216,8 +234,8 @@ def main() -> None:
     if args.language:
         config["language"] = args.language
 
-    synthesize_backup(Path(args.input), Path(args.output), config)
+    batch.run_from_args(args, synthesize_backup, config)
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
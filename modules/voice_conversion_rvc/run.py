@@ -8,6 +8,7 @@ import subprocess
 import sys
 import tempfile
 from pathlib import Path
+from typing import Sequence
 
 import soundfile as sf
 
@@ -21,11 +22,13 @@ ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.append(str(ROOT_DIR))
 
+from shared.utils import progress
 from shared.utils.io_helpers import (
     configure_logging,
     ensure_parent,
     read_yaml,
 )
+from shared.utils.resident_worker import run_entrypoint
 
 
 LOGGER = logging.getLogger("pipeline.rvc")
@@ -87,6 +90,16 @@ def _build_command(config: dict, input_audio: Path, output_audio: Path) -> tuple
     return command, env
 
 
+# 백엔드 보존 정책(GC)이 비정상 종료로 남은 임시 파일을 찾을 수 있도록 붙이는 접두사
+TEMP_PREFIX = "padiem_rvc_"
+
+
+def _temp_wav() -> Path:
+    fd, name = tempfile.mkstemp(prefix=TEMP_PREFIX, suffix=".wav")
+    os.close(fd)
+    return Path(name)
+
+
 def _apply_augmentations(source: Path, config: dict) -> Path:
     """
     ffmpeg 기반 증강: 시간 늘이기/줄이기(atempo), 저역/고역 EQ, 노이즈 믹스.
@@ -103,7 +116,7 @@ def _apply_augmentations(source: Path, config: dict) -> Path:
         y, sr = librosa.load(source, sr=None, mono=True)
         atempo = max(0.5, min(2.0, float(time_stretch)))
         y_stretch = librosa.effects.time_stretch(y, atempo)
-        stretched_path = Path(tempfile.mkstemp(suffix=".wav")[1])
+        stretched_path = _temp_wav()
         sf.write(stretched_path, y_stretch, sr)
         LOGGER.info("formant_preserve 적용: librosa phase vocoder atempo=%s", atempo)
     elif time_stretch:
@@ -131,9 +144,11 @@ def _apply_augmentations(source: Path, config: dict) -> Path:
 
     # 노이즈가 없고 필터도 없으면 원본 반환
     if not filters and noise_db is None:
+        if stretched_path:
+            stretched_path.unlink(missing_ok=True)
         return source
 
-    tmp = Path(tempfile.mkstemp(suffix=".wav")[1])
+    tmp = _temp_wav()
 
     if noise_db is not None:
         # 입력 오디오 길이 파악
@@ -183,7 +198,14 @@ def _apply_augmentations(source: Path, config: dict) -> Path:
         ]
 
     LOGGER.info("RVC 증강 적용: %s", " ".join(command))
-    subprocess.run(command, check=True)
+    try:
+        subprocess.run(command, check=True)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        if stretched_path:
+            stretched_path.unlink(missing_ok=True)
 
     return tmp
 
@@ -194,17 +216,23 @@ def convert_voice(input_audio: Path, output_audio: Path, config: dict) -> None:
 
     ensure_parent(output_audio)
     # 증강 적용(옵션)
-    augmented_audio = _apply_augmentations(input_audio, config)
+    with progress.stage("augment"):
+        augmented_audio = _apply_augmentations(input_audio, config)
 
-    command, env = _build_command(config, augmented_audio, output_audio)
+    try:
+        command, env = _build_command(config, augmented_audio, output_audio)
 
-    LOGGER.info("RVC 변환 실행: %s", " ".join(command))
+        LOGGER.info("RVC 변환 실행: %s", " ".join(command))
 
-    try:
-        subprocess.run(command, check=True, env=env)
-    except subprocess.CalledProcessError as exc:
-        LOGGER.error("RVC 변환 실패: %s", exc)
-        raise RuntimeError("RVC 변환 중 오류가 발생했습니다.") from exc
+        try:
+            with progress.stage("convert"):
+                subprocess.run(command, check=True, env=env)
+        except subprocess.CalledProcessError as exc:
+            LOGGER.error("RVC 변환 실패: %s", exc)
+            raise RuntimeError("RVC 변환 중 오류가 발생했습니다.") from exc
+    finally:
+        if augmented_audio != input_audio:
+            augmented_audio.unlink(missing_ok=True)
 
     if not output_audio.exists():
         raise RuntimeError("RVC 변환 후 출력 파일이 생성되지 않았습니다.")
@@ -212,12 +240,12 @@ def convert_voice(input_audio: Path, output_audio: Path, config: dict) -> None:
     LOGGER.info("RVC 음성 변환 완료: %s", output_audio)
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--config")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     logging_config = ROOT_DIR / "shared" / "logging_config.yaml"
     configure_logging(logging_config)
@@ -228,4 +256,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    run_entrypoint(main)
@@ -1,14 +1,87 @@
 from __future__ import annotations
 
 import argparse
+import csv
+import hashlib
+import importlib.util
+import inspect
+import itertools
+import json
+import os
+import shutil
+import string
 import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Iterator
 
 import yaml
 
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 ROOT_DIR = SCRIPT_DIR.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from shared.utils import io_helpers, process_tree, progress, run_lock, step_cache  # noqa: E402
+from shared.utils.tracing import Tracer  # noqa: E402
+
+
+# config.yaml에 pipelines가 없을 때 쓰는 기본 파이프라인 (목록 순서는 의존성을 알 수 없을 때의 실행 순서)
+DEFAULT_PIPELINES = {
+    "video": ["audio_extract", "stt", "text_process", "tts", "tts_backup", "rvc", "lipsync"],
+    "video_trt": ["audio_extract", "stt", "text_process", "tts", "tts_backup", "rvc", "lipsync", "onnx_export", "tensorrt_export"],
+    "audio": ["stt", "text_process", "tts_backup", "rvc"],
+    "quick": ["stt", "text_process", "tts_backup"],
+}
+DEFAULT_MAX_PARALLEL = 2
+STAMP_DIR = ".stamps"
+# --input-dir에서 찾는 파일 (audio/quick 파이프라인은 오디오만)
+AUDIO_SUFFIXES = {".mp3", ".wav", ".m4a", ".flac", ".aac"}
+VIDEO_SUFFIXES = {".mp4", ".mov", ".mkv", ".avi", ".webm"}
+
+STATUS_SUCCESS = "success"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+STATUS_SKIPPED = "skipped"
+
+
+@dataclass
+class Step:
+    """config.yaml 단계 하나. inputs/outputs는 context 키, needs는 직접 지정한 선행 단계 이름."""
+
+    name: str
+    command: list[str]
+    inputs: list[str] = field(default_factory=list)
+    outputs: list[str] = field(default_factory=list)
+    needs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StepResult:
+    status: str
+    started: float | None = None
+    finished: float | None = None
+    cache_hit: bool = False
+    up_to_date: bool = False
+    error: str | None = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+class PipelineAborted(RuntimeError):
+    """다른 단계가 실패해 중단된 단계."""
 
 
 def sanitize_run_name(name: str) -> str:
@@ -27,9 +100,548 @@ def format_command(command_template: list[str], context: dict[str, str]) -> list
     return [part.format(**context) for part in command_template]
 
 
-def run_step(command_template: list[str], context: dict[str, str]) -> None:
+@dataclass(eq=False)
+class _RunState:
+    """run_dag 한 번(입력 파일 하나)의 중단 플래그, 실행 중인 단계와 모듈 프로세스.
+
+    일괄 처리에서 여러 파일을 동시에 돌려도 한 파일의 실패가 다른 파일을 중단시키지 않도록 실행마다 따로 둔다.
+    """
+
+    key: str = ""
+    tracer: Tracer | None = None
+    abort: threading.Event = field(default_factory=threading.Event)
+    processes: dict[subprocess.Popen, str] = field(default_factory=dict)
+    active: set[str] = field(default_factory=set)
+
+
+_process_lock = threading.Lock()
+_states: dict[str, _RunState] = {}
+_run_ids = itertools.count(1)
+# run_dag 밖에서 단계를 직접 실행할 때 쓰는 상태
+_default_state = _RunState()
+# 단계를 실행 중인 스레드의 실행 상태와 단계 이름 (모듈 진행률 이벤트/프로세스를 단계에 연결)
+_current = threading.local()
+# 추적 시 하위 프로세스 모듈이 progress 이벤트를 보내는 소켓
+_event_server: progress.EventServer | None = None
+# 진행률 채널 job_id = "<실행 키>|<단계>"
+_KEY_SEPARATOR = "|"
+
+
+def _current_state() -> _RunState:
+    return getattr(_current, "state", None) or _default_state
+
+
+def _run_subprocess(command: list[str]) -> None:
+    """모듈을 별도 프로세스 그룹으로 실행 (중단 시 모듈이 띄운 ffmpeg 등까지 함께 종료)."""
+    state = _current_state()
+    if state.abort.is_set():
+        raise PipelineAborted("다른 단계가 실패해 실행하지 않았습니다.")
+    step = getattr(_current, "step", None)
+    env = None
+    channel = f"{state.key}{_KEY_SEPARATOR}{step}"
+    if _event_server is not None and state.tracer is not None and step is not None:
+        env = {**os.environ, "PYTHONUNBUFFERED": "1", **_event_server.env_for(channel)}
+    process = subprocess.Popen(command, cwd=SCRIPT_DIR, env=env, **process_tree.new_group_kwargs())
+    with _process_lock:
+        state.processes[process] = step or Path(command[1]).parent.name
+    if state.abort.is_set():
+        process_tree.kill_tree(process)
+    try:
+        returncode = process.wait()
+    finally:
+        with _process_lock:
+            state.processes.pop(process, None)
+    if env is not None:
+        # 모듈이 종료 직전에 보낸 구간 이벤트까지 받은 뒤 단계를 닫는다.
+        _event_server.drain(channel)
+    if state.abort.is_set() and returncode != 0:
+        raise PipelineAborted("다른 단계가 실패해 중단했습니다.")
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, command)
+
+
+def abort_running(state: _RunState | None = None) -> None:
+    """새 단계를 시작하지 않고 실행 중인 모듈 프로세스를 종료 (state가 없으면 모든 실행)."""
+    with _process_lock:
+        states = [state] if state is not None else [*_states.values(), _default_state]
+        processes = []
+        for target in states:
+            target.abort.set()
+            processes += list(target.processes)
+    for process in processes:
+        process_tree.kill_tree(process)
+
+
+def _dispatch_event(channel: str, event: dict[str, Any]) -> None:
+    """하위 프로세스 모듈의 진행률 이벤트를 해당 실행의 추적 기록으로 전달."""
+    key, _, step = channel.rpartition(_KEY_SEPARATOR)
+    with _process_lock:
+        state = _states.get(key)
+    if state is not None and state.tracer is not None:
+        state.tracer.handle_event(step, event)
+
+
+def _dispatch_local_event(event: dict[str, Any]) -> None:
+    """--in-process 모듈의 진행률 이벤트: 이벤트를 보낸 스레드가 실행 중인 단계로 전달."""
+    state = getattr(_current, "state", None)
+    if state is not None and state.tracer is not None:
+        state.tracer.handle_event(getattr(_current, "step", None) or "orchestrator", event)
+
+
+def open_event_channel(in_process: bool) -> None:
+    """모듈이 progress.stage()로 보내는 세부 구간을 추적 기록으로 받기 시작."""
+    global _event_server
+    if in_process:
+        progress.set_channel(_dispatch_local_event)
+        return
+    if _event_server is None:
+        try:
+            _event_server = progress.EventServer(_dispatch_event)
+        except OSError as exc:
+            print(f"[trace] 진행률 채널을 열 수 없어 단계 구간만 기록합니다: {exc}")
+
+
+def close_event_channel() -> None:
+    global _event_server
+    progress.set_channel(None)
+    if _event_server is not None:
+        _event_server.close()
+        _event_server = None
+
+
+class StepSlots:
+    """여러 실행(파일)이 함께 쓰는 동시 실행 한도: 전체 단계 수와 단계별 수 (예: lipsync 2개)."""
+
+    def __init__(self, total: int, per_step: dict[str, int] | None = None) -> None:
+        self._total = threading.BoundedSemaphore(max(1, total))
+        self._per_step = {name: threading.BoundedSemaphore(max(1, limit)) for name, limit in (per_step or {}).items()}
+
+    @contextmanager
+    def hold(self, step: str) -> Iterator[None]:
+        # 단계별 한도를 먼저 잡아, 그 단계를 기다리는 동안 전체 슬롯을 차지하지 않는다.
+        with self._per_step.get(step) or nullcontext():
+            with self._total:
+                yield
+
+
+class InProcessRunner:
+    """--in-process: 모듈 run.py를 한 번만 import하고 main(argv)를 직접 호출.
+
+    인터프리터 기동과 torch 등 import가 단계마다 반복되지 않고, 모델은 모듈의 모델 캐시에 남아
+    같은 모듈을 쓰는 다음 단계가 재사용한다. main(argv)를 받지 않는 스크립트는 하위 프로세스로 실행한다.
+    실행 중인 단계는 강제로 멈출 수 없어, 다른 단계가 실패하면 진행 중인 단계가 끝날 때까지 기다린다.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._modules: dict[Path, ModuleType | None] = {}
+        self._call_locks: dict[Path, threading.Lock] = {}
+        self.import_sec: dict[str, float] = {}
+
+    def _load(self, script: Path) -> ModuleType | None:
+        with self._lock:
+            if script in self._modules:
+                return self._modules[script]
+            started = time.perf_counter()
+            spec = importlib.util.spec_from_file_location(f"padiem_step_{script.parent.name}_{script.stem}", script)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(spec.name, None)
+                raise
+            main = getattr(module, "main", None)
+            if main is None or not inspect.signature(main).parameters:
+                module = None
+            self._modules[script] = module
+            self._call_locks[script] = threading.Lock()
+            self.import_sec[script.parent.name] = time.perf_counter() - started
+            print(f"[in-process] {script.parent.name} import {self.import_sec[script.parent.name]:.2f}s")
+            return module
+
+    def __call__(self, command: list[str]) -> None:
+        if _current_state().abort.is_set():
+            raise PipelineAborted("다른 단계가 실패해 실행하지 않았습니다.")
+        spec = step_cache.parse_command(command, SCRIPT_DIR)
+        module = self._load(spec.script) if spec is not None and spec.script.exists() else None
+        if module is None:
+            _run_subprocess(command)
+            return
+        # 같은 모듈의 모델 캐시를 두 스레드가 동시에 채우지 않도록 모듈별로 한 번에 하나씩 실행
+        with self._call_locks[spec.script]:
+            try:
+                module.main(command[2:])
+            except SystemExit as exc:
+                if exc.code not in (None, 0):
+                    raise subprocess.CalledProcessError(exc.code if isinstance(exc.code, int) else 1, command) from None
+
+
+def run_step(
+    command_template: list[str],
+    context: dict[str, str],
+    runner: Callable[[list[str]], None] | None = None,
+) -> dict:
+    """단계 실행 (같은 입력/설정/모듈 버전의 이전 결과가 캐시에 있으면 출력만 배치)."""
     command = format_command(command_template, context)
-    subprocess.run(command, check=True, cwd=SCRIPT_DIR)
+
+    def _execute() -> dict:
+        (runner or _run_subprocess)(command)
+        return {}
+
+    result = step_cache.run_cached(command, _execute, cwd=SCRIPT_DIR)
+    if result["cache_hit"]:
+        print(f"[cache] {Path(command[1]).parent.name}: 이전 결과 재사용")
+    return result
+
+
+def _step_paths(step: Step, command: list[str], context: dict[str, str]) -> tuple[list[Path], list[Path], Path | None]:
+    """단계의 입력 파일, 출력 파일, 설정 파일 (명령 인자 + inputs/outputs 선언)."""
+    spec = step_cache.parse_command(command, SCRIPT_DIR)
+    inputs = list(spec.inputs) if spec else []
+    outputs = list(spec.outputs) if spec else []
+    inputs += [Path(context[key]) for key in step.inputs if context.get(key)]
+    if not outputs:
+        outputs = [Path(context[key]) for key in step.outputs if context.get(key)]
+    # 제자리에서 고치는 단계(demucs 등)는 출력이 곧 입력이라 입력 해시에서 빼고 출력 확인으로 대신한다.
+    output_set = {path.resolve() for path in outputs}
+    inputs = sorted({path.resolve() for path in inputs} - output_set)
+    return inputs, outputs, spec.config if spec else None
+
+
+def _digest(path: Path) -> str | None:
+    return step_cache.file_digest(path) if path.is_file() else None
+
+
+def compute_stamp(step: Step, command: list[str], context: dict[str, str]) -> str | None:
+    """입력 파일 해시 + 설정 파일 내용(과 설정이 가리키는 파일) + 모듈 소스 + 명령으로 만든 단계 stamp (입력 파일이 없으면 None)."""
+    inputs, _, config = _step_paths(step, command, context)
+    if any(not path.is_file() for path in inputs):
+        return None
+    spec = step_cache.parse_command(command, SCRIPT_DIR)
+    payload = {
+        "command": command,
+        "inputs": {str(path): _digest(path) for path in inputs},
+        "config": _digest(config) if config is not None else None,
+        "version": step_cache.module_version(spec.script) if spec and spec.script.exists() else None,
+        "references": [_digest(path) for path in step_cache.referenced_files(spec)] if spec else [],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def stamp_path(context: dict[str, str], name: str) -> Path:
+    return Path(context["run_dir"]) / STAMP_DIR / f"{name}.json"
+
+
+def is_up_to_date(step: Step, command: list[str], context: dict[str, str]) -> bool:
+    """stamp가 같고 출력 파일이 지난 실행 직후 그대로면 다시 실행할 필요가 없다."""
+    try:
+        recorded = json.loads(stamp_path(context, step.name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    stamp = compute_stamp(step, command, context)
+    if stamp is None or recorded.get("stamp") != stamp:
+        return False
+    outputs = recorded.get("outputs") or {}
+    if not outputs:
+        return False
+    for path, digest in outputs.items():
+        target = Path(path)
+        if not target.exists() or (digest is not None and _digest(target) != digest):
+            return False
+    return True
+
+
+def write_stamp(step: Step, command: list[str], context: dict[str, str]) -> None:
+    stamp = compute_stamp(step, command, context)
+    _, outputs, _ = _step_paths(step, command, context)
+    if stamp is None or not outputs or not all(path.exists() for path in outputs):
+        return
+    target = stamp_path(context, step.name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        "step": step.name,
+        "stamp": stamp,
+        "outputs": {str(path): _digest(path) for path in outputs},
+        "finished_at": time.time(),
+    }
+    tmp = target.with_suffix(".tmp")
+    tmp.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, target)
+
+
+def execute_step(
+    step: Step,
+    context: dict[str, str],
+    force: bool = False,
+    runner: Callable[[list[str]], None] | None = None,
+) -> dict:
+    """stamp가 최신이면 건너뛰고, 아니면 실행한 뒤 stamp를 남긴다."""
+    command = format_command(step.command, context)
+    if not force and is_up_to_date(step, command, context):
+        print(f"[pipeline] {step.name}: 입력/설정/출력 변경 없음, 건너뜀")
+        return {"up_to_date": True, "cache_hit": False}
+    # 실행 도중 실패하면 예전 stamp로 최신 판정되지 않도록 먼저 지운다.
+    stamp_path(context, step.name).unlink(missing_ok=True)
+    result = run_step(step.command, context, runner)
+    write_stamp(step, command, context)
+    return result
+
+
+def select_steps(
+    steps: list[Step],
+    deps: dict[str, set[str]],
+    from_step: str | None = None,
+    only: list[str] | None = None,
+) -> list[str]:
+    """--from-step(그 단계와 그 뒤에 이어지는 단계) / --only(지정한 단계만)로 실행할 단계 선택."""
+    names = [step.name for step in steps]
+    unknown = [name for name in [from_step, *(only or [])] if name and name not in names]
+    if unknown:
+        raise ValueError(f"파이프라인에 없는 단계: {', '.join(unknown)} (가능한 단계: {', '.join(names)})")
+    selected = set(names)
+    if from_step:
+        selected = {from_step}
+        for name in names:  # 목록은 선행 단계가 앞에 오는 순서
+            if deps[name] & selected:
+                selected.add(name)
+    if only:
+        selected &= set(only)
+    return [name for name in names if name in selected]
+
+
+def _placeholder_keys(value: str) -> list[str]:
+    return [name for _, name, _, _ in string.Formatter().parse(value) if name]
+
+
+def _infer_io(command: list[str]) -> tuple[list[str], list[str]]:
+    """inputs/outputs 선언이 없는 단계: --input/--output 류 인자의 {키}로 추론."""
+    inputs: list[str] = []
+    outputs: list[str] = []
+    for flag, value in zip(command, command[1:]):
+        if flag in step_cache.INPUT_FLAGS:
+            inputs += _placeholder_keys(value)
+        elif flag in step_cache.OUTPUT_FLAGS:
+            outputs += _placeholder_keys(value)
+    return inputs, outputs
+
+
+def load_steps(config: dict, names: list[str]) -> list[Step]:
+    """파이프라인에 포함된 단계 정의 (설정에 없는 단계는 건너뜀).
+
+    단계는 명령 목록(예전 형식) 또는 {command, inputs, outputs, needs} 객체로 적을 수 있다.
+    """
+    all_steps = config.get("steps", {})
+    steps: list[Step] = []
+    for name in names:
+        spec = all_steps.get(name)
+        if not spec:
+            continue
+        if isinstance(spec, list):
+            spec = {"command": spec}
+        command = [str(part) for part in spec["command"]]
+        inferred_inputs, inferred_outputs = _infer_io(command)
+        steps.append(
+            Step(
+                name=name,
+                command=command,
+                inputs=list(spec.get("inputs", inferred_inputs)),
+                outputs=list(spec.get("outputs", inferred_outputs)),
+                needs=list(spec.get("needs", [])),
+            )
+        )
+    return steps
+
+
+def build_dag(steps: list[Step], context: dict[str, str]) -> dict[str, set[str]]:
+    """단계 -> 먼저 끝나야 하는 단계들.
+
+    입력 키를 마지막으로 만든 앞 단계(쓰기 후 읽기), 같은 키를 덮어쓰는 단계는 그 키를 읽는 앞 단계
+    (읽기 후 쓰기)와 마지막으로 쓴 단계를 기다린다. 입력을 만드는 단계가 없고 파일도 아직 없으면
+    목록상 앞 단계가 모두 끝난 뒤 실행한다 (예전처럼 순서대로).
+    """
+    names = {step.name for step in steps}
+    deps: dict[str, set[str]] = {}
+    last_writer: dict[str, str] = {}
+    readers: dict[str, list[str]] = {}
+    for index, step in enumerate(steps):
+        needs = {name for name in step.needs if name in names}
+        for key in step.inputs:
+            if key in last_writer:
+                needs.add(last_writer[key])
+            elif key in context and not Path(context[key]).exists():
+                print(f"[pipeline] 경고: {step.name}의 입력 {key}를 만드는 단계가 없어 앞 단계가 끝난 뒤 실행합니다.")
+                needs.update(previous.name for previous in steps[:index])
+        for key in step.outputs:
+            needs.update(reader for reader in readers.get(key, []) if reader != step.name)
+            if key in last_writer:
+                needs.add(last_writer[key])
+        for key in step.inputs:
+            readers.setdefault(key, []).append(step.name)
+        for key in step.outputs:
+            last_writer[key] = step.name
+            readers[key] = []
+        needs.discard(step.name)
+        deps[step.name] = needs
+    return deps
+
+
+def run_dag(
+    steps: list[Step],
+    deps: dict[str, set[str]],
+    context: dict[str, str],
+    max_parallel: int = DEFAULT_MAX_PARALLEL,
+    execute: Callable[[Step, dict[str, str]], dict[str, Any]] | None = None,
+    tracer: Tracer | None = None,
+    slots: StepSlots | None = None,
+    label: str = "",
+) -> dict[str, StepResult]:
+    """선행 단계가 끝난 단계부터 최대 max_parallel개를 동시에 실행.
+
+    한 단계라도 실패하면 새 단계를 시작하지 않고 실행 중인 단계를 중단한다(fail-fast).
+    slots가 있으면 다른 실행과 함께 쓰는 한도 안에서만 단계를 시작한다(기다리는 시간은 단계 시간에 넣지 않음).
+    반환값의 시각은 파이프라인 시작 기준 초.
+    """
+    execute = execute or execute_step
+    state = _RunState(key=f"run{next(_run_ids)}", tracer=tracer)
+    with _process_lock:
+        _states[state.key] = state
+    if tracer is not None:
+        tracer.start_sampling(lambda: _sample_rss(state), float(os.getenv("PADIEM_TRACE_SAMPLE_SEC", "0.5")))
+    prefix = f"{label}/" if label else ""
+    origin = time.monotonic()
+    results: dict[str, StepResult] = {}
+    pending = [step for step in steps]
+    running: dict[Future, Step] = {}
+    failed = False
+
+    finished_at: dict[str, float] = {}
+
+    def _call(step: Step) -> dict[str, Any]:
+        with slots.hold(step.name) if slots is not None else nullcontext():
+            if state.abort.is_set():
+                raise PipelineAborted("다른 단계가 실패해 실행하지 않았습니다.")
+            _current.state, _current.step = state, step.name
+            with _process_lock:
+                state.active.add(step.name)
+            if tracer is not None:
+                tracer.step_started(step.name)
+            results[step.name].started = time.monotonic() - origin
+            try:
+                return execute(step, context)
+            finally:
+                results[step.name].finished = time.monotonic() - origin
+                finished_at[step.name] = time.time()
+                with _process_lock:
+                    state.active.discard(step.name)
+                _current.state = _current.step = None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="pipeline-step") as pool:
+        try:
+            while pending or running:
+                if not failed:
+                    for step in list(pending):
+                        if len(running) >= max(1, max_parallel):
+                            break
+                        if all(results.get(name) and results[name].status == STATUS_SUCCESS for name in deps[step.name]):
+                            pending.remove(step)
+                            results[step.name] = StepResult(status="running")
+                            print(f"[pipeline] {prefix}{step.name} 시작")
+                            running[pool.submit(_call, step)] = step
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    result = results[step.name]
+                    try:
+                        outcome = future.result()
+                    except PipelineAborted as exc:
+                        result.status, result.error = STATUS_CANCELLED, str(exc)
+                    except Exception as exc:  # noqa: BLE001 - 요약에 기록하고 나머지 단계를 중단
+                        result.status, result.error = STATUS_FAILED, str(exc) or type(exc).__name__
+                        print(f"[pipeline] {prefix}{step.name} 실패: {result.error}")
+                        if not failed:
+                            failed = True
+                            abort_running(state)
+                    else:
+                        result.status = STATUS_SUCCESS
+                        result.cache_hit = bool(outcome.get("cache_hit"))
+                        result.up_to_date = bool(outcome.get("up_to_date"))
+                        print(f"[pipeline] {prefix}{step.name} 완료 ({result.elapsed:.1f}s)")
+                    if tracer is not None:
+                        tracer.step_finished(
+                            step.name,
+                            result.status,
+                            at=finished_at.get(step.name),
+                            cache_hit=result.cache_hit or None,
+                            up_to_date=result.up_to_date or None,
+                            audio_sec=_audio_seconds(step, context),
+                        )
+        except KeyboardInterrupt:
+            abort_running(state)
+            raise
+        finally:
+            if tracer is not None:
+                tracer.stop_sampling()
+            with _process_lock:
+                _states.pop(state.key, None)
+    for step in pending:
+        results[step.name] = StepResult(status=STATUS_SKIPPED)
+    return results
+
+
+def _audio_seconds(step: Step, context: dict[str, str]) -> float | None:
+    """단계가 처리한 오디오 길이: 입력 WAV가 있으면 그 길이, 없으면 출력 WAV 길이."""
+    try:
+        command = format_command(step.command, context)
+    except (KeyError, IndexError):
+        return None
+    inputs, outputs, _ = _step_paths(step, command, context)
+    for path in [*inputs, *outputs]:
+        duration = io_helpers.wav_duration(path)
+        if duration:
+            return round(duration, 3)
+    return None
+
+
+def _sample_rss(state: _RunState) -> dict[str, int]:
+    """실행 중인 단계별 RSS. 하위 프로세스 단계는 프로세스 그룹 합계, 인프로세스 단계는 이 프로세스 RSS."""
+    with _process_lock:
+        groups = {process.pid: name for process, name in state.processes.items()}
+        active = set(state.active)
+    values = process_tree.group_rss_bytes(groups) if sys.platform != "win32" else {}
+    own = process_tree.rss_bytes(os.getpid())
+    for name in active - set(groups.values()):
+        values[name] = own
+    return values
+
+
+def critical_path(steps: list[Step], deps: dict[str, set[str]], results: dict[str, StepResult]) -> tuple[list[str], float]:
+    """실행 시간 합이 가장 긴 의존 경로 (이 경로가 전체 소요 시간의 하한)."""
+    longest: dict[str, tuple[float, list[str]]] = {}
+    for step in steps:  # 목록은 항상 선행 단계가 앞에 오는 순서
+        elapsed = results[step.name].elapsed if step.name in results else 0.0
+        best = max((longest[name] for name in deps[step.name] if name in longest), default=(0.0, []), key=lambda item: item[0])
+        longest[step.name] = (best[0] + elapsed, [*best[1], step.name])
+    if not longest:
+        return [], 0.0
+    total, path = max(longest.values(), key=lambda item: item[0])
+    return path, total
+
+
+def format_summary(steps: list[Step], deps: dict[str, set[str]], results: dict[str, StepResult], wall: float) -> str:
+    lines = ["[pipeline] 단계별 소요 시간"]
+    for step in steps:
+        result = results[step.name]
+        note = " (캐시)" if result.cache_hit else " (변경 없음)" if result.up_to_date else ""
+        if result.error and result.status != STATUS_SUCCESS:
+            note = f" - {result.error}"
+        lines.append(f"  {step.name:<16} {result.status:<9} {result.elapsed:8.1f}s{note}")
+    path, total = critical_path(steps, deps, results)
+    serial = sum(result.elapsed for result in results.values())
+    lines.append(f"  전체 {wall:.1f}s / 단계 합계 {serial:.1f}s / 임계 경로 {total:.1f}s: {' -> '.join(path)}")
+    return "\n".join(lines)
 
 
 def load_pipeline_config(config_path: Path) -> dict:
@@ -97,11 +709,19 @@ def parse_args() -> argparse.Namespace:
         default=str(SCRIPT_DIR / "config.yaml"),
         help="파이프라인 설정 YAML 경로",
     )
-    parser.add_argument(
+    inputs = parser.add_mutually_exclusive_group(required=True)
+    inputs.add_argument(
         "--input-media",
-        required=True,
         help="오디오를 추출할 입력 미디어 경로",
     )
+    inputs.add_argument(
+        "--input-dir",
+        help="이 폴더(하위 폴더 포함)의 미디어 파일을 모두 처리 (긴 파일부터)",
+    )
+    inputs.add_argument(
+        "--manifest",
+        help='처리할 파일 목록 JSON: ["a.mp4", {"input_media": "b.mp4", "run_name": "...", "speaker_audio": "..."}]',
+    )
     parser.add_argument(
         "--run-name",
         help="결과를 저장할 실행 폴더명(미지정 시 입력 파일명 기반)",
@@ -115,31 +735,342 @@ def parse_args() -> argparse.Namespace:
         "--speaker-audio",
         help="RVC 단계에서 사용할 타깃 화자 음성 경로(선택)",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help="서로 의존하지 않는 단계를 동시에 실행할 최대 개수 (1이면 순서대로 실행)",
+    )
+    parser.add_argument(
+        "--from-step",
+        help="이 단계와 그 뒤에 이어지는 단계만 실행 (stamp와 관계없이 다시 실행)",
+    )
+    parser.add_argument(
+        "--only",
+        help="쉼표로 구분한 단계만 실행 (stamp와 관계없이 다시 실행, 앞 단계 출력은 실행 폴더에 있어야 함)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="stamp를 무시하고 모든 단계를 다시 실행",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="모듈을 하위 프로세스 대신 이 인터프리터에서 직접 호출 (import/모델 적재를 단계 간 공유)",
+    )
+    parser.add_argument(
+        "--trace",
+        help="Chrome Trace Event 형식 실행 기록 경로 (기본: 실행 폴더의 trace.json, chrome://tracing·Perfetto에서 열기)",
+    )
+    parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="실행 기록(trace.json)을 남기지 않음",
+    )
+    parser.add_argument(
+        "--batch-workers",
+        type=int,
+        default=DEFAULT_MAX_PARALLEL,
+        help="일괄 처리 시 동시에 진행할 파일 수 (단계 동시 실행 수는 --max-parallel이 전체 한도)",
+    )
+    parser.add_argument(
+        "--step-limit",
+        action="append",
+        metavar="STEP=N",
+        help="일괄 처리 시 단계별 동시 실행 한도 (예: --step-limit lipsync=2, 여러 번 지정 가능)",
+    )
+    parser.add_argument(
+        "--report",
+        help="일괄 처리 보고서 JSON 경로 (같은 이름의 .csv도 저장, 기본: <run-root>/batch_<시각>.json)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="단계 결과 캐시를 사용하지 않고 모든 단계를 다시 실행",
+    )
+    args = parser.parse_args()
+    if args.run_name and not args.input_media:
+        parser.error("--run-name은 --input-media와 함께만 쓸 수 있습니다 (일괄 처리는 파일명 기반).")
+    return args
+
+
+@dataclass
+class RunPlan:
+    """입력 파일 하나의 실행 계획."""
+
+    context: dict[str, str]
+    steps: list[Step]
+    deps: dict[str, set[str]]
+    forced: set[str]
+
+
+def plan_run(args: argparse.Namespace, config: dict) -> RunPlan:
+    context = build_context(args)
+    apply_placeholders(config, context)
+
+    pipelines = config.get("pipelines") or DEFAULT_PIPELINES
+    steps = load_steps(config, list(pipelines.get(args.pipeline_type, [])))
+    deps = build_dag(steps, context)
+
+    only = [name.strip() for name in args.only.split(",") if name.strip()] if args.only else None
+    try:
+        selected = select_steps(steps, deps, args.from_step, only)
+    except ValueError as exc:
+        raise SystemExit(f"[pipeline] {exc}") from None
+    # 직접 고른 단계는 stamp가 최신이어도 다시 실행한다.
+    forced = set(selected) if args.force or args.from_step or only else set()
+    run_steps = [step for step in steps if step.name in selected]
+    run_deps = {name: deps[name] & set(selected) for name in selected}
+    return RunPlan(context, run_steps, run_deps, forced)
+
+
+def execute_plan(
+    plan: RunPlan,
+    args: argparse.Namespace,
+    runner: InProcessRunner | None,
+    slots: StepSlots | None = None,
+    label: str = "",
+    trace_path: Path | None = None,
+) -> tuple[dict[str, StepResult], float, Tracer | None]:
+    """계획대로 실행하고 (단계별 결과, 전체 소요 초, 추적 기록)을 반환. 추적 기록은 실행 폴더에 저장.
+
+    실행하는 동안 실행 폴더에 잠금 파일을 두어 서버의 보존 정책 정리가 폴더를 건드리지 않게 한다.
+    """
+    tracer = None if args.no_trace else Tracer(f"pipeline:{args.pipeline_type}" + (f":{label}" if label else ""))
+    started = time.monotonic()
+    try:
+        with run_lock.hold(Path(plan.context["run_dir"])):
+            results = run_dag(
+                plan.steps,
+                plan.deps,
+                plan.context,
+                max_parallel=args.max_parallel,
+                execute=lambda step, ctx: execute_step(step, ctx, force=step.name in plan.forced, runner=runner),
+                tracer=tracer,
+                slots=slots,
+                label=label,
+            )
+    finally:
+        # 이 실행의 단계들만 읽는 JSON이므로 일괄 처리 중에 쌓이지 않게 버린다.
+        io_helpers.forget_json_memo(Path(plan.context["run_dir"]))
+        if tracer is not None:
+            tracer.write(trace_path or Path(plan.context["run_dir"]) / "trace.json")
+    return results, time.monotonic() - started, tracer
 
 
 def main() -> None:
     args = parse_args()
+    if args.no_cache:
+        os.environ[step_cache.ENABLED_ENV] = "0"
     config = load_pipeline_config(Path(args.config))
-    context = build_context(args)
-    apply_placeholders(config, context)
 
-    all_steps = config.get("steps", {})
-    
-    pipelines = {
-        "video": ["audio_extract", "stt", "text_process", "tts", "tts_backup", "rvc", "lipsync"],
-        "video_trt": ["audio_extract", "stt", "text_process", "tts", "tts_backup", "rvc", "lipsync", "onnx_export", "tensorrt_export"],
-        "audio": ["stt", "text_process", "tts_backup", "rvc"],
-        "quick": ["stt", "text_process", "tts_backup"],
+    runner: InProcessRunner | None = None
+    if args.in_process:
+        runner = InProcessRunner()
+        io_helpers.enable_json_memo()
+    if not args.no_trace:
+        open_event_channel(runner is not None)
+    try:
+        if args.input_dir or args.manifest:
+            failed = run_batch(args, config, runner)
+        else:
+            failed = run_single(args, config, runner)
+    finally:
+        close_event_channel()
+    if runner is not None and runner.import_sec:
+        print(f"[in-process] 모듈 import 합계 {sum(runner.import_sec.values()):.2f}s (단계마다 인터프리터를 새로 띄우지 않음)")
+    if failed:
+        raise SystemExit(1)
+
+
+def run_single(args: argparse.Namespace, config: dict, runner: InProcessRunner | None) -> bool:
+    plan = plan_run(args, config)
+    trace_path = Path(args.trace) if args.trace else Path(plan.context["run_dir"]) / "trace.json"
+    results, wall, tracer = execute_plan(plan, args, runner, trace_path=trace_path)
+    print(format_summary(plan.steps, plan.deps, results, wall))
+    if tracer is not None:
+        print(tracer.summary())
+        print(f"[trace] {trace_path} (chrome://tracing 또는 https://ui.perfetto.dev 에서 열기)")
+    return any(result.status != STATUS_SUCCESS for result in results.values())
+
+
+def media_duration(path: Path) -> float | None:
+    """미디어 길이(초): WAV는 헤더에서, 그 외는 ffprobe로 (없거나 실패하면 None)."""
+    duration = io_helpers.wav_duration(path)
+    if duration is not None or shutil.which("ffprobe") is None:
+        return duration
+    try:
+        output = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True,
+        ).stdout
+        return float(output.strip())
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+
+def collect_batch_items(args: argparse.Namespace) -> list[dict[str, Any]]:
+    """--input-dir의 미디어 파일 또는 --manifest 항목을 긴 것부터 정렬해 반환.
+
+    매니페스트는 경로 문자열 또는 {"input_media", "run_name", "speaker_audio"} 객체의 배열(또는 {"items": [...]}).
+    길이를 모두 알 수 있으면 길이, 하나라도 모르면 파일 크기 순으로 정렬한다.
+    """
+    if args.manifest:
+        data = json.loads(Path(args.manifest).read_text(encoding="utf-8"))
+        entries = data.get("items") if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise SystemExit(f"[pipeline] 매니페스트 형식이 올바르지 않습니다: {args.manifest}")
+        items = [{"input_media": entry} if isinstance(entry, str) else dict(entry) for entry in entries]
+        for index, item in enumerate(items):
+            if not item.get("input_media"):
+                raise SystemExit(f"[pipeline] 매니페스트 {index}번 항목에 input_media가 없습니다.")
+    else:
+        suffixes = AUDIO_SUFFIXES if args.pipeline_type in ("audio", "quick") else AUDIO_SUFFIXES | VIDEO_SUFFIXES
+        root = resolve_path(args.input_dir)
+        items = [{"input_media": str(path)} for path in sorted(root.rglob("*")) if path.is_file() and path.suffix.lower() in suffixes]
+
+    used: set[str] = set()
+    for item in items:
+        path = resolve_path(item["input_media"])
+        item["input_media"] = str(path)
+        item["size"] = path.stat().st_size if path.exists() else 0
+        item["duration_sec"] = media_duration(path) if path.exists() else None
+        # 다른 폴더의 같은 파일명이 같은 실행 폴더를 쓰지 않도록 번호를 붙인다.
+        base = sanitize_run_name(item.get("run_name") or path.stem)
+        name, suffix = base, 2
+        while name in used:
+            name, suffix = f"{base}_{suffix}", suffix + 1
+        used.add(name)
+        item["run_name"] = name
+
+    by_duration = all(item["duration_sec"] is not None for item in items)
+    items.sort(key=lambda item: item["duration_sec"] if by_duration else item["size"], reverse=True)
+    return items
+
+
+def parse_step_limits(values: list[str] | None) -> dict[str, int]:
+    limits: dict[str, int] = {}
+    for value in values or []:
+        name, _, limit = value.partition("=")
+        try:
+            limits[name.strip()] = int(limit)
+        except ValueError:
+            raise SystemExit(f"[pipeline] --step-limit는 <단계>=<개수> 형식이어야 합니다: {value}") from None
+    return limits
+
+
+def _item_report(item: dict[str, Any], plan: RunPlan | None, results: dict[str, StepResult], wall: float, error: str | None) -> dict[str, Any]:
+    failed_step = next((name for name, result in results.items() if result.status == STATUS_FAILED), None)
+    status = STATUS_SUCCESS if error is None and results and all(result.status == STATUS_SUCCESS for result in results.values()) else STATUS_FAILED
+    if error is None and failed_step is not None:
+        error = results[failed_step].error
+    return {
+        "input_media": item["input_media"],
+        "run_name": item["run_name"],
+        "run_dir": plan.context["run_dir"] if plan is not None else None,
+        "duration_sec": round(item["duration_sec"], 3) if item.get("duration_sec") is not None else None,
+        "status": status,
+        "elapsed_sec": round(wall, 3),
+        "failed_step": failed_step,
+        "error": error,
+        "steps": {
+            name: {
+                "status": result.status,
+                "elapsed_sec": round(result.elapsed, 3),
+                "cache_hit": result.cache_hit,
+                "up_to_date": result.up_to_date,
+            }
+            for name, result in results.items()
+        },
     }
-    
-    steps_to_run = pipelines.get(args.pipeline_type, [])
 
-    for step_name in steps_to_run:
-        command_template = all_steps.get(step_name)
-        if not command_template:
-            continue
-        run_step(command_template, context)
+
+def write_batch_report(report: dict[str, Any], path: Path) -> None:
+    """일괄 처리 보고서를 JSON(path)과 같은 이름의 CSV(파일마다 한 줄)로 저장."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+    step_names: list[str] = []
+    for item in report["items"]:
+        step_names.extend(name for name in item["steps"] if name not in step_names)
+    columns = ["input_media", "run_name", "status", "duration_sec", "elapsed_sec", "failed_step", "error"]
+    with path.with_suffix(".csv").open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow([*columns, *(f"{name}_sec" for name in step_names)])
+        for item in report["items"]:
+            steps = item["steps"]
+            writer.writerow(
+                [*("" if item[column] is None else item[column] for column in columns)]
+                + [steps[name]["elapsed_sec"] if name in steps else "" for name in step_names]
+            )
+
+
+def run_batch(args: argparse.Namespace, config: dict, runner: InProcessRunner | None) -> bool:
+    """여러 입력 파일을 긴 것부터 --batch-workers개씩 동시에 처리.
+
+    모든 파일의 단계는 --max-parallel(전체)과 --step-limit(단계별) 한도를 함께 쓰고,
+    한 파일의 실패는 그 파일의 남은 단계만 중단한다. 파일이 끝날 때마다 보고서를 다시 쓴다.
+    """
+    items = collect_batch_items(args)
+    if not items:
+        raise SystemExit("[pipeline] 처리할 입력 파일이 없습니다.")
+    slots = StepSlots(args.max_parallel, parse_step_limits(args.step_limit))
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = Path(args.report) if args.report else resolve_path(args.run_root) / f"batch_{stamp}.json"
+    report: dict[str, Any] = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "pipeline_type": args.pipeline_type,
+        "total": len(items),
+        "succeeded": 0,
+        "failed": 0,
+        "items": [],
+    }
+    report_lock = threading.Lock()
+    started = time.monotonic()
+    print(f"[batch] {len(items)}개 파일, 동시 파일 {args.batch_workers}개, 동시 단계 {args.max_parallel}개")
+
+    def _process(item: dict[str, Any]) -> None:
+        item_args = argparse.Namespace(**{**vars(args), "input_media": item["input_media"], "run_name": item["run_name"]})
+        if item.get("speaker_audio"):
+            item_args.speaker_audio = item["speaker_audio"]
+        plan: RunPlan | None = None
+        results: dict[str, StepResult] = {}
+        wall, error = 0.0, None
+        try:
+            plan = plan_run(item_args, config)
+            results, wall, _ = execute_plan(plan, item_args, runner, slots=slots, label=item["run_name"])
+        except (Exception, SystemExit) as exc:  # noqa: BLE001 - 파일 하나의 실패는 보고서에 남기고 계속
+            error = str(exc) or type(exc).__name__
+        entry = _item_report(item, plan, results, wall, error)
+        with report_lock:
+            report["items"].append(entry)
+            report["succeeded" if entry["status"] == STATUS_SUCCESS else "failed"] += 1
+            done = report["succeeded"] + report["failed"]
+            report["elapsed_sec"] = round(time.monotonic() - started, 3)
+            write_batch_report(report, report_path)
+        print(f"[batch] ({done}/{len(items)}) {item['run_name']} {entry['status']} ({wall:.1f}s)")
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.batch_workers), thread_name_prefix="pipeline-batch")
+    try:
+        for future in [pool.submit(_process, item) for item in items]:
+            future.result()
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        abort_running()
+        raise
+    pool.shutdown()
+
+    report["finished_at"] = datetime.now().isoformat(timespec="seconds")
+    report["elapsed_sec"] = round(time.monotonic() - started, 3)
+    write_batch_report(report, report_path)
+    print(f"[batch] 성공 {report['succeeded']} / 실패 {report['failed']} ({report['elapsed_sec']:.1f}s), 보고서: {report_path} (.csv)")
+    return report["failed"] > 0
 
 
 if __name__ == "__main__":
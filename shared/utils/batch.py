@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from shared.utils import progress
+from shared.utils.io_helpers import read_json, write_json
+
+
+LOGGER = logging.getLogger("pipeline.batch")
+
+ITEM_SUCCESS = "success"
+ITEM_FAILED = "failed"
+
+Handler = Callable[[Path, Path, dict], None]
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """모듈 CLI에 배치 옵션 추가 (--input/--output 대신 사용)."""
+    parser.add_argument(
+        "--batch-manifest",
+        help='[{"input": ..., "output": ..., "config": {...}}, ...] 형식 JSON. 한 번 적재한 모델로 모든 항목을 처리',
+    )
+    parser.add_argument("--batch-report", help="항목별 결과 JSON 경로 (기본: <매니페스트>.report.json)")
+
+
+def validate_arguments(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.batch_manifest:
+        if args.input or args.output:
+            parser.error("--batch-manifest는 --input/--output과 함께 쓸 수 없습니다.")
+    elif not (args.input and args.output):
+        parser.error("--input과 --output, 또는 --batch-manifest가 필요합니다.")
+
+
+def read_manifest(path: Path) -> list[dict[str, Any]]:
+    """매니페스트 항목 목록. 최상위가 배열이거나 {"items": [...]} 객체."""
+    data = read_json(path)
+    items = data.get("items") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValueError(f"배치 매니페스트 형식이 올바르지 않습니다: {path}")
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not item.get("input") or not item.get("output"):
+            raise ValueError(f"배치 매니페스트 {index}번 항목에 input/output이 없습니다.")
+        if not isinstance(item.get("config", {}), dict):
+            raise ValueError(f"배치 매니페스트 {index}번 항목의 config는 객체여야 합니다.")
+    return items
+
+
+def default_report_path(manifest: Path) -> Path:
+    return manifest.with_name(f"{manifest.stem}.report.json")
+
+
+def run_batch(items: list[dict[str, Any]], handler: Handler, config: dict, report_path: Path) -> dict[str, Any]:
+    """항목을 같은 프로세스에서 차례로 처리하고 항목별 상태를 report_path에 기록.
+
+    handler(input, output, config)는 단일 실행 함수(run_stt 등)로, 모델은 모듈 캐시에 남아 한 번만 적재된다.
+    항목마다 보고서를 다시 써 두므로 중간에 중단돼도 끝난 항목을 확인할 수 있다.
+    실패한 항목이 있어도 나머지는 계속 처리하며, 모든 항목이 실패한 경우에만 RuntimeError.
+    """
+    total = len(items)
+    report: dict[str, Any] = {
+        "started_at": datetime.utcnow().isoformat() + "Z",
+        "total": total,
+        "succeeded": 0,
+        "failed": 0,
+        "items": [],
+    }
+    started = time.perf_counter()
+    for index, item in enumerate(items):
+        progress.report(stage="batch", fraction=index / total, items_done=index, items_total=total)
+        entry: dict[str, Any] = {"input": str(item["input"]), "output": str(item["output"])}
+        item_started = time.perf_counter()
+        try:
+            handler(Path(item["input"]), Path(item["output"]), {**config, **(item.get("config") or {})})
+        except Exception as exc:  # noqa: BLE001 - 항목 실패는 보고서에 남기고 다음 항목으로
+            LOGGER.exception("배치 항목 실패 (%d/%d): %s", index + 1, total, item["input"])
+            entry.update(status=ITEM_FAILED, error=str(exc) or type(exc).__name__)
+            report["failed"] += 1
+        else:
+            entry["status"] = ITEM_SUCCESS
+            report["succeeded"] += 1
+        entry["elapsed_sec"] = round(time.perf_counter() - item_started, 3)
+        report["items"].append(entry)
+        write_json(report_path, report)
+
+    report["elapsed_sec"] = round(time.perf_counter() - started, 3)
+    report["finished_at"] = datetime.utcnow().isoformat() + "Z"
+    write_json(report_path, report)
+    progress.report(stage="batch", fraction=1.0, items_done=total, items_total=total)
+    LOGGER.info("배치 처리 완료: 성공 %d / 실패 %d (%.1fs)", report["succeeded"], report["failed"], report["elapsed_sec"])
+    if total and report["failed"] == total:
+        raise RuntimeError(f"배치 항목이 모두 실패했습니다. 보고서: {report_path}")
+    return report
+
+
+def run_from_args(args: argparse.Namespace, handler: Handler, config: dict) -> None:
+    """--batch-manifest가 있으면 배치로, 없으면 --input/--output 한 건을 처리."""
+    if not args.batch_manifest:
+        handler(Path(args.input), Path(args.output), config)
+        return
+    manifest = Path(args.batch_manifest)
+    report_path = Path(args.batch_report) if args.batch_report else default_report_path(manifest)
+    run_batch(read_manifest(manifest), handler, config, report_path)
@@ -0,0 +1,470 @@
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Sequence
+
+
+LOGGER = logging.getLogger("pipeline.gemini")
+
+ENDPOINT_ENV = "PADIEM_GEMINI_ENDPOINT"
+DEFAULT_ENDPOINT = "https://generativelanguage.googleapis.com/v1beta"
+DEFAULT_TIMEOUT_SEC = 300.0
+# 모델별 분당 요청 수. PADIEM_GEMINI_RPM_<모델> (예: PADIEM_GEMINI_RPM_GEMINI_2_5_FLASH)로 모델마다 조정
+DEFAULT_RPM = 60.0
+DEFAULT_BURST = 4
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE_SEC = 1.0
+BACKOFF_MAX_SEC = 60.0
+# 재시도할 HTTP 상태 (요청 한도 초과, 일시적인 서버 오류)
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# 헤지 요청: 관측한 지연 시간 p95가 지나도 응답이 없으면 같은 요청을 한 번 더 보낸다.
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY_SEC = 2.0
+_LATENCY_WINDOW = 200
+
+# 번역 등 텍스트 요청에서 쓰는 안전 필터 해제 설정
+BLOCK_NONE_SAFETY = [
+    {"category": category, "threshold": "BLOCK_NONE"}
+    for category in (
+        "HARM_CATEGORY_HARASSMENT",
+        "HARM_CATEGORY_HATE_SPEECH",
+        "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        "HARM_CATEGORY_DANGEROUS_CONTENT",
+    )
+]
+
+
+class GeminiError(RuntimeError):
+    """Gemini 호출 실패. retryable이면 재시도로 해결될 수 있는 오류(요청 한도, 일시적인 서버/네트워크 오류)."""
+
+    def __init__(self, message: str, status: int | None = None, retryable: bool = False, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _model_env(model: str) -> str:
+    return re.sub(r"[^A-Z0-9]+", "_", model.upper()).strip("_")
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지고 최대 burst개까지 쌓이는 토큰 버킷 (스레드 안전)."""
+
+    def __init__(self, rate_per_sec: float, burst: int) -> None:
+        self.rate = rate_per_sec
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """토큰을 얻을 때까지 기다리고 기다린 시간(초)을 반환."""
+        if self.rate <= 0:
+            return 0.0
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return now - started
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+@dataclass
+class GeminiResponse:
+    data: dict[str, Any]
+    latency: float
+    size: int
+    attempts: int = 1
+    hedged: bool = False
+
+    @property
+    def parts(self) -> list[dict[str, Any]]:
+        candidates = self.data.get("candidates") or []
+        if not candidates:
+            return []
+        return (candidates[0].get("content") or {}).get("parts") or []
+
+    @property
+    def text(self) -> str:
+        return "".join(part.get("text", "") for part in self.parts)
+
+    def inline_data(self) -> bytes | None:
+        """첫 번째 바이너리 파트(TTS 오디오 등)를 디코딩해 반환."""
+        for part in self.parts:
+            inline = part.get("inlineData") or part.get("inline_data")
+            if inline and inline.get("data"):
+                return base64.b64decode(inline["data"])
+        return None
+
+
+@dataclass
+class _ModelStats:
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    rate_wait_sec: float = 0.0
+    response_bytes: int = 0
+    max_response_bytes: int = 0
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=_LATENCY_WINDOW))
+
+    def percentile(self, fraction: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _part(item: Any) -> dict[str, Any]:
+    """SDK 형식 입력(문자열, {"mime_type", "data": bytes})을 REST 파트로 변환."""
+    if isinstance(item, str):
+        return {"text": item}
+    if isinstance(item, dict) and isinstance(item.get("data"), (bytes, bytearray)):
+        return {"inline_data": {"mime_type": item.get("mime_type", "application/octet-stream"), "data": base64.b64encode(item["data"]).decode("ascii")}}
+    if isinstance(item, dict):
+        return item
+    raise TypeError(f"지원하지 않는 Gemini 입력 형식입니다: {type(item).__name__}")
+
+
+def build_request(
+    contents: str | Sequence[Any],
+    generation_config: dict[str, Any] | None = None,
+    safety_settings: list[dict[str, str]] | None = None,
+) -> dict[str, Any]:
+    items = [contents] if isinstance(contents, (str, dict)) else list(contents)
+    body: dict[str, Any] = {"contents": [{"role": "user", "parts": [_part(item) for item in items]}]}
+    if generation_config:
+        body["generationConfig"] = generation_config
+    if safety_settings:
+        body["safetySettings"] = safety_settings
+    return body
+
+
+class GeminiClient:
+    """프로세스 안에서 공유하는 Gemini REST 클라이언트.
+
+    모델별 토큰 버킷으로 호출 속도를 제한하고, 429/5xx/네트워크 오류는 지수 백오프(서버가 준 Retry-After 우선)로
+    재시도하며, 지연 시간이 관측 p95를 넘는 요청은 한 번 더 보내(헤지) 먼저 온 응답을 쓴다.
+    모델별 요청 수/재시도/헤지/지연 시간/응답 크기는 stats()로 확인한다.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        endpoint: str | None = None,
+        timeout: float = DEFAULT_TIMEOUT_SEC,
+        max_retries: int | None = None,
+        backoff_base: float = BACKOFF_BASE_SEC,
+        backoff_max: float = BACKOFF_MAX_SEC,
+    ) -> None:
+        self.api_key = api_key or os.getenv("GEMINI_API_KEY") or ""
+        self.endpoint = (endpoint or os.getenv(ENDPOINT_ENV) or DEFAULT_ENDPOINT).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = int(_env_float("PADIEM_GEMINI_MAX_RETRIES", DEFAULT_MAX_RETRIES)) if max_retries is None else max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._stats: dict[str, _ModelStats] = {}
+
+    # ---- 내부 도구 ----
+
+    def _bucket(self, model: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(model)
+            if bucket is None:
+                rpm = _env_float(f"PADIEM_GEMINI_RPM_{_model_env(model)}", _env_float("PADIEM_GEMINI_RPM", DEFAULT_RPM))
+                bucket = TokenBucket(rpm / 60.0, int(_env_float("PADIEM_GEMINI_BURST", DEFAULT_BURST)))
+                self._buckets[model] = bucket
+            return bucket
+
+    def _model_stats(self, model: str) -> _ModelStats:
+        with self._lock:
+            return self._stats.setdefault(model, _ModelStats())
+
+    def _hedge_delay(self, model: str) -> float | None:
+        if os.getenv("PADIEM_GEMINI_HEDGE", "1").strip().lower() in ("0", "false", "no", "off"):
+            return None
+        fixed = os.getenv("PADIEM_GEMINI_HEDGE_SEC")
+        if fixed:
+            seconds = _env_float("PADIEM_GEMINI_HEDGE_SEC", 0)
+            return seconds if seconds > 0 else None
+        stats = self._model_stats(model)
+        with self._lock:
+            if len(stats.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            p95 = stats.percentile(0.95)
+        return max(HEDGE_MIN_DELAY_SEC, p95 or 0)
+
+    def _open(self, url: str, body: dict[str, Any]):
+        request = urllib.request.Request(
+            url,
+            data=json.dumps(body).encode("utf-8"),
+            headers={"Content-Type": "application/json", "x-goog-api-key": self.api_key},
+            method="POST",
+        )
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as exc:
+            detail = exc.read().decode("utf-8", errors="replace")[:500]
+            retry_after = exc.headers.get("Retry-After") if exc.headers else None
+            try:
+                retry_after_sec = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after_sec = None
+            raise GeminiError(
+                f"Gemini 요청 실패 (HTTP {exc.code}): {detail}",
+                status=exc.code,
+                retryable=exc.code in RETRYABLE_STATUSES,
+                retry_after=retry_after_sec,
+            ) from exc
+        except (urllib.error.URLError, TimeoutError, ConnectionError) as exc:
+            raise GeminiError(f"Gemini 연결 실패: {exc}", retryable=True) from exc
+
+    def _post(self, model: str, body: dict[str, Any]) -> GeminiResponse:
+        started = time.monotonic()
+        with self._open(f"{self.endpoint}/models/{model}:generateContent", body) as response:
+            try:
+                raw = response.read()
+            except (OSError, TimeoutError) as exc:
+                raise GeminiError(f"Gemini 응답 수신 실패: {exc}", retryable=True) from exc
+        try:
+            data = json.loads(raw.decode("utf-8"))
+        except ValueError as exc:
+            raise GeminiError("Gemini 응답이 JSON이 아닙니다.", retryable=True) from exc
+        if not data.get("candidates"):
+            reason = (data.get("promptFeedback") or {}).get("blockReason") or "응답 후보 없음"
+            raise GeminiError(f"Gemini가 응답을 생성하지 않았습니다: {reason}")
+        return GeminiResponse(data=data, latency=time.monotonic() - started, size=len(raw))
+
+    def _hedged(self, model: str, body: dict[str, Any], delay: float | None) -> GeminiResponse:
+        """요청을 보내고 delay초 안에 응답이 없으면 같은 요청을 한 번 더 보내 먼저 성공한 응답을 반환.
+
+        늦게 끝난 요청의 결과는 버린다. 헤지 요청도 속도 제한 토큰을 쓰며, 토큰이 없으면 보내지 않는다.
+        """
+        if delay is None:
+            return self._post(model, body)
+        results: queue.Queue[tuple[str, BaseException | None, GeminiResponse | None]] = queue.Queue()
+
+        def _run(name: str) -> None:
+            try:
+                results.put((name, None, self._post(model, body)))
+            except BaseException as exc:  # noqa: BLE001 - 호출 스레드로 전달
+                results.put((name, exc, None))
+
+        threading.Thread(target=_run, args=("primary",), name="gemini-request", daemon=True).start()
+        try:
+            outcome = [results.get(timeout=delay)]
+        except queue.Empty:
+            outcome = []
+        if not outcome and self._bucket(model).try_acquire():
+            stats = self._model_stats(model)
+            with self._lock:
+                stats.hedges += 1
+            LOGGER.info("Gemini %s 응답이 %.1f초 넘게 없어 헤지 요청을 보냅니다.", model, delay)
+            threading.Thread(target=_run, args=("hedge",), name="gemini-hedge", daemon=True).start()
+            first_error: BaseException | None = None
+            for _ in range(2):
+                name, error, response = results.get()
+                if response is not None:
+                    response.hedged = True
+                    if name == "hedge":
+                        with self._lock:
+                            stats.hedge_wins += 1
+                    return response
+                first_error = first_error or error
+            raise first_error  # type: ignore[misc]
+
+        _, error, response = outcome[0] if outcome else results.get()
+        if error is not None:
+            raise error
+        return response  # type: ignore[return-value]
+
+    def _backoff(self, attempt: int, error: GeminiError) -> float:
+        if error.retry_after is not None:
+            return min(self.backoff_max, error.retry_after)
+        delay = min(self.backoff_max, self.backoff_base * 2**attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    # ---- 공개 API ----
+
+    def generate(
+        self,
+        model: str,
+        contents: str | Sequence[Any],
+        generation_config: dict[str, Any] | None = None,
+        safety_settings: list[dict[str, str]] | None = None,
+        hedge: bool = True,
+    ) -> GeminiResponse:
+        """generateContent 호출 (속도 제한 → 요청/헤지 → 재시도). 재시도해도 실패하면 GeminiError.
+
+        hedge=False는 오디오 업로드처럼 요청이 크거나 비용이 큰 호출에 쓴다.
+        """
+        if not self.api_key:
+            raise GeminiError("GEMINI_API_KEY가 설정되지 않았습니다.")
+        body = build_request(contents, generation_config, safety_settings)
+        stats = self._model_stats(model)
+        bucket = self._bucket(model)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            with self._lock:
+                stats.requests += 1
+                stats.rate_wait_sec += waited
+            started = time.monotonic()
+            try:
+                response = self._hedged(model, body, self._hedge_delay(model) if hedge else None)
+            except GeminiError as exc:
+                if not exc.retryable or attempt >= self.max_retries:
+                    with self._lock:
+                        stats.failures += 1
+                    raise
+                delay = self._backoff(attempt, exc)
+                attempt += 1
+                with self._lock:
+                    stats.retries += 1
+                LOGGER.warning("Gemini %s 요청 실패, %.1f초 후 재시도합니다 (%d/%d): %s", model, delay, attempt, self.max_retries, exc)
+                time.sleep(delay)
+                continue
+            elapsed = time.monotonic() - started
+            response.latency = elapsed
+            response.attempts = attempt + 1
+            with self._lock:
+                stats.latencies.append(elapsed)
+                stats.response_bytes += response.size
+                stats.max_response_bytes = max(stats.max_response_bytes, response.size)
+            LOGGER.info(
+                "Gemini %s 응답 %.2f초, %d bytes (시도 %d%s)",
+                model,
+                elapsed,
+                response.size,
+                response.attempts,
+                ", 헤지" if response.hedged else "",
+            )
+            return response
+
+    def stream(
+        self,
+        model: str,
+        contents: str | Sequence[Any],
+        generation_config: dict[str, Any] | None = None,
+        safety_settings: list[dict[str, str]] | None = None,
+    ) -> Iterator[str]:
+        """streamGenerateContent(SSE)로 텍스트 조각을 차례로 반환.
+
+        연결을 여는 단계까지만 재시도하고, 조각을 받기 시작한 뒤의 오류는 그대로 전달한다 (중복 출력 방지).
+        """
+        if not self.api_key:
+            raise GeminiError("GEMINI_API_KEY가 설정되지 않았습니다.")
+        body = build_request(contents, generation_config, safety_settings)
+        stats = self._model_stats(model)
+        bucket = self._bucket(model)
+        attempt = 0
+        while True:
+            waited = bucket.acquire()
+            with self._lock:
+                stats.requests += 1
+                stats.rate_wait_sec += waited
+            try:
+                response = self._open(f"{self.endpoint}/models/{model}:streamGenerateContent?alt=sse", body)
+                break
+            except GeminiError as exc:
+                if not exc.retryable or attempt >= self.max_retries:
+                    with self._lock:
+                        stats.failures += 1
+                    raise
+                delay = self._backoff(attempt, exc)
+                attempt += 1
+                with self._lock:
+                    stats.retries += 1
+                LOGGER.warning("Gemini %s 스트리밍 연결 실패, %.1f초 후 재시도합니다 (%d/%d): %s", model, delay, attempt, self.max_retries, exc)
+                time.sleep(delay)
+
+        started = time.monotonic()
+        size = 0
+        with response:
+            for line in response:
+                size += len(line)
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                chunk = GeminiResponse(data=json.loads(line[5:].decode("utf-8")), latency=0.0, size=len(line))
+                if chunk.text:
+                    yield chunk.text
+        with self._lock:
+            stats.latencies.append(time.monotonic() - started)
+            stats.response_bytes += size
+            stats.max_response_bytes = max(stats.max_response_bytes, size)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """모델별 호출 지표 (요청/실패/재시도/헤지 수, 속도 제한 대기, 지연 시간 p50/p95, 응답 크기)."""
+        with self._lock:
+            report: dict[str, dict[str, Any]] = {}
+            for model, stats in self._stats.items():
+                p50, p95 = stats.percentile(0.5), stats.percentile(0.95)
+                report[model] = {
+                    "requests": stats.requests,
+                    "failures": stats.failures,
+                    "retries": stats.retries,
+                    "hedges": stats.hedges,
+                    "hedge_wins": stats.hedge_wins,
+                    "rate_wait_sec": round(stats.rate_wait_sec, 3),
+                    "latency_sec": {
+                        "p50": round(p50, 3) if p50 is not None else None,
+                        "p95": round(p95, 3) if p95 is not None else None,
+                    },
+                    "response_bytes": {"total": stats.response_bytes, "max": stats.max_response_bytes},
+                }
+            return report
+
+
+_clients: dict[str, GeminiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(api_key: str | None = None) -> GeminiClient:
+    """API 키별로 하나씩 공유하는 클라이언트 (키를 주지 않으면 GEMINI_API_KEY)."""
+    key = api_key or os.getenv("GEMINI_API_KEY") or ""
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GeminiClient(api_key=key)
+            _clients[key] = client
+        return client
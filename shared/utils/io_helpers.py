@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import copy
 import json
 import logging
 import logging.config
+import threading
 import wave
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Iterable
 
@@ -15,8 +18,56 @@ def ensure_parent(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
+# 오케스트레이터 --in-process 실행 시, 다음 단계가 같은 인터프리터에서 방금 쓴 JSON을
+# 디스크에서 다시 읽고 파싱하지 않도록 경로별로 보관 (파일 크기/수정 시각이 같을 때만 사용)
+JSON_MEMO_LIMIT = 32
+_json_memo: OrderedDict[str, tuple[int, int, Any]] | None = None
+_json_memo_limit = JSON_MEMO_LIMIT
+_json_memo_lock = threading.Lock()
+
+
+def enable_json_memo(enabled: bool = True, max_entries: int = JSON_MEMO_LIMIT) -> None:
+    """write_json으로 쓴 데이터를 메모리에 보관해 read_json이 재사용하도록 설정.
+
+    최대 max_entries개까지 보관하고, 넘으면 가장 오래 쓰지 않은 것부터 버린다.
+    """
+    global _json_memo, _json_memo_limit
+    with _json_memo_lock:
+        _json_memo = OrderedDict() if enabled else None
+        _json_memo_limit = max(1, max_entries)
+
+
+def forget_json_memo(root: Path) -> int:
+    """root 아래 경로의 보관본을 버리고 버린 개수를 반환 (실행 하나가 끝났을 때)."""
+    prefix = root.resolve()
+    with _json_memo_lock:
+        if _json_memo is None:
+            return 0
+        stale = [path for path in _json_memo if Path(path).is_relative_to(prefix)]
+        for path in stale:
+            del _json_memo[path]
+    return len(stale)
+
+
+def _memo_key(json_path: Path) -> tuple[str, int, int] | None:
+    try:
+        stat = json_path.stat()
+    except OSError:
+        return None
+    return str(json_path.resolve()), stat.st_size, stat.st_mtime_ns
+
+
 def read_json(json_path: Path) -> Any:
     """JSON 파일 읽기."""
+    if _json_memo is not None:
+        key = _memo_key(json_path)
+        with _json_memo_lock:
+            entry = _json_memo.get(key[0]) if key and _json_memo is not None else None
+            if entry is not None:
+                _json_memo.move_to_end(key[0])
+        if entry is not None and entry[:2] == key[1:]:
+            # 읽은 쪽이 세그먼트를 고쳐도 보관본과 다른 단계에 영향이 없도록 사본을 준다.
+            return copy.deepcopy(entry[2])
     with json_path.open("r", encoding="utf-8") as f:
         return json.load(f)
 
@@ -26,6 +77,15 @@ def write_json(json_path: Path, data: Any) -> None:
     ensure_parent(json_path)
     with json_path.open("w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    if _json_memo is not None:
+        key = _memo_key(json_path)
+        if key is not None:
+            with _json_memo_lock:
+                if _json_memo is not None:
+                    _json_memo[key[0]] = (key[1], key[2], copy.deepcopy(data))
+                    _json_memo.move_to_end(key[0])
+                    while len(_json_memo) > _json_memo_limit:
+                        _json_memo.popitem(last=False)
 
 
 def read_yaml(yaml_path: Path) -> dict:
@@ -49,6 +109,18 @@ def read_wav(wav_path: Path) -> tuple[dict[str, int], bytes]:
     return params, frames
 
 
+def wav_duration(path: Path) -> float | None:
+    """WAV 파일 길이(초). WAV가 아니거나 읽을 수 없으면 None."""
+    if path.suffix.lower() != ".wav":
+        return None
+    try:
+        with wave.open(str(path), "rb") as wav:
+            rate = wav.getframerate()
+            return wav.getnframes() / rate if rate else None
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
 def write_wav(
     wav_path: Path,
     frames: bytes,
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+from typing import Any
+
+
+LOGGER = logging.getLogger("pipeline.process")
+
+# SIGTERM 후 강제 종료(SIGKILL)까지 기다리는 시간(초)
+DEFAULT_GRACE_SEC = 3.0
+
+
+def new_group_kwargs() -> dict[str, Any]:
+    """자식 프로세스를 별도 프로세스 그룹으로 띄우기 위한 Popen 인자.
+
+    모듈이 다시 띄우는 ffmpeg/추론 스크립트까지 같은 그룹에 묶여 kill_tree()로 함께 정리된다.
+    """
+    if sys.platform == "win32":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+
+def kill_tree(process: subprocess.Popen, grace: float = DEFAULT_GRACE_SEC) -> None:
+    """프로세스와 그 자식 프로세스 전체를 종료 (호출 측을 막지 않음).
+
+    POSIX는 프로세스 그룹에 SIGTERM을 보내고 grace초 뒤에도 남아 있으면 SIGKILL,
+    Windows는 taskkill /T /F로 자식까지 즉시 종료한다.
+    """
+    if process.poll() is not None:
+        return
+    if sys.platform == "win32":
+        subprocess.run(
+            ["taskkill", "/T", "/F", "/PID", str(process.pid)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+        return
+
+    try:
+        pgid = os.getpgid(process.pid)
+    except ProcessLookupError:
+        return
+    if pgid != process.pid:
+        # 별도 그룹으로 띄우지 않은 프로세스는 그룹 전체(=백엔드 자신)를 건드리지 않도록 단독 종료
+        process.terminate()
+        pgid = None
+    else:
+        _signal_group(pgid, signal.SIGTERM)
+
+    def _force_kill() -> None:
+        try:
+            process.wait(grace)
+        except subprocess.TimeoutExpired:
+            LOGGER.warning("프로세스 %s가 종료되지 않아 강제 종료합니다.", process.pid)
+            process.kill()
+        if pgid is not None:
+            # 리더가 먼저 끝나도 남아 있는 자식(ffmpeg 등)까지 정리
+            _signal_group(pgid, signal.SIGKILL)
+
+    threading.Thread(target=_force_kill, name=f"kill-tree-{process.pid}", daemon=True).start()
+
+
+def _signal_group(pgid: int, sig: int) -> None:
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def rss_bytes(pid: int) -> int:
+    """프로세스 상주 메모리(VmRSS) 바이트 (읽을 수 없으면 0)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii", errors="replace") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def group_rss_bytes(pgids: dict[int, str]) -> dict[str, int]:
+    """프로세스 그룹별(=작업/상주 워커별) RSS 합계를 레이블로 묶어 반환 (/proc가 있는 Linux 전용)."""
+    totals: dict[str, int] = {}
+    if not pgids or not os.path.isdir("/proc"):
+        return totals
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/stat", encoding="ascii", errors="replace") as f:
+                # comm에 공백/괄호가 있을 수 있으므로 마지막 ')' 뒤에서 필드를 자른다.
+                fields = f.read().rsplit(")", 1)[1].split()
+            pgrp = int(fields[2])
+        except (OSError, ValueError, IndexError):
+            continue
+        label = pgids.get(pgrp)
+        if label is not None:
+            totals[label] = totals.get(label, 0) + rss_bytes(int(entry.name))
+    return totals
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Client, Connection, Listener
+from typing import Any, Callable, Iterator, TextIO
+
+
+LOGGER = logging.getLogger("pipeline.progress")
+
+ADDRESS_ENV = "PADIEM_PROGRESS_ADDRESS"
+AUTHKEY_ENV = "PADIEM_PROGRESS_AUTHKEY"
+JOB_ENV = "PADIEM_JOB_ID"
+
+_lock = threading.RLock()
+_local = threading.local()
+_sender: Callable[[dict[str, Any]], None] | None = None
+_env_sender: Callable[[dict[str, Any]], None] | None = None
+_env_checked = False
+
+
+def set_channel(sender: Callable[[dict[str, Any]], None] | None) -> None:
+    """이벤트 전송 함수를 지정 (상주 워커가 요청마다 IPC 연결로 지정, None이면 해제)."""
+    global _sender
+    with _lock:
+        _sender = sender
+
+
+def _connect_from_env() -> Callable[[dict[str, Any]], None] | None:
+    """백엔드가 넘긴 환경 변수의 진행률 소켓에 접속 (없거나 실패하면 None)."""
+    global _env_sender, _env_checked
+    if _env_checked:
+        return _env_sender
+    _env_checked = True
+    address = os.getenv(ADDRESS_ENV)
+    if not address:
+        return None
+    try:
+        host, port = address.rsplit(":", 1)
+        conn = Client((host, int(port)), authkey=bytes.fromhex(os.environ[AUTHKEY_ENV]))
+    except (OSError, KeyError, ValueError) as exc:
+        LOGGER.debug("진행률 채널 연결 실패: %s", exc)
+        return None
+    job_id = os.getenv(JOB_ENV)
+    _env_sender = lambda event: conn.send({"job_id": job_id, "event": event})  # noqa: E731
+    return _env_sender
+
+
+def enabled() -> bool:
+    with _lock:
+        return (_sender or _connect_from_env()) is not None
+
+
+def emit(event: dict[str, Any]) -> None:
+    """진행률 이벤트를 전송. 채널이 없으면(CLI 단독 실행 등) 아무 일도 하지 않는다."""
+    global _env_sender
+    # 전송 실패 로그가 TeeStream을 거쳐 다시 emit을 부르는 재귀를 막는다.
+    if getattr(_local, "emitting", False):
+        return
+    _local.emitting = True
+    try:
+        with _lock:
+            sender = _sender or _connect_from_env()
+            if sender is None:
+                return
+            try:
+                sender({"ts": time.time(), **event})
+            except (OSError, EOFError, ValueError) as exc:
+                LOGGER.debug("진행률 이벤트 전송 실패: %s", exc)
+                if sender is _env_sender:
+                    _env_sender = None
+    finally:
+        _local.emitting = False
+
+
+def report(stage: str | None = None, fraction: float | None = None, **fields: Any) -> None:
+    """현재 단계와 진행률(0~1) 보고. segments_done, rtf 등 부가 정보는 키워드로 전달."""
+    event: dict[str, Any] = {"type": "progress", **fields}
+    if stage is not None:
+        event["stage"] = stage
+    if fraction is not None:
+        event["fraction"] = round(max(0.0, min(float(fraction), 1.0)), 4)
+    emit(event)
+
+
+@contextmanager
+def stage(name: str, **fields: Any) -> Iterator[None]:
+    """구간 시작/종료를 보고해 백엔드가 단계별 소요 시간을 기록하게 한다."""
+    emit({"type": "stage", "stage": name, "status": "start", **fields})
+    started = time.perf_counter()
+    status = "error"
+    try:
+        yield
+        status = "end"
+    finally:
+        emit({"type": "stage", "stage": name, "status": status, "elapsed_sec": round(time.perf_counter() - started, 3)})
+
+
+def log_line(line: str) -> None:
+    emit({"type": "log", "line": line})
+
+
+class TeeStream:
+    """원래 스트림에 그대로 쓰면서 완성된 줄을 콜백으로 넘기는 래퍼 (상주 워커의 로그 수집용)."""
+
+    def __init__(self, stream: TextIO, on_line: Callable[[str], None]) -> None:
+        self._stream = stream
+        self._on_line = on_line
+        self._buffer = ""
+
+    def write(self, text: str) -> int:
+        written = self._stream.write(text)
+        self._buffer += text
+        *lines, self._buffer = self._buffer.replace("\r", "\n").split("\n")
+        for line in lines:
+            if line.strip():
+                self._on_line(line)
+        return written
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+class EventServer:
+    """모듈 프로세스가 접속하는 로컬 진행률 소켓 (multiprocessing.connection, 127.0.0.1).
+
+    env_for(job_id)를 자식 프로세스 환경 변수로 넘기면, 자식의 emit() 이벤트가 handler(job_id, event)로 전달된다.
+    """
+
+    def __init__(self, handler: Callable[[str, dict[str, Any]], None]) -> None:
+        self._handler = handler
+        self._authkey = os.urandom(16)
+        self._listener = Listener(("127.0.0.1", 0), authkey=self._authkey)
+        host, port = self._listener.address
+        self.address = f"{host}:{port}"
+        self._closed = False
+        # 연결별 수신 스레드와 그 연결이 보낸 job_id (drain()에서 남은 이벤트를 다 읽을 때까지 기다리는 데 사용)
+        self._readers: dict[threading.Thread, str | None] = {}
+        self._readers_lock = threading.Lock()
+        threading.Thread(target=self._accept_loop, name="progress-accept", daemon=True).start()
+
+    def env_for(self, job_id: str) -> dict[str, str]:
+        return {
+            ADDRESS_ENV: self.address,
+            AUTHKEY_ENV: self._authkey.hex(),
+            JOB_ENV: job_id,
+        }
+
+    def _accept_loop(self) -> None:
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                if self._closed:
+                    return
+                LOGGER.warning("진행률 채널 연결 수락 실패", exc_info=True)
+                continue
+            reader = threading.Thread(target=self._read_loop, args=(conn,), name="progress-reader", daemon=True)
+            with self._readers_lock:
+                self._readers[reader] = None
+            reader.start()
+
+    def _read_loop(self, conn: Connection) -> None:
+        current = threading.current_thread()
+        try:
+            while True:
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    return
+                if isinstance(message, dict) and message.get("job_id") and isinstance(message.get("event"), dict):
+                    with self._readers_lock:
+                        self._readers[current] = message["job_id"]
+                    self._handler(message["job_id"], message["event"])
+        finally:
+            conn.close()
+            with self._readers_lock:
+                self._readers.pop(current, None)
+
+    def drain(self, job_id: str, timeout: float = 2.0) -> None:
+        """job_id 프로세스가 끝난 뒤 소켓에 남은 이벤트를 모두 처리할 때까지 대기 (최대 timeout초)."""
+        deadline = time.monotonic() + timeout
+        with self._readers_lock:
+            readers = [reader for reader, owner in self._readers.items() if owner == job_id]
+        for reader in readers:
+            reader.join(max(0.0, deadline - time.monotonic()))
+
+    def close(self) -> None:
+        self._closed = True
+        self._listener.close()
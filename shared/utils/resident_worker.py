@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+from shared.utils import process_tree, progress
+
+
+LOGGER = logging.getLogger("pipeline.worker")
+
+ADDRESS_ENV = "PADIEM_WORKER_ADDRESS"
+AUTHKEY_ENV = "PADIEM_WORKER_AUTHKEY"
+
+_CONNECT_TIMEOUT_SEC = 60.0
+_POLL_INTERVAL_SEC = 0.5
+
+
+def in_worker_mode() -> bool:
+    """현재 프로세스가 상주 워커로 실행 중인지 여부."""
+    return bool(os.getenv(ADDRESS_ENV))
+
+
+def run_entrypoint(main: Callable[[Sequence[str] | None], None]) -> None:
+    """모듈 run.py의 진입점.
+
+    상주 워커 환경 변수가 있으면 요청 루프를 돌며 같은 프로세스에서 main(argv)를
+    반복 호출하고(모델은 모듈 캐시에 유지), 없으면 일반 CLI처럼 한 번 실행한다.
+    """
+    if in_worker_mode():
+        serve(main)
+    else:
+        main(None)
+
+
+def serve(main: Callable[[Sequence[str] | None], None]) -> None:
+    """백엔드 측 Listener에 접속해 {"argv": [...]} 요청을 순차 처리.
+
+    요청 처리 중 progress.report()/stage() 이벤트와 stdout/stderr 줄은
+    {"event": {...}} 메시지로 먼저 전달하고, 마지막에 결과 메시지를 보낸다.
+    """
+    host, port = os.environ[ADDRESS_ENV].rsplit(":", 1)
+    authkey = bytes.fromhex(os.environ[AUTHKEY_ENV])
+    conn = Client((host, int(port)), authkey=authkey)
+    sys.stdout = progress.TeeStream(sys.stdout, progress.log_line)
+    sys.stderr = progress.TeeStream(sys.stderr, progress.log_line)
+    LOGGER.info("상주 워커 준비 완료 (pid=%s)", os.getpid())
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError:
+                break
+            if not isinstance(message, dict) or message.get("type") == "shutdown":
+                break
+            progress.set_channel(lambda event: conn.send({"event": event}))
+            try:
+                reply = _handle(main, list(message.get("argv", [])))
+            finally:
+                progress.set_channel(None)
+            conn.send(reply)
+    finally:
+        conn.close()
+
+
+def _handle(main: Callable[[Sequence[str] | None], None], argv: list[str]) -> dict[str, Any]:
+    started = time.perf_counter()
+    error: str | None = None
+    try:
+        main(argv)
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            error = f"모듈이 종료 코드 {exc.code}로 끝났습니다."
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.exception("상주 워커 요청 처리 실패")
+        error = str(exc) or exc.__class__.__name__
+    return {"ok": error is None, "error": error, "elapsed_sec": time.perf_counter() - started}
+
+
+class ResidentWorker:
+    """run.py를 상주 프로세스로 띄우고 로컬 IPC로 작업을 전달하는 클라이언트."""
+
+    def __init__(
+        self,
+        script: str | Path,
+        python: str = sys.executable,
+        cwd: str | Path | None = None,
+        env: dict[str, str] | None = None,
+        new_group: bool = False,
+    ) -> None:
+        self.script = str(script)
+        self.python = python
+        self.cwd = str(cwd) if cwd else None
+        self.env = env
+        # True면 워커를 별도 프로세스 그룹으로 띄워 kill() 시 자식 프로세스까지 함께 종료
+        self.new_group = new_group
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._conn: Connection | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid if self._process else None
+
+    @property
+    def alive(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _start(self) -> None:
+        authkey = os.urandom(16)
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        host, port = listener.address
+        env = {**os.environ, **(self.env or {})}
+        env[ADDRESS_ENV] = f"{host}:{port}"
+        env[AUTHKEY_ENV] = authkey.hex()
+
+        LOGGER.info("상주 워커 시작: %s", self.script)
+        group_kwargs = process_tree.new_group_kwargs() if self.new_group else {}
+        process = subprocess.Popen([self.python, self.script], cwd=self.cwd, env=env, **group_kwargs)
+
+        accepted: list[Connection] = []
+        accept_error: list[BaseException] = []
+
+        def _accept() -> None:
+            try:
+                accepted.append(listener.accept())
+            except BaseException as exc:  # noqa: BLE001 - listener가 닫히면 발생
+                accept_error.append(exc)
+
+        thread = threading.Thread(target=_accept, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + _CONNECT_TIMEOUT_SEC
+        while thread.is_alive() and process.poll() is None and time.monotonic() < deadline:
+            thread.join(_POLL_INTERVAL_SEC)
+        listener.close()
+        thread.join(1.0)
+
+        if not accepted:
+            process.kill()
+            process.wait()
+            raise RuntimeError(f"상주 워커가 연결되지 않았습니다: {self.script}")
+
+        self._process = process
+        self._conn = accepted[0]
+
+    def call(
+        self,
+        argv: Sequence[str],
+        on_event: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """워커에서 main(argv)를 실행하고 결과를 반환 (실패 시 RuntimeError).
+
+        처리 도중 워커가 보낸 진행률/로그 이벤트는 on_event로 전달한다.
+        """
+        with self._lock:
+            if not self.alive:
+                self._reset()
+                self._start()
+            assert self._conn is not None and self._process is not None
+            self._conn.send({"argv": list(argv)})
+            while True:
+                while not self._conn.poll(_POLL_INTERVAL_SEC):
+                    if self._process.poll() is not None:
+                        code = self._process.returncode
+                        self._reset()
+                        raise RuntimeError(f"상주 워커가 비정상 종료되었습니다 (Exit code: {code})")
+                try:
+                    message = self._conn.recv()
+                except (EOFError, OSError) as exc:
+                    self._reset()
+                    raise RuntimeError("상주 워커와의 연결이 끊어졌습니다.") from exc
+                if isinstance(message, dict) and "event" in message:
+                    if on_event is not None:
+                        try:
+                            on_event(message["event"])
+                        except Exception:  # noqa: BLE001 - 이벤트 처리 실패가 작업을 막지 않도록
+                            LOGGER.exception("상주 워커 이벤트 처리 실패")
+                    continue
+                reply = message
+                break
+            self.requests += 1
+
+        if not reply.get("ok"):
+            raise RuntimeError(f"모듈 실행 중 오류 발생: {reply.get('error')}")
+        return reply
+
+    def _reset(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+        if self._process is not None and self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+        self._conn = None
+        self._process = None
+        self.requests = 0
+
+    def kill(self) -> None:
+        """처리 중인 요청과 무관하게 워커 프로세스를 강제 종료 (call()은 RuntimeError로 끝남)."""
+        process = self._process
+        if process is not None and process.poll() is None:
+            if self.new_group:
+                process_tree.kill_tree(process)
+            else:
+                process.kill()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            if self._conn is not None and self.alive:
+                try:
+                    self._conn.send({"type": "shutdown"})
+                    assert self._process is not None
+                    self._process.wait(timeout)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._reset()
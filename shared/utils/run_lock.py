@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+# 실행 중인 오케스트레이터가 실행 폴더에 남기는 잠금 파일 (보존 정책 정리가 건너뛴다)
+RUN_LOCK_NAME = ".run.lock"
+# 소유 프로세스를 확인할 수 없는 잠금(다른 호스트, Windows)은 이 시간이 지나면 남은 것으로 본다.
+STALE_LOCK_SEC = 24 * 3600
+
+
+def _pid_alive(pid: int) -> bool | None:
+    """같은 호스트의 프로세스가 살아 있는지 (확인할 수 없으면 None)."""
+    if pid <= 0 or sys.platform == "win32":
+        # Windows의 os.kill(pid, 0)은 프로세스를 종료하므로 사용하지 않는다.
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+@contextmanager
+def hold(run_dir: Path) -> Iterator[Path]:
+    """실행하는 동안 run_dir에 잠금 파일을 두고, 끝나면 지운다."""
+    path = run_dir / RUN_LOCK_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"pid": os.getpid(), "host": socket.gethostname(), "started_at": time.time()}
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    try:
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def is_locked(run_dir: Path, now: float | None = None) -> bool:
+    """run_dir을 실행 중인 오케스트레이터가 있으면 True (소유 프로세스가 종료된 잠금은 무시)."""
+    path = run_dir / RUN_LOCK_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        # 쓰는 중이거나 깨진 잠금은 실행 중으로 본다.
+        return True
+    alive = _pid_alive(int(data.get("pid") or 0)) if data.get("host") == socket.gethostname() else None
+    if alive is not None:
+        return alive
+    now = time.time() if now is None else now
+    return now - mtime < STALE_LOCK_SEC
@@ -0,0 +1,356 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Sequence
+
+import yaml
+
+
+LOGGER = logging.getLogger("pipeline.cache")
+
+ENABLED_ENV = "PADIEM_STEP_CACHE"
+DIR_ENV = "PADIEM_CACHE_DIR"
+MAX_BYTES_ENV = "PADIEM_CACHE_MAX_BYTES"
+
+DEFAULT_MAX_BYTES = 20 * 1024**3
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+# 모듈 CLI 인자 중 입력 파일/출력 파일/설정 파일을 가리키는 옵션
+INPUT_FLAGS = ("--input", "--video", "--audio", "--input_video", "--input_audio", "--speaker-wav")
+OUTPUT_FLAGS = ("--output", "--output_video")
+CONFIG_FLAG = "--config"
+
+_HASH_CHUNK = 1024 * 1024
+# file_digest 메모 최대 항목 수 (가장 오래 쓰지 않은 것부터 버림)
+_DIGEST_MEMO_LIMIT = 4096
+# 모듈이 import하는 공용 코드. 바뀌면 모든 단계의 키가 바뀐다.
+SHARED_CODE_DIR = ROOT_DIR / "shared" / "utils"
+_META_FILE = "meta.json"
+
+
+@dataclass
+class StepSpec:
+    """캐시 키 계산에 쓰는 명령 분해 결과."""
+
+    script: Path
+    inputs: list[Path]
+    outputs: list[Path]
+    config: Path | None
+    args: list[str]
+    # 나머지 인자 중 존재하는 파일을 가리키는 값 (--speaker-audio 등)
+    arg_files: list[Path] = field(default_factory=list)
+
+
+def _resolve(value: str, cwd: Path) -> Path:
+    path = Path(value)
+    return path if path.is_absolute() else (cwd / path).resolve()
+
+
+def parse_command(command: Sequence[str], cwd: Path = ROOT_DIR) -> StepSpec | None:
+    """`python <script> --input ... --output ...` 형태의 모듈 명령을 분해 (스크립트 명령이 아니면 None)."""
+    if len(command) < 2 or not command[1].endswith(".py"):
+        return None
+    script = _resolve(command[1], cwd)
+    inputs: list[Path] = []
+    outputs: list[Path] = []
+    config: Path | None = None
+    args: list[str] = []
+    arg_files: list[Path] = []
+    rest = list(command[2:])
+    index = 0
+    while index < len(rest):
+        flag = rest[index]
+        value = rest[index + 1] if index + 1 < len(rest) else None
+        if value is not None and flag in INPUT_FLAGS:
+            inputs.append(_resolve(value, cwd))
+        elif value is not None and flag in OUTPUT_FLAGS:
+            outputs.append(_resolve(value, cwd))
+        elif value is not None and flag == CONFIG_FLAG:
+            config = _resolve(value, cwd)
+        else:
+            args.append(flag)
+            if not flag.startswith("-") and _resolve(flag, cwd).is_file():
+                arg_files.append(_resolve(flag, cwd))
+            index += 1
+            continue
+        index += 2
+    if config is None:
+        # --config를 생략하면 모듈이 기본 설정을 쓰므로 그 내용을 키에 포함
+        default = script.parent / "config" / "settings.yaml"
+        config = default if default.exists() else None
+    return StepSpec(script, inputs, outputs, config, args, arg_files)
+
+
+_digest_lock = threading.Lock()
+_digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용 SHA-256 (경로/크기/수정 시각이 같으면 이전 계산 결과를 재사용)."""
+    stat = path.stat()
+    memo_key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        cached = _digests.get(memo_key)
+        if cached is not None:
+            _digests.move_to_end(memo_key)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _digest_lock:
+        _digests[memo_key] = value
+        while len(_digests) > _DIGEST_MEMO_LIMIT:
+            _digests.popitem(last=False)
+    return value
+
+
+def module_version(script: Path) -> str:
+    """모듈 버전: 실행 스크립트와 같은 폴더, 그리고 공용 코드(shared/utils)의 파이썬 소스 전체 해시."""
+    digest = hashlib.sha256()
+    for folder in (script.parent, SHARED_CODE_DIR):
+        for source in sorted(folder.glob("*.py")):
+            digest.update(f"{folder.name}/{source.name}".encode("utf-8"))
+            digest.update(file_digest(source).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _config_values(node: Any) -> list[str]:
+    if isinstance(node, dict):
+        return [value for item in node.values() for value in _config_values(item)]
+    if isinstance(node, list):
+        return [value for item in node for value in _config_values(item)]
+    return [node] if isinstance(node, str) and node.strip() else []
+
+
+def config_files(config: Path) -> list[Path]:
+    """설정 파일(YAML/JSON)의 값 중 존재하는 파일을 가리키는 경로 (체크포인트, 화자 음성 등).
+
+    상대 경로는 저장소 루트, 설정 파일 폴더 순으로 찾는다. 읽을 수 없는 설정은 빈 목록.
+    """
+    try:
+        text = config.read_text(encoding="utf-8")
+        data = json.loads(text) if config.suffix.lower() == ".json" else yaml.safe_load(text)
+    except (OSError, ValueError, yaml.YAMLError):
+        return []
+    found: list[Path] = []
+    for value in _config_values(data):
+        path = Path(value)
+        candidates = [path] if path.is_absolute() else [ROOT_DIR / path, config.parent / path]
+        for candidate in candidates:
+            try:
+                is_file = candidate.is_file()
+            except OSError:
+                continue
+            if is_file:
+                resolved = candidate.resolve()
+                if resolved != config.resolve() and resolved not in found:
+                    found.append(resolved)
+                break
+    return found
+
+
+def referenced_files(spec: StepSpec) -> list[Path]:
+    """입력 외에 결과에 영향을 주는 파일: 설정이 가리키는 파일과 경로 값 인자."""
+    files = config_files(spec.config) if spec.config is not None and spec.config.is_file() else []
+    return files + [path for path in spec.arg_files if path not in files]
+
+
+def step_key(spec: StepSpec) -> str | None:
+    """입력 파일 해시 + 실제 설정 내용과 설정이 가리키는 파일 해시 + 모듈 버전 + 나머지 인자로 캐시 키 계산.
+
+    입력이 없거나 디렉터리이면(결과를 재현할 수 없는 단계) None.
+    """
+    if not spec.outputs or not spec.script.exists():
+        return None
+    if any(not path.is_file() for path in spec.inputs):
+        return None
+    payload = {
+        "module": spec.script.parent.name,
+        "script": spec.script.name,
+        "version": module_version(spec.script),
+        "inputs": [file_digest(path) for path in spec.inputs],
+        "config": file_digest(spec.config) if spec.config is not None and spec.config.is_file() else None,
+        "references": [file_digest(path) for path in referenced_files(spec)],
+        "args": spec.args,
+        "outputs": [path.suffix for path in spec.outputs],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _place(source: Path, target: Path) -> None:
+    """source를 target 위치에 하드링크(불가하면 복사)로 배치."""
+    try:
+        # 이미 같은 파일(하드링크)이면 그대로 둔다. 같은 파일끼리의 rename은 아무것도 하지 않아 임시 파일이 남는다.
+        if os.path.samefile(source, target):
+            return
+    except OSError:
+        pass
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def detach(path: Path) -> None:
+    """하드링크된 출력 파일을 독립 사본으로 바꿔, 모듈이 덮어써도 캐시 항목이 바뀌지 않게 한다."""
+    try:
+        if path.stat().st_nlink <= 1:
+            return
+    except FileNotFoundError:
+        return
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    shutil.copy2(path, tmp)
+    os.replace(tmp, path)
+
+
+class StepCache:
+    """모듈 실행 결과를 콘텐츠 해시로 저장하는 크기 제한 LRU 캐시.
+
+    항목은 root/<key 앞 2자리>/<key>/ 에 출력 파일과 meta.json으로 저장되고,
+    항목 디렉터리의 수정 시각을 마지막 사용 시각으로 써서 오래된 것부터 지운다.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def lookup(self, key: str, outputs: Sequence[Path]) -> dict[str, Any] | None:
+        """적중하면 출력 파일을 배치하고 저장해 둔 결과를 반환 (없으면 None)."""
+        entry = self._entry_dir(key)
+        try:
+            meta = json.loads((entry / _META_FILE).read_text(encoding="utf-8"))
+            for index, target in enumerate(outputs):
+                _place(entry / f"output{index}{target.suffix}", target)
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        return meta.get("result", {})
+
+    def store(self, key: str, outputs: Sequence[Path], result: dict[str, Any]) -> bool:
+        """실행이 끝난 출력 파일을 캐시에 저장 (출력 파일이 없으면 저장하지 않음)."""
+        if not all(path.is_file() for path in outputs):
+            return False
+        entry = self._entry_dir(key)
+        if entry.exists():
+            return True
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{key[:8]}-", dir=entry.parent))
+        try:
+            size = 0
+            for index, source in enumerate(outputs):
+                _place(source, staging / f"output{index}{source.suffix}")
+                size += source.stat().st_size
+            meta = {"key": key, "size": size, "created_at": time.time(), "result": result}
+            (staging / _META_FILE).write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+            try:
+                staging.rename(entry)
+            except OSError:
+                # 같은 키를 다른 실행이 먼저 저장함
+                return True
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+        self.evict()
+        return True
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for entry in self.root.glob("??/*"):
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry.iterdir())
+                entries.append((entry.stat().st_mtime, size, entry))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self) -> int:
+        """전체 크기가 max_bytes를 넘으면 가장 오래 쓰지 않은 항목부터 삭제하고, 삭제한 수를 반환."""
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                shutil.rmtree(entry, ignore_errors=True)
+                total -= size
+                removed += 1
+            if removed:
+                LOGGER.info("단계 캐시 %d개 항목 정리 (현재 %.1f MiB)", removed, total / 1024**2)
+            return removed
+
+    def run(
+        self,
+        command: Sequence[str],
+        execute: Callable[[], dict[str, Any]],
+        cwd: Path = ROOT_DIR,
+    ) -> dict[str, Any]:
+        """캐시를 거쳐 모듈 명령 실행. 결과 dict에는 cache_hit 플래그가 붙는다."""
+        spec = parse_command(command, cwd)
+        key = step_key(spec) if spec is not None else None
+        if key is None:
+            return {**execute(), "cache_hit": False}
+
+        cached = self.lookup(key, spec.outputs)
+        if cached is not None:
+            LOGGER.info("단계 캐시 적중: %s (%s)", spec.script.parent.name, key[:12])
+            return {**cached, "cache_hit": True}
+
+        for path in spec.outputs:
+            detach(path)
+        result = execute()
+        try:
+            self.store(key, spec.outputs, result)
+        except OSError:
+            LOGGER.warning("단계 캐시 저장 실패: %s", key[:12], exc_info=True)
+        return {**result, "cache_hit": False}
+
+
+_cache: StepCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> StepCache | None:
+    """환경 변수 설정에 따른 공용 캐시 (PADIEM_STEP_CACHE=0이면 None)."""
+    global _cache
+    if os.getenv(ENABLED_ENV, "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            root = Path(os.getenv(DIR_ENV) or ROOT_DIR / "data" / "cache" / "steps")
+            _cache = StepCache(root, int(os.getenv(MAX_BYTES_ENV, str(DEFAULT_MAX_BYTES))))
+        return _cache
+
+
+def run_cached(
+    command: Sequence[str],
+    execute: Callable[[], dict[str, Any]],
+    cwd: Path = ROOT_DIR,
+) -> dict[str, Any]:
+    """공용 캐시가 켜져 있으면 캐시를 거쳐, 아니면 그대로 실행."""
+    cache = get_cache()
+    if cache is None:
+        return {**execute(), "cache_hit": False}
+    return cache.run(command, execute, cwd)
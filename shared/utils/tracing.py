@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+
+MIB = 1024**2
+
+
+@dataclass
+class _StepTrace:
+    tid: int
+    started: float | None = None
+    finished: float | None = None
+    args: dict[str, Any] = field(default_factory=dict)
+    phases: dict[str, float] = field(default_factory=dict)
+    open_phases: dict[str, float] = field(default_factory=dict)
+    peak_rss: int = 0
+
+
+class Tracer:
+    """파이프라인 실행을 Chrome Trace Event 형식(chrome://tracing, Perfetto)으로 기록.
+
+    단계마다 트랙(tid) 하나를 두고 단계 전체 구간과 모듈이 progress.stage()로 보낸 세부 구간을
+    "X" 이벤트로, 상주 메모리 표본을 "C"(카운터) 이벤트로 남긴다. 시각은 모두 time.time() 기준.
+    """
+
+    def __init__(self, process_name: str = "pipeline") -> None:
+        self.origin = time.time()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._steps: dict[str, _StepTrace] = {}
+        self._events: list[dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": process_name}},
+        ]
+        self._sampler: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def _us(self, at: float) -> int:
+        return round((at - self.origin) * 1_000_000)
+
+    def _step(self, name: str) -> _StepTrace:
+        step = self._steps.get(name)
+        if step is None:
+            step = self._steps[name] = _StepTrace(tid=len(self._steps) + 1)
+            self._events.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": step.tid, "args": {"name": name}})
+            self._events.append({"name": "thread_sort_index", "ph": "M", "pid": self._pid, "tid": step.tid, "args": {"sort_index": step.tid}})
+        return step
+
+    def _span(self, step: _StepTrace, name: str, category: str, start: float, end: float, args: dict[str, Any] | None = None) -> None:
+        event = {"name": name, "cat": category, "ph": "X", "ts": self._us(start), "dur": max(0, self._us(end) - self._us(start)), "pid": self._pid, "tid": step.tid}
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    def step_started(self, name: str, at: float | None = None) -> None:
+        with self._lock:
+            self._step(name).started = at if at is not None else time.time()
+
+    def step_finished(self, name: str, status: str, at: float | None = None, **args: Any) -> None:
+        """단계 구간을 닫는다. 닫히지 않은 세부 구간은 단계 종료 시각에 함께 닫는다."""
+        end = at if at is not None else time.time()
+        with self._lock:
+            step = self._step(name)
+            step.finished = end
+            for phase in list(step.open_phases):
+                self._close_phase(step, phase, end, "error" if status != "success" else "end")
+            # 모듈이 직접 보고한 값(audio_sec 등)이 있으면 그대로 둔다.
+            for key, value in args.items():
+                if value is not None:
+                    step.args.setdefault(key, value)
+            step.args["status"] = status
+            if step.peak_rss:
+                step.args["peak_rss_mb"] = round(step.peak_rss / MIB, 1)
+            elapsed = end - (step.started if step.started is not None else end)
+            if step.args.get("audio_sec"):
+                step.args["rtf"] = round(elapsed / step.args["audio_sec"], 3)
+            self._span(step, name, "step", step.started if step.started is not None else end, end, dict(step.args))
+
+    def _close_phase(self, step: _StepTrace, phase: str, end: float, status: str, elapsed: float | None = None) -> None:
+        started = step.open_phases.pop(phase, None)
+        if elapsed is not None:
+            started = end - elapsed
+        elif started is None:
+            return
+        step.phases[phase] = step.phases.get(phase, 0.0) + (end - started)
+        self._span(step, phase, "phase", started, end, {"status": status} if status != "end" else None)
+
+    def handle_event(self, name: str, event: dict[str, Any]) -> None:
+        """모듈이 보낸 진행률 프로토콜 이벤트(shared.utils.progress) 반영."""
+        kind = event.get("type")
+        at = float(event.get("ts") or time.time())
+        with self._lock:
+            step = self._step(name)
+            if kind == "stage":
+                phase = str(event.get("stage"))
+                if event.get("status") == "start":
+                    step.open_phases[phase] = at
+                else:
+                    elapsed = event.get("elapsed_sec")
+                    self._close_phase(step, phase, at, str(event.get("status")), float(elapsed) if elapsed is not None else None)
+            elif kind == "progress" and event.get("audio_sec") is not None:
+                step.args["audio_sec"] = round(float(event["audio_sec"]), 3)
+
+    def sample_rss(self, values: dict[str, int], at: float | None = None) -> None:
+        """레이블별 RSS(바이트) 표본 기록. 실행 중인 단계의 최대값도 갱신한다."""
+        if not values:
+            return
+        at = at if at is not None else time.time()
+        with self._lock:
+            for name, value in values.items():
+                step = self._steps.get(name)
+                if step is not None:
+                    step.peak_rss = max(step.peak_rss, value)
+            self._events.append(
+                {"name": "rss_mb", "ph": "C", "ts": self._us(at), "pid": self._pid, "args": {name: round(value / MIB, 1) for name, value in values.items()}}
+            )
+
+    def start_sampling(self, collect: Callable[[], dict[str, int]], interval: float = 0.5) -> None:
+        """collect()가 돌려주는 레이블별 RSS를 interval초마다 기록하는 스레드 시작."""
+
+        def _loop() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.sample_rss(collect())
+                except Exception:  # noqa: BLE001 - 표본 하나를 놓쳐도 실행에는 영향 없음
+                    continue
+
+        self._sampler = threading.Thread(target=_loop, name="trace-rss", daemon=True)
+        self._sampler.start()
+
+    def stop_sampling(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=5)
+            self._sampler = None
+
+    def events(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return list(self._events)
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {"traceEvents": self.events(), "displayTimeUnit": "ms", "otherData": {"started_at": self.origin}}
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def hot_phases(self, limit: int = 5) -> list[tuple[str, str, float]]:
+        """(단계, 구간, 초)를 오래 걸린 순으로."""
+        with self._lock:
+            phases = [(name, phase, sec) for name, step in self._steps.items() for phase, sec in step.phases.items()]
+        return sorted(phases, key=lambda item: item[2], reverse=True)[:limit]
+
+    def summary(self) -> str:
+        lines = ["[trace] 단계별 세부 구간"]
+        with self._lock:
+            steps = sorted(self._steps.items(), key=lambda item: item[1].tid)
+            for name, step in steps:
+                if step.started is None or step.finished is None:
+                    continue
+                elapsed = step.finished - step.started
+                phases = ", ".join(f"{phase} {sec:.1f}s" for phase, sec in sorted(step.phases.items(), key=lambda item: item[1], reverse=True))
+                extras = []
+                if step.peak_rss:
+                    extras.append(f"RSS {step.peak_rss / MIB:.0f}MiB")
+                if step.args.get("audio_sec"):
+                    extras.append(f"오디오 {step.args['audio_sec']:.1f}s (RTF {elapsed / step.args['audio_sec']:.2f})")
+                lines.append(f"  {name:<16} {elapsed:8.1f}s  {phases or '-'}{'  ' + ' / '.join(extras) if extras else ''}")
+        hot = self.hot_phases(1)
+        if hot:
+            name, phase, sec = hot[0]
+            lines.append(f"  가장 오래 걸린 구간: {name}/{phase} {sec:.1f}s")
+        return "\n".join(lines)
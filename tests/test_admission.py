@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend import admission, job_manager, utils
+from backend.scheduler import Scheduler
+
+MIB = 1024**2
+
+
+@pytest.fixture(autouse=True)
+def isolated(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Scheduler:
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(admission, "_peak_rss", {})
+    monkeypatch.delenv("PADIEM_REMOTE_MODULES", raising=False)
+    scheduler = Scheduler({"heavy": 2, "light": 4})
+    monkeypatch.setattr(admission, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def test_queue_limit_rejects_with_retry_after_from_throughput(isolated: Scheduler, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_MAX_QUEUED_TTS", "2")
+    admission.check("tts")
+    for _ in range(3):
+        job_manager.create_job({"module": "tts"})
+    # 평균 실행 40초, heavy 슬롯 2개, 상한을 2건 넘음 -> 40초
+    monkeypatch.setattr(
+        isolated,
+        "stats",
+        lambda: {"resources": {"heavy": {"slots": 2, "running": 2, "queued": 3}}, "modules": {"tts": {"completed": 5, "run_sec": {"avg": 40.0}}}},
+    )
+
+    with pytest.raises(admission.AdmissionRejected) as excinfo:
+        admission.check("tts")
+    assert excinfo.value.retry_after == 40
+    # 다른 모듈은 영향을 받지 않고, 0이면 제한 없음
+    admission.check("rvc")
+    monkeypatch.setenv("PADIEM_MAX_QUEUED_TTS", "0")
+    admission.check("tts")
+
+
+def test_memory_headroom_uses_observed_peak_rss(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission, "available_memory", lambda: 3000 * MIB)
+    monkeypatch.setenv("PADIEM_MEM_RESERVE_MB", "512")
+    # 관측 기록이 없으면 검사하지 않는다.
+    admission.check("lipsync")
+
+    admission.record_rss({"lipsync": 2000 * MIB, "rvc": 4000 * MIB})
+    admission.record_rss({"lipsync": 1500 * MIB})
+    assert admission.peak_rss()["lipsync"] == 2000 * MIB
+    admission.check("lipsync")
+
+    with pytest.raises(admission.AdmissionRejected) as excinfo:
+        admission.check("rvc")
+    assert "메모리" in excinfo.value.reason and excinfo.value.retry_after >= 1
+
+
+def test_memory_check_skipped_when_job_would_wait_for_a_slot(isolated: Scheduler, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(admission, "available_memory", lambda: 100 * MIB)
+    admission.record_rss({"rvc": 4000 * MIB})
+    monkeypatch.setattr(isolated, "stats", lambda: {"resources": {"heavy": {"slots": 2, "running": 2, "queued": 0}}, "modules": {}})
+    admission.check("rvc")
+
+
+def test_rejected_submission_creates_no_job(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_MAX_QUEUED_TEXT_PROCESSOR", "1")
+    job_manager.create_job({"module": "text_processor"})
+    command = [sys.executable, "-c", "pass"]
+
+    with pytest.raises(admission.AdmissionRejected):
+        utils.start_module_job(command, {"module": "text_processor"})
+    assert job_manager.count_jobs() == 1
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+
+from backend import batches
+from shared.utils import batch
+
+
+def _manifest(tmp_path: Path, items: list[dict]) -> Path:
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps({"items": items}), encoding="utf-8")
+    return path
+
+
+def test_batch_reports_each_item_and_continues_after_failure(tmp_path: Path) -> None:
+    calls: list[tuple[str, dict]] = []
+
+    def handler(source: Path, target: Path, config: dict) -> None:
+        calls.append((source.name, config))
+        if source.name == "bad.wav":
+            raise FileNotFoundError("입력 오디오를 찾을 수 없습니다")
+        target.write_text("ok", encoding="utf-8")
+
+    manifest = _manifest(
+        tmp_path,
+        [
+            {"input": str(tmp_path / "a.wav"), "output": str(tmp_path / "a.json")},
+            {"input": str(tmp_path / "bad.wav"), "output": str(tmp_path / "bad.json")},
+            {"input": str(tmp_path / "c.wav"), "output": str(tmp_path / "c.json"), "config": {"language": "en"}},
+        ],
+    )
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input")
+    parser.add_argument("--output")
+    batch.add_arguments(parser)
+    args = parser.parse_args(["--batch-manifest", str(manifest)])
+    batch.validate_arguments(parser, args)
+
+    batch.run_from_args(args, handler, {"language": "ko", "model_name": "small"})
+
+    report = json.loads(batch.default_report_path(manifest).read_text(encoding="utf-8"))
+    assert [item["status"] for item in report["items"]] == ["success", "failed", "success"]
+    assert report["succeeded"] == 2 and report["failed"] == 1
+    assert "찾을 수 없습니다" in report["items"][1]["error"]
+    # 항목별 config가 공통 설정 위에 덮인다.
+    assert calls[2][1] == {"language": "en", "model_name": "small"}
+    assert calls[0][1] == {"language": "ko", "model_name": "small"}
+
+
+def test_batch_fails_when_every_item_fails(tmp_path: Path) -> None:
+    def handler(source: Path, target: Path, config: dict) -> None:
+        raise RuntimeError("boom")
+
+    items = [{"input": "x.wav", "output": "x.json"}]
+    with pytest.raises(RuntimeError):
+        batch.run_batch(items, handler, {}, tmp_path / "report.json")
+    assert json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["failed"] == 1
+
+
+def test_manifest_requires_input_and_output(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        batch.read_manifest(_manifest(tmp_path, [{"input": "a.wav"}]))
+
+
+def test_backend_manifest_rejects_missing_inputs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(batches, "BATCH_ROOT", tmp_path / "batches")
+    present = tmp_path / "a.wav"
+    present.write_bytes(b"")
+
+    with pytest.raises(FileNotFoundError):
+        batches.write_manifest("stt", [(present, tmp_path / "a.json"), (tmp_path / "missing.wav", tmp_path / "b.json")])
+    assert not (tmp_path / "batches").exists()
+
+    manifest, report = batches.write_manifest("stt", [(present, tmp_path / "a.json")])
+    assert batch.read_manifest(manifest) == [{"input": str(present), "output": str(tmp_path / "a.json")}]
+    assert batches.summarize("job", report)["total"] == 0
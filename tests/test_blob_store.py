@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+import pytest
+
+from backend import blob_store
+
+
+@pytest.fixture(autouse=True)
+def store_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(blob_store, "BLOB_ROOT", tmp_path / "blobs")
+    monkeypatch.setattr(blob_store, "UPLOAD_ROOT", tmp_path / "uploads")
+    monkeypatch.setattr(blob_store, "SESSION_ROOT", tmp_path / "uploads" / ".sessions")
+    return tmp_path
+
+
+def test_resumable_upload_rejects_wrong_offset_and_finalizes(store_root: Path) -> None:
+    data = os.urandom(3000)
+    sha256 = hashlib.sha256(data).hexdigest()
+    session = blob_store.create_session("clip.mp4", size=len(data))
+    upload_id = session["upload_id"]
+
+    assert blob_store.append_chunk(upload_id, 0, [data[:1000]]) == 1000
+    # 연결이 끊겨 클라이언트가 앞 청크를 다시 보내는 경우
+    with pytest.raises(blob_store.OffsetMismatch) as excinfo:
+        blob_store.append_chunk(upload_id, 0, [data[:1000]])
+    assert excinfo.value.current == 1000
+    assert blob_store.session_status(upload_id)["offset"] == 1000
+
+    blob_store.append_chunk(upload_id, 1000, [data[1000:]])
+    result = blob_store.finalize_session(upload_id, sha256)
+
+    assert result["path"] == store_root / "uploads" / "clip.mp4"
+    assert result["path"].read_bytes() == data
+    assert os.path.samefile(result["path"], blob_store.blob_path(sha256))
+    with pytest.raises(KeyError):
+        blob_store.session_status(upload_id)
+
+
+def test_repeat_upload_reuses_blob_and_path(store_root: Path) -> None:
+    data = b"same source video"
+    sha256 = hashlib.sha256(data).hexdigest()
+
+    first = blob_store.create_session("source.mp4")["upload_id"]
+    blob_store.append_chunk(first, 0, [data])
+    first_result = blob_store.finalize_session(first, sha256)
+
+    second = blob_store.create_session("source.mp4")["upload_id"]
+    blob_store.append_chunk(second, 0, [data])
+    second_result = blob_store.finalize_session(second, sha256)
+
+    assert second_result["deduplicated"] is True
+    assert second_result["path"] == first_result["path"]
+    assert len(list((store_root / "blobs").rglob("*"))) == 2  # 접두사 디렉터리 + blob 하나
+
+    # 이름은 같지만 내용이 다르면 새 경로
+    writer = blob_store.BlobWriter()
+    writer.write(b"different")
+    other_sha, deduplicated = writer.commit()
+    assert deduplicated is False
+    assert blob_store.default_destination("source.mp4", other_sha).name == "1_source.mp4"
+
+
+def test_finalize_with_wrong_hash_discards_session() -> None:
+    upload_id = blob_store.create_session("a.wav")["upload_id"]
+    blob_store.append_chunk(upload_id, 0, [b"abc"])
+
+    with pytest.raises(blob_store.UploadError):
+        blob_store.finalize_session(upload_id, "0" * 64)
+    with pytest.raises(KeyError):
+        blob_store.session_status(upload_id)
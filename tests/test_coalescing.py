@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager, utils
+from backend.scheduler import RESOURCE_HEAVY, RESOURCE_LIGHT, Scheduler
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    monkeypatch.setenv("PADIEM_STEP_CACHE", "0")
+
+
+def _command(tmp_path: Path, source: Path, output: str = "out.json") -> list[str]:
+    script = tmp_path / "modules" / "fake" / "run.py"
+    script.parent.mkdir(parents=True, exist_ok=True)
+    script.write_text("# fake\n", encoding="utf-8")
+    return [sys.executable, str(script), "--input", str(source), "--output", str(tmp_path / output)]
+
+
+def test_identical_requests_share_one_job(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    release = threading.Event()
+    calls: list[list[str]] = []
+
+    def fake_run(command, job_id=None):
+        calls.append(command)
+        release.wait(5)
+        return {"stdout": "done", "stderr": ""}
+
+    monkeypatch.setattr(utils, "run_module", fake_run)
+    meta = {"module": "text_processor"}
+
+    first = utils.start_module_job(_command(tmp_path, source), meta)
+    second = utils.start_module_job(_command(tmp_path, source), meta)
+    other = utils.start_module_job(_command(tmp_path, source, "other.json"), meta)
+    assert first == second
+    assert other != first
+
+    attached, future = utils._submit_job(_command(tmp_path, source), meta)
+    assert attached == first
+    release.set()
+    assert future.result(5)["stdout"] == "done"
+    assert job_manager.get_job(first)["status"] == job_manager.JobStatus.SUCCESS
+    assert [command[-1] for command in calls].count(str(tmp_path / "out.json")) == 1
+
+
+def test_release_waiter_keeps_job_while_others_wait(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    release = threading.Event()
+    monkeypatch.setattr(utils, "run_module", lambda command, job_id=None: release.wait(5) and {})
+    meta = {"module": "text_processor"}
+
+    job_id, future = utils._submit_job(_command(tmp_path, source), meta)
+    same_id, _ = utils._submit_job(_command(tmp_path, source), meta)
+    assert same_id == job_id
+
+    assert utils._release_waiter(job_id) is False
+    assert utils._release_waiter(job_id) is True
+    release.set()
+    future.result(5)
+
+
+def test_coalesce_key_does_not_hash_inputs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    hashed: list[Path] = []
+    original = utils.step_cache.file_digest
+
+    def tracking_digest(path: Path) -> str:
+        hashed.append(path)
+        return original(path)
+
+    monkeypatch.setattr(utils.step_cache, "file_digest", tracking_digest)
+    meta = {"module": "text_processor"}
+
+    key = utils._coalesce_key(_command(tmp_path, source), meta)
+    linked = tmp_path / "linked.wav"
+    linked.hardlink_to(source)
+
+    assert key is not None and source not in hashed
+    assert utils._coalesce_key(_command(tmp_path, linked), meta) == key
+    source.write_bytes(b"changed audio")
+    assert utils._coalesce_key(_command(tmp_path, source), meta) != key
+
+
+def test_waiting_request_gets_stop_reason_when_pending_job_is_cancelled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+    monkeypatch.setattr(utils, "run_module", lambda command, job_id=None: release.wait(5) and {})
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    meta = {"module": "lipsync"}
+
+    async def scenario() -> None:
+        scheduler = Scheduler({RESOURCE_HEAVY: 1, RESOURCE_LIGHT: 1})
+        monkeypatch.setattr(utils, "get_scheduler", lambda: scheduler)
+        utils.start_module_job(_command(tmp_path, source, "busy.json"), meta)
+        waiting = asyncio.create_task(utils.run_module_async(_command(tmp_path, source, "queued.json"), meta))
+        await asyncio.sleep(0.1)
+        [pending] = job_manager.list_jobs(status=job_manager.JobStatus.PENDING)
+        assert utils.cancel_job(pending["job_id"], "사용자가 취소했습니다.")
+        with pytest.raises(utils.JobStopped) as excinfo:
+            await waiting
+        assert excinfo.value.status == job_manager.JobStatus.CANCELLED
+        assert excinfo.value.reason == "사용자가 취소했습니다." and excinfo.value.job_id == pending["job_id"]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
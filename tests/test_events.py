@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend import events, job_manager
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path):
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    events.install()
+    yield
+    job_manager.remove_listener(events._on_job_update)
+
+
+def test_job_events_stream_until_terminal_status() -> None:
+    job_id = job_manager.create_job({"module": "stt"})
+
+    async def collect() -> list[dict]:
+        received: list[dict] = []
+
+        def worker() -> None:
+            job_manager.mark_running(job_id)
+            events.publish_progress(job_id, stage="transcribe", fraction=0.5)
+            job_manager.mark_success(job_id, {"stdout": "ok"})
+
+        async for event in events.job_events(job_id, keepalive=5):
+            received.append(event)
+            if len(received) == 1:
+                # 워커 스레드에서 발생한 변경이 이벤트 루프로 전달되는지 확인
+                threading.Thread(target=worker).start()
+        return received
+
+    received = asyncio.run(asyncio.wait_for(collect(), timeout=10))
+    assert [event["type"] for event in received] == ["status", "status", "progress", "status"]
+    assert [event.get("status") for event in received if event["type"] == "status"] == [
+        "pending",
+        "running",
+        "success",
+    ]
+    assert received[2]["fraction"] == 0.5
+    assert events.get_bus().subscriber_count(job_id) == 0
+
+
+def test_job_events_for_finished_job_end_immediately() -> None:
+    job_id = job_manager.create_job({"module": "stt"})
+    job_manager.mark_failed(job_id, "boom")
+
+    async def collect() -> list[dict]:
+        return [event async for event in events.job_events(job_id)]
+
+    received = asyncio.run(collect())
+    assert len(received) == 1
+    assert received[0]["job"]["error"] == "boom"
+    assert events.format_sse(received[0]).startswith("event: status\ndata: ")
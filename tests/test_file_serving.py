@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+
+from backend import file_serving
+
+
+def test_parse_range_variants() -> None:
+    assert file_serving.parse_range(None, 100) is None
+    assert file_serving.parse_range("bytes=0-9", 100) == (0, 9)
+    assert file_serving.parse_range("bytes=90-", 100) == (90, 99)
+    assert file_serving.parse_range("bytes=-10", 100) == (90, 99)
+    assert file_serving.parse_range("bytes=50-500", 100) == (50, 99)
+    # 여러 구간은 지원하지 않고 전체 응답
+    assert file_serving.parse_range("bytes=0-1,5-6", 100) is None
+    with pytest.raises(file_serving.RangeNotSatisfiable):
+        file_serving.parse_range("bytes=100-", 100)
+
+
+def test_iter_file_reads_requested_range(tmp_path: Path) -> None:
+    path = tmp_path / "clip.bin"
+    path.write_bytes(bytes(range(256)) * 4)
+
+    assert b"".join(file_serving.iter_file(path, 10, 19, chunk_size=3)) == bytes(range(10, 20))
+    assert b"".join(file_serving.iter_file(path)) == path.read_bytes()
+
+
+def test_etag_changes_with_content_and_matches_weakly(tmp_path: Path) -> None:
+    path = tmp_path / "out.wav"
+    path.write_bytes(b"a" * 10)
+    etag = file_serving.strong_etag(path)
+
+    assert file_serving.etag_matches(etag, etag)
+    assert file_serving.etag_matches(f'"other", W/{etag}', etag)
+    assert not file_serving.etag_matches(None, etag)
+
+    path.write_bytes(b"b" * 10)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert file_serving.strong_etag(path) != etag
+
+
+def test_maybe_gzip_respects_accept_encoding() -> None:
+    body = b'{"segments": []}' * 200
+
+    compressed, used = file_serving.maybe_gzip(body, "gzip, deflate, br")
+    assert used and gzip.decompress(compressed) == body
+    assert file_serving.maybe_gzip(body, "gzip;q=0") == (body, False)
+    assert file_serving.maybe_gzip(b"{}", "gzip") == (b"{}", False)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterator
+
+import pytest
+
+from shared.utils import gemini_client
+from shared.utils.gemini_client import GeminiClient, GeminiError, TokenBucket
+
+
+def _reply(text: str = "ok", inline: bytes | None = None) -> dict[str, Any]:
+    parts: list[dict[str, Any]] = [{"text": text}]
+    if inline is not None:
+        parts.append({"inlineData": {"mimeType": "audio/pcm", "data": base64.b64encode(inline).decode("ascii")}})
+    return {"candidates": [{"content": {"parts": parts}}]}
+
+
+class FakeGemini:
+    """요청마다 handler(순번, 경로, 본문) -> (상태, 본문, 지연 초)로 응답하는 로컬 가짜 서버."""
+
+    def __init__(self, handler: Callable[[int, str, dict], tuple[int, Any, float]]) -> None:
+        self.handler = handler
+        self.requests: list[tuple[str, dict, Any]] = []
+        self._lock = threading.Lock()
+        fake = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                with fake._lock:
+                    index = len(fake.requests)
+                    fake.requests.append((self.path, body, self.headers))
+                status, payload, delay = fake.handler(index, self.path, body)
+                time.sleep(delay)
+                raw = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(raw)))
+                self.end_headers()
+                self.wfile.write(raw)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/v1beta"
+
+    def client(self, **kwargs: Any) -> GeminiClient:
+        return GeminiClient(api_key="test-key", endpoint=self.endpoint, backoff_base=0.01, **kwargs)
+
+
+@pytest.fixture()
+def fake_server() -> Iterator[Callable[..., FakeGemini]]:
+    servers: list[FakeGemini] = []
+
+    def _start(handler: Callable[[int, str, dict], tuple[int, Any, float]]) -> FakeGemini:
+        server = FakeGemini(handler)
+        servers.append(server)
+        return server
+
+    yield _start
+    for server in servers:
+        server.server.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def no_env_hedge(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("PADIEM_GEMINI_HEDGE_SEC", raising=False)
+    monkeypatch.setenv("PADIEM_GEMINI_RPM", "6000")
+
+
+def test_transient_errors_are_retried_with_backoff(fake_server) -> None:
+    server = fake_server(lambda i, _p, _b: (503, {"error": "busy"}, 0) if i < 2 else (200, _reply("번역"), 0))
+    client = server.client()
+
+    response = client.generate("gemini-test", ["prompt", {"mime_type": "audio/wav", "data": b"RIFF"}], {"response_mime_type": "application/json"})
+
+    assert response.text == "번역" and response.attempts == 3
+    path, body, headers = server.requests[0]
+    assert path == "/v1beta/models/gemini-test:generateContent" and headers.get("x-goog-api-key") == "test-key"
+    assert body["contents"][0]["parts"][1]["inline_data"]["data"] == base64.b64encode(b"RIFF").decode("ascii")
+    assert body["generationConfig"] == {"response_mime_type": "application/json"}
+    stats = client.stats()["gemini-test"]
+    assert stats["requests"] == 3 and stats["retries"] == 2 and stats["failures"] == 0
+    assert stats["response_bytes"]["total"] == response.size
+
+
+def test_client_errors_fail_fast_and_retries_are_bounded(fake_server) -> None:
+    bad = fake_server(lambda _i, _p, _b: (400, {"error": "bad request"}, 0)).client()
+    with pytest.raises(GeminiError) as excinfo:
+        bad.generate("gemini-test", "prompt")
+    assert excinfo.value.status == 400 and not excinfo.value.retryable
+    assert bad.stats()["gemini-test"]["requests"] == 1
+
+    limited = fake_server(lambda _i, _p, _b: (429, {"error": "quota"}, 0)).client(max_retries=2)
+    with pytest.raises(GeminiError) as excinfo:
+        limited.generate("gemini-test", "prompt")
+    assert excinfo.value.status == 429
+    assert limited.stats()["gemini-test"]["requests"] == 3
+
+
+def test_slow_request_is_hedged(fake_server, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_GEMINI_HEDGE_SEC", "0.1")
+    server = fake_server(lambda i, _p, _b: (200, _reply("느림" if i == 0 else "빠름", inline=b"\x00\x01"), 1.5 if i == 0 else 0))
+    client = server.client()
+
+    started = time.monotonic()
+    response = client.generate("gemini-test", "prompt")
+
+    assert time.monotonic() - started < 1.0
+    assert response.text == "빠름" and response.hedged and response.inline_data() == b"\x00\x01"
+    stats = client.stats()["gemini-test"]
+    assert stats["hedges"] == 1 and stats["hedge_wins"] == 1
+    # hedge=False 호출은 헤지하지 않는다.
+    assert not client.generate("gemini-test", "prompt", hedge=False).hedged
+
+
+def test_token_bucket_limits_rate() -> None:
+    bucket = TokenBucket(rate_per_sec=20, burst=1)
+    started = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.09
+    assert not bucket.try_acquire()
+
+
+def test_stream_yields_text_chunks(fake_server) -> None:
+    events = b"".join(f"data: {json.dumps(_reply(text))}\r\n\r\n".encode("utf-8") for text in ("안녕", "하세요"))
+    server = fake_server(lambda _i, _p, _b: (200, events, 0))
+
+    assert list(server.client().stream("gemini-test", "prompt")) == ["안녕", "하세요"]
+    assert server.requests[0][0] == "/v1beta/models/gemini-test:streamGenerateContent?alt=sse"
+
+
+def test_shared_client_per_api_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GEMINI_API_KEY", "env-key")
+    assert gemini_client.get_client() is gemini_client.get_client("env-key")
+    assert gemini_client.get_client("other") is not gemini_client.get_client()
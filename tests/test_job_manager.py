@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "jobs.sqlite3"
+    job_manager.configure(db_path)
+    return db_path
+
+
+def test_job_lifecycle_is_persisted() -> None:
+    job_id = job_manager.create_job({"module": "stt", "output": "out.json"}, command=["python", "run.py"])
+    job_manager.mark_running(job_id)
+    job_manager.mark_success(job_id, {"stdout": "ok"})
+
+    job = job_manager.get_job(job_id)
+    assert job["status"] == job_manager.JobStatus.SUCCESS
+    assert job["result"] == {"stdout": "ok"}
+    assert job["meta"]["module"] == "stt"
+    assert "command" not in job
+
+
+def test_unknown_job_raises_key_error() -> None:
+    with pytest.raises(KeyError):
+        job_manager.get_job("missing")
+    with pytest.raises(KeyError):
+        job_manager.mark_failed("missing", "error")
+
+
+def test_list_jobs_filters_and_paginates() -> None:
+    ids = [job_manager.create_job({"module": "stt" if idx % 2 else "tts"}) for idx in range(5)]
+    job_manager.mark_failed(ids[0], "boom")
+
+    assert job_manager.count_jobs() == 5
+    assert job_manager.count_jobs(module="stt") == 2
+    assert [job["job_id"] for job in job_manager.list_jobs(status="failed")] == [ids[0]]
+
+    page = job_manager.list_jobs(limit=2, offset=1)
+    assert len(page) == 2
+
+
+def test_recover_jobs_requeues_running_jobs() -> None:
+    running = job_manager.create_job({"module": "lipsync"}, command=["python", "lipsync.py"])
+    job_manager.mark_running(running)
+    finished = job_manager.create_job({"module": "stt"})
+    job_manager.mark_success(finished)
+
+    recovered = job_manager.recover_jobs()
+
+    assert [job["job_id"] for job in recovered] == [running]
+    assert recovered[0]["command"] == ["python", "lipsync.py"]
+    assert job_manager.get_job(running)["status"] == job_manager.JobStatus.PENDING
+
+
+def test_stopped_jobs_are_terminal() -> None:
+    job_id = job_manager.create_job({"module": "lipsync"})
+    job_manager.mark_running(job_id)
+    job_manager.mark_stopped(job_id, job_manager.JobStatus.TIMED_OUT, "timeout")
+
+    job = job_manager.get_job(job_id)
+    assert job["status"] == "timed_out"
+    assert job["error"] == "timeout"
+    assert job["finished_at"] is not None
+    assert job["status"] in job_manager.TERMINAL_STATUSES
+    with pytest.raises(ValueError):
+        job_manager.mark_stopped(job_id, job_manager.JobStatus.FAILED, "nope")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager, job_queue, remote_jobs, utils
+from backend.worker import Worker
+from shared.utils import step_cache
+
+
+@pytest.fixture()
+def queue(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> job_queue.SqliteQueue:
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    sqlite_queue = job_queue.SqliteQueue(tmp_path / "queue.sqlite3")
+    job_queue.configure(sqlite_queue)
+    monkeypatch.setenv("PADIEM_REMOTE_MODULES", "remote_test")
+    # 테스트가 poll_once()를 직접 호출하므로 백그라운드 확인 스레드는 사실상 멈춰 둔다.
+    monkeypatch.setenv("PADIEM_QUEUE_POLL_SEC", "3600")
+    monkeypatch.setattr(step_cache, "get_cache", lambda: None)
+    yield sqlite_queue
+    job_queue.configure(None)
+
+
+def test_claim_is_exclusive_and_expired_lease_is_reclaimed(queue: job_queue.SqliteQueue) -> None:
+    assert queue.enqueue("job-1", "tts", ["{python}", "-c", "pass"], {"module": "tts"})
+    assert not queue.enqueue("job-1", "tts", ["{python}", "-c", "pass"], {"module": "tts"})
+
+    assert queue.claim("w-other", {"lipsync"}, 60) is None
+    claimed = queue.claim("w-1", {"tts"}, lease_sec=0.05)
+    assert claimed is not None and claimed.command == ["{python}", "-c", "pass"] and claimed.attempts == 1
+    assert queue.claim("w-2", None, 60) is None
+
+    time.sleep(0.1)
+    reclaimed = queue.claim("w-2", None, 60)
+    assert reclaimed is not None and reclaimed.job_id == "job-1" and reclaimed.attempts == 2
+    # 리스를 잃은 워커는 연장/완료할 수 없다.
+    assert not queue.heartbeat("job-1", "w-1", 60)
+    assert not queue.complete("job-1", "w-1", "success")
+    assert queue.complete("job-1", "w-2", "success", result={"ok": True})
+    [finished] = queue.finished()
+    assert finished.outcome == "success" and finished.result == {"ok": True}
+
+
+def test_cancel_removes_queued_job_and_flags_claimed_job(queue: job_queue.SqliteQueue) -> None:
+    queue.enqueue("claimed", "tts", ["x"], {})
+    assert queue.claim("w-1", None, 60).job_id == "claimed"
+    queue.enqueue("queued", "tts", ["x"], {})
+
+    assert queue.cancel("queued", "cancelled", "사용자 요청") == "queued"
+    assert not queue.contains("queued")
+    assert queue.heartbeat("claimed", "w-1", 60)
+    assert queue.cancel("claimed", "timed_out", "제한 시간") == "claimed"
+    assert not queue.heartbeat("claimed", "w-1", 60)
+    assert queue.cancel_reason("claimed") == ("timed_out", "제한 시간")
+    assert queue.cancel("missing", "cancelled", "") is None
+
+
+def test_portable_command_round_trip() -> None:
+    base = Path("/srv/padiem")
+    command = [sys.executable, "/srv/padiem/modules/tts_xtts/run.py", "--input", "/mnt/other/a.json"]
+    portable = job_queue.portable_command(command, base)
+    assert portable == ["{python}", "modules/tts_xtts/run.py", "--input", "/mnt/other/a.json"]
+    assert job_queue.local_command(portable)[0] == sys.executable
+
+
+def test_remote_job_runs_on_worker_and_result_reaches_job_store(queue: job_queue.SqliteQueue, tmp_path: Path) -> None:
+    command = [sys.executable, "-c", "print('remote hello')"]
+    meta = {"module": "remote_test"}
+    job_id = job_manager.create_job(meta, command=command)
+    future = utils._launch_job(job_id, command, meta)
+    assert queue.contains(job_id)
+
+    worker = Worker(queue, "w-test", {"remote_test"}, lease_sec=5)
+    assert worker.run_next()
+    assert not worker.run_next()
+    assert remote_jobs.poll_once() == 1
+
+    assert future.result(timeout=5)["worker_id"] == "w-test"
+    job = job_manager.get_job(job_id)
+    assert job["status"] == job_manager.JobStatus.SUCCESS
+    assert "remote hello" in job["logs"]
+    assert not queue.contains(job_id)
+
+
+def test_cancel_stops_remote_process(queue: job_queue.SqliteQueue) -> None:
+    command = [sys.executable, "-c", "import time; time.sleep(30)"]
+    meta = {"module": "remote_test"}
+    job_id = job_manager.create_job(meta, command=command)
+    future = utils._launch_job(job_id, command, meta)
+
+    worker = Worker(queue, "w-test", None, lease_sec=0.3)
+    runner = threading.Thread(target=worker.run_next)
+    runner.start()
+    deadline = time.monotonic() + 5
+    while not queue.running() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    remote_jobs.poll_once()
+    assert job_manager.get_job(job_id)["status"] == job_manager.JobStatus.RUNNING
+
+    started = time.monotonic()
+    assert utils.cancel_job(job_id, "사용자 요청")
+    runner.join(10)
+    assert not runner.is_alive() and time.monotonic() - started < 5
+    remote_jobs.poll_once()
+
+    with pytest.raises(utils.JobStopped):
+        future.result(timeout=5)
+    job = job_manager.get_job(job_id)
+    assert job["status"] == job_manager.JobStatus.CANCELLED and job["error"] == "사용자 요청"
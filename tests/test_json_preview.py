@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from backend import json_preview
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 값이 읽기 단위 경계에 걸치는 경우를 확인하기 위해 작은 단위로 읽는다.
+    monkeypatch.setattr(json_preview, "READ_CHUNK_CHARS", 7)
+
+
+def _segments(count: int) -> list[dict]:
+    return [{"id": idx, "start": idx * 2.0, "end": idx * 2.0 + 1.5, "text": f"문장 {idx}"} for idx in range(count)]
+
+
+def test_slice_whisper_style_object(tmp_path: Path) -> None:
+    path = tmp_path / "result.json"
+    document = {"id": "clip", "language": "ko", "text": "x" * 5000, "segments": _segments(50), "metadata": {"duration": 100.0}}
+    path.write_text(json.dumps(document, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    preview = json_preview.slice_segments(path, offset=10, limit=3)
+
+    assert preview["total"] == 50
+    assert preview["matched"] == 50
+    assert [segment["id"] for segment in preview["segments"]] == [10, 11, 12]
+    assert preview["fields"] == {"id": "clip", "language": "ko", "metadata": {"duration": 100.0}}
+    assert preview["omitted_fields"] == ["text"]
+
+
+def test_slice_top_level_array_by_time_range(tmp_path: Path) -> None:
+    path = tmp_path / "gemini.json"
+    path.write_text(json.dumps(_segments(20)), encoding="utf-8")
+
+    preview = json_preview.slice_segments(path, start=10.0, end=15.0)
+
+    # 9.5초에 끝나는 4번은 제외, 10초에 시작하는 5번부터 14초에 시작하는 7번까지
+    assert [segment["id"] for segment in preview["segments"]] == [5, 6, 7]
+    assert preview["total"] == 20
+    assert preview["matched"] == 3
+
+
+def test_slice_rejects_non_segment_json(tmp_path: Path) -> None:
+    path = tmp_path / "scalar.json"
+    path.write_text("42", encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        json_preview.slice_segments(path)
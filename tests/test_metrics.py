@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import sys
+import wave
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager, metrics
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path) -> Path:
+    db_path = tmp_path / "jobs.sqlite3"
+    job_manager.configure(db_path)
+    return db_path
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    histogram = metrics.Histogram("test_seconds", "테스트", ("module",), buckets=(1, 5))
+    for value in (0.5, 2, 2, 10):
+        histogram.observe(value, "stt")
+
+    lines = list(histogram.samples())
+
+    assert 'test_seconds_bucket{module="stt",le="1"} 1' in lines
+    assert 'test_seconds_bucket{module="stt",le="5"} 3' in lines
+    assert 'test_seconds_bucket{module="stt",le="+Inf"} 4' in lines
+    assert 'test_seconds_sum{module="stt"} 14.5' in lines
+    assert 'test_seconds_count{module="stt"} 4' in lines
+
+
+def test_terminal_jobs_are_counted_once_and_queue_depth_is_reported() -> None:
+    metrics.install()
+    try:
+        before = metrics.JOBS_FINISHED.value("rvc", job_manager.JobStatus.FAILED)
+        failed = job_manager.create_job({"module": "rvc"})
+        job_manager.mark_running(failed)
+        job_manager.mark_failed(failed, "oom")
+        # 종료 후 상태 알림이 한 번 더 와도 다시 세지 않는다.
+        job_manager.mark_failed(failed, "oom")
+        job_manager.create_job({"module": "stt"})
+        running = job_manager.create_job({"module": "lipsync"})
+        job_manager.mark_running(running)
+    finally:
+        job_manager.remove_listener(metrics._on_job_update)
+
+    assert metrics.JOBS_FINISHED.value("rvc", job_manager.JobStatus.FAILED) == before + 1
+    text = metrics.render(job_manager.active_counts(), {"resources": {"heavy": {"slots": 1, "running": 1, "queued": 0}}}, {})
+    assert 'padiem_jobs_queued{module="stt"} 1' in text
+    assert 'padiem_jobs_in_flight{module="lipsync"} 1' in text
+    assert 'padiem_scheduler_slots{resource="heavy"} 1' in text
+
+
+def test_realtime_factor_uses_wav_duration(tmp_path: Path) -> None:
+    audio = tmp_path / "speech.wav"
+    with wave.open(str(audio), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(16000)
+        wav.writeframes(b"\0\0" * 16000 * 4)
+
+    metrics.observe_run("test_rtf", [tmp_path / "input.json", audio], elapsed=2.0)
+
+    assert metrics.REALTIME_FACTOR.count("test_rtf") == 1
+    assert 'padiem_job_realtime_factor_bucket{module="test_rtf",le="0.5"} 1' in list(metrics.REALTIME_FACTOR.samples())
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc 기반 RSS 수집")
+def test_child_rss_is_summed_per_process_group() -> None:
+    rss = metrics.group_rss_bytes({os.getpgrp(): "self"})
+    assert rss["self"] > 0
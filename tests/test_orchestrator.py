@@ -0,0 +1,393 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from orchestrator import pipeline_runner
+from orchestrator.pipeline_runner import Step, StepResult
+from shared.utils import io_helpers
+from shared.utils.tracing import Tracer
+
+CONFIG = Path(pipeline_runner.SCRIPT_DIR) / "config.yaml"
+
+
+def _context(tmp_path: Path) -> dict[str, str]:
+    media = tmp_path / "input.mp4"
+    media.write_bytes(b"")
+    keys = ["audio_output", "stt_output", "text_output", "tts_output", "xtts_output", "rvc_output", "lipsync_output", "onnx_output", "trt_engine"]
+    context = {key: str(tmp_path / key) for key in keys}
+    context.update(input_media=str(media), modules_dir=str(tmp_path), run_dir=str(tmp_path))
+    return context
+
+
+def _steps(tmp_path: Path, pipeline: str) -> tuple[list[Step], dict[str, set[str]]]:
+    config = pipeline_runner.load_pipeline_config(CONFIG)
+    steps = pipeline_runner.load_steps(config, config["pipelines"][pipeline])
+    return steps, pipeline_runner.build_dag(steps, _context(tmp_path))
+
+
+def test_config_dag_runs_tts_engines_side_by_side(tmp_path: Path) -> None:
+    steps, deps = _steps(tmp_path, "video")
+
+    assert deps["audio_extract"] == set()
+    assert deps["tts"] == {"text_process"} and deps["tts_backup"] == {"text_process"}
+    assert deps["rvc"] == {"tts"} and deps["lipsync"] == {"rvc"}
+    # 입력을 만드는 단계가 없으면 예전처럼 앞 단계를 모두 기다린다.
+    trt_steps, trt_deps = _steps(tmp_path, "video_trt")
+    assert trt_deps["tensorrt_export"] == {step.name for step in trt_steps[:-1]}
+
+
+def test_legacy_list_steps_infer_io_and_order_overwrites() -> None:
+    config = {
+        "steps": {
+            "extract": ["python", "a.py", "--input", "{input_media}", "--output", "{audio_output}"],
+            "denoise": ["python", "b.py", "--input", "{audio_output}", "--output", "{audio_output}"],
+            "stt": ["python", "c.py", "--input", "{audio_output}", "--output", "{stt_output}"],
+            "report": {"command": ["python", "d.py"], "needs": ["stt", "missing"]},
+        }
+    }
+    steps = pipeline_runner.load_steps(config, ["extract", "denoise", "stt", "report", "absent"])
+
+    assert [step.name for step in steps] == ["extract", "denoise", "stt", "report"]
+    assert steps[1].inputs == ["audio_output"] and steps[1].outputs == ["audio_output"]
+    deps = pipeline_runner.build_dag(steps, {})
+    assert deps == {"extract": set(), "denoise": {"extract"}, "stt": {"denoise"}, "report": {"stt"}}
+
+
+def test_independent_steps_run_concurrently_up_to_max_parallel() -> None:
+    steps = [Step(name, []) for name in ("a", "b", "c", "d")]
+    deps = {"a": set(), "b": set(), "c": set(), "d": {"a", "b", "c"}}
+    lock = threading.Lock()
+    active: list[int] = [0, 0]
+
+    def execute(step: Step, _context: dict[str, str]) -> dict:
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.1)
+        with lock:
+            active[0] -= 1
+        return {"cache_hit": step.name == "d"}
+
+    results = pipeline_runner.run_dag(steps, deps, {}, max_parallel=2, execute=execute)
+
+    assert active[1] == 2
+    assert all(result.status == "success" for result in results.values())
+    assert results["d"].started >= max(results[name].finished for name in "abc") and results["d"].cache_hit
+
+
+def test_failure_stops_running_steps_and_skips_the_rest(tmp_path: Path) -> None:
+    slow = Step("slow", [])
+    steps = [slow, Step("broken", []), Step("after", [])]
+    deps = {"slow": set(), "broken": set(), "after": {"slow"}}
+
+    def execute(step: Step, _context: dict[str, str]) -> dict:
+        if step.name == "broken":
+            time.sleep(0.1)
+            raise subprocess.CalledProcessError(3, ["python", "broken.py"])
+        pipeline_runner._run_subprocess(["sleep", "30"])
+        return {}
+
+    started = time.monotonic()
+    results = pipeline_runner.run_dag(steps, deps, {}, max_parallel=2, execute=execute)
+
+    assert time.monotonic() - started < 10
+    assert [results[step.name].status for step in steps] == ["cancelled", "failed", "skipped"]
+    assert "3" in (results["broken"].error or "")
+
+
+def test_critical_path_and_summary() -> None:
+    steps = [Step(name, []) for name in ("extract", "stt", "text", "tts", "xtts")]
+    deps = {"extract": set(), "stt": {"extract"}, "text": {"stt"}, "tts": {"text"}, "xtts": {"text"}}
+    spans = {"extract": (0, 1), "stt": (1, 4), "text": (4, 5), "tts": (5, 11), "xtts": (5, 7)}
+    results = {name: StepResult("success", start, end) for name, (start, end) in spans.items()}
+
+    path, total = pipeline_runner.critical_path(steps, deps, results)
+
+    assert path == ["extract", "stt", "text", "tts"] and total == pytest.approx(11)
+    summary = pipeline_runner.format_summary(steps, deps, results, wall=11.2)
+    assert "단계 합계 13.0s" in summary and "임계 경로 11.0s: extract -> stt -> text -> tts" in summary
+
+
+def _stamped_pipeline(tmp_path: Path) -> tuple[list[Step], dict[str, set[str]], dict[str, str], Path]:
+    module = tmp_path / "modules" / "upper"
+    module.mkdir(parents=True)
+    (module / "run.py").write_text(
+        "import sys\n"
+        "from pathlib import Path\n"
+        "args = dict(zip(sys.argv[1::2], sys.argv[2::2]))\n"
+        "with open(Path(args['--output']).with_suffix('.log'), 'a') as log: log.write('x')\n"
+        "if Path(args['--config']).read_text() == 'fail': sys.exit(2)\n"
+        "Path(args['--output']).write_text(Path(args['--input']).read_text().upper())\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "first.yaml").write_text("ok", encoding="utf-8")
+    (tmp_path / "second.yaml").write_text("ok", encoding="utf-8")
+    (tmp_path / "source.txt").write_text("hello", encoding="utf-8")
+    config = {
+        "steps": {
+            name: [sys.executable, str(module / "run.py"), "--input", f"{{{src}}}", "--output", f"{{{dst}}}", "--config", str(tmp_path / f"{name}.yaml")]
+            for name, src, dst in (("first", "source", "middle"), ("second", "middle", "final"))
+        }
+    }
+    context = {"source": str(tmp_path / "source.txt"), "middle": str(tmp_path / "middle.txt"), "final": str(tmp_path / "final.txt"), "run_dir": str(tmp_path)}
+    steps = pipeline_runner.load_steps(config, ["first", "second"])
+    return steps, pipeline_runner.build_dag(steps, context), context, tmp_path
+
+
+def _runs(tmp_path: Path) -> tuple[int, int]:
+    count = lambda name: len((tmp_path / f"{name}.log").read_text()) if (tmp_path / f"{name}.log").exists() else 0  # noqa: E731
+    return count("middle"), count("final")
+
+
+def test_stamps_skip_unchanged_steps_and_rerun_only_what_changed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_STEP_CACHE", "0")
+    steps, deps, context, root = _stamped_pipeline(tmp_path)
+
+    (root / "second.yaml").write_text("fail", encoding="utf-8")
+    results = pipeline_runner.run_dag(steps, deps, context)
+    assert results["second"].status == "failed" and _runs(root) == (1, 1)
+
+    # 뒤 단계만 고치고 다시 실행하면 실패한 단계만 돈다.
+    (root / "second.yaml").write_text("ok", encoding="utf-8")
+    results = pipeline_runner.run_dag(steps, deps, context)
+    assert results["first"].up_to_date and not results["second"].up_to_date
+    assert _runs(root) == (1, 2) and (root / "final.txt").read_text() == "HELLO"
+
+    results = pipeline_runner.run_dag(steps, deps, context)
+    assert all(result.up_to_date for result in results.values()) and _runs(root) == (1, 2)
+
+    # 입력이 바뀌면 첫 단계부터, 출력 파일을 손대면 그 단계만 다시 실행
+    (root / "source.txt").write_text("bye", encoding="utf-8")
+    pipeline_runner.run_dag(steps, deps, context)
+    assert _runs(root) == (2, 3) and (root / "final.txt").read_text() == "BYE"
+    (root / "final.txt").write_text("edited", encoding="utf-8")
+    pipeline_runner.run_dag(steps, deps, context)
+    assert _runs(root) == (2, 4)
+
+    forced = lambda step, ctx: pipeline_runner.execute_step(step, ctx, force=True)  # noqa: E731
+    pipeline_runner.run_dag(steps, deps, context, execute=forced)
+    assert _runs(root) == (3, 5)
+
+
+def test_select_steps_from_step_and_only(tmp_path: Path) -> None:
+    steps, deps = _steps(tmp_path, "video")
+
+    assert pipeline_runner.select_steps(steps, deps, from_step="tts") == ["tts", "rvc", "lipsync"]
+    assert pipeline_runner.select_steps(steps, deps, only=["stt", "lipsync"]) == ["stt", "lipsync"]
+    assert pipeline_runner.select_steps(steps, deps, from_step="text_process", only=["tts_backup"]) == ["tts_backup"]
+    with pytest.raises(ValueError, match="nope"):
+        pipeline_runner.select_steps(steps, deps, only=["nope"])
+
+
+def test_in_process_runner_imports_each_module_once(tmp_path: Path) -> None:
+    module = tmp_path / "modules" / "counter"
+    module.mkdir(parents=True)
+    (module / "run.py").write_text(
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from shared.utils.io_helpers import read_json, write_json\n"
+        "IMPORTS = Path(__file__).with_name('imports.log')\n"
+        "IMPORTS.write_text(IMPORTS.read_text() + 'x' if IMPORTS.exists() else 'x')\n"
+        "def main(argv=None):\n"
+        "    args = dict(zip(argv[::2], argv[1::2]))\n"
+        "    if args['--input'] == 'fail':\n"
+        "        sys.exit(4)\n"
+        "    data = read_json(Path(args['--input']))\n"
+        "    write_json(Path(args['--output']), {'count': data['count'] + 1})\n",
+        encoding="utf-8",
+    )
+    legacy = tmp_path / "modules" / "legacy"
+    legacy.mkdir()
+    (legacy / "run.py").write_text(
+        "import sys\n"
+        "def main():\n"
+        "    open(sys.argv[sys.argv.index('--output') + 1], 'w').write('subprocess')\n"
+        "if __name__ == '__main__':\n"
+        "    main()\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "0.json").write_text('{"count": 0}', encoding="utf-8")
+    script = str(module / "run.py")
+    runner = pipeline_runner.InProcessRunner()
+
+    for index in range(3):
+        runner([sys.executable, script, "--input", str(tmp_path / f"{index}.json"), "--output", str(tmp_path / f"{index + 1}.json")])
+    runner([sys.executable, str(legacy / "run.py"), "--output", str(tmp_path / "legacy.txt")])
+
+    assert (tmp_path / "3.json").read_text().count("3") == 1
+    assert (module / "imports.log").read_text() == "x" and set(runner.import_sec) == {"counter", "legacy"}
+    assert (tmp_path / "legacy.txt").read_text() == "subprocess"
+    with pytest.raises(subprocess.CalledProcessError) as excinfo:
+        runner([sys.executable, script, "--input", "fail", "--output", str(tmp_path / "x.json")])
+    assert excinfo.value.returncode == 4
+
+
+def test_json_memo_hands_off_copies_and_tracks_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "segments.json"
+    io_helpers.enable_json_memo()
+    try:
+        data = {"segments": [{"text": "안녕"}]}
+        io_helpers.write_json(path, data)
+        data["segments"].append({"text": "변경"})
+        first = io_helpers.read_json(path)
+        first["segments"][0]["text"] = "수정"
+        assert io_helpers.read_json(path) == {"segments": [{"text": "안녕"}]}
+
+        path.write_text('{"segments": [], "edited": true}', encoding="utf-8")
+        assert io_helpers.read_json(path) == {"segments": [], "edited": True}
+    finally:
+        io_helpers.enable_json_memo(False)
+
+
+def test_json_memo_is_bounded_and_cleared_per_run(tmp_path: Path) -> None:
+    io_helpers.enable_json_memo(max_entries=2)
+    try:
+        for name in ("a", "b", "c"):
+            io_helpers.write_json(tmp_path / "run1" / f"{name}.json", {"name": name})
+        io_helpers.write_json(tmp_path / "run2" / "d.json", {"name": "d"})
+        assert [Path(path).name for path in io_helpers._json_memo] == ["c.json", "d.json"]
+
+        assert io_helpers.forget_json_memo(tmp_path / "run1") == 1
+        assert [Path(path).name for path in io_helpers._json_memo] == ["d.json"]
+        assert io_helpers.read_json(tmp_path / "run1" / "a.json") == {"name": "a"}
+    finally:
+        io_helpers.enable_json_memo(False)
+
+
+def test_trace_collects_module_stages_from_subprocess(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_STEP_CACHE", "0")
+    module = tmp_path / "modules" / "staged"
+    module.mkdir(parents=True)
+    (module / "run.py").write_text(
+        "import sys, time, wave\n"
+        f"sys.path.insert(0, {str(pipeline_runner.ROOT_DIR)!r})\n"
+        "from shared.utils import progress\n"
+        "with progress.stage('load_model'):\n"
+        "    time.sleep(0.2)\n"
+        "with progress.stage('inference'):\n"
+        "    with wave.open(sys.argv[sys.argv.index('--output') + 1], 'wb') as out:\n"
+        "        out.setnchannels(1); out.setsampwidth(2); out.setframerate(8000); out.writeframes(b'\\0\\0' * 16000)\n",
+        encoding="utf-8",
+    )
+    steps = [Step("synth", [sys.executable, str(module / "run.py"), "--output", "{out}"], outputs=["out"])]
+    context = {"out": str(tmp_path / "out.wav"), "run_dir": str(tmp_path)}
+
+    tracer = Tracer("quick")
+    pipeline_runner.open_event_channel(in_process=False)
+    try:
+        results = pipeline_runner.run_dag(steps, {"synth": set()}, context, tracer=tracer)
+    finally:
+        pipeline_runner.close_event_channel()
+    tracer.write(tmp_path / "trace.json")
+
+    assert results["synth"].status == "success"
+    events = json.loads((tmp_path / "trace.json").read_text(encoding="utf-8"))["traceEvents"]
+    spans = {event["name"]: event for event in events if event["ph"] == "X"}
+    assert {"synth", "load_model", "inference"} <= set(spans)
+    assert spans["load_model"]["dur"] >= 150_000
+    assert spans["synth"]["args"]["audio_sec"] == 2.0
+    assert pipeline_runner._event_server is None
+
+
+def _wav(path: Path, seconds: float) -> None:
+    import wave
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(2)
+        out.setframerate(1000)
+        out.writeframes(b"\0\0" * int(seconds * 1000))
+
+
+def test_batch_items_are_ordered_longest_first_with_unique_run_names(tmp_path: Path) -> None:
+    _wav(tmp_path / "in" / "short.wav", 1)
+    _wav(tmp_path / "in" / "long.wav", 3)
+    _wav(tmp_path / "in" / "nested" / "short.wav", 2)
+    (tmp_path / "in" / "notes.txt").write_text("skip", encoding="utf-8")
+    args = pipeline_runner.argparse.Namespace(manifest=None, input_dir=str(tmp_path / "in"), pipeline_type="quick")
+
+    items = pipeline_runner.collect_batch_items(args)
+
+    assert [(Path(item["input_media"]).parent.name, item["duration_sec"]) for item in items] == [("in", 3.0), ("nested", 2.0), ("in", 1.0)]
+    assert [item["run_name"] for item in items] == ["long", "short", "short_2"]
+    assert pipeline_runner.parse_step_limits(["lipsync=2", "tts = 1"]) == {"lipsync": 2, "tts": 1}
+
+
+def test_step_slots_limit_total_and_per_step_concurrency() -> None:
+    slots = pipeline_runner.StepSlots(3, {"lipsync": 1})
+    lock = threading.Lock()
+    active: dict[str, int] = {"all": 0, "lipsync": 0}
+    peak: dict[str, int] = {"all": 0, "lipsync": 0}
+
+    def work(name: str) -> None:
+        with slots.hold(name):
+            with lock:
+                for key in ("all", name):
+                    if key in active:
+                        active[key] += 1
+                        peak[key] = max(peak[key], active[key])
+            time.sleep(0.05)
+            with lock:
+                for key in ("all", name):
+                    if key in active:
+                        active[key] -= 1
+
+    threads = [threading.Thread(target=work, args=(name,)) for name in ["lipsync"] * 3 + ["stt"] * 4]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == {"all": 3, "lipsync": 1}
+
+
+def test_batch_failure_in_one_file_does_not_stop_others(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PADIEM_STEP_CACHE", "0")
+    module = tmp_path / "modules" / "copy"
+    module.mkdir(parents=True)
+    (module / "run.py").write_text(
+        "import shutil, sys, time\n"
+        "args = dict(zip(sys.argv[1::2], sys.argv[2::2]))\n"
+        "time.sleep(0.3 if 'slow' in args['--input'] else 0)\n"
+        "if 'bad' in args['--input']:\n"
+        "    sys.exit(5)\n"
+        "shutil.copy(args['--input'], args['--output'])\n",
+        encoding="utf-8",
+    )
+    config_path = tmp_path / "pipeline.yaml"
+    config_path.write_text(
+        "pipelines:\n"
+        "  quick: [first, second]\n"
+        "steps:\n"
+        f"  first: [{sys.executable}, {module / 'run.py'}, --input, '{{input_media}}', --output, '{{stt_output}}']\n"
+        f"  second: [{sys.executable}, {module / 'run.py'}, --input, '{{stt_output}}', --output, '{{text_output}}']\n",
+        encoding="utf-8",
+    )
+    _wav(tmp_path / "in" / "slow.wav", 2)
+    _wav(tmp_path / "in" / "bad.wav", 1)
+    report_path = tmp_path / "report.json"
+    argv = [
+        "pipeline_runner.py", "--pipeline-type", "quick", "--config", str(config_path), "--input-dir", str(tmp_path / "in"),
+        "--run-root", str(tmp_path / "runs"), "--batch-workers", "2", "--max-parallel", "2", "--report", str(report_path), "--no-trace",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    with pytest.raises(SystemExit) as excinfo:
+        pipeline_runner.main()
+
+    assert excinfo.value.code == 1
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    items = {item["run_name"]: item for item in report["items"]}
+    assert report["succeeded"] == 1 and report["failed"] == 1
+    assert items["slow"]["status"] == "success" and items["slow"]["steps"]["second"]["status"] == "success"
+    assert items["bad"]["failed_step"] == "first" and items["bad"]["steps"]["second"]["status"] == "skipped"
+    rows = (tmp_path / "report.csv").read_text(encoding="utf-8").splitlines()
+    assert rows[0].endswith("first_sec,second_sec") and len(rows) == 3
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager, pipeline
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path) -> None:
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+
+
+def test_build_steps_links_primary_tts_to_rvc_and_lipsync(tmp_path: Path) -> None:
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"")
+    run_dir = tmp_path / "clip"
+
+    steps = {
+        step.name: step
+        for step in pipeline.build_steps(video, run_dir, tts_models=["xtts", "vallex"], lipsync_model="musetalk")
+    }
+
+    assert list(steps) == ["audio_extract", "stt", "text_process", "tts_xtts", "tts_vallex", "rvc", "lipsync"]
+    assert steps["tts_vallex"].needs == ["text_process"]
+    assert steps["rvc"].needs == ["tts_xtts"]
+    assert steps["lipsync"].module == "lipsync_musetalk"
+    assert steps["lipsync"].needs == ["rvc"]
+    assert steps["stt"].output == str(run_dir / "clip_result.json")
+
+
+def test_build_steps_requires_outputs_of_skipped_stages(tmp_path: Path) -> None:
+    audio = tmp_path / "voice.wav"
+    audio.write_bytes(b"")
+
+    with pytest.raises(ValueError):
+        pipeline.build_steps(audio, tmp_path / "voice", stages=["tts", "rvc"])
+
+    # 오디오 입력은 추출/립싱크 없이 STT부터 시작
+    steps = pipeline.build_steps(audio, tmp_path / "voice")
+    assert [step.name for step in steps] == ["stt", "text_process", "tts_vallex", "rvc"]
+    assert steps[0].needs == []
+    assert str(audio) in steps[0].command
+
+
+def _steps() -> list[pipeline.PipelineStep]:
+    return [
+        pipeline.PipelineStep("text", "text_processor", ["text"], "text.json"),
+        pipeline.PipelineStep("tts_a", "tts", ["tts_a"], "a.wav", ["text"]),
+        pipeline.PipelineStep("tts_b", "tts_backup", ["tts_b"], "b.wav", ["text"]),
+        pipeline.PipelineStep("rvc", "rvc", ["rvc"], "rvc.wav", ["tts_a"]),
+    ]
+
+
+def _run(steps: list[pipeline.PipelineStep], failing: set[str], barrier: threading.Barrier | None = None) -> dict:
+    executor = ThreadPoolExecutor(max_workers=4)
+
+    def launch(job_id: str, command: list[str], meta: dict) -> Future:
+        def work() -> dict:
+            job_manager.mark_running(job_id)
+            if barrier is not None and command[0] in ("tts_a", "tts_b"):
+                # 두 TTS 분기가 동시에 실행 중이어야 통과
+                barrier.wait(5)
+            if command[0] in failing:
+                job_manager.mark_failed(job_id, "boom")
+                raise RuntimeError("boom")
+            job_manager.mark_success(job_id, {"stdout": command[0]})
+            return {}
+
+        return executor.submit(work)
+
+    job_id = job_manager.create_job({"module": "pipeline"})
+    run = pipeline.PipelineRun(job_id, steps, launch=launch)
+    run.run()
+    executor.shutdown()
+    return job_manager.get_job(job_id)
+
+
+def test_independent_branches_run_concurrently() -> None:
+    job = _run(_steps(), failing=set(), barrier=threading.Barrier(2))
+
+    assert job["status"] == job_manager.JobStatus.SUCCESS
+    assert job["result"]["outputs"]["rvc"] == "rvc.wav"
+    assert job["progress"]["fraction"] == 1.0
+    assert {entry["status"] for entry in job["progress"]["steps"].values()} == {job_manager.JobStatus.SUCCESS}
+
+
+def test_failed_step_skips_dependents_only() -> None:
+    job = _run(_steps(), failing={"tts_a"})
+
+    steps = job["progress"]["steps"]
+    assert job["status"] == job_manager.JobStatus.FAILED
+    assert steps["tts_a"]["status"] == job_manager.JobStatus.FAILED
+    assert steps["rvc"]["status"] == pipeline.STEP_SKIPPED
+    assert steps["tts_b"]["status"] == job_manager.JobStatus.SUCCESS
+    child = job_manager.get_job(steps["tts_b"]["job_id"])
+    assert child["meta"]["parent_job_id"] == job["job_id"]
+
+
+def test_active_run_dir_cannot_be_shared(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    run_dir = tmp_path / "runs" / "clip"
+    active = pipeline.PipelineRun("job-active", _steps(), run_dir=run_dir)
+    monkeypatch.setattr(pipeline, "_runs", {"job-active": active})
+
+    assert pipeline.run_dir_owner(tmp_path / "runs" / ".." / "runs" / "clip") == "job-active"
+    assert pipeline.run_dir_owner(tmp_path / "runs" / "clip_2") is None
+    with pytest.raises(pipeline.RunDirBusy) as excinfo:
+        pipeline.start_pipeline(_steps(), meta={"run_dir": str(run_dir)})
+    assert excinfo.value.job_id == "job-active"
+    assert list(pipeline._runs) == ["job-active"]
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from shared.utils import process_tree
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX 프로세스 그룹 동작 확인")
+def test_kill_tree_terminates_grandchildren(tmp_path: Path) -> None:
+    pid_file = tmp_path / "child.pid"
+    # 모듈이 ffmpeg를 띄우는 것처럼 자식 프로세스를 하나 더 띄우고 대기하는 프로세스
+    script = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n"
+    )
+    process = subprocess.Popen([sys.executable, "-c", script], **process_tree.new_group_kwargs())
+    deadline = time.monotonic() + 10
+    while not pid_file.exists() or not pid_file.read_text():
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    child_pid = int(pid_file.read_text())
+
+    process_tree.kill_tree(process, grace=0.5)
+    process.wait(5)
+
+    deadline = time.monotonic() + 5
+    while _alive(child_pid):
+        assert time.monotonic() < deadline, "손자 프로세스가 남아 있습니다"
+        time.sleep(0.05)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # 부모가 이미 종료되어 회수되지 않은 좀비는 종료된 것으로 본다
+    stat = Path(f"/proc/{pid}/stat")
+    return not (stat.exists() and stat.read_text().split()[2] == "Z")
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+
+from backend import job_manager, progress
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(autouse=True)
+def job_db(tmp_path: Path):
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    yield
+    progress.shutdown()
+
+
+def test_subprocess_progress_is_stored_on_job(tmp_path: Path) -> None:
+    script = tmp_path / "module.py"
+    script.write_text(
+        textwrap.dedent(
+            f"""
+            import sys
+            sys.path.append({str(ROOT_DIR)!r})
+            from shared.utils import progress
+
+            with progress.stage("load_model"):
+                pass
+            progress.report(stage="infer", fraction=0.5, rtf=0.25)
+            progress.report(stage="infer", fraction=1.0, segments_done=3)
+            """
+        ),
+        encoding="utf-8",
+    )
+    job_id = job_manager.create_job({"module": "stt"})
+    progress.begin(job_id)
+    subprocess.run([sys.executable, str(script)], check=True, env={**os.environ, **progress.env_for(job_id)})
+    progress.add_log(job_id, "마지막 로그")
+
+    # 진행률 이벤트는 별도 수신 스레드가 처리하므로 마지막 이벤트가 반영될 때까지 대기
+    deadline = time.monotonic() + 5
+    while progress._trackers[job_id].progress.get("segments_done") != 3 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    progress.finish(job_id)
+    job = job_manager.get_job(job_id)
+
+    assert job["progress"]["stage"] == "infer"
+    assert job["progress"]["fraction"] == 1.0
+    assert job["progress"]["rtf"] == 0.25
+    assert set(job["timings"]) == {"load_model", "infer"}
+    assert job["logs"] == ["마지막 로그"]
+    assert "logs" not in job_manager.list_jobs()[0]
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from shared.utils.resident_worker import ResidentWorker
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture()
+def worker_script(tmp_path: Path) -> Path:
+    script = tmp_path / "run.py"
+    script.write_text(
+        textwrap.dedent(
+            f"""
+            import os
+            import sys
+
+            sys.path.append({str(ROOT_DIR)!r})
+            from shared.utils import progress
+            from shared.utils.resident_worker import run_entrypoint
+
+            CALLS = []
+
+
+            def main(argv=None):
+                output, value = argv
+                if value == "fail":
+                    raise ValueError("bad input")
+                CALLS.append(value)
+                with progress.stage("write"):
+                    print(f"writing {{value}}")
+                progress.report(stage="write", fraction=1.0, segments_done=len(CALLS))
+                with open(output, "w", encoding="utf-8") as f:
+                    f.write(f"{{os.getpid()}}:{{len(CALLS)}}")
+
+
+            if __name__ == "__main__":
+                run_entrypoint(main)
+            """
+        ),
+        encoding="utf-8",
+    )
+    return script
+
+
+def test_resident_worker_reuses_process_state(worker_script: Path, tmp_path: Path) -> None:
+    worker = ResidentWorker(worker_script, python=sys.executable)
+    output = tmp_path / "out.txt"
+    try:
+        worker.call([str(output), "a"])
+        first_pid, first_calls = output.read_text(encoding="utf-8").split(":")
+        worker.call([str(output), "b"])
+        second_pid, second_calls = output.read_text(encoding="utf-8").split(":")
+
+        assert first_pid == second_pid == str(worker.pid)
+        assert (first_calls, second_calls) == ("1", "2")
+
+        with pytest.raises(RuntimeError, match="bad input"):
+            worker.call([str(output), "fail"])
+        assert worker.alive
+    finally:
+        worker.stop()
+    assert not worker.alive
+
+
+def test_resident_worker_forwards_progress_events(worker_script: Path, tmp_path: Path) -> None:
+    worker = ResidentWorker(worker_script, python=sys.executable)
+    received: list[dict] = []
+    try:
+        worker.call([str(tmp_path / "out.txt"), "a"], on_event=received.append)
+    finally:
+        worker.stop()
+
+    kinds = [(event["type"], event.get("status")) for event in received]
+    assert ("stage", "start") in kinds and ("stage", "end") in kinds
+    assert {"type": "log", "line": "writing a"}.items() <= next(e for e in received if e["type"] == "log").items()
+    assert next(e for e in received if e["type"] == "progress")["segments_done"] == 1
+
+
+def test_vallex_resident_worker_restarts_when_settings_change(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from modules.tts_vallex import run as vallex_run
+
+    started: list[FakeWorker] = []
+
+    class FakeWorker:
+        def __init__(self, script: str, python: str, cwd: Path | None, env: dict[str, str]) -> None:
+            self.cwd, self.env, self.stopped, self.calls = cwd, env, False, 0
+            started.append(self)
+
+        def call(self, argv: list[str], on_event=None) -> None:
+            self.calls += 1
+
+        def stop(self) -> None:
+            self.stopped = True
+
+    monkeypatch.setattr(vallex_run, "ResidentWorker", FakeWorker)
+    monkeypatch.setattr(vallex_run, "_VALLEX_WORKERS", {})
+    monkeypatch.setenv("PADIEM_PROGRESS_JOB", "job-1")
+    command = [sys.executable, "run_vallex.py", "--input-text", "a.txt"]
+    checkpoints = tmp_path / "checkpoints"
+
+    def run(work_dir: Path, env: dict[str, str]) -> None:
+        vallex_run._run_vallex_resident(command, work_dir=work_dir, env={**vallex_run.os.environ, **env}, checkpoint_dir=checkpoints)
+
+    run(tmp_path / "work", {"CUDA_VISIBLE_DEVICES": "0"})
+    monkeypatch.setenv("PADIEM_PROGRESS_JOB", "job-2")  # 작업마다 바뀌는 환경은 재시작 사유가 아님
+    run(tmp_path / "work", {"CUDA_VISIBLE_DEVICES": "0"})
+    run(tmp_path / "work", {"CUDA_VISIBLE_DEVICES": "1"})
+    run(tmp_path / "other", {"CUDA_VISIBLE_DEVICES": "1"})
+
+    assert [worker.calls for worker in started] == [2, 1, 1]
+    assert [worker.stopped for worker in started] == [True, True, False]
+    assert started[0].env == {"CUDA_VISIBLE_DEVICES": "0"} and started[2].cwd == tmp_path / "other"
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+from pathlib import Path
+
+import pytest
+
+from backend import blob_store, job_manager, retention
+from shared.utils import run_lock, step_cache
+
+DAY = 24 * 3600
+
+
+@pytest.fixture(autouse=True)
+def roots(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    job_manager.configure(tmp_path / "jobs.sqlite3")
+    monkeypatch.setattr(retention, "TEMP_DIR", tmp_path / "temp")
+    monkeypatch.setattr(retention, "RUN_ROOT", tmp_path / "runs")
+    monkeypatch.setattr(retention, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(retention.tempfile, "gettempdir", lambda: str(tmp_path / "systmp"))
+    monkeypatch.setattr(blob_store, "BLOB_ROOT", tmp_path / "blobs")
+    monkeypatch.setattr(blob_store, "SESSION_ROOT", tmp_path / "sessions")
+    monkeypatch.setattr(retention.batches, "BATCH_ROOT", tmp_path / "batches")
+    monkeypatch.setattr(step_cache, "get_cache", lambda: None)
+    monkeypatch.setattr(retention, "_disk_usage", lambda _path: (10, 100))
+    (tmp_path / "systmp").mkdir()
+    return tmp_path
+
+
+def _file(path: Path, size: int, age: float) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_expired_artifacts_are_reported_in_dry_run_and_removed(roots: Path) -> None:
+    old_temp = _file(roots / "temp" / "clip_head10s.mp4", 100, 2 * DAY)
+    fresh_temp = _file(roots / "temp" / "clip.wav", 100, 60)
+    stale_rvc = _file(roots / "systmp" / "padiem_rvc_abc.wav", 50, 2 * DAY)
+    foreign = _file(roots / "systmp" / "other.wav", 50, 2 * DAY)
+    old_audio = _file(roots / "runs" / "old" / "old_audio.wav", 10, 8 * DAY)
+    old_final = _file(roots / "runs" / "old" / "old_rvc.wav", 10, 8 * DAY)
+
+    report = retention.run_gc(dry_run=True)
+
+    assert {Path(entry["path"]) for entry in report["removed"]} == {old_temp, stale_rvc, old_audio}
+    assert old_temp.exists() and old_audio.exists()
+
+    retention.run_gc()
+
+    assert not old_temp.exists() and not stale_rvc.exists() and not old_audio.exists()
+    assert fresh_temp.exists() and foreign.exists() and old_final.exists()
+
+
+def test_active_runs_are_kept(roots: Path) -> None:
+    run_dir = _file(roots / "runs" / "busy" / "busy_audio.wav", 10, 8 * DAY).parent
+    job_manager.create_job({"module": "pipeline", "run_dir": str(run_dir)})
+
+    retention.run_gc()
+
+    assert run_dir.exists()
+
+
+def test_run_finals_are_kept_unless_enabled(roots: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(retention, "_disk_usage", lambda _path: (99, 100))
+    run_dir = roots / "runs" / "clip"
+    intermediates = [
+        _file(run_dir / "clip_audio.wav", 10, 8 * DAY),
+        _file(run_dir / "clip_valle.wav", 10, 8 * DAY),
+        _file(run_dir / ".stamps" / "stt.json", 1, 8 * DAY).parent,
+    ]
+    final = _file(run_dir / "clip_wav2lip.mp4", 10, 8 * DAY)
+
+    retention.run_gc()
+
+    assert final.exists() and not any(path.exists() for path in intermediates)
+
+    monkeypatch.setenv("PADIEM_TTL_FINALS", str(30 * DAY))
+    report = retention.run_gc()
+
+    assert [entry["kind"] for entry in report["removed"]] == ["finals"]
+    assert not run_dir.exists()
+
+
+def test_recent_or_locked_run_dirs_are_kept(roots: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(retention, "_disk_usage", lambda _path: (99, 100))
+    # 오래 걸리는 단계가 실행 중이면 폴더의 다른 파일은 오래됐어도 지우지 않는다.
+    busy = roots / "runs" / "busy"
+    old_audio = _file(busy / "busy_audio.wav", 10, DAY)
+    _file(busy / "busy_result.json", 1, 60)
+    locked = roots / "runs" / "locked"
+    locked_audio = _file(locked / "locked_audio.wav", 10, DAY)
+    stale = roots / "runs" / "stale"
+    stale_audio = _file(stale / "stale_audio.wav", 10, DAY)
+    (stale / run_lock.RUN_LOCK_NAME).write_text(json.dumps({"pid": 2**22 + 1, "host": socket.gethostname()}), encoding="utf-8")
+    os.utime(stale / run_lock.RUN_LOCK_NAME, (time.time() - DAY, time.time() - DAY))
+
+    with run_lock.hold(locked):
+        os.utime(locked / run_lock.RUN_LOCK_NAME, (time.time() - DAY, time.time() - DAY))
+        retention.run_gc()
+        assert old_audio.exists() and locked_audio.exists()
+
+    assert not stale_audio.exists()
+
+
+def test_temp_inputs_of_running_jobs_are_kept(roots: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(retention, "_disk_usage", lambda _path: (95, 100))
+    trimmed = _file(roots / "temp" / "clip_head10s.mp4", 100, 2 * DAY)
+    augmented = _file(roots / "systmp" / "padiem_rvc_abc.wav", 50, 2 * DAY)
+    lipsync = job_manager.create_job({"module": "lipsync"})
+    job_manager.mark_running(lipsync)
+    job_manager.create_job({"module": "rvc"})  # 대기 중인 작업은 임시 파일을 쓰지 않음
+
+    report = retention.run_gc()
+
+    assert trimmed.exists() and not augmented.exists()
+    assert {entry["kind"] for entry in report["removed"]} == {"tmp"}
+
+
+def test_disk_pressure_evicts_oldest_intermediates_first(roots: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    used = {"bytes": 95}
+    monkeypatch.setattr(retention, "_disk_usage", lambda _path: (used["bytes"], 100))
+    older = _file(roots / "runs" / "a" / "a.wav", 10, 3 * DAY).parent
+    newer = _file(roots / "runs" / "b" / "b.wav", 10, 2 * DAY).parent
+    temp = _file(roots / "temp" / "t.wav", 5, DAY / 2)
+
+    original_remove = retention._remove
+
+    def _remove(item):
+        used["bytes"] -= item.size
+        return original_remove(item)
+
+    monkeypatch.setattr(retention, "_remove", _remove)
+    report = retention.run_gc()
+
+    # temp(5) → 가장 오래된 run(10)을 지우면 80%로 내려가 멈춘다.
+    assert [entry["reason"] for entry in report["removed"]] == ["disk", "disk"]
+    assert not temp.exists() and not older.exists()
+    assert newer.exists()
+
+
+def test_finished_job_records_expire() -> None:
+    old = job_manager.create_job({"module": "stt"})
+    job_manager.mark_success(old, {})
+    pending = job_manager.create_job({"module": "stt"})
+
+    report = retention.run_gc(now=time.time() + 31 * DAY)
+
+    assert report["jobs_purged"] == 1
+    with pytest.raises(KeyError):
+        job_manager.get_job(old)
+    assert job_manager.get_job(pending)["status"] == job_manager.JobStatus.PENDING
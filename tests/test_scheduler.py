@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from backend.scheduler import RESOURCE_HEAVY, RESOURCE_LIGHT, Scheduler, timeout_for
+
+
+def test_heavy_slots_limit_concurrency_and_report_queue_position() -> None:
+    scheduler = Scheduler({RESOURCE_HEAVY: 1, RESOURCE_LIGHT: 2})
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> str:
+        started.set()
+        release.wait(5)
+        return "first"
+
+    first = scheduler.submit("job-1", "lipsync", blocking)
+    assert started.wait(5)
+    second = scheduler.submit("job-2", "tts", lambda: "second")
+    third = scheduler.submit("job-3", "stt", lambda: "third")
+
+    assert scheduler.queue_position("job-2") == 1
+    assert scheduler.queue_position("job-3") == 2
+    assert scheduler.stats()["resources"][RESOURCE_HEAVY] == {"slots": 1, "running": 1, "queued": 2}
+
+    # light 작업은 heavy 대기열과 무관하게 바로 실행
+    assert scheduler.submit("job-4", "text_processor", lambda: "light").result(5) == "light"
+
+    release.set()
+    assert [f.result(5) for f in (first, second, third)] == ["first", "second", "third"]
+    assert scheduler.queue_position("job-3") is None
+    assert scheduler.stats()["modules"]["lipsync"]["completed"] == 1
+
+
+def test_cancel_removes_queued_task() -> None:
+    scheduler = Scheduler({RESOURCE_HEAVY: 1, RESOURCE_LIGHT: 1})
+    release = threading.Event()
+    started = threading.Event()
+
+    def blocking() -> str:
+        started.set()
+        release.wait(5)
+        return "running"
+
+    running = scheduler.submit("job-1", "rvc", blocking)
+    assert started.wait(5)
+    queued = scheduler.submit("job-2", "rvc", lambda: "never")
+
+    assert scheduler.cancel("job-2") is True
+    assert queued.cancelled()
+    # 이미 실행 중인 작업은 대기열 취소 대상이 아님
+    assert scheduler.cancel("job-1") is False
+
+    release.set()
+    assert running.result(5) == "running"
+
+
+def test_module_timeouts_can_be_overridden(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert timeout_for("lipsync") == 7200
+    monkeypatch.setenv("PADIEM_TIMEOUT_LIPSYNC", "90")
+    assert timeout_for("lipsync") == 90
+    assert timeout_for("lipsync", items=3) == 270
+    monkeypatch.setenv("PADIEM_TIMEOUT_LIPSYNC", "0")
+    assert timeout_for("lipsync") is None
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from shared.utils import step_cache
+from shared.utils.step_cache import StepCache
+
+
+def _module(tmp_path: Path) -> Path:
+    module_dir = tmp_path / "modules" / "fake"
+    (module_dir / "config").mkdir(parents=True)
+    (module_dir / "config" / "settings.yaml").write_text("language: ko\n", encoding="utf-8")
+    script = module_dir / "run.py"
+    script.write_text("# fake module\n", encoding="utf-8")
+    return script
+
+
+def _runner(output: Path, calls: list[int]):
+    def execute() -> dict:
+        calls.append(1)
+        output.write_text(f"run {len(calls)}", encoding="utf-8")
+        return {"stdout": "ok"}
+
+    return execute
+
+
+def test_hit_materializes_output_without_running(tmp_path: Path) -> None:
+    script = _module(tmp_path)
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    output = tmp_path / "out" / "result.json"
+    output.parent.mkdir()
+    cache = StepCache(tmp_path / "cache")
+    command = [sys.executable, str(script), "--input", str(source), "--output", str(output)]
+    calls: list[int] = []
+
+    first = cache.run(command, _runner(output, calls))
+    output.unlink()
+    second = cache.run(command, _runner(output, calls))
+
+    assert first["cache_hit"] is False
+    assert second == {"stdout": "ok", "cache_hit": True}
+    assert calls == [1]
+    assert output.read_text(encoding="utf-8") == "run 1"
+
+    # 캐시에서 배치한 출력(하드링크)을 다시 덮어써도 캐시 항목은 바뀌지 않아야 한다.
+    cache.run([*command, "--target-language", "en"], _runner(output, calls))
+    output.unlink()
+    assert cache.run(command, _runner(output, calls))["cache_hit"] is True
+    assert output.read_text(encoding="utf-8") == "run 1"
+
+
+def test_input_config_or_module_change_misses(tmp_path: Path) -> None:
+    script = _module(tmp_path)
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    output = tmp_path / "out.json"
+    cache = StepCache(tmp_path / "cache")
+    command = [sys.executable, str(script), "--input", str(source), "--output", str(output)]
+    calls: list[int] = []
+
+    cache.run(command, _runner(output, calls))
+    source.write_bytes(b"other audio")
+    cache.run(command, _runner(output, calls))
+    (script.parent / "config" / "settings.yaml").write_text("language: en\n", encoding="utf-8")
+    cache.run(command, _runner(output, calls))
+    script.write_text("# fake module v2\n", encoding="utf-8")
+    result = cache.run(command, _runner(output, calls))
+
+    assert calls == [1, 1, 1, 1]
+    assert result["cache_hit"] is False
+
+
+def test_referenced_files_and_shared_code_change_misses(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = _module(tmp_path)
+    shared_dir = tmp_path / "shared_utils"
+    shared_dir.mkdir()
+    (shared_dir / "audio.py").write_text("# v1\n", encoding="utf-8")
+    monkeypatch.setattr(step_cache, "SHARED_CODE_DIR", shared_dir)
+    checkpoint = script.parent / "checkpoints" / "out.pth"
+    checkpoint.parent.mkdir()
+    checkpoint.write_bytes(b"weights v1")
+    (script.parent / "config" / "settings.yaml").write_text(f"checkpoint: {checkpoint}\nf0_method: harvest\n", encoding="utf-8")
+    speaker = tmp_path / "speaker.wav"
+    speaker.write_bytes(b"voice v1")
+    source = tmp_path / "in.wav"
+    source.write_bytes(b"audio")
+    output = tmp_path / "out.wav"
+    cache = StepCache(tmp_path / "cache")
+    command = [sys.executable, str(script), "--input", str(source), "--output", str(output), "--speaker-audio", str(speaker)]
+    calls: list[int] = []
+
+    cache.run(command, _runner(output, calls))
+    assert cache.run(command, _runner(output, calls))["cache_hit"] is True
+    checkpoint.write_bytes(b"weights v2 (retrained)")
+    cache.run(command, _runner(output, calls))
+    speaker.write_bytes(b"voice v2 (new take)")
+    cache.run(command, _runner(output, calls))
+    (shared_dir / "audio.py").write_text("# v2 bug fix\n", encoding="utf-8")
+    cache.run(command, _runner(output, calls))
+
+    assert calls == [1, 1, 1, 1]
+
+
+def test_digest_memo_is_bounded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(step_cache, "_DIGEST_MEMO_LIMIT", 2)
+    monkeypatch.setattr(step_cache, "_digests", step_cache.OrderedDict())
+    paths = [tmp_path / f"{index}.bin" for index in range(3)]
+    for path in paths:
+        path.write_bytes(path.name.encode("ascii"))
+        step_cache.file_digest(path)
+    step_cache.file_digest(paths[1])
+    step_cache.file_digest(paths[0])
+
+    assert [key[0] for key in step_cache._digests] == [str(paths[1]), str(paths[0])]
+
+
+def test_eviction_removes_least_recently_used(tmp_path: Path) -> None:
+    script = _module(tmp_path)
+    cache = StepCache(tmp_path / "cache")
+    keys = []
+    for index in range(3):
+        source = tmp_path / f"in{index}.wav"
+        source.write_bytes(bytes([index]))
+        output = tmp_path / f"out{index}.json"
+        command = [sys.executable, str(script), "--input", str(source), "--output", str(output)]
+        cache.run(command, _runner(output, []))
+        entry = next(path for path in (tmp_path / "cache").glob("??/*") if path.name not in keys)
+        keys.append(entry.name)
+        # 항목마다 마지막 사용 시각을 다르게 둔다.
+        os.utime(entry, (index, index))
+
+    sizes = {entry.name: size for _, size, entry in cache._entries()}
+    cache.max_bytes = sizes[keys[1]] + sizes[keys[2]]
+    assert cache.evict() == 1
+    remaining = {path.name for path in (tmp_path / "cache").glob("??/*")}
+    assert keys[0] not in remaining
+    assert keys[2] in remaining
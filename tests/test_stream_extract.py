@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from backend import blob_store, stream_extract
+
+
+# ffmpeg 대신 입력(-i 뒤 인자)을 그대로 출력 파일(마지막 인자)에 복사하는 스크립트.
+# FAIL_ON_PIPE가 설정되면 표준 입력 디코딩에 실패하는 형식(moov가 끝에 있는 MP4 등)을 흉내 낸다.
+FAKE_FFMPEG = """\
+import os, sys
+args = sys.argv[1:]
+source = args[args.index("-i") + 1]
+if source == "pipe:0":
+    if os.environ.get("FAIL_ON_PIPE"):
+        sys.stdin.buffer.read(10)
+        sys.stderr.write("moov atom not found\\n")
+        sys.exit(1)
+    data = sys.stdin.buffer.read()
+else:
+    with open(source, "rb") as f:
+        data = f.read()
+with open(args[-1], "wb") as f:
+    f.write(data)
+"""
+
+
+@pytest.fixture(autouse=True)
+def store_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(blob_store, "BLOB_ROOT", tmp_path / "blobs")
+    monkeypatch.setattr(blob_store, "UPLOAD_ROOT", tmp_path / "uploads")
+    monkeypatch.setattr(blob_store, "SESSION_ROOT", tmp_path / "uploads" / ".sessions")
+    return tmp_path
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path: Path) -> dict:
+    script = tmp_path / "fake_ffmpeg.py"
+    script.write_text(FAKE_FFMPEG, encoding="utf-8")
+    launcher = tmp_path / "ffmpeg"
+    launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+    launcher.chmod(0o755)
+    return {"ffmpeg_path": str(launcher)}
+
+
+@pytest.mark.skipif(os.name == "nt", reason="셸 스크립트 기반 가짜 ffmpeg")
+def test_streaming_extract_decodes_while_uploading(tmp_path: Path, fake_ffmpeg: dict) -> None:
+    data = os.urandom(300_000)
+    output = tmp_path / "out" / "clip_audio.wav"
+    extractor = stream_extract.StreamingExtractor(output, config=fake_ffmpeg)
+    for idx in range(0, len(data), 65536):
+        extractor.feed(data[idx:idx + 65536])
+    result = extractor.finish()
+
+    assert result["streamed"] is True
+    assert result["sha256"] == hashlib.sha256(data).hexdigest()
+    assert result["size"] == len(data)
+    assert output.read_bytes() == data
+    assert blob_store.blob_path(result["sha256"]).read_bytes() == data
+
+
+@pytest.mark.skipif(os.name == "nt", reason="셸 스크립트 기반 가짜 ffmpeg")
+def test_falls_back_to_stored_original_when_pipe_decoding_fails(
+    tmp_path: Path, fake_ffmpeg: dict, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("FAIL_ON_PIPE", "1")
+    data = os.urandom(200_000)
+    output = tmp_path / "clip_audio.wav"
+    extractor = stream_extract.StreamingExtractor(output, config=fake_ffmpeg)
+    for idx in range(0, len(data), 4096):
+        extractor.feed(data[idx:idx + 4096])
+    result = extractor.finish()
+
+    assert result["streamed"] is False
+    # 스트림 디코딩이 중간에 끊겨도 원본은 빠짐없이 저장되고 그 원본으로 다시 추출한다.
+    assert output.read_bytes() == data
+
+
+def test_missing_ffmpeg_raises_runtime_error(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError):
+        stream_extract.StreamingExtractor(tmp_path / "a.wav", config={"ffmpeg_path": str(tmp_path / "nope")})
+    assert not list((tmp_path / "uploads" / ".sessions").glob("*.part"))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+from shared.utils.tracing import MIB, Tracer
+
+
+def test_spans_counters_and_summary(tmp_path: Path) -> None:
+    tracer = Tracer("pipeline:quick")
+    base = tracer.origin
+    tracer.step_started("stt", at=base)
+    tracer.handle_event("stt", {"type": "stage", "stage": "load_model", "status": "start", "ts": base + 0.1})
+    tracer.handle_event("stt", {"type": "stage", "stage": "load_model", "status": "end", "elapsed_sec": 2.0, "ts": base + 2.1})
+    tracer.handle_event("stt", {"type": "stage", "stage": "transcribe", "status": "start", "ts": base + 2.1})
+    tracer.handle_event("stt", {"type": "progress", "stage": "transcribe", "audio_sec": 20.0, "ts": base + 7.0})
+    tracer.sample_rss({"stt": 900 * MIB}, at=base + 3)
+    tracer.sample_rss({"stt": 1200 * MIB, "other": 10 * MIB}, at=base + 4)
+    # 닫히지 않은 구간은 단계가 끝날 때 닫히고, 모듈이 보고한 audio_sec가 우선한다.
+    tracer.step_finished("stt", "success", at=base + 8.1, audio_sec=99.0)
+    tracer.step_started("text_process", at=base + 8.1)
+    tracer.step_finished("text_process", "failed", at=base + 8.6)
+
+    path = tmp_path / "run" / "trace.json"
+    tracer.write(path)
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+
+    spans = {(event["cat"], event["name"]): event for event in events if event["ph"] == "X"}
+    step = spans[("step", "stt")]
+    assert step["ts"] == 0 and step["dur"] == 8_100_000
+    assert step["args"] == {"audio_sec": 20.0, "status": "success", "peak_rss_mb": 1200.0, "rtf": 0.405}
+    assert spans[("phase", "load_model")]["ts"] == 100_000 and spans[("phase", "load_model")]["dur"] == 2_000_000
+    assert spans[("phase", "transcribe")]["dur"] == 6_000_000 and spans[("phase", "transcribe")]["tid"] == step["tid"]
+    assert spans[("step", "text_process")]["args"]["status"] == "failed"
+    names = {event["args"]["name"] for event in events if event["name"] == "thread_name"}
+    assert names == {"stt", "text_process"}
+    counters = [event for event in events if event["ph"] == "C"]
+    assert counters[-1]["args"] == {"stt": 1200.0, "other": 10.0}
+
+    summary = tracer.summary()
+    assert "transcribe 6.0s, load_model 2.0s" in summary and "(RTF 0.40" in summary
+    assert "가장 오래 걸린 구간: stt/transcribe 6.0s" in summary
+
+
+def test_sampler_records_until_stopped() -> None:
+    tracer = Tracer()
+    tracer.step_started("rvc")
+    tracer.start_sampling(lambda: {"rvc": 5 * MIB}, interval=0.01)
+    time.sleep(0.1)
+    tracer.stop_sampling()
+    count = sum(1 for event in tracer.events() if event["ph"] == "C")
+    time.sleep(0.05)
+
+    assert count >= 2 and sum(1 for event in tracer.events() if event["ph"] == "C") == count
+    tracer.step_finished("rvc", "success")
+    assert "RSS 5MiB" in tracer.summary()